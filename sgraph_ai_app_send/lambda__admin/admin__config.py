@@ -17,6 +17,12 @@ APP_SEND__UI__ADMIN__START_PAGE              = 'index'
 APP_SEND__UI__ADMIN__MAJOR__VERSION          = "v0/v0.1"
 APP_SEND__UI__ADMIN__LATEST__VERSION         = "v0.1.7"
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Room Sessions — set a signing key to issue stateless HMAC-signed session tokens
+# ═══════════════════════════════════════════════════════════════════════════════
+
+ENV_VAR__SGRAPH_SEND__SESSION_SIGNING_KEY        = 'SGRAPH_SEND__SESSION_SIGNING_KEY'
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # Observability Pipeline — Environment Variables
 # Set these on the admin Lambda to enable the /metrics/* endpoints
@@ -19,6 +19,7 @@ from sgraph_ai_app_send.lambda__admin.service.Service__Data_Room
 from sgraph_ai_app_send.lambda__admin.service.Service__Invites                      import Service__Invites
 from sgraph_ai_app_send.lambda__admin.service.Service__Room__Session                import Service__Room__Session
 from sgraph_ai_app_send.lambda__admin.service.Service__Audit                        import Service__Audit
+from sgraph_ai_app_send.lambda__admin.service.Service__Analytics__Buffer            import Service__Analytics__Buffer
 from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client__Vault            import Send__Cache__Client__Vault
 from sgraph_ai_app_send.lambda__admin.fast_api.routes.Routes__Tokens                import Routes__Tokens
 from sgraph_ai_app_send.lambda__admin.fast_api.routes.Routes__Keys                  import Routes__Keys
@@ -28,12 +29,15 @@ from sgraph_ai_app_send.lambda__admin.fast_api.routes.Routes__Data_Room
 from sgraph_ai_app_send.lambda__admin.fast_api.routes.Routes__Invites               import Routes__Invites
 from sgraph_ai_app_send.lambda__admin.fast_api.routes.Routes__Cache__Browser        import Routes__Cache__Browser
 from sgraph_ai_app_send.lambda__admin.service.Middleware__Analytics                 import Middleware__Analytics
+from sgraph_ai_app_send.lambda__admin.service.Middleware__Cache__Request_Scope      import Middleware__Cache__Request_Scope
 from sgraph_ai_app_send.lambda__admin.service.Service__Analytics__Pulse             import compute_pulse
-from sgraph_ai_app_send.lambda__admin.admin__config                                 import METRICS__USE_STUB
+from sgraph_ai_app_send.lambda__admin.admin__config                                 import METRICS__USE_STUB, ENV_VAR__SGRAPH_SEND__SESSION_SIGNING_KEY
+from osbot_utils.utils.Env                                                          import get_env
 from sgraph_ai_app_send.lambda__admin.server_analytics.Routes__Metrics              import Routes__Metrics
 from sgraph_ai_app_send.lambda__admin.server_analytics.Service__Metrics__Cache      import Service__Metrics__Cache
 from sgraph_ai_app_send.lambda__admin.server_analytics.Metrics__Pipeline__Setup     import create_metrics_cache, create_metrics_cache_with_stub
 from sgraph_ai_app_send.utils.MCP__Setup                                            import MCP__Setup
+from sgraph_ai_app_send.utils.Middleware__Flush                                     import Middleware__Flush
 from sgraph_ai_app_send.utils.Version                                               import version__sgraph_ai_app_send
 
 ROUTES_PATHS__ANALYTICS = ['/health/pulse']
@@ -54,6 +58,7 @@ class Fast_API__SGraph__App__Send__Admin(Serverless__Fast_API):
     service_invites      : Service__Invites          = None                             # Invite service (Phase 3)
     service_room_session : Service__Room__Session    = None                             # Room session service (Phase 3)
     service_audit        : Service__Audit            = None                             # Audit trail service (Phase 3)
+    analytics_buffer     : Service__Analytics__Buffer = None                            # Write-behind analytics events (segments per flush)
     metrics_cache        : Service__Metrics__Cache   = None                             # Metrics cache service
 
     def app_kwargs(self, **kwargs):                                                      # Override: move docs under /api/ so CloudFront routes them to Lambda
@@ -96,6 +101,9 @@ class Fast_API__SGraph__App__Send__Admin(Serverless__Fast_API):
         if self.service_audit is None:                                                  # Auto-create audit service (Phase 3)
             self.service_audit = Service__Audit(send_cache_client=self.send_cache_client)
 
+        if self.analytics_buffer is None:                                               # Auto-create analytics buffer (flushed at the end of each request)
+            self.analytics_buffer = Service__Analytics__Buffer(send_cache_client=self.send_cache_client)
+
         if self.service_data_room is None:                                              # Auto-create data room service (Phase 3)
             self.service_data_room = Service__Data_Room(
                 send_cache_client = self.send_cache_client ,
@@ -109,7 +117,8 @@ class Fast_API__SGraph__App__Send__Admin(Serverless__Fast_API):
 
         if self.service_room_session is None:                                           # Auto-create room session service (Phase 3)
             self.service_room_session = Service__Room__Session(
-                send_cache_client = self.send_cache_client)
+                send_cache_client = self.send_cache_client                                ,
+                signing_key       = get_env(ENV_VAR__SGRAPH_SEND__SESSION_SIGNING_KEY, ''))   # Set → stateless signed session tokens
 
         if self.metrics_cache is None:                                              # Auto-create metrics pipeline
             if METRICS__USE_STUB:                                                      # Local dev: stub data, no AWS calls
@@ -147,9 +156,15 @@ class Fast_API__SGraph__App__Send__Admin(Serverless__Fast_API):
             self.add_routes(Routes__Metrics      ,
                             metrics_cache = self.metrics_cache)
 
-        # if self.send_cache_client is not None:                                      # Record admin traffic for Analytics Pulse  # disabled: creates 5 files per request, caused 65k+ file buildup — redesign needed
-        #     self.app().add_middleware(Middleware__Analytics,
-        #                              send_cache_client = self.send_cache_client)
+        if self.send_cache_client is not None:                                      # Memoise cache lookups for the lifetime of each request
+            self.app().add_middleware(Middleware__Cache__Request_Scope,
+                                      send_cache_client = self.send_cache_client)
+
+        if self.analytics_buffer is not None:                                       # Record admin traffic — buffered, one segment per flush (not 5 files per request)
+            self.app().add_middleware(Middleware__Analytics,
+                                      analytics_buffer = self.analytics_buffer)
+            self.app().add_middleware(Middleware__Flush,                           # Added last = outermost: flushes after the event is recorded
+                                      flushers = [self.analytics_buffer])
 
         self.setup_mcp()                                                              # Mount MCP server (after all routes registered)
 
@@ -161,12 +176,14 @@ class Fast_API__SGraph__App__Send__Admin(Serverless__Fast_API):
 
     def setup_pulse_route(self):                                                  # Register /health/pulse directly (no tag prefix)
         send_cache_client = self.send_cache_client
+        analytics_buffer  = self.analytics_buffer
 
         @route_path(path='/health/pulse')
-        def pulse(window_minutes: Safe_UInt = 5):
+        def pulse(window_minutes: Safe_UInt = 5):                                  # Merges ≤ 60 minute rollups (+ this instance's unflushed events)
             return compute_pulse(
                 send_cache_client = send_cache_client ,
-                window_minutes    = window_minutes    )
+                window_minutes    = window_minutes    ,
+                analytics_buffer  = analytics_buffer  )
 
         self.add_route_get(pulse)
 
@@ -3,16 +3,19 @@
 # REST endpoints for browsing the cache service (admin Lambda)
 # Provides namespace listing, folder browsing, and entry inspection
 # ===============================================================================
+from fastapi                                                                   import HTTPException
 from osbot_fast_api.api.decorators.route_path import route_path
 from osbot_fast_api.api.routes.Fast_API__Routes                                import Fast_API__Routes
-from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client              import Send__Cache__Client
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client              import Send__Cache__Client, SUMMARY__FIELDS
 
 TAG__ROUTES_CACHE = 'cache'
 
 ROUTES_PATHS__CACHE = [f'/{TAG__ROUTES_CACHE}/namespaces'         ,
                        f'/{TAG__ROUTES_CACHE}/folders/{{path:path}}',
                        f'/{TAG__ROUTES_CACHE}/files/{{path:path}}'  ,
-                       f'/{TAG__ROUTES_CACHE}/entry/{{namespace}}/{{cache_id}}']
+                       f'/{TAG__ROUTES_CACHE}/entry/{{namespace}}/{{cache_id}}',
+                       f'/{TAG__ROUTES_CACHE}/summary-check/{{namespace}}'  ,
+                       f'/{TAG__ROUTES_CACHE}/summary-rebuild/{{namespace}}']
 
 
 class Routes__Cache__Browser(Fast_API__Routes):                                # Cache browser endpoints
@@ -48,9 +51,21 @@ class Routes__Cache__Browser(Fast_API__Routes):                                #
             return dict(cache_id=cache_id, namespace=namespace, data=None, found=False)
         return dict(cache_id=cache_id, namespace=namespace, data=data, found=True)
 
+    def summary_check__namespace(self, namespace: str) -> dict:              # GET /cache/summary-check/{namespace}
+        if namespace not in SUMMARY__FIELDS:
+            raise HTTPException(status_code=404, detail='No summary index for namespace')
+        return self.send_cache_client.summary__check(namespace)
+
+    def summary_rebuild__namespace(self, namespace: str) -> dict:            # POST /cache/summary-rebuild/{namespace}
+        if namespace not in SUMMARY__FIELDS:
+            raise HTTPException(status_code=404, detail='No summary index for namespace')
+        return self.send_cache_client.summary__check(namespace, repair=True)
+
     def setup_routes(self):                                                    # Register all cache browser endpoints
-        self.add_route_get(self.namespaces                  )
-        self.add_route_get(self.folders__path                )
-        self.add_route_get(self.files__path                  )
-        self.add_route_get(self.entry__namespace__cache_id   )
+        self.add_route_get (self.namespaces                  )
+        self.add_route_get (self.folders__path                )
+        self.add_route_get (self.files__path                  )
+        self.add_route_get (self.entry__namespace__cache_id   )
+        self.add_route_get (self.summary_check__namespace    )
+        self.add_route_post(self.summary_rebuild__namespace  )
         return self
@@ -22,8 +22,10 @@ ROUTES_PATHS__ROOMS = [f'/{TAG__ROUTES_ROOMS}/create'
                        f'/{TAG__ROUTES_ROOMS}/members/{{room_id}}'                ,
                        f'/{TAG__ROUTES_ROOMS}/members-add/{{room_id}}'            ,
                        f'/{TAG__ROUTES_ROOMS}/members-remove/{{room_id}}/{{user_id}}' ,
+                       f'/{TAG__ROUTES_ROOMS}/members-rebuild'                    ,
                        f'/{TAG__ROUTES_ROOMS}/invite/{{room_id}}'                 ,
-                       f'/{TAG__ROUTES_ROOMS}/audit/{{room_id}}'                  ]
+                       f'/{TAG__ROUTES_ROOMS}/audit/{{room_id}}'                  ,
+                       f'/{TAG__ROUTES_ROOMS}/audit-verify/{{room_id}}'           ]
 
 
 class Routes__Data_Room(Fast_API__Routes):                                   # Data room management endpoints
@@ -55,9 +57,10 @@ class Routes__Data_Room(Fast_API__Routes):                                   # D
             raise HTTPException(status_code=404, detail='Room not found')
         return result
 
-    def list(self) -> dict:                                                  # GET /rooms/list
-        rooms = self.service_data_room.list_rooms()
-        return dict(rooms=rooms, count=len(rooms))
+    def list(self, cursor: str = '', limit: int = 0) -> dict:                # GET /rooms/list?cursor=...&limit=...
+        page  = self.service_data_room.list_rooms_page(cursor=cursor, limit=limit)
+        rooms = page['items']
+        return dict(rooms=rooms, count=len(rooms), next_cursor=page['next_cursor'])
 
     def archive__room_id(self, room_id: Safe_Str__Id) -> dict:              # POST /rooms/archive/{room_id}
         room_data = self.service_data_room.get_room(room_id)
@@ -103,6 +106,9 @@ class Routes__Data_Room(Fast_API__Routes):                                   # D
         self.service_audit.log(room_id, owner, 'member.removed', target_guid=user_id)
         return result
 
+    def members_rebuild(self) -> dict:                                       # POST /rooms/members-rebuild — backfill per-user membership entries from the ACLs
+        return self.service_data_room.rebuild_member_indexes()
+
     # ═══════════════════════════════════════════════════════════════════════
     # Invite Generation
     # ═══════════════════════════════════════════════════════════════════════
@@ -121,9 +127,15 @@ class Routes__Data_Room(Fast_API__Routes):                                   # D
     # Audit Trail
     # ═══════════════════════════════════════════════════════════════════════
 
-    def audit__room_id(self, room_id: Safe_Str__Id) -> dict:                # GET /rooms/audit/{room_id}
-        events = self.service_audit.get_room_events(room_id)
-        return dict(room_id=room_id, events=events, count=len(events))
+    def audit__room_id(self, room_id: Safe_Str__Id,                         # GET /rooms/audit/{room_id}?cursor=...&limit=...
+                       cursor: str = '', limit: int = 50) -> dict:
+        page   = self.service_audit.query_page(room_id=room_id, cursor=cursor, limit=limit)
+        events = page['events']
+        return dict(room_id=room_id, events=events, count=len(events), next_cursor=page['next_cursor'])
+
+    def audit_verify__room_id(self, room_id: Safe_Str__Id,                  # GET /rooms/audit-verify/{room_id}?from_seq=N — chain check (default: since last checkpoint)
+                              from_seq: int = 0, limit: int = 0) -> dict:
+        return self.service_audit.verify_chain(room_id, from_seq=from_seq or None, limit=limit)
 
     # ═══════════════════════════════════════════════════════════════════════
     # Route Registration
@@ -137,6 +149,8 @@ class Routes__Data_Room(Fast_API__Routes):                                   # D
         self.add_route_get   (self.members__room_id                         )
         self.add_route_post  (self.members_add__room_id                     )
         self.add_route_delete(self.members_remove__room_id__user_id         )
+        self.add_route_post  (self.members_rebuild                          )
         self.add_route_post  (self.invite__room_id                          )
         self.add_route_get   (self.audit__room_id                           )
+        self.add_route_get   (self.audit_verify__room_id                    )
         return self
@@ -15,7 +15,9 @@ ROUTES_PATHS__KEYS = [f'/{TAG__ROUTES_KEYS}/publish'                ,
                       f'/{TAG__ROUTES_KEYS}/lookup/{{code}}'        ,
                       f'/{TAG__ROUTES_KEYS}/unpublish/{{code}}'     ,
                       f'/{TAG__ROUTES_KEYS}/list'                   ,
-                      f'/{TAG__ROUTES_KEYS}/log'                    ]
+                      f'/{TAG__ROUTES_KEYS}/log'                    ,
+                      f'/{TAG__ROUTES_KEYS}/log-verify'             ,
+                      f'/{TAG__ROUTES_KEYS}/reindex'                ]
 
 
 class Routes__Keys(Fast_API__Routes):                                        # Key registry endpoints
@@ -57,16 +59,24 @@ class Routes__Keys(Fast_API__Routes):                                        # K
             raise HTTPException(status_code=404, detail='Key not found')
         return result
 
-    def list(self) -> dict:                                                  # GET /keys/list
-        keys = self.service_keys.list_keys()
-        return dict(keys  = keys       ,
-                    count = len(keys)  )
+    def list(self, cursor: str = '', limit: int = 0) -> dict:                # GET /keys/list?cursor=...&limit=...
+        page = self.service_keys.list_keys_page(cursor=cursor, limit=limit)
+        keys = page['items']
+        return dict(keys        = keys                ,
+                    count       = len(keys)           ,
+                    next_cursor = page['next_cursor'] )
 
-    def log(self) -> dict:                                                   # GET /keys/log
-        entries = self.service_keys.get_log()
-        head    = entries[-1] if entries else None
-        return dict(entries = entries ,
-                    head    = head    )
+    def log(self, from_seq: int = 0, limit: int = 0) -> dict:                # GET /keys/log?from_seq=...&limit=...
+        page = self.service_keys.get_log_page(from_seq=from_seq, limit=limit)
+        return dict(entries  = page['entries']  ,
+                    head     = page['head']     ,
+                    next_seq = page['next_seq'] )
+
+    def log_verify(self, from_seq: int = 0, limit: int = 0) -> dict:         # GET /keys/log-verify?from_seq=...&limit=...
+        return self.service_keys.verify_log(from_seq=from_seq, limit=limit)
+
+    def reindex(self) -> dict:                                               # POST /keys/reindex
+        return self.service_keys.repair_fingerprint_index()                 # Backfill fingerprint index used by publish
 
     def setup_routes(self):                                                  # Register all key endpoints
         self.add_route_post  (self.publish           )
@@ -74,4 +84,6 @@ class Routes__Keys(Fast_API__Routes):                                        # K
         self.add_route_delete(self.unpublish__code    )
         self.add_route_get   (self.list               )
         self.add_route_get   (self.log                )
+        self.add_route_get   (self.log_verify         )
+        self.add_route_post  (self.reindex            )
         return self
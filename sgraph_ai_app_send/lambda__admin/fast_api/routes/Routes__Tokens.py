@@ -9,6 +9,7 @@ from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id
 from sgraph_ai_app_send.lambda__admin.schemas.Schema__Token__Create__Request       import Schema__Token__Create__Request
 from sgraph_ai_app_send.lambda__admin.schemas.Schema__Token__Update_Limit__Request import Schema__Token__Update_Limit__Request
 from sgraph_ai_app_send.lambda__admin.schemas.Schema__Token__Use__Request          import Schema__Token__Use__Request
+from sgraph_ai_app_send.lambda__admin.schemas.Schema__Token__Use_Batch__Request    import Schema__Token__Use_Batch__Request
 from sgraph_ai_app_send.lambda__admin.service.Service__Tokens                      import Service__Tokens
 
 TAG__ROUTES_TOKENS = 'tokens'
@@ -16,11 +17,15 @@ TAG__ROUTES_TOKENS = 'tokens'
 ROUTES_PATHS__TOKENS = [f'/{TAG__ROUTES_TOKENS}/create'                      ,
                         f'/{TAG__ROUTES_TOKENS}/lookup/{{token_name}}'        ,
                         f'/{TAG__ROUTES_TOKENS}/use/{{token_name}}'           ,
+                        f'/{TAG__ROUTES_TOKENS}/use-batch'                    ,
+                        f'/{TAG__ROUTES_TOKENS}/lease/{{token_name}}'         ,
+                        f'/{TAG__ROUTES_TOKENS}/release/{{token_name}}'       ,
                         f'/{TAG__ROUTES_TOKENS}/revoke/{{token_name}}'        ,
                         f'/{TAG__ROUTES_TOKENS}/update-limit/{{token_name}}'  ,
                         f'/{TAG__ROUTES_TOKENS}/reactivate/{{token_name}}'    ,
                         f'/{TAG__ROUTES_TOKENS}/list'                         ,
-                        f'/{TAG__ROUTES_TOKENS}/list-details'                 ]
+                        f'/{TAG__ROUTES_TOKENS}/list-details'                 ,
+                        f'/{TAG__ROUTES_TOKENS}/generation'                   ]
 
 
 class Routes__Tokens(Fast_API__Routes):                                    # Token management endpoints
@@ -64,6 +69,23 @@ class Routes__Tokens(Fast_API__Routes):                                    # Tok
             action      = action      ,
             transfer_id = transfer_id )
 
+    def use_batch(self, body: Schema__Token__Use_Batch__Request) -> dict:  # POST /tokens/use-batch — queued usage from user Lambdas
+        return self.service_tokens.use_batch(body.events)
+
+    def lease__token_name(self, token_name: Safe_Str__Id,                  # POST /tokens/lease/{token_name}?size=K — reserve a block of uses
+                                size      : int = 10
+                          ) -> dict:
+        return self.service_tokens.lease(token_name, size)
+
+    def release__token_name(self, token_name: Safe_Str__Id,                # POST /tokens/release/{token_name}?lease_id=...&unused=N
+                                  lease_id  : str = ''   ,
+                                  unused    : int = 0
+                            ) -> dict:
+        result = self.service_tokens.release(token_name, lease_id, unused)
+        if result.get('reason') == 'not_found':
+            raise HTTPException(status_code=404, detail='Token not found')
+        return result
+
     def revoke__token_name(self, token_name: Safe_Str__Id) -> dict:        # POST /tokens/revoke/{token_name}
         success = self.service_tokens.revoke(token_name)
         if not success:
@@ -87,17 +109,25 @@ class Routes__Tokens(Fast_API__Routes):                                    # Tok
         token_names = self.service_tokens.list_tokens()
         return dict(token_names=token_names)
 
-    def list_details(self) -> dict:                                        # GET /tokens/list-details
-        tokens = self.service_tokens.list_tokens_with_details()            # Single call returns all token data
-        return dict(tokens=tokens)
+    def list_details(self, cursor: str = '', limit: int = 0) -> dict:     # GET /tokens/list-details?cursor=...&limit=...
+        page = self.service_tokens.list_tokens_page(cursor=cursor, limit=limit)    # Single call returns all token data (bulk fetch)
+        return dict(tokens      = page['items']       ,
+                    next_cursor = page['next_cursor'] )
+
+    def generation(self) -> dict:                                          # GET /tokens/generation — cheap poll for user Lambda token caches
+        return dict(generation=self.service_tokens.generation())
 
     def setup_routes(self):                                                # Register all token endpoints
         self.add_route_post(self.create                    )
         self.add_route_get (self.lookup__token_name        )
         self.add_route_post(self.use__token_name           )
+        self.add_route_post(self.use_batch                 )
+        self.add_route_post(self.lease__token_name         )
+        self.add_route_post(self.release__token_name       )
         self.add_route_post(self.revoke__token_name        )
         self.add_route_post(self.update_limit__token_name  )
         self.add_route_post(self.reactivate__token_name    )
         self.add_route_get (self.list                      )
         self.add_route_get (self.list_details              )
+        self.add_route_get (self.generation                )
         return self
@@ -47,8 +47,10 @@ class Routes__Users(Fast_API__Routes):                                         #
             raise HTTPException(status_code=404, detail='User not found for this fingerprint')
         return result
 
-    def list(self) -> dict:                                                   # GET /users/list
-        return dict(users=self.service_users.list_users())
+    def list(self, cursor: str = '', limit: int = 0) -> dict:                 # GET /users/list?cursor=...&limit=...
+        page = self.service_users.list_users_page(cursor=cursor, limit=limit)
+        return dict(users       = page['items']       ,
+                    next_cursor = page['next_cursor'] )
 
     # ═══════════════════════════════════════════════════════════════════════
     # Route Registration
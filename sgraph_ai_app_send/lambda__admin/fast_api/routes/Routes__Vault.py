@@ -5,6 +5,7 @@
 
 import base64
 from   fastapi                                                                      import HTTPException
+from   starlette.responses                                                          import StreamingResponse
 from   osbot_fast_api.api.routes.Fast_API__Routes                                  import Fast_API__Routes
 from   osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id  import Safe_Str__Id
 from   sgraph_ai_app_send.lambda__admin.schemas.Schema__Vault__Create__Request     import Schema__Vault__Create__Request
@@ -13,7 +14,7 @@ from   sgraph_ai_app_send.lambda__admin.schemas.Schema__Vault__File__Request
 from   sgraph_ai_app_send.lambda__admin.schemas.Schema__Vault__File__Chunk__Request import Schema__Vault__File__Chunk__Request, Schema__Vault__File__Assemble__Request
 from   sgraph_ai_app_send.lambda__admin.schemas.Schema__Vault__Index__Request      import Schema__Vault__Index__Request
 from   sgraph_ai_app_send.lambda__admin.schemas.Schema__Vault__Share__Request     import Schema__Vault__Share__Request
-from   sgraph_ai_app_send.lambda__admin.service.Service__Vault                     import Service__Vault
+from   sgraph_ai_app_send.lambda__admin.service.Service__Vault                     import Service__Vault, Vault__File__Corrupt
 from   sgraph_ai_app_send.lambda__admin.service.Service__Vault__ACL               import Service__Vault__ACL
 
 TAG__ROUTES_VAULT = 'vault'
@@ -29,6 +30,7 @@ ROUTES_PATHS__VAULT = [f'/{TAG__ROUTES_VAULT}/create'                         ,
                        f'/{TAG__ROUTES_VAULT}/files/{{vault_cache_key}}'       ,
                        f'/{TAG__ROUTES_VAULT}/file-chunk'                      ,
                        f'/{TAG__ROUTES_VAULT}/file-assemble'                   ,
+                       f'/{TAG__ROUTES_VAULT}/file-manifest/{{vault_cache_key}}/{{file_guid}}' ,
                        f'/{TAG__ROUTES_VAULT}/index'                           ,
                        f'/{TAG__ROUTES_VAULT}/index/{{vault_cache_key}}'       ,
                        f'/{TAG__ROUTES_VAULT}/list-all/{{vault_cache_key}}'    ,
@@ -37,6 +39,17 @@ ROUTES_PATHS__VAULT = [f'/{TAG__ROUTES_VAULT}/create'                         ,
                        f'/{TAG__ROUTES_VAULT}/permissions/{{vault_cache_key}}' ]
 
 
+def base64_json_stream(parts):                                                 # {"data": "<base64>"} built one part at a time (3-byte aligned so the pieces concatenate)
+    yield b'{"data":"'
+    carry = b''
+    for part in parts:
+        data  = carry + part
+        keep  = len(data) - len(data) % 3
+        carry = data[keep:]
+        yield base64.b64encode(data[:keep])
+    yield base64.b64encode(carry) + b'"}'
+
+
 class Routes__Vault(Fast_API__Routes):                                         # Vault management endpoints
     tag              : str = TAG__ROUTES_VAULT
     service_vault    : Service__Vault                                          # Injected vault service
@@ -103,13 +116,14 @@ class Routes__Vault(Fast_API__Routes):                                         #
 
     def file__vault_cache_key__file_guid(self,                                 # GET /vault/file/{vault_cache_key}/{file_guid}
                                          vault_cache_key: Safe_Str__Id,
-                                         file_guid: Safe_Str__Id) -> dict:
-        result = self.service_vault.get_file(vault_cache_key, file_guid)
-        if result is None:
+                                         file_guid: Safe_Str__Id):
+        try:
+            parts = self.service_vault.stream_file(vault_cache_key, file_guid) # Assembled files: one chunk in memory at a time
+        except Vault__File__Corrupt as error:                                  # Checked against the descriptor before the response starts
+            raise HTTPException(status_code=500, detail=f'File corrupt: {error}')
+        if parts is None:
             raise HTTPException(status_code=404, detail='File not found')
-        if isinstance(result, (bytes, bytearray)):
-            return dict(data=base64.b64encode(result).decode('ascii'))
-        return dict(data=result)
+        return StreamingResponse(base64_json_stream(parts), media_type='application/json')
 
     def files__vault_cache_key(self, vault_cache_key: Safe_Str__Id) -> dict:   # GET /vault/files/{vault_cache_key}
         result = self.service_vault.list_files(vault_cache_key)
@@ -126,11 +140,22 @@ class Routes__Vault(Fast_API__Routes):                                         #
             raise HTTPException(status_code=400, detail='Invalid chunk_index')
         encrypted_chunk = base64.b64decode(body.chunk_data)
         result = self.service_vault.store_file_chunk(
-            body.vault_cache_key, body.file_guid, body.chunk_index, encrypted_chunk)
+            body.vault_cache_key, body.file_guid, body.chunk_index, encrypted_chunk, body.chunk_sha256)
         if result is None:
             raise HTTPException(status_code=404, detail='Vault not found')
+        if 'error' in result:
+            raise HTTPException(status_code=400, detail=result['error'])
         return dict(status='stored', file_guid=body.file_guid,
-                    chunk_index=body.chunk_index, total_chunks=body.total_chunks)
+                    chunk_index=body.chunk_index, total_chunks=body.total_chunks,
+                    size=result.get('size'), sha256=result.get('sha256'))
+
+    def file_manifest__vault_cache_key__file_guid(self,                        # GET /vault/file-manifest/{vault_cache_key}/{file_guid}
+                                                  vault_cache_key: Safe_Str__Id,
+                                                  file_guid: Safe_Str__Id) -> dict:
+        result = self.service_vault.chunk_manifest(vault_cache_key, file_guid)  # Chunks received so far — clients re-send only what is missing
+        if result is None:
+            raise HTTPException(status_code=404, detail='Vault not found')
+        return result
 
     def file_assemble(self, body: Schema__Vault__File__Assemble__Request) -> dict:  # POST /vault/file-assemble
         if body.total_chunks <= 0:
@@ -231,6 +256,7 @@ class Routes__Vault(Fast_API__Routes):                                         #
         self.add_route_get   (self.files__vault_cache_key                   )
         self.add_route_post  (self.file_chunk                               )
         self.add_route_post  (self.file_assemble                            )
+        self.add_route_get   (self.file_manifest__vault_cache_key__file_guid )
         self.add_route_post  (self.index                                    )
         self.add_route_get   (self.index__vault_cache_key                   )
         self.add_route_get   (self.list_all__vault_cache_key                )
@@ -0,0 +1,10 @@
+# ===============================================================================
+# SGraph Send - Token Use Batch Request Schema
+# Type_Safe request body for POST /tokens/use-batch
+# ===============================================================================
+
+from osbot_utils.type_safe.Type_Safe                                            import Type_Safe
+
+
+class Schema__Token__Use_Batch__Request(Type_Safe):                          # POST /tokens/use-batch request body
+    events : list                                                            # List of {token_name, ip_hash, action, transfer_id, event_id}
@@ -2,6 +2,7 @@
 # SGraph Send - Vault File Chunk Request Schema
 # Type_Safe request body for POST /vault/file-chunk
 # Supports uploading large files in chunks that fit under Lambda's 6MB limit
+# Chunks may be sent in parallel and in any order
 # ===============================================================================
 
 from osbot_utils.type_safe.Type_Safe import Type_Safe
@@ -13,6 +14,7 @@ class Schema__Vault__File__Chunk__Request(Type_Safe):                        # P
     chunk_index     : int                                                    # 0-based index of this chunk
     total_chunks    : int                                                    # Total number of chunks for this file
     chunk_data      : str                                                    # Base64-encoded encrypted chunk bytes
+    chunk_sha256    : str                                                    # Optional hex SHA-256 of the chunk bytes (rejected on mismatch)
 
 
 class Schema__Vault__File__Assemble__Request(Type_Safe):                     # POST /vault/file-assemble request body
@@ -2,29 +2,67 @@
 # SGraph Send - CloudWatch Client
 # Type_Safe wrapper for AWS CloudWatch metric collection
 # Uses lazy boto3 import (available in Lambda runtime, not in package deps)
+# Metrics are requested as query specs in GetMetricData batches of up to 500
+# queries; the regional and us-east-1 (CloudFront) batches run concurrently
+# boto3 clients get connect/read timeouts, so no call can hang a snapshot;
+# batch errors propagate (the metrics collector marks those components
+# 'unknown') and a batch past its deadline stops before its next call
 # ===============================================================================
 
+import time
+from concurrent.futures                                                                                      import ThreadPoolExecutor
 from datetime                                                                                                import datetime, timezone, timedelta
 from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
 from osbot_utils.type_safe.primitives.core.Safe_UInt                                                         import Safe_UInt
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id                              import Safe_Str__Id
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Label                           import Safe_Str__Label
+from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metric__Query                         import Schema__Metric__Query
 from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metric__Series                        import Schema__Metric__Series
 
+CLOUDWATCH__MAX_QUERIES_PER_CALL = 500                                   # GetMetricData limit on MetricDataQueries per request
+CLOUDWATCH__CONNECT_TIMEOUT      = 2                                     # Seconds to open a connection to CloudWatch
+CLOUDWATCH__READ_TIMEOUT         = 5                                     # Seconds to wait for a GetMetricData response
+CLOUDWATCH__MAX_ATTEMPTS         = 2                                     # Attempts per call, first one included
+
 
 class CloudWatch__Client(Type_Safe):                                     # CloudWatch metric collection client
     region : Safe_Str__Id = 'eu-west-2'                                  # Primary AWS region
 
     def setup(self):                                                     # Initialise boto3 clients (lazy import)
         import boto3
-        self._boto3_client    = boto3.client('cloudwatch', region_name=str(self.region))
-        self._boto3_client_cf = boto3.client('cloudwatch', region_name='us-east-1')      # CloudFront metrics only in us-east-1
+        from botocore.config import Config
+        config = Config(connect_timeout = CLOUDWATCH__CONNECT_TIMEOUT                                  ,
+                        read_timeout    = CLOUDWATCH__READ_TIMEOUT                                     ,
+                        retries         = dict(total_max_attempts=CLOUDWATCH__MAX_ATTEMPTS, mode='standard'))
+        self._boto3_client    = boto3.client('cloudwatch', region_name=str(self.region), config=config)
+        self._boto3_client_cf = boto3.client('cloudwatch', region_name='us-east-1'     , config=config)   # CloudFront metrics only in us-east-1
         return self
 
     # ═══════════════════════════════════════════════════════════════════════
     # Core Metric Retrieval
     # ═══════════════════════════════════════════════════════════════════════
 
+    def get_metric_batch(self, queries          : list               ,   # [Schema__Metric__Query] → [Schema__Metric__Series] (same order)
+                               lookback_minutes : Safe_UInt = 60     ,
+                               period_seconds   : Safe_UInt = 300    ,
+                               deadline         : float     = None   ,   # time.monotonic() after which no new call is made (TimeoutError)
+                         ) -> list:                                      # Raises on any failed call — no silently empty series
+        end_time   = datetime.now(timezone.utc)
+        start_time = end_time - timedelta(minutes=int(lookback_minutes))
+        by_client  = {}                                                  # One group per regional client (CloudFront → us-east-1)
+        for index, query in enumerate(queries):
+            by_client.setdefault(self._client_for_namespace(str(query.namespace)), []).append((index, query))
+
+        points = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(by_client))) as executor:
+            futures = [executor.submit(self._get_metric_batch__client, client, indexed_queries,
+                                       start_time, end_time, int(period_seconds), deadline)
+                       for client, indexed_queries in by_client.items()]
+            for future in futures:
+                points.update(future.result())
+
+        return [self._metric_series(query, points.get(index, {})) for index, query in enumerate(queries)]
+
     def get_metric_data(self, namespace        : str                 ,   # Standard statistics (Sum, Average, Max)
                               metric_name      : Safe_Str__Label    ,
                               dimensions       : list               ,
@@ -33,36 +71,12 @@ class CloudWatch__Client(Type_Safe):                                     # Cloud
                               lookback_minutes : Safe_UInt       = 60   ,
                               period_seconds   : Safe_UInt       = 300  ,
                         ) -> Schema__Metric__Series:
-        client   = self._client_for_namespace(str(namespace))
-        end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(minutes=int(lookback_minutes))
-
-        try:
-            response = client.get_metric_statistics(
-                Namespace  = str(namespace)                                  ,
-                MetricName = str(metric_name)                                ,
-                Dimensions = [{'Name': d['Name'], 'Value': d['Value']} for d in dimensions],
-                StartTime  = start_time                                      ,
-                EndTime    = end_time                                        ,
-                Period     = int(period_seconds)                              ,
-                Statistics = [str(statistic)]                                 ,
-                Unit       = str(unit)                                       )
-
-            datapoints = sorted(response.get('Datapoints', []), key=lambda d: d['Timestamp'])
-            timestamps = [int(d['Timestamp'].timestamp()) for d in datapoints]
-            values     = [d.get(str(statistic), 0.0)       for d in datapoints]
-        except Exception:
-            timestamps = []
-            values     = []
-
-        return Schema__Metric__Series(
-            metric_name = metric_name                                        ,
-            namespace   = namespace                                          ,
-            dimensions  = dimensions                                         ,
-            unit        = unit                                               ,
-            statistic   = statistic                                          ,
-            timestamps  = timestamps                                         ,
-            values      = values                                             )
+        query = Schema__Metric__Query(namespace   = namespace   ,
+                                      metric_name = metric_name ,
+                                      dimensions  = dimensions  ,
+                                      statistic   = statistic   ,
+                                      unit        = unit        )
+        return self.get_metric_batch([query], lookback_minutes=lookback_minutes, period_seconds=period_seconds)[0]
 
     def get_metric_data_extended(self, namespace        : str                 ,  # Percentile statistics (p50, p95, p99)
                                       metric_name      : Safe_Str__Label    ,
@@ -72,46 +86,13 @@ class CloudWatch__Client(Type_Safe):                                     # Cloud
                                       lookback_minutes : Safe_UInt       = 60   ,
                                       period_seconds   : Safe_UInt       = 300  ,
                                 ) -> Schema__Metric__Series:
-        client   = self._client_for_namespace(str(namespace))
-        end_time = datetime.now(timezone.utc)
-        start_time = end_time - timedelta(minutes=int(lookback_minutes))
-
-        metric_data_query = dict(
-            Id         = 'metric_query'                                      ,
-            MetricStat = dict(
-                Metric = dict(
-                    Namespace  = str(namespace)                              ,
-                    MetricName = str(metric_name)                            ,
-                    Dimensions = [{'Name': d['Name'], 'Value': d['Value']} for d in dimensions]),
-                Period = int(period_seconds)                                  ,
-                Stat   = str(statistic_label)                                ,
-                Unit   = str(unit)                                           ))
-
-        try:
-            response = client.get_metric_data(
-                MetricDataQueries = [metric_data_query]                      ,
-                StartTime         = start_time                               ,
-                EndTime           = end_time                                 )
-
-            results    = response.get('MetricDataResults', [{}])[0] if response.get('MetricDataResults') else {}
-            timestamps = [int(t.timestamp()) for t in results.get('Timestamps', [])]
-            values     = list(results.get('Values', []))
-
-            paired     = sorted(zip(timestamps, values), key=lambda p: p[0])
-            timestamps = [p[0] for p in paired]
-            values     = [p[1] for p in paired]
-        except Exception:
-            timestamps = []
-            values     = []
-
-        return Schema__Metric__Series(
-            metric_name = metric_name                                        ,
-            namespace   = namespace                                          ,
-            dimensions  = dimensions                                         ,
-            unit        = unit                                               ,
-            statistic   = statistic_label                                    ,
-            timestamps  = timestamps                                         ,
-            values      = values                                             )
+        return self.get_metric_data(namespace        = namespace        ,
+                                    metric_name      = metric_name      ,
+                                    dimensions       = dimensions       ,
+                                    statistic        = statistic_label  ,
+                                    unit             = unit             ,
+                                    lookback_minutes = lookback_minutes ,
+                                    period_seconds   = period_seconds   )
 
     # ═══════════════════════════════════════════════════════════════════════
     # Convenience Methods
@@ -192,3 +173,46 @@ class CloudWatch__Client(Type_Safe):                                     # Cloud
         if namespace == 'AWS/CloudFront':
             return self._boto3_client_cf
         return self._boto3_client
+
+    def _get_metric_batch__client(self, client, indexed_queries,         # GetMetricData in chunks of ≤ 500 queries → {index: {timestamp: value}}
+                                  start_time, end_time, period_seconds,
+                                  deadline=None) -> dict:
+        points = {index: {} for index, _ in indexed_queries}
+        for offset in range(0, len(indexed_queries), CLOUDWATCH__MAX_QUERIES_PER_CALL):
+            chunk   = indexed_queries[offset:offset + CLOUDWATCH__MAX_QUERIES_PER_CALL]
+            request = dict(MetricDataQueries = [self._metric_data_query(index, query, period_seconds) for index, query in chunk],
+                           StartTime         = start_time          ,
+                           EndTime           = end_time            ,
+                           ScanBy            = 'TimestampAscending')
+            while True:                                                  # Results of one chunk may span several pages
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError('GetMetricData batch passed its deadline')
+                response = client.get_metric_data(**request)
+                for result in response.get('MetricDataResults', []):
+                    timestamps = [int(t.timestamp()) for t in result.get('Timestamps', [])]
+                    points[int(result['Id'][1:])].update(zip(timestamps, result.get('Values', [])))
+                if not response.get('NextToken'):
+                    break
+                request['NextToken'] = response['NextToken']
+        return points
+
+    def _metric_data_query(self, index, query, period_seconds) -> dict:  # Query spec → GetMetricData MetricDataQuery (Id 'q<index>')
+        return dict(Id         = f'q{index}'                                                                       ,
+                    MetricStat = dict(Metric = dict(Namespace  = str(query.namespace)                               ,
+                                                    MetricName = str(query.metric_name)                             ,
+                                                    Dimensions = [{'Name': d['Name'], 'Value': d['Value']} for d in query.dimensions]),
+                                      Period = period_seconds                                                      ,
+                                      Stat   = str(query.statistic)                                                ,
+                                      Unit   = str(query.unit)                                                     ),
+                    ReturnData = True                                                                              )
+
+    def _metric_series(self, query, points) -> Schema__Metric__Series:   # Query spec + {timestamp: value} → series (chronological)
+        timestamps = sorted(points)
+        return Schema__Metric__Series(
+            metric_name = query.metric_name                                  ,
+            namespace   = query.namespace                                    ,
+            dimensions  = query.dimensions                                   ,
+            unit        = query.unit                                         ,
+            statistic   = query.statistic                                    ,
+            timestamps  = timestamps                                         ,
+            values      = [points[timestamp] for timestamp in timestamps]    )
@@ -22,6 +22,15 @@ class CloudWatch__Client__Stub(Type_Safe):                               # Test
     # Same interface as CloudWatch__Client — returns canned data
     # ═══════════════════════════════════════════════════════════════════════
 
+    def get_metric_batch(self, queries          : list               ,
+                               lookback_minutes : Safe_UInt = 60     ,
+                               period_seconds   : Safe_UInt = 300    ,
+                               deadline         : float     = None   ,   # Sample data is instant — never late
+                         ) -> list:
+        return [self._build_sample_series(query.metric_name, query.namespace, query.dimensions, query.unit, query.statistic,
+                                          lookback_minutes, period_seconds)
+                for query in queries]
+
     def get_metric_data(self, namespace        : str                 ,
                               metric_name      : Safe_Str__Label    ,
                               dimensions       : list               ,
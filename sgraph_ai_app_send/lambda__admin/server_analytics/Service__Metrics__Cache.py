@@ -2,24 +2,35 @@
 # SGraph Send - Metrics Cache Service
 # On-demand collection with cache layer via Send__Cache__Client
 # Stores snapshots in cache with TTL-based freshness
+# CloudFront log summaries always cover the whole window, merged from per-file
+# partials stored under the file's S3 key + ETag. The stored partials are the
+# watermark: one listing says which window files are done (only those are
+# fetched), so a refresh on any instance parses only files not seen before.
+# Partial keys carry the file's hour, so the same listing finds the partials
+# that fell out of the window — each refresh deletes them
 # ===============================================================================
 
+import hashlib
 import json
 import time
+from datetime                                                                                                import datetime, timezone, timedelta
 from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
 from osbot_utils.type_safe.primitives.core.Safe_UInt                                                         import Safe_UInt
 from sgraph_ai_app_send.lambda__admin.server_analytics.Service__Metrics__Collector                           import Service__Metrics__Collector
+from sgraph_ai_app_send.lambda__admin.server_analytics.collectors.CloudFront__Logs__Summary                 import CloudFront__Logs__Summary
 from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client                                            import Send__Cache__Client
 
 NS_METRICS = 'metrics'                                                     # Cache namespace for metrics data
 
 CACHE_KEY__SNAPSHOT        = 'latest-snapshot'                              # Cache key for latest snapshot
 CACHE_KEY__CF_LOGS_SUMMARY = 'cf-logs-summary'                             # Cache key for CF logs summary
+CACHE_KEY__CF_LOG_PARTIAL  = 'cf-log-part-'                                # Prefix for per-file CF log partials: cf-log-part-<YYYYmmddHH>-<hash> (immutable)
 
 class Service__Metrics__Cache(Type_Safe):                                  # Metrics collection with cache layer
     send_cache_client    : Send__Cache__Client                             # Cache service wrapper
     metrics_collector    : Service__Metrics__Collector                      # Metrics collection orchestrator
     cache_ttl_seconds    : Safe_UInt = 300                                 # 5 minute cache TTL
+    cf_log_partials      : dict                                            # In-process copy: S3 key → (etag, CloudFront__Logs__Summary)
 
     def get_snapshot(self, force_refresh=False) -> dict:                   # Get metrics snapshot (cached or fresh)
         if not force_refresh:
@@ -31,7 +42,8 @@ class Service__Metrics__Cache(Type_Safe):                                  # Met
         snapshot_dict = snapshot.json()
         snapshot_dict['_cached_at'] = int(time.time())
 
-        self._store_cached(CACHE_KEY__SNAPSHOT, snapshot_dict)
+        if not any(health.get('status') == 'unknown' for health in snapshot_dict.get('health_status', [])):
+            self._store_cached(CACHE_KEY__SNAPSHOT, snapshot_dict)           # Partial snapshots (a region timed out) are not cached
         return snapshot_dict
 
     def get_cf_logs_summary(self, logs_bucket, lookback_hours=24, force_refresh=False) -> dict:  # Get CF logs summary (cached)
@@ -40,12 +52,25 @@ class Service__Metrics__Cache(Type_Safe):                                  # Met
             if cached:
                 return cached
 
-        summary = self.metrics_collector.collect_cloudfront_logs_summary(
-            logs_bucket    = logs_bucket    ,
-            lookback_hours = lookback_hours )
-        summary['_cached_at'] = int(time.time())
+        collector   = self.metrics_collector.cloudfront_logs_collector(logs_bucket    = logs_bucket    ,
+                                                                       lookback_hours = lookback_hours )
+        log_objects = collector.list_log_objects()
+        stored      = self._cf_log_partial_keys()                          # One listing: the watermark, and the partials to prune
+        partials    = self._get_cf_log_partials(log_objects, stored)
+        new_objects = [log_object for log_object in log_objects if log_object['key'] not in partials]
+        for log_object, partial in collector.summarise_files(new_objects):  # Only files without a stored partial are parsed
+            self._store_cf_log_partial(log_object, partial)
+            partials[log_object['key']] = partial
+
+        merged = CloudFront__Logs__Summary()                               # Every window file, not just the ones parsed now
+        for partial in partials.values():
+            merged.merge(partial)
+        summary = merged.result()
+        summary['log_files_parsed'] = collector.log_files_read
+        summary['_cached_at'      ] = int(time.time())
 
         self._store_cached(CACHE_KEY__CF_LOGS_SUMMARY, summary)
+        self._prune_cf_log_partials(stored, lookback_hours)
         return summary
 
     def get_cache_status(self) -> dict:                                    # Return cache freshness info
@@ -91,3 +116,73 @@ class Service__Metrics__Cache(Type_Safe):                                  # Met
                 body      = data       )
         except Exception:
             pass
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Internal — CloudFront Log Partials
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def _cf_log_partial_key(self, log_object) -> str:                       # cf-log-part-<hour modified>-<hash of S3 key + ETag> (a rewritten file gets a new key)
+        modified = log_object.get('last_modified') or datetime.now(timezone.utc)   # S3 always sends LastModified; the fallback only keeps keys well-formed
+        digest   = hashlib.sha256(f"{log_object['key']}@{log_object['etag']}".encode()).hexdigest()
+        return f"{CACHE_KEY__CF_LOG_PARTIAL}{modified.strftime('%Y%m%d%H')}-{digest[:32]}"
+
+    def _cf_log_partial_keys(self):                                        # Keys of every stored partial — the persisted watermark (None if the listing fails)
+        try:
+            keys = self.send_cache_client.cache_client.admin_storage().folders(
+                path             = f'{NS_METRICS}/data/key-based/' ,
+                return_full_path = False                           ,
+                recursive        = False                           ) or []
+        except Exception:
+            return None
+        return {key for key in keys if key.startswith(CACHE_KEY__CF_LOG_PARTIAL)}
+
+    def _get_cf_log_partials(self, log_objects, stored=None) -> dict:       # S3 key → partial for window files already summarised (stored: listed partial keys)
+        in_window            = {log_object['key']: log_object['etag'] for log_object in log_objects}
+        self.cf_log_partials = {key: (etag, partial) for key, (etag, partial) in self.cf_log_partials.items()
+                                if in_window.get(key) == etag}               # Drop files that left the window or were rewritten
+        partials = {key: partial for key, (_, partial) in self.cf_log_partials.items()}
+        missing  = {self._cf_log_partial_key(log_object): log_object for log_object in log_objects
+                    if log_object['key'] not in partials}
+        if not missing:
+            return partials
+        try:                                                               # Fetch only partials the watermark says exist
+            for part_key, _, body in self.send_cache_client.entries__lookup_many(NS_METRICS, [key for key in missing if stored is None or key in stored]):
+                if body and body.get('summary'):
+                    log_object = missing[part_key]
+                    partial    = CloudFront__Logs__Summary.from_data(body['summary'])
+                    partials[log_object['key']]             = partial
+                    self.cf_log_partials[log_object['key']] = (log_object['etag'], partial)
+        except Exception:
+            pass
+        return partials
+
+    def _store_cf_log_partial(self, log_object, partial):                  # Persist one file's partial summary (best effort)
+        part_key = self._cf_log_partial_key(log_object)
+        self.cf_log_partials[log_object['key']] = (log_object['etag'], partial)
+        try:
+            self.send_cache_client.cache_client.store().store__json__cache_key(
+                namespace       = NS_METRICS                                            ,
+                strategy        = 'key_based'                                           ,
+                cache_key       = part_key                                              ,
+                file_id         = part_key                                              ,
+                body            = dict(part_key = part_key                ,
+                                       s3_key   = log_object['key']       ,
+                                       etag     = log_object['etag']      ,
+                                       summary  = partial.to_data()       ),
+                json_field_path = 'part_key'                                            )
+        except Exception:
+            pass
+
+    def _prune_cf_log_partials(self, stored, lookback_hours):              # Delete listed partials of files older than the window (and pre-hour keys)
+        cutoff_hour = (datetime.now(timezone.utc) - timedelta(hours=int(lookback_hours))).strftime('%Y%m%d%H')
+        start       = len(CACHE_KEY__CF_LOG_PARTIAL)
+        pruned      = []
+        for part_key in sorted(stored or ()):
+            hour, separator = part_key[start:start + 10], part_key[start + 10:start + 11]
+            if separator != '-' or hour < cutoff_hour:                     # Partials stored before keys carried the hour are re-parsed once
+                try:
+                    self.send_cache_client.entry__delete(NS_METRICS, part_key)
+                    pruned.append(part_key)
+                except Exception:
+                    pass
+        return pruned
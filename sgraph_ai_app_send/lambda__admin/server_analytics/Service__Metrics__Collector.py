@@ -2,8 +2,15 @@
 # SGraph Send - Metrics Collector Service
 # Orchestrates collection from all infrastructure components
 # Produces a complete Schema__Metrics__Snapshot
+# Collectors' query specs go to CloudWatch as one GetMetricData batch per
+# region; the batches run concurrently under a deadline, and components whose
+# batch misses it or fails come back empty with an 'unknown' health status.
+# A late batch stops at its next CloudWatch call (each call is bounded by the
+# client's timeouts), so the pool is joined — no thread outlives a snapshot
 # ===============================================================================
 
+import time
+from concurrent.futures                                                                                      import ThreadPoolExecutor, wait
 from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
 from osbot_utils.type_safe.primitives.core.Safe_UInt                                                         import Safe_UInt
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id                              import Safe_Str__Id
@@ -15,12 +22,15 @@ from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Health__S
 from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metrics__Snapshot                     import Schema__Metrics__Snapshot
 from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Thresholds__Config                    import Schema__Thresholds__Config
 
+METRICS__COLLECTOR_TIMEOUT = 10.0                                          # Seconds a snapshot waits for each regional batch
+
 
 class Service__Metrics__Collector(Type_Safe):                              # Orchestrates metrics collection across all components
     cloudwatch_client   : object                                           # CloudWatch__Client or CloudWatch__Client__Stub
     region              : Safe_Str__Id   = 'eu-west-2'                     # Primary AWS region
     lookback_minutes    : Safe_UInt      = 60                              # Default lookback
     period_seconds      : Safe_UInt      = 300                             # Default CloudWatch resolution
+    timeout_seconds     : float          = METRICS__COLLECTOR_TIMEOUT      # Deadline per regional batch; late or failed components are 'unknown'
 
     # Infrastructure identifiers
     distribution_id     : Safe_Str__Id                                     # CloudFront distribution ID
@@ -31,18 +41,27 @@ class Service__Metrics__Collector(Type_Safe):                              # Orc
     s3_filter_id        : Safe_Str__Id   = 'all-requests'                  # S3 request metrics filter ID
     thresholds          : Schema__Thresholds__Config                        # Health evaluation thresholds
 
-    def collect_snapshot(self) -> Schema__Metrics__Snapshot:                # Collect full metrics snapshot
-        cloudfront   = self._collect_cloudfront()
-        lambda_user  = self._collect_lambda(self.lambda_user_name)
-        lambda_admin = self._collect_lambda(self.lambda_admin_name)
-        s3_transfers = self._collect_s3(self.s3_transfers_bucket)
-        s3_cache     = self._collect_s3(self.s3_cache_bucket)
+    def collect_snapshot(self) -> Schema__Metrics__Snapshot:                # Collect full metrics snapshot (one batch per region, run concurrently)
+        collectors   = dict(cloudfront   = self._cloudfront_collector()                      ,
+                            lambda_user  = self._lambda_collector(self.lambda_user_name )   ,
+                            lambda_admin = self._lambda_collector(self.lambda_admin_name)   ,
+                            s3_transfers = self._s3_collector    (self.s3_transfers_bucket) ,
+                            s3_cache     = self._s3_collector    (self.s3_cache_bucket    ) )
+        metrics, unknown = self._collect_concurrently(collectors)
+        for component in unknown:                                           # Timed out / failed → empty series, marked 'unknown' below
+            metrics[component] = collectors[component].from_series({})
+        cloudfront   = metrics['cloudfront'  ]
+        lambda_user  = metrics['lambda_user' ]
+        lambda_admin = metrics['lambda_admin']
+        s3_transfers = metrics['s3_transfers']
+        s3_cache     = metrics['s3_cache'    ]
 
         health_status = self._evaluate_health(cloudfront   = cloudfront   ,
                                                lambda_user  = lambda_user  ,
                                                lambda_admin = lambda_admin ,
                                                s3_transfers = s3_transfers ,
-                                               s3_cache     = s3_cache     )
+                                               s3_cache     = s3_cache     ,
+                                               unknown      = unknown      )
 
         return Schema__Metrics__Snapshot(
             region           = self.region                                  ,
@@ -56,52 +75,96 @@ class Service__Metrics__Collector(Type_Safe):                              # Orc
             health_status    = [h.json() for h in health_status]           )
 
     def collect_cloudfront_logs_summary(self, logs_bucket, lookback_hours=24) -> dict:  # Collect CF real-time logs summary
+        return self.cloudfront_logs_collector(logs_bucket, lookback_hours).collect_summary()
+
+    def cloudfront_logs_collector(self, logs_bucket, lookback_hours=24) -> CloudFront__Logs__Collector:   # CF real-time logs reader (S3 client ready)
         collector = CloudFront__Logs__Collector(logs_bucket    = logs_bucket    ,
                                                 lookback_hours = lookback_hours )
-        collector.setup()
-        return collector.collect_summary()
+        return collector.setup()
 
     # ═══════════════════════════════════════════════════════════════════════
     # Internal — Collection
     # ═══════════════════════════════════════════════════════════════════════
 
-    def _collect_cloudfront(self):                                          # Collect CloudFront metrics
-        collector = CloudFront__Metrics__Collector(
+    def _collect_concurrently(self, collectors):                           # ({component: metrics}, {component: reason}) — batches done before the deadline
+        batches = {}                                                        # One batch per CloudWatch region (CloudFront → us-east-1)
+        for component, collector in collectors.items():
+            batches.setdefault(self._collector_region(collector), {})[component] = collector
+        deadline = time.monotonic() + float(self.timeout_seconds)
+        with ThreadPoolExecutor(max_workers=max(1, len(batches))) as executor:   # Joined on exit: a late batch ends at its next call
+            futures = {executor.submit(self._collect_batched, batch, deadline): batch for batch in batches.values()}
+            done, _ = wait(futures, timeout=float(self.timeout_seconds))
+        metrics, unknown = {}, {}
+        for future, batch in futures.items():
+            error = future.exception()
+            if future not in done or isinstance(error, TimeoutError):
+                reason = f'No metrics within {float(self.timeout_seconds):g}s (timed out)'
+            elif error is not None:
+                reason = f'CloudWatch error: {type(error).__name__}'
+            else:
+                metrics.update(future.result())
+                continue
+            unknown.update({component: reason for component in batch})
+        return metrics, unknown
+
+    def _collector_region(self, collector) -> str:                          # Region whose CloudWatch endpoint serves the collector's metrics
+        namespaces = {str(query.namespace) for query in collector.metric_queries().values()}
+        return 'us-east-1' if 'AWS/CloudFront' in namespaces else str(self.region)
+
+    def _collect_batched(self, collectors, deadline=None) -> dict:         # {component: collector} → {component: metrics schema} (raises on CloudWatch errors)
+        specs  = [(component, field, query) for component, collector in collectors.items()
+                                            for field, query     in collector.metric_queries().items()]
+        series = self.cloudwatch_client.get_metric_batch([query for _, _, query in specs],         # ≤ 500 queries per GetMetricData call, per region
+                                                         lookback_minutes = self.lookback_minutes ,
+                                                         period_seconds   = self.period_seconds   ,
+                                                         deadline         = deadline              )
+        by_component = {component: {} for component in collectors}
+        for (component, field, _), metric_series in zip(specs, series):
+            by_component[component][field] = metric_series
+        return {component: collector.from_series(by_component[component]) for component, collector in collectors.items()}
+
+    def _cloudfront_collector(self):                                        # CloudFront metrics collector
+        return CloudFront__Metrics__Collector(
             cloudwatch_client = self.cloudwatch_client                      ,
             distribution_id   = self.distribution_id                        ,
             lookback_minutes  = self.lookback_minutes                       ,
             period_seconds    = self.period_seconds                         )
-        return collector.collect()
 
-    def _collect_lambda(self, function_name):                              # Collect Lambda metrics for one function
-        collector = Lambda__Metrics__Collector(
+    def _lambda_collector(self, function_name):                            # Lambda metrics collector for one function
+        return Lambda__Metrics__Collector(
             cloudwatch_client = self.cloudwatch_client                      ,
             function_name     = function_name                               ,
             lookback_minutes  = self.lookback_minutes                       ,
             period_seconds    = self.period_seconds                         )
-        return collector.collect()
 
-    def _collect_s3(self, bucket_name):                                    # Collect S3 metrics for one bucket
-        collector = S3__Metrics__Collector(
+    def _s3_collector(self, bucket_name):                                  # S3 metrics collector for one bucket
+        return S3__Metrics__Collector(
             cloudwatch_client = self.cloudwatch_client                      ,
             bucket_name       = bucket_name                                 ,
             filter_id         = self.s3_filter_id                           ,
             lookback_minutes  = self.lookback_minutes                       ,
             period_seconds    = self.period_seconds                         )
-        return collector.collect()
 
     # ═══════════════════════════════════════════════════════════════════════
     # Internal — Health Evaluation
     # ═══════════════════════════════════════════════════════════════════════
 
-    def _evaluate_health(self, cloudfront, lambda_user, lambda_admin, s3_transfers, s3_cache) -> list:
-        results = []
-        results.append(self._evaluate_lambda_health('Lambda: user'  , lambda_user ))
-        results.append(self._evaluate_lambda_health('Lambda: admin' , lambda_admin))
-        results.append(self._evaluate_s3_health    ('S3: transfers' , s3_transfers))
-        results.append(self._evaluate_s3_health    ('S3: cache'     , s3_cache    ))
-        results.append(self._evaluate_cf_health    ('CloudFront'    , cloudfront  ))
-        return results
+    def _evaluate_health(self, cloudfront, lambda_user, lambda_admin, s3_transfers, s3_cache, unknown=None) -> list:   # unknown: component → reason
+        checks = [('lambda_user' , 'Lambda: user'  , self._evaluate_lambda_health, lambda_user ),
+                  ('lambda_admin', 'Lambda: admin' , self._evaluate_lambda_health, lambda_admin),
+                  ('s3_transfers', 'S3: transfers' , self._evaluate_s3_health    , s3_transfers),
+                  ('s3_cache'    , 'S3: cache'     , self._evaluate_s3_health    , s3_cache    ),
+                  ('cloudfront'  , 'CloudFront'    , self._evaluate_cf_health    , cloudfront  )]
+        unknown = unknown or {}
+        return [self._unknown_health(component_name, unknown[component]) if component in unknown else evaluate(component_name, metrics)
+                for component, component_name, evaluate, metrics in checks]
+
+    def _unknown_health(self, component_name, reason) -> Schema__Health__Status:   # Metrics not collected (deadline missed or CloudWatch error)
+        return Schema__Health__Status(component    = component_name ,
+                                      status       = 'unknown'      ,
+                                      status_emoji = '?'            ,
+                                      message      = reason         ,
+                                      metrics      = {}             )
 
     def _evaluate_lambda_health(self, component_name, metrics) -> Schema__Health__Status:
         invocations = self._sum_values(metrics.invocations)
@@ -3,14 +3,28 @@
 # Reads CloudFront real-time logs from S3 (delivered via Kinesis Firehose)
 # Parses tab-separated records and stores structured events in cache service
 # Note: c-ip field is deliberately excluded from log configuration (privacy)
+# Listing enumerates each day (or day/hour) prefix in the window once, pages
+# the prefixes concurrently and keeps objects modified since the hour-floored
+# cutoff. The collector is stateless: every call covers the whole window, and
+# Service__Metrics__Cache skips files whose partial summary is already stored
+# Files are streamed (gzip decoded line by line, never fully in memory), only
+# the needed columns are projected into a CloudFront__Logs__Table, and files
+# are processed by a thread pool, each folded into a mergeable summary
+# summarise_files() returns the per-file partials so callers can persist them
 # ===============================================================================
 
 import gzip
-import json
+import io
+from concurrent.futures                                                                                      import ThreadPoolExecutor
 from datetime                                                                                                import datetime, timezone, timedelta
 from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
 from osbot_utils.type_safe.primitives.core.Safe_UInt                                                         import Safe_UInt
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id                              import Safe_Str__Id
+from sgraph_ai_app_send.lambda__admin.server_analytics.collectors.CloudFront__Logs__Summary                 import CloudFront__Logs__Summary, CF_LOGS__SUMMARY_FIELDS
+from sgraph_ai_app_send.lambda__admin.server_analytics.collectors.CloudFront__Logs__Table                   import CloudFront__Logs__Table, cf_log__value
+
+CF_LOGS__MAX_WORKERS = 8                                                 # Concurrent prefix listings / file reads
+GZIP__MAGIC          = b'\x1f\x8b'
 
 # Fields selected in CloudFront real-time log configuration (in order)
 # This must match the field selection in the CloudFront console
@@ -46,120 +60,137 @@ CF_LOG_FIELDS = [
 
 
 class CloudFront__Logs__Collector(Type_Safe):                            # Reads and parses CloudFront real-time logs from S3
-    logs_bucket     : Safe_Str__Id                                       # S3 bucket for CF logs
-    logs_prefix     : Safe_Str__Id = 'cloudfront-realtime'               # S3 key prefix
-    lookback_hours  : Safe_UInt    = 24                                  # How far back to look for logs
-    region          : Safe_Str__Id = 'eu-west-2'                         # AWS region for S3
+    logs_bucket      : Safe_Str__Id                                      # S3 bucket for CF logs
+    logs_prefix      : Safe_Str__Id = 'cloudfront-realtime'              # S3 key prefix
+    lookback_hours   : Safe_UInt    = 24                                 # How far back to look for logs
+    region           : Safe_Str__Id = 'eu-west-2'                        # AWS region for S3
+    hour_partitioned : bool         = False                              # Keys carry an hour=HH/ level below day=DD/
+    max_workers      : Safe_UInt    = CF_LOGS__MAX_WORKERS               # Concurrent prefix listings / file reads
+    log_files_read   : int          = 0                                  # Files read by the last collect / collect_summary
 
     def setup(self):                                                     # Initialise S3 client (lazy import)
         import boto3
         self._s3_client = boto3.client('s3', region_name=str(self.region))
         return self
 
-    def collect(self) -> list:                                           # Collect and parse all log files in lookback window
-        keys       = self._list_log_files()
-        all_events = []
-        for key in keys:
-            events = self._read_and_parse(key)
-            all_events.extend(events)
-        return all_events
-
-    def collect_summary(self) -> dict:                                   # Collect and return summary statistics
-        events = self.collect()
-        if not events:
-            return dict(total_records     = 0               ,
-                        log_files_read    = 0               ,
-                        time_range        = ''              ,
-                        status_breakdown  = {}              ,
-                        edge_locations    = []              ,
-                        cache_hit_rate    = 0.0             ,
-                        top_paths         = []              )
-
-        status_counts = {}
-        edge_locations = set()
-        path_counts   = {}
-        cache_hits    = 0
-        total         = len(events)
-
-        for event in events:
-            status = event.get('sc-status', '')
-            bucket = f'{status[0]}xx' if len(status) >= 1 else 'unknown'
-            status_counts[bucket] = status_counts.get(bucket, 0) + 1
-
-            edge = event.get('x-edge-location', '')
-            if edge:
-                edge_locations.add(edge)
-
-            path = event.get('cs-uri-stem', '')
-            path_counts[path] = path_counts.get(path, 0) + 1
-
-            result = event.get('x-edge-result-type', '')
-            if result == 'Hit':
-                cache_hits += 1
-
-        top_paths = sorted(path_counts.items(), key=lambda x: x[1], reverse=True)[:20]
-        top_paths = [dict(path=p, count=c) for p, c in top_paths]
-
-        return dict(total_records     = total                             ,
-                    status_breakdown  = status_counts                     ,
-                    edge_locations    = sorted(edge_locations)            ,
-                    cache_hit_rate    = round(cache_hits / total * 100, 2) if total > 0 else 0.0,
-                    top_paths         = top_paths                         )
+    def collect(self, columns=CF_LOG_FIELDS) -> list:                    # Parse the window's log files → row dicts (projected columns only)
+        rows = []
+        for _, table in self._read_tables(columns):
+            rows.extend(table.rows())
+        return rows
+
+    def collect_summary(self) -> dict:                                   # Summary of the window's log files (bounded memory: one table per worker)
+        summary = CloudFront__Logs__Summary()
+        for _, file_summary in self._map_files(self.list_log_objects(), self._summarise_file):
+            summary.merge(file_summary)
+        return summary.result()
+
+    def list_log_objects(self) -> list:                                  # Objects in the lookback window (prefixes listed concurrently)
+        now      = datetime.now(timezone.utc)
+        cutoff   = self._cutoff(now)
+        prefixes = self._log_prefixes(now)
+        workers  = max(1, min(int(self.max_workers), len(prefixes)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            listings = list(executor.map(lambda prefix: self._list_prefix(prefix, cutoff), prefixes))
+        log_objects = {}
+        for listing in listings:
+            for log_object in listing:
+                log_objects[log_object['key']] = log_object
+        return [log_objects[key] for key in sorted(log_objects)]
+
+    def summarise_files(self, log_objects) -> list:                      # Per-file partial summaries → [(log_object, CloudFront__Logs__Summary)]
+        return self._map_files(log_objects, self._summarise_file)
 
     # ═══════════════════════════════════════════════════════════════════════
     # Internal
     # ═══════════════════════════════════════════════════════════════════════
 
-    def _list_log_files(self) -> list:                                   # List S3 keys for log files in lookback window
-        now    = datetime.now(timezone.utc)
-        keys   = []
-
-        for hours_ago in range(int(self.lookback_hours)):
-            dt     = now - timedelta(hours=hours_ago)
-            prefix = f"{self.logs_prefix}/year={dt.strftime('%Y')}/month={dt.strftime('%m')}/day={dt.strftime('%d')}/"
-
-            try:
-                paginator = self._s3_client.get_paginator('list_objects_v2')
-                for page in paginator.paginate(Bucket=str(self.logs_bucket), Prefix=prefix):
-                    for obj in page.get('Contents', []):
-                        keys.append(obj['Key'])
-            except Exception:
-                continue
-
-        return keys
-
-    def _read_and_parse(self, key) -> list:                              # Read one S3 file and parse log records
+    def _cutoff(self, now=None) -> datetime:                             # Start of the lookback window, floored to the hour
+        now = now or datetime.now(timezone.utc)
+        return (now - timedelta(hours=int(self.lookback_hours))).replace(minute=0, second=0, microsecond=0)
+
+    def _log_prefixes(self, now=None) -> list:                           # Each day (or day/hour) prefix in the window, once
+        now      = now or datetime.now(timezone.utc)
+        hour     = self._cutoff(now)
+        prefixes = []
+        while hour <= now:
+            prefix = f"{self.logs_prefix}/year={hour.strftime('%Y')}/month={hour.strftime('%m')}/day={hour.strftime('%d')}/"
+            if self.hour_partitioned:
+                prefix += f"hour={hour.strftime('%H')}/"
+            if prefix not in prefixes:
+                prefixes.append(prefix)
+            hour += timedelta(hours=1)
+        return prefixes
+
+    def _list_prefix(self, prefix, cutoff) -> list:                      # All pages of one prefix → [{key, etag, last_modified}] since cutoff
+        log_objects = []
         try:
-            response = self._s3_client.get_object(Bucket=str(self.logs_bucket), Key=key)
-            body     = response['Body'].read()
-
-            if key.endswith('.gz') or body[:2] == b'\x1f\x8b':           # GZIP compressed
-                body = gzip.decompress(body)
-
-            text    = body.decode('utf-8', errors='replace')
-            events  = []
-
-            for line in text.strip().split('\n'):
-                line = line.strip()
+            paginator = self._s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=str(self.logs_bucket), Prefix=prefix):
+                for obj in page.get('Contents', []):
+                    last_modified = obj.get('LastModified')
+                    if last_modified is not None and last_modified < cutoff:
+                        continue                                         # Same day, but before the window
+                    log_objects.append(dict(key           = obj['Key']                         ,
+                                            etag          = str(obj.get('ETag', '')).strip('"') ,
+                                            last_modified = last_modified                      ))
+        except Exception:
+            pass
+        return log_objects
+
+    def _list_log_files(self) -> list:                                   # S3 keys of the log files in the lookback window
+        return [log_object['key'] for log_object in self.list_log_objects()]
+
+    def _map_files(self, log_objects, read_file) -> list:                # read_file(log_object) in parallel → [(log_object, result)]
+        workers = max(1, min(int(self.max_workers), len(log_objects)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(read_file, log_objects))
+        done = [(log_object, result) for log_object, result in zip(log_objects, results) if result is not None]
+        self.log_files_read = len(done)                                  # Failed reads are left out (and retried by the next call)
+        return done
+
+    def _read_tables(self, columns) -> list:
+        return self._map_files(self.list_log_objects(), lambda log_object: self._read_table(log_object['key'], columns))
+
+    def _summarise_file(self, log_object):                               # One file → CloudFront__Logs__Summary (None if unreadable)
+        table = self._read_table(log_object['key'], CF_LOGS__SUMMARY_FIELDS)
+        if table is None:
+            return None
+        summary = CloudFront__Logs__Summary(log_files_read=1)
+        return summary.add_table(table)
+
+    def _read_table(self, key, columns) -> CloudFront__Logs__Table:      # Stream one S3 file into a projected table (None on failure)
+        try:
+            indexes = [CF_LOG_FIELDS.index(column) for column in columns]
+            table   = CloudFront__Logs__Table(columns=list(columns))
+            for line in self._read_lines(key):
+                line = line.rstrip('\r\n')
                 if not line or line.startswith('#'):
                     continue
-                event = self._parse_line(line)
-                if event:
-                    events.append(event)
-
-            return events
+                fields = line.split('\t')
+                table.append([cf_log__value(column, fields[index].strip() if index < len(fields) else '')
+                              for column, index in zip(columns, indexes)])
+            return table
         except Exception:
-            return []
+            return None
+
+    def _read_lines(self, key):                                          # Decoded lines of one S3 object, streamed (gzip or plain text)
+        response = self._s3_client.get_object(Bucket=str(self.logs_bucket), Key=key)
+        body     = io.BufferedReader(Stream__Readable(response['Body']))
+        if key.endswith('.gz') or body.peek(2)[:2] == GZIP__MAGIC:
+            body = gzip.GzipFile(fileobj=body)
+        yield from io.TextIOWrapper(body, encoding='utf-8', errors='replace')
+
+
+class Stream__Readable(io.RawIOBase):                                    # Raw-stream adapter over any object with read(n) (e.g. botocore StreamingBody)
 
-    def _parse_line(self, line) -> dict:                                 # Parse one tab-separated log line
-        fields = line.split('\t')
-        event  = {}
+    def __init__(self, source):
+        self.source = source
 
-        for i, field_name in enumerate(CF_LOG_FIELDS):
-            if i < len(fields):
-                value = fields[i]
-                if value == '-':
-                    value = ''
-                event[field_name] = value
+    def readable(self):
+        return True
 
-        return event if event else None
+    def readinto(self, buffer):
+        data = self.source.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
@@ -0,0 +1,120 @@
+# ===============================================================================
+# SGraph Send - CloudFront Logs Summary
+# Incremental, mergeable summary of CloudFront real-time log records
+# Tables are folded in as they are parsed (no event list is kept), and
+# summaries of separate files merge into one — counts add up, edge locations
+# union, paths / user agents / latency are fixed-size sketches
+# to_data() / from_data() persist a summary (e.g. one partial per log file)
+# ===============================================================================
+
+import math
+from collections                                                                      import Counter
+from datetime                                                                           import datetime, timezone
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__HyperLogLog     import Sketch__HyperLogLog
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__T_Digest        import Sketch__T_Digest
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__Top_K           import Sketch__Top_K
+
+CF_LOGS__TOP_PATHS      = 20                                                 # Paths reported in a summary
+CF_LOGS__SUMMARY_FIELDS = ('timestamp', 'sc-status', 'cs-uri-stem', 'cs-user-agent',
+                           'x-edge-location', 'x-edge-result-type', 'time-taken')    # Columns a summary reads
+
+
+class CloudFront__Logs__Summary(Type_Safe):                                  # Status buckets, POPs, paths, agents, latency
+    total_records  : int   = 0
+    log_files_read : int   = 0
+    cache_hits     : int   = 0
+    time_first     : float = math.inf
+    time_last      : float = -math.inf
+    status_counts  : dict                                                    # '2xx' → count (≤ 6 buckets)
+    edge_locations : dict                                                    # POP → count (bounded by the number of POPs)
+    top_paths      : Sketch__Top_K
+    user_agents    : Sketch__HyperLogLog
+    latency        : Sketch__T_Digest                                        # time-taken in ms
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.top_paths.k = CF_LOGS__TOP_PATHS
+
+    def add_table(self, table):                                              # Fold one CloudFront__Logs__Table in (column-wise, batched)
+        status_counts  = self.status_counts
+        edge_locations = self.edge_locations
+        for status, count in Counter(table.column('sc-status')).items():
+            bucket = f'{status // 100}xx' if status else 'unknown'
+            status_counts[bucket] = status_counts.get(bucket, 0) + count
+        for edge, count in Counter(table.column('x-edge-location')).items():
+            if edge:
+                edge_locations[edge] = edge_locations.get(edge, 0) + count
+        self.top_paths.add_many(table.column('cs-uri-stem'))                # Paths repeat heavily — one sketch update per distinct path
+        self.user_agents.add_many(set(table.column('cs-user-agent')))
+        self.latency.add_many(time_taken * 1000 for time_taken in table.column('time-taken')
+                              if not math.isnan(time_taken))                 # Seconds → ms
+        timestamps = [timestamp for timestamp in table.column('timestamp') if not math.isnan(timestamp)]
+        if timestamps:
+            self.time_first = min(self.time_first, min(timestamps))
+            self.time_last  = max(self.time_last , max(timestamps))
+        self.cache_hits    += table.column('x-edge-result-type').count('Hit')
+        self.total_records += table.size()
+        return self
+
+    def merge(self, other):                                                  # Combine with the summary of other files
+        self.total_records  += other.total_records
+        self.log_files_read += other.log_files_read
+        self.cache_hits     += other.cache_hits
+        self.time_first      = min(self.time_first, other.time_first)
+        self.time_last       = max(self.time_last , other.time_last )
+        for target, source in ((self.status_counts, other.status_counts), (self.edge_locations, other.edge_locations)):
+            for key, count in source.items():
+                target[key] = target.get(key, 0) + count
+        self.top_paths.merge  (other.top_paths  )
+        self.user_agents.merge(other.user_agents)
+        self.latency.merge    (other.latency    )
+        return self
+
+    def to_data(self) -> dict:                                               # JSON-safe form (sketches serialised, empty times → None)
+        empty = self.time_first > self.time_last
+        return dict(type           = 'cf_logs_summary'                          ,
+                    total_records  = self.total_records                         ,
+                    log_files_read = self.log_files_read                        ,
+                    cache_hits     = self.cache_hits                            ,
+                    time_first     = None if empty else self.time_first         ,
+                    time_last      = None if empty else self.time_last          ,
+                    status_counts  = dict(self.status_counts)                   ,
+                    edge_locations = dict(self.edge_locations)                  ,
+                    top_paths      = self.top_paths.to_data()                   ,
+                    user_agents    = self.user_agents.to_data()                 ,
+                    latency        = self.latency.to_data()                     )
+
+    @classmethod
+    def from_data(cls, data):                                                # Inverse of to_data (None/empty → empty summary)
+        data    = data or {}
+        summary = cls(total_records  = data.get('total_records' , 0),
+                      log_files_read = data.get('log_files_read', 0),
+                      cache_hits     = data.get('cache_hits'    , 0))
+        if data.get('time_first') is not None:
+            summary.time_first = float(data['time_first'])
+            summary.time_last  = float(data['time_last' ])
+        summary.status_counts  = dict(data.get('status_counts' ) or {})
+        summary.edge_locations = dict(data.get('edge_locations') or {})
+        summary.top_paths      = Sketch__Top_K      .from_data(data.get('top_paths'  ) or dict(k=CF_LOGS__TOP_PATHS))
+        summary.user_agents    = Sketch__HyperLogLog.from_data(data.get('user_agents'))
+        summary.latency        = Sketch__T_Digest   .from_data(data.get('latency'    ))
+        return summary
+
+    def time_range(self):                                                    # 'first/last' ISO interval of the records ('' when empty)
+        if self.time_first > self.time_last:
+            return ''
+        iso = lambda timestamp: datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+        return f'{iso(self.time_first)}/{iso(self.time_last)}'
+
+    def result(self) -> dict:                                                # The collect_summary response
+        total = self.total_records
+        return dict(total_records      = total                                                          ,
+                    log_files_read     = self.log_files_read                                            ,
+                    time_range         = self.time_range()                                              ,
+                    status_breakdown   = dict(self.status_counts)                                       ,
+                    edge_locations     = sorted(self.edge_locations)                                    ,
+                    cache_hit_rate     = round(self.cache_hits / total * 100, 2) if total > 0 else 0.0  ,
+                    top_paths          = [dict(path=p, count=c) for p, c in self.top_paths.top()] if total else [],
+                    unique_user_agents = self.user_agents.count()                                       ,
+                    latency_ms         = self.latency.percentiles() if total else {}                    )
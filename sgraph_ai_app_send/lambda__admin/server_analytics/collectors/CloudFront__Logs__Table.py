@@ -0,0 +1,63 @@
+# ===============================================================================
+# SGraph Send - CloudFront Logs Table
+# Struct-of-arrays view of parsed CloudFront real-time log records
+# Only the projected columns are kept: numeric columns are typed arrays
+# (8 bytes or less per value), text columns are lists of interned strings
+# (repeated paths / user agents / POPs share one object)
+# ===============================================================================
+
+import math
+import sys
+from array                                                                              import array
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+
+CF_LOG__NUMERIC_COLUMNS = {'timestamp'          : 'd' ,                      # array typecode per numeric field
+                           'sc-status'          : 'H' ,
+                           'sc-bytes'           : 'Q' ,
+                           'sc-content-len'     : 'Q' ,
+                           'time-taken'         : 'd' ,
+                           'time-to-first-byte' : 'd' ,
+                           'origin-fbl'         : 'd' ,
+                           'origin-lbl'         : 'd' }
+
+
+def cf_log__value(column, text):                                             # Typed value of one raw field ('-' / '' → 0 or NaN)
+    typecode = CF_LOG__NUMERIC_COLUMNS.get(column)
+    if typecode is None:
+        return sys.intern(text) if text and text != '-' else ''
+    if typecode == 'd':
+        try:
+            return float(text)
+        except ValueError:
+            return math.nan
+    try:
+        return int(text)
+    except ValueError:
+        return 0
+
+
+class CloudFront__Logs__Table(Type_Safe):                                    # Columnar log records (projected fields only)
+    columns : list                                                           # Projected field names, in order
+    data    : dict                                                           # field → array / list of values (aligned by row)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        for column in self.columns:
+            if column not in self.data:
+                typecode          = CF_LOG__NUMERIC_COLUMNS.get(column)
+                self.data[column] = array(typecode) if typecode else []
+
+    def append(self, values):                                                # One row: values aligned with self.columns
+        for column, value in zip(self.columns, values):
+            self.data[column].append(value)
+        return self
+
+    def size(self):                                                          # Number of rows
+        return len(self.data[self.columns[0]]) if self.columns else 0
+
+    def column(self, name):                                                  # All values of one column
+        return self.data[name]
+
+    def rows(self):                                                          # Row dicts (for callers that want records)
+        for index in range(self.size()):
+            yield {column: self.data[column][index] for column in self.columns}
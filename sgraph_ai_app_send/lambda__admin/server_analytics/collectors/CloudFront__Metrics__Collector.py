@@ -2,11 +2,13 @@
 # SGraph Send - CloudFront Metrics Collector
 # Collects all CloudWatch metrics for one CloudFront distribution
 # Note: CloudFront metrics are only available in us-east-1
+# Metrics are described as query specs and fetched in one batched request
 # ===============================================================================
 
 from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
 from osbot_utils.type_safe.primitives.core.Safe_UInt                                                         import Safe_UInt
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id                              import Safe_Str__Id
+from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metric__Query                         import Schema__Metric__Query
 from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__CloudFront__Metrics                   import Schema__CloudFront__Metrics
 
 
@@ -16,21 +18,28 @@ class CloudFront__Metrics__Collector(Type_Safe):                         # Colle
     lookback_minutes  : Safe_UInt = 60                                   # Time range to collect
     period_seconds    : Safe_UInt = 300                                  # CloudWatch resolution
 
-    def collect(self) -> Schema__CloudFront__Metrics:                    # Collect all CloudFront metrics
-        return Schema__CloudFront__Metrics(
-            distribution_id  = self.distribution_id                      ,
-            requests         = self._metric('Requests'       , 'Sum'    , 'None'   ),
-            bytes_downloaded = self._metric('BytesDownloaded', 'Sum'    , 'None'   ),
-            bytes_uploaded   = self._metric('BytesUploaded'  , 'Sum'    , 'None'   ),
-            error_rate_4xx   = self._metric('4xxErrorRate'   , 'Average', 'Percent'),
-            error_rate_5xx   = self._metric('5xxErrorRate'   , 'Average', 'Percent'),
-            cache_hit_rate   = self._metric('CacheHitRate'   , 'Average', 'Percent'))
+    def collect(self) -> Schema__CloudFront__Metrics:                    # Collect all CloudFront metrics (one batched CloudWatch request)
+        queries = self.metric_queries()
+        series  = self.cloudwatch_client.get_metric_batch(list(queries.values())                   ,
+                                                          lookback_minutes = self.lookback_minutes ,
+                                                          period_seconds   = self.period_seconds   )
+        return self.from_series(dict(zip(queries, series)))
 
-    def _metric(self, metric_name, statistic, unit):                     # Helper to call CloudWatch with distribution dimensions
-        return self.cloudwatch_client.get_cloudfront_metric(
-            distribution_id  = self.distribution_id  ,
-            metric_name      = metric_name           ,
-            statistic        = statistic             ,
-            unit             = unit                  ,
-            lookback_minutes = self.lookback_minutes ,
-            period_seconds   = self.period_seconds   )
+    def metric_queries(self) -> dict:                                    # Schema field → Schema__Metric__Query
+        return dict(requests         = self._query('Requests'       , 'Sum'    , 'None'   ),
+                    bytes_downloaded = self._query('BytesDownloaded', 'Sum'    , 'None'   ),
+                    bytes_uploaded   = self._query('BytesUploaded'  , 'Sum'    , 'None'   ),
+                    error_rate_4xx   = self._query('4xxErrorRate'   , 'Average', 'Percent'),
+                    error_rate_5xx   = self._query('5xxErrorRate'   , 'Average', 'Percent'),
+                    cache_hit_rate   = self._query('CacheHitRate'   , 'Average', 'Percent'))
+
+    def from_series(self, series) -> Schema__CloudFront__Metrics:        # Schema field → Schema__Metric__Series (from metric_queries)
+        return Schema__CloudFront__Metrics(distribution_id=self.distribution_id, **series)
+
+    def _query(self, metric_name, statistic, unit):                      # Query spec with distribution dimensions
+        return Schema__Metric__Query(namespace   = 'AWS/CloudFront'                                            ,
+                                     metric_name = metric_name                                                 ,
+                                     dimensions  = [{'Name': 'DistributionId', 'Value': str(self.distribution_id)},
+                                                    {'Name': 'Region'        , 'Value': 'Global'                 }],
+                                     statistic   = statistic                                                   ,
+                                     unit        = unit                                                        )
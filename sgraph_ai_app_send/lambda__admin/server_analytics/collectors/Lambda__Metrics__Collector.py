@@ -1,11 +1,13 @@
 # ===============================================================================
 # SGraph Send - Lambda Metrics Collector
 # Collects all CloudWatch metrics for one Lambda function
+# Metrics are described as query specs and fetched in one batched request
 # ===============================================================================
 
 from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
 from osbot_utils.type_safe.primitives.core.Safe_UInt                                                         import Safe_UInt
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id                              import Safe_Str__Id
+from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metric__Query                         import Schema__Metric__Query
 from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Lambda__Metrics                       import Schema__Lambda__Metrics
 
 
@@ -15,50 +17,30 @@ class Lambda__Metrics__Collector(Type_Safe):                             # Colle
     lookback_minutes  : Safe_UInt = 60                                   # Time range to collect
     period_seconds    : Safe_UInt = 300                                  # CloudWatch resolution
 
-    def collect(self) -> Schema__Lambda__Metrics:                        # Collect all Lambda metrics
-        return Schema__Lambda__Metrics(
-            function_name         = self.function_name                    ,
-            invocations           = self.collect_invocations()            ,
-            errors                = self.collect_errors()                 ,
-            duration_avg          = self.collect_duration_avg()           ,
-            duration_p50          = self.collect_duration_percentile('p50'),
-            duration_p95          = self.collect_duration_percentile('p95'),
-            duration_p99          = self.collect_duration_percentile('p99'),
-            duration_max          = self.collect_duration_max()           ,
-            throttles             = self.collect_throttles()              ,
-            concurrent_executions = self.collect_concurrent_executions()  )
-
-    def collect_invocations(self):
-        return self.cloudwatch_client.get_lambda_metric(
-            function_name = self.function_name, metric_name = 'Invocations',
-            statistic = 'Sum', unit = 'Count', lookback_minutes = self.lookback_minutes, period_seconds = self.period_seconds)
-
-    def collect_errors(self):
-        return self.cloudwatch_client.get_lambda_metric(
-            function_name = self.function_name, metric_name = 'Errors',
-            statistic = 'Sum', unit = 'Count', lookback_minutes = self.lookback_minutes, period_seconds = self.period_seconds)
-
-    def collect_duration_avg(self):
-        return self.cloudwatch_client.get_lambda_metric(
-            function_name = self.function_name, metric_name = 'Duration',
-            statistic = 'Average', unit = 'Milliseconds', lookback_minutes = self.lookback_minutes, period_seconds = self.period_seconds)
-
-    def collect_duration_percentile(self, percentile):
-        return self.cloudwatch_client.get_lambda_metric_percentile(
-            function_name = self.function_name, metric_name = 'Duration',
-            percentile = percentile, unit = 'Milliseconds', lookback_minutes = self.lookback_minutes, period_seconds = self.period_seconds)
-
-    def collect_duration_max(self):
-        return self.cloudwatch_client.get_lambda_metric(
-            function_name = self.function_name, metric_name = 'Duration',
-            statistic = 'Maximum', unit = 'Milliseconds', lookback_minutes = self.lookback_minutes, period_seconds = self.period_seconds)
-
-    def collect_throttles(self):
-        return self.cloudwatch_client.get_lambda_metric(
-            function_name = self.function_name, metric_name = 'Throttles',
-            statistic = 'Sum', unit = 'Count', lookback_minutes = self.lookback_minutes, period_seconds = self.period_seconds)
-
-    def collect_concurrent_executions(self):
-        return self.cloudwatch_client.get_lambda_metric(
-            function_name = self.function_name, metric_name = 'ConcurrentExecutions',
-            statistic = 'Maximum', unit = 'Count', lookback_minutes = self.lookback_minutes, period_seconds = self.period_seconds)
+    def collect(self) -> Schema__Lambda__Metrics:                        # Collect all Lambda metrics (one batched CloudWatch request)
+        queries = self.metric_queries()
+        series  = self.cloudwatch_client.get_metric_batch(list(queries.values())                   ,
+                                                          lookback_minutes = self.lookback_minutes ,
+                                                          period_seconds   = self.period_seconds   )
+        return self.from_series(dict(zip(queries, series)))
+
+    def metric_queries(self) -> dict:                                    # Schema field → Schema__Metric__Query
+        return dict(invocations           = self._query('Invocations'         , 'Sum'    , 'Count'       ),
+                    errors                = self._query('Errors'              , 'Sum'    , 'Count'       ),
+                    duration_avg          = self._query('Duration'            , 'Average', 'Milliseconds'),
+                    duration_p50          = self._query('Duration'            , 'p50'    , 'Milliseconds'),
+                    duration_p95          = self._query('Duration'            , 'p95'    , 'Milliseconds'),
+                    duration_p99          = self._query('Duration'            , 'p99'    , 'Milliseconds'),
+                    duration_max          = self._query('Duration'            , 'Maximum', 'Milliseconds'),
+                    throttles             = self._query('Throttles'           , 'Sum'    , 'Count'       ),
+                    concurrent_executions = self._query('ConcurrentExecutions', 'Maximum', 'Count'       ))
+
+    def from_series(self, series) -> Schema__Lambda__Metrics:             # Schema field → Schema__Metric__Series (from metric_queries)
+        return Schema__Lambda__Metrics(function_name=self.function_name, **series)
+
+    def _query(self, metric_name, statistic, unit):                      # Query spec with function dimensions
+        return Schema__Metric__Query(namespace   = 'AWS/Lambda'                                          ,
+                                     metric_name = metric_name                                           ,
+                                     dimensions  = [{'Name': 'FunctionName', 'Value': str(self.function_name)}],
+                                     statistic   = statistic                                             ,
+                                     unit        = unit                                                  )
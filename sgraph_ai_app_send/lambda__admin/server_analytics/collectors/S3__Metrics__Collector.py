@@ -1,11 +1,13 @@
 # ===============================================================================
 # SGraph Send - S3 Metrics Collector
 # Collects all CloudWatch request metrics for one S3 bucket
+# Metrics are described as query specs and fetched in one batched request
 # ===============================================================================
 
 from osbot_utils.type_safe.Type_Safe                                                                         import Type_Safe
 from osbot_utils.type_safe.primitives.core.Safe_UInt                                                         import Safe_UInt
 from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Id                              import Safe_Str__Id
+from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metric__Query                         import Schema__Metric__Query
 from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__S3__Metrics                           import Schema__S3__Metrics
 
 
@@ -16,25 +18,30 @@ class S3__Metrics__Collector(Type_Safe):                                 # Colle
     lookback_minutes  : Safe_UInt = 60                                   # Time range to collect
     period_seconds    : Safe_UInt = 300                                  # CloudWatch resolution
 
-    def collect(self) -> Schema__S3__Metrics:                            # Collect all S3 metrics
-        return Schema__S3__Metrics(
-            bucket_name           = self.bucket_name                      ,
-            filter_id             = self.filter_id                        ,
-            get_requests          = self._metric('GetRequests'         , 'Sum'    , 'Count'       ),
-            put_requests          = self._metric('PutRequests'         , 'Sum'    , 'Count'       ),
-            first_byte_latency    = self._metric('FirstByteLatency'    , 'Average', 'Milliseconds'),
-            total_request_latency = self._metric('TotalRequestLatency' , 'Average', 'Milliseconds'),
-            errors_4xx            = self._metric('4xxErrors'           , 'Sum'    , 'Count'       ),
-            errors_5xx            = self._metric('5xxErrors'           , 'Sum'    , 'Count'       ),
-            bytes_downloaded      = self._metric('BytesDownloaded'     , 'Sum'    , 'Bytes'       ),
-            bytes_uploaded        = self._metric('BytesUploaded'       , 'Sum'    , 'Bytes'       ))
+    def collect(self) -> Schema__S3__Metrics:                            # Collect all S3 metrics (one batched CloudWatch request)
+        queries = self.metric_queries()
+        series  = self.cloudwatch_client.get_metric_batch(list(queries.values())                   ,
+                                                          lookback_minutes = self.lookback_minutes ,
+                                                          period_seconds   = self.period_seconds   )
+        return self.from_series(dict(zip(queries, series)))
 
-    def _metric(self, metric_name, statistic, unit):                     # Helper to call CloudWatch with bucket dimensions
-        return self.cloudwatch_client.get_s3_metric(
-            bucket_name      = self.bucket_name      ,
-            filter_id        = self.filter_id        ,
-            metric_name      = metric_name           ,
-            statistic        = statistic             ,
-            unit             = unit                  ,
-            lookback_minutes = self.lookback_minutes ,
-            period_seconds   = self.period_seconds   )
+    def metric_queries(self) -> dict:                                    # Schema field → Schema__Metric__Query
+        return dict(get_requests          = self._query('GetRequests'         , 'Sum'    , 'Count'       ),
+                    put_requests          = self._query('PutRequests'         , 'Sum'    , 'Count'       ),
+                    first_byte_latency    = self._query('FirstByteLatency'    , 'Average', 'Milliseconds'),
+                    total_request_latency = self._query('TotalRequestLatency' , 'Average', 'Milliseconds'),
+                    errors_4xx            = self._query('4xxErrors'           , 'Sum'    , 'Count'       ),
+                    errors_5xx            = self._query('5xxErrors'           , 'Sum'    , 'Count'       ),
+                    bytes_downloaded      = self._query('BytesDownloaded'     , 'Sum'    , 'Bytes'       ),
+                    bytes_uploaded        = self._query('BytesUploaded'       , 'Sum'    , 'Bytes'       ))
+
+    def from_series(self, series) -> Schema__S3__Metrics:                # Schema field → Schema__Metric__Series (from metric_queries)
+        return Schema__S3__Metrics(bucket_name=self.bucket_name, filter_id=self.filter_id, **series)
+
+    def _query(self, metric_name, statistic, unit):                      # Query spec with bucket dimensions
+        return Schema__Metric__Query(namespace   = 'AWS/S3'                                            ,
+                                     metric_name = metric_name                                         ,
+                                     dimensions  = [{'Name': 'BucketName', 'Value': str(self.bucket_name)},
+                                                    {'Name': 'FilterId'  , 'Value': str(self.filter_id)  }],
+                                     statistic   = statistic                                           ,
+                                     unit        = unit                                                )
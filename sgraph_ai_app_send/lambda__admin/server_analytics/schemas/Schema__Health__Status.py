@@ -10,7 +10,7 @@ from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Lab
 
 class Schema__Health__Status(Type_Safe):                                 # Health evaluation for one component
     component    : Safe_Str__Label                                       # Component name (e.g., 'Lambda: user-dev')
-    status       : Safe_Str__Id                                          # 'healthy', 'warning', 'critical'
+    status       : Safe_Str__Id                                          # 'healthy', 'warning', 'critical', 'unknown'
     status_emoji : Safe_Str__Label                                       # Visual indicator
     message      : str                                                   # Human-readable description
     metrics      : dict                                                  # Key metric values for this evaluation
@@ -0,0 +1,16 @@
+# ===============================================================================
+# SGraph Send - Metric Query Schema
+# One CloudWatch metric request (a GetMetricData query spec)
+# Collectors describe their metrics as queries; CloudWatch__Client batches them
+# ===============================================================================
+
+from osbot_utils.type_safe.Type_Safe                                                    import Type_Safe
+from osbot_utils.type_safe.primitives.domains.identifiers.safe_str.Safe_Str__Label      import Safe_Str__Label
+
+
+class Schema__Metric__Query(Type_Safe):                                  # One metric to fetch from CloudWatch
+    namespace   : str                                                    # AWS namespace (e.g., 'AWS/Lambda') — raw str to preserve /
+    metric_name : Safe_Str__Label                                        # Metric name (e.g., 'Invocations')
+    dimensions  : list                                                   # List of {Name, Value} dicts
+    statistic   : Safe_Str__Label = 'Sum'                                # 'Sum', 'Average', 'Maximum' or a percentile (e.g., 'p95')
+    unit        : Safe_Str__Label = 'Count'                              # Unit (e.g., 'Count', 'Milliseconds')
@@ -0,0 +1,80 @@
+# ===============================================================================
+# SGraph Send - Count-Min Sketch
+# Approximate per-value counts in fixed memory (depth rows × width counters)
+# Estimates never undercount; overcount is at most ~e/width of the total with
+# probability 1 - e^-depth. Mergeable (counter-wise sum) across windows and
+# instances; to_data() is JSON-safe — sparse while few counters are set
+# Plain __slots__ class (no Type_Safe attribute checks on the counter path)
+# ===============================================================================
+
+import base64
+from array                                                                              import array
+from collections                                                                        import Counter
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__HyperLogLog     import sketch__hash64
+
+COUNT_MIN__WIDTH__DEFAULT = 512                                              # Counters per row (~0.5% of total overcount)
+COUNT_MIN__DEPTH__DEFAULT = 4                                                # Rows (independent hash positions)
+
+
+class Sketch__Count_Min:                                                     # Frequency sketch
+    __slots__ = ('width' ,                                                   # Counters per row
+                 'depth' ,                                                   # Rows
+                 'total' ,                                                   # Sum of all counts added
+                 'table' )                                                   # array('Q') of depth*width counters, row-major
+
+    def __init__(self, width=COUNT_MIN__WIDTH__DEFAULT, depth=COUNT_MIN__DEPTH__DEFAULT, total=0, table=None):
+        self.width = max(1, width)
+        self.depth = max(1, depth)
+        self.total = total
+        self.table = table if table is not None else array('Q', bytes(8 * self.width * self.depth))
+
+    def positions(self, value):                                              # One counter index per row (double hashing of one 64-bit hash)
+        hashed = sketch__hash64(value)
+        first  = hashed & 0xFFFFFFFF
+        second = (hashed >> 32) | 1
+        return [row * self.width + (first + row * second) % self.width for row in range(self.depth)]
+
+    def add(self, value, count=1):                                           # Count one value (count times)
+        for position in self.positions(value):
+            self.table[position] += count
+        self.total += count
+        return self
+
+    def add_many(self, values):                                              # Count a batch of values (one table update per distinct value)
+        for value, count in Counter(values).items():
+            self.add(value, count)
+        return self
+
+    def estimate(self, value):                                               # Upper-bound estimate of value's count
+        return min(self.table[position] for position in self.positions(value))
+
+    def merge(self, other):                                                  # Sum with another sketch of the same shape
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError(f'cannot merge Count-Min {other.depth}x{other.width} into {self.depth}x{self.width}')
+        self.table  = array('Q', map(sum, zip(self.table, other.table)))
+        self.total += other.total
+        return self
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Serialisation
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def to_data(self):                                                       # JSON-safe form (sparse or dense)
+        sparse = {str(index): count for index, count in enumerate(self.table) if count}
+        data   = dict(type='count_min', width=self.width, depth=self.depth, total=self.total)
+        if len(sparse) * 12 < len(self.table) * 8:                           # ~12 JSON bytes per sparse entry vs ~11 base64 bytes per dense counter
+            return dict(data, sparse=sparse)
+        return dict(data, dense=base64.b64encode(self.table.tobytes()).decode())
+
+    @classmethod
+    def from_data(cls, data):                                                # Inverse of to_data (None/empty → empty sketch)
+        data   = data or {}
+        sketch = cls(width = data.get('width', COUNT_MIN__WIDTH__DEFAULT),
+                     depth = data.get('depth', COUNT_MIN__DEPTH__DEFAULT),
+                     total = data.get('total', 0                        ))
+        if data.get('dense'):
+            sketch.table = array('Q')
+            sketch.table.frombytes(base64.b64decode(data['dense']))
+        for index, count in (data.get('sparse') or {}).items():
+            sketch.table[int(index)] = count
+        return sketch
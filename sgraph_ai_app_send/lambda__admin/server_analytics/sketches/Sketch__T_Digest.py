@@ -0,0 +1,142 @@
+# ===============================================================================
+# SGraph Send - t-digest Sketch
+# Latency percentiles in fixed memory: values are clustered into centroids
+# (mean, weight) that stay small near the tails, so p95/p99 remain accurate
+# while the digest holds O(compression) centroids however many values arrive.
+# Mergeable (centroids of both sides are re-clustered); to_data() is JSON-safe
+# Plain __slots__ class; count / minimum / maximum update on every add
+# ===============================================================================
+
+import math
+
+T_DIGEST__COMPRESSION__DEFAULT = 100                                         # At most ~compression/2 centroids after a compress
+T_DIGEST__BUFFER_FACTOR        = 5                                           # Unmerged values held (× compression) before compressing
+
+
+class Sketch__T_Digest:                                                      # Quantile sketch (merging t-digest)
+    __slots__ = ('compression' ,                                             # Size bound of the centroid list
+                 'centroids'   ,                                             # [[mean, weight]] sorted by mean
+                 'buffer'      ,                                             # Values added since the last compress
+                 'count'       ,                                             # Total weight observed
+                 'minimum'     ,
+                 'maximum'     )
+
+    def __init__(self, compression=T_DIGEST__COMPRESSION__DEFAULT):
+        self.compression = compression
+        self.centroids   = []
+        self.buffer      = []
+        self.count       = 0.0
+        self.minimum     = float('inf')
+        self.maximum     = float('-inf')
+
+    def add(self, value, weight=1):                                          # Observe one value (None is ignored)
+        if value is None:
+            return self
+        value = float(value)
+        self.buffer.append((value, weight))
+        self.count  += weight
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        if len(self.buffer) >= self.compression * T_DIGEST__BUFFER_FACTOR:
+            self.compress()
+        return self
+
+    def add_many(self, values):                                              # Observe a batch of values (one state update per batch)
+        values = [float(value) for value in values if value is not None]
+        if not values:
+            return self
+        self.buffer.extend((value, 1) for value in values)
+        self.count  += len(values)
+        self.minimum = min(self.minimum, min(values))
+        self.maximum = max(self.maximum, max(values))
+        if len(self.buffer) >= self.compression * T_DIGEST__BUFFER_FACTOR:
+            self.compress()
+        return self
+
+    def scale(self, q):                                                      # k1 scale function: steep near q=0/1 → small tail clusters
+        return self.compression / (2 * math.pi) * math.asin(2 * min(1.0, max(0.0, q)) - 1)
+
+    def compress(self):                                                      # Re-cluster centroids + buffer under the size bound
+        points = sorted([tuple(centroid) for centroid in self.centroids] + list(self.buffer))
+        self.buffer    = []
+        self.centroids = []
+        if not points:
+            return self
+        total      = sum(weight for _, weight in points)
+        merged     = []
+        cumulative = 0.0
+        k_left     = self.scale(0.0)
+        mean, weight = points[0]
+        for next_mean, next_weight in points[1:]:
+            proposed = weight + next_weight
+            if self.scale((cumulative + proposed) / total) - k_left <= 1:   # Cluster stays within one unit of the scale function
+                mean   = (mean * weight + next_mean * next_weight) / proposed
+                weight = proposed
+            else:
+                merged.append([mean, weight])
+                cumulative  += weight
+                k_left       = self.scale(cumulative / total)
+                mean, weight = next_mean, next_weight
+        merged.append([mean, weight])
+        self.centroids = merged
+        return self
+
+    def quantile(self, q):                                                   # Estimated value at quantile q (0..1); None when empty
+        if self.buffer:
+            self.compress()
+        if not self.centroids:
+            return None
+        q = min(1.0, max(0.0, q))
+        if len(self.centroids) == 1:
+            return self.centroids[0][0]
+        target     = q * self.count
+        cumulative = 0.0
+        previous   = (self.minimum, 0.0)                                     # (value, rank) of the previous interpolation point
+        for mean, weight in self.centroids:
+            center = cumulative + weight / 2
+            if target <= center:
+                span = center - previous[1]
+                return previous[0] + (mean - previous[0]) * ((target - previous[1]) / span if span > 0 else 0)
+            previous    = (mean, center)
+            cumulative += weight
+        span = self.count - previous[1]
+        return previous[0] + (self.maximum - previous[0]) * ((target - previous[1]) / span if span > 0 else 0)
+
+    def percentiles(self, percents=(50, 95, 99), digits=2):                  # {'p50': ..., 'p95': ..., 'p99': ...}
+        result = {}
+        for percent in percents:
+            value = self.quantile(percent / 100)
+            result[f'p{percent}'] = round(value, digits) if value is not None else None
+        return result
+
+    def merge(self, other):                                                  # Union with another digest
+        self.buffer.extend(tuple(centroid) for centroid in other.centroids)
+        self.buffer.extend(other.buffer)
+        self.count  += other.count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self.compress()
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Serialisation
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def to_data(self):                                                       # JSON-safe form (compressed centroids)
+        self.compress()
+        return dict(type        = 'tdigest'                                           ,
+                    compression = self.compression                                    ,
+                    count       = self.count                                          ,
+                    min         = self.minimum if self.count else None                ,
+                    max         = self.maximum if self.count else None                ,
+                    centroids   = [[round(mean, 6), weight] for mean, weight in self.centroids])
+
+    @classmethod
+    def from_data(cls, data):                                                # Inverse of to_data (None/empty → empty digest)
+        data   = data or {}
+        sketch = cls(compression=data.get('compression', T_DIGEST__COMPRESSION__DEFAULT))
+        sketch.centroids = [list(centroid) for centroid in data.get('centroids') or []]
+        sketch.count     = float(data.get('count', 0))
+        if data.get('min') is not None:
+            sketch.minimum = float(data['min'])
+            sketch.maximum = float(data['max'])
+        return sketch
@@ -0,0 +1,97 @@
+# ===============================================================================
+# SGraph Send - Top-K Sketch
+# Heavy hitters (e.g. top paths) in fixed memory: a Count-Min sketch counts
+# every value, a min-heap keeps the `capacity` best candidates by estimate.
+# Memory is bounded by the sketch plus capacity values, however many distinct
+# values are seen. Mergeable across windows and instances (candidates of both
+# sides are re-ranked against the merged counts)
+# Plain __slots__ class, like the Count-Min it wraps; add_many() batches repeats
+# ===============================================================================
+
+import heapq
+from collections                                                                        import Counter
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__Count_Min       import Sketch__Count_Min
+
+TOP_K__K__DEFAULT        = 20                                                # Values reported by top()
+TOP_K__CAPACITY_FACTOR   = 2                                                 # Candidates kept per reported value (slack for late risers)
+
+
+class Sketch__Top_K:                                                         # Count-Min + candidate heap
+    __slots__ = ('k'          ,                                              # Values reported by top()
+                 'count_min'  ,                                              # Sketch__Count_Min of every value
+                 'candidates' ,                                              # value → last estimate (at most capacity() entries)
+                 'heap'       )                                              # [(estimate, value)] min-heap, may hold stale entries
+
+    def __init__(self, k=TOP_K__K__DEFAULT, count_min=None):
+        self.k          = k
+        self.count_min  = count_min if count_min is not None else Sketch__Count_Min()
+        self.candidates = {}
+        self.heap       = []
+
+    def capacity(self):
+        return max(1, self.k * TOP_K__CAPACITY_FACTOR)
+
+    def add(self, value, count=1):                                           # Count one value; keep it if it ranks among the candidates
+        if value is None:
+            return self
+        self.count_min.add(value, count)
+        estimate = self.count_min.estimate(value)
+        if value in self.candidates or len(self.candidates) < self.capacity():
+            self.candidates[value] = estimate
+            heapq.heappush(self.heap, (estimate, value))
+        elif estimate > self.minimum():
+            _, evicted = heapq.heappop(self.heap)
+            del self.candidates[evicted]
+            self.candidates[value] = estimate
+            heapq.heappush(self.heap, (estimate, value))
+        if len(self.heap) > 4 * self.capacity():                             # Compact stale entries left by re-pushed candidates
+            self.rebuild_heap()
+        return self
+
+    def add_many(self, values):                                              # Count a batch of values (one update per distinct value)
+        for value, count in Counter(value for value in values if value is not None).items():
+            self.add(value, count)
+        return self
+
+    def minimum(self):                                                       # Smallest current candidate estimate (drops stale heap entries)
+        while self.heap:
+            estimate, value = self.heap[0]
+            if self.candidates.get(value) == estimate:
+                return estimate
+            heapq.heappop(self.heap)
+        return 0
+
+    def rebuild_heap(self):
+        self.heap = [(estimate, value) for value, estimate in self.candidates.items()]
+        heapq.heapify(self.heap)
+
+    def top(self, k=None):                                                   # [(value, estimate)] highest first
+        ranked = heapq.nlargest(k or self.k, self.candidates.items(), key=lambda item: (item[1], item[0]))
+        return [(value, estimate) for value, estimate in ranked]
+
+    def merge(self, other):                                                  # Merge counts, then re-rank the union of candidates
+        self.count_min.merge(other.count_min)
+        values          = set(self.candidates) | set(other.candidates)
+        estimates       = [(value, self.count_min.estimate(value)) for value in values]
+        self.candidates = dict(heapq.nlargest(self.capacity(), estimates, key=lambda item: (item[1], item[0])))
+        self.rebuild_heap()
+        return self
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Serialisation
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def to_data(self):                                                       # JSON-safe form
+        return dict(type       = 'top_k'                        ,
+                    k          = self.k                         ,
+                    count_min  = self.count_min.to_data()       ,
+                    candidates = dict(self.candidates)          )
+
+    @classmethod
+    def from_data(cls, data):                                                # Inverse of to_data (None/empty → empty sketch)
+        data   = data or {}
+        sketch = cls(k         = data.get('k', TOP_K__K__DEFAULT)                 ,
+                     count_min = Sketch__Count_Min.from_data(data.get('count_min')))
+        sketch.candidates = dict(data.get('candidates') or {})
+        sketch.rebuild_heap()
+        return sketch
@@ -1,7 +1,8 @@
 # ===============================================================================
 # SGraph Send - Analytics Middleware
 # FastAPI middleware that records one raw analytics event per HTTP request
-# Wraps all writes in try/except — analytics failures never affect user requests
+# Events go to Service__Analytics__Buffer (in-process, no cache write per request)
+# Wraps all recording in try/except — analytics failures never affect user requests
 # ===============================================================================
 
 import hashlib
@@ -11,7 +12,7 @@ import time
 from starlette.middleware.base                                                  import BaseHTTPMiddleware
 from starlette.requests                                                        import Request
 from starlette.responses                                                       import Response
-from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client              import Send__Cache__Client
+from sgraph_ai_app_send.lambda__admin.service.Service__Analytics__Buffer       import Service__Analytics__Buffer
 
 
 def classify_event_type(path, method):                                     # Classify HTTP request into event type
@@ -39,11 +40,11 @@ def hash_ip(ip_address):                                                   # SHA
     return hashlib.sha256(ip_address.encode()).hexdigest()
 
 
-class Middleware__Analytics(BaseHTTPMiddleware):                            # Records one raw event per HTTP request
+class Middleware__Analytics(BaseHTTPMiddleware):                            # Buffers one raw event per HTTP request
 
-    def __init__(self, app, send_cache_client: Send__Cache__Client):
+    def __init__(self, app, analytics_buffer: Service__Analytics__Buffer):
         super().__init__(app)
-        self.send_cache_client = send_cache_client
+        self.analytics_buffer = analytics_buffer
 
     async def dispatch(self, request: Request, call_next):
         start_time = time.time()
@@ -67,9 +68,10 @@ class Middleware__Analytics(BaseHTTPMiddleware):                            # Re
                 user_agent_normalised = normalise_user_agent(user_agent)   ,
                 content_bytes         = int(response.headers.get('content-length', 0)),
                 transfer_id           = ''                                 ,
-                token_id              = ''                                 )
+                token_id              = ''                                 ,
+                timestamp             = start_time                         )
 
-            self.send_cache_client.analytics__record_event(event_data)
+            self.analytics_buffer.record(event_data)                       # Written by Middleware__Flush once the request is done
         except Exception:                                                  # Never let analytics recording crash user requests
             pass
 
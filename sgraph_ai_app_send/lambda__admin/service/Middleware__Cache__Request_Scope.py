@@ -0,0 +1,20 @@
+# ===============================================================================
+# SGraph Send - Cache Request Scope Middleware
+# Opens a Send__Cache__Client request scope per HTTP request so repeated
+# lookups of the same key within one request hit the in-memory memo
+# ===============================================================================
+
+from starlette.middleware.base                                                  import BaseHTTPMiddleware
+from starlette.requests                                                        import Request
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client              import Send__Cache__Client
+
+
+class Middleware__Cache__Request_Scope(BaseHTTPMiddleware):                 # One lookup memo per HTTP request
+
+    def __init__(self, app, send_cache_client: Send__Cache__Client):
+        super().__init__(app)
+        self.send_cache_client = send_cache_client
+
+    async def dispatch(self, request: Request, call_next):
+        with self.send_cache_client.request_scope():                       # Memo is dropped when the response is returned
+            return await call_next(request)
@@ -4,7 +4,16 @@
 # Follows Html_Cache__Client pattern: Type_Safe wrapper with domain-specific methods
 # ===============================================================================
 
+import copy
+import hashlib
+import re
+import time
+from concurrent.futures                                                                         import ThreadPoolExecutor
+from contextlib                                                                                 import contextmanager
+from contextvars                                                                                import ContextVar, copy_context
+from datetime                                                                                   import datetime, timezone
 from mgraph_ai_service_cache_client.client.cache_client.Cache__Service__Client                  import Cache__Service__Client
+from mgraph_ai_service_cache_client.schemas.cache.enums.Enum__Cache__Data_Type                  import Enum__Cache__Data_Type
 from osbot_utils.helpers.cache.Cache__Hash__Generator                                           import Cache__Hash__Generator
 from osbot_utils.type_safe.Type_Safe                                                            import Type_Safe
 
@@ -18,11 +27,60 @@ NS_ROOMS      = 'rooms'                                                     # Da
 NS_INVITES    = 'invites'                                                   # Data room invite codes
 NS_AUDIT      = 'audit'                                                     # Immutable audit trail
 NS_SESSIONS   = 'sessions'                                                  # Room-scoped session tokens
+NS_REVOKED    = 'revocations'                                               # Signed-session revocations + generation bumps (one entry each)
+NS_SUMMARIES  = 'summaries'                                                 # Prefix of the per-namespace list-view row namespaces
+NS_COUNTERS   = 'counters'                                                  # Segmented logs (prefix: one namespace per log)
+NS_MEMBERS    = 'members'                                                   # Room memberships (prefix: one namespace per user)
+NS_ROLLUPS    = 'rollups'                                                   # Pulse rollup partials (prefix: one namespace per UTC hour)
+
+SUMMARY__FIELDS         = {NS_TOKENS : ('token_name', 'status', 'usage_count', 'usage_limit', 'created_by')                   ,
+                           NS_KEYS   : ('code', 'fingerprint', 'algorithm', 'key_size', 'created', 'active',
+                                        'signing_key_pem', 'public_key_pem')                                                   ,
+                           NS_USERS  : ('user_id', 'display_name', 'key_fingerprint', 'created', 'active')                     ,
+                           NS_ROOMS  : ('room_id', 'name', 'description', 'owner_user_id', 'vault_cache_id',
+                                        'vault_cache_key', 'status', 'created', 'member_count')                                }
+SUMMARY__ID_FIELD       = {NS_TOKENS : 'token_name', NS_KEYS: 'code', NS_USERS: 'user_id', NS_ROOMS: 'room_id'}
+SUMMARY__SKIP_PREFIXES  = ('idx-', 'log-')                                  # Index + log entries share the entity namespaces
+SUMMARY__GENERATION     = 'idx-generation'                                  # Per-namespace generation marker (in the summary namespace)
+
+KEY_LOG__HEAD              = 'idx-log-head'                                 # Transparency log head hint (copy of the latest entry)
+KEY_LOG__CHECKPOINT_PREFIX = 'idx-log-ckpt-'                                # Transparency log checkpoints, one per block
+
+TOKEN__DATA_KEY__EVENTS   = 'usage_events'                             # Token child docs: one per use (leased uses under usage_events/<lease_id>)
+TOKEN__DATA_KEY__LEASES   = 'leases'                                   # Token child docs: one per lease, named <lease_id>-<granted>-<expires>
+TOKEN__DATA_KEY__RELEASES = 'releases'                                 # Token child docs: one per lease close, named <lease_id>-<unused>
+
+INVITE__DATA_KEY__USES    = 'uses'                                     # Invite child docs: one per acceptance, named <ms>-<user digest>-<claim>
+
+COUNTER__HEAD_KEY    = 'head'                                             # Counter head hint (seq + chain_hash of the latest slot)
+COUNTER__SLOT_PREFIX = 'slot-'                                            # Counter slots (one per append, own key), never overwritten
+COUNTER__CKPT_PREFIX = 'ckpt-'                                            # Counter checkpoints (chained logs)
+
+ROOM__MEMBER_SEPARATOR    = '-'                                          # Membership entry key: <room_id>-<permission> (room ids are hex)
+ROOM__MEMBERS_BUILT       = 'idx-members-built'                          # Marker in the rooms namespace: membership entries were rebuilt from the ACLs
+
+ANALYTICS__SEGMENT_PREFIX = 'seg-'                                       # Buffered analytics segments (one per flush per instance)
+ANALYTICS__ROLLUP_PREFIX  = 'roll-'                                      # Pulse rollup partials: roll-<minute>-<flush_id>, one per flush and minute
+ANALYTICS__MERGED_PREFIX  = 'merged-'                                    # Merged rollup of a past minute: merged-<minute> (+ the partials it covers)
+
+SESSION__REVOKED_PREFIX    = 'rev-'                                       # One entry per revoked signed session: rev-<expires>-<session_id>
+SESSION__GENERATION_PREFIX = 'gen-'                                       # One entry per revoke-all: gen-<claim> (generation = number of entries)
+
+BULK__MAX_WORKERS = 8                                                      # Parallel lookups per bulk fetch (bounded fan-out)
+
+lookup_memo   = ContextVar('send_cache_client__lookup_memo', default=None)  # Request-scoped (namespace, key) → (cache_id, body) memo
+
+
+def scoped_namespace(prefix, name):                                          # <prefix>-<readable name>-<hash> (namespaces only keep [a-zA-Z0-9_-])
+    readable = re.sub(r'[^a-zA-Z0-9_-]', '_', name)[:64]
+    digest   = hashlib.sha256(name.encode()).hexdigest()[:8]
+    return f'{prefix}-{readable}-{digest}'
 
 
 class Send__Cache__Client(Type_Safe):                                      # Cache service client wrapper for SGraph Send
-    cache_client   : Cache__Service__Client                                # Official cache service client
-    hash_generator : Cache__Hash__Generator                                # Hash generator for cache keys
+    cache_client     : Cache__Service__Client                              # Official cache service client
+    hash_generator   : Cache__Hash__Generator                              # Hash generator for cache keys
+    bulk_max_workers : int = BULK__MAX_WORKERS                             # Concurrency bound for entries__lookup_many
 
     # ═══════════════════════════════════════════════════════════════════════
     # Health
@@ -34,6 +92,218 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             return result.get('status') == 'ok'
         return False
 
+    # ═══════════════════════════════════════════════════════════════════════
+    # Entry Lookup — one round trip for (cache_id, body), memoised per request
+    # ═══════════════════════════════════════════════════════════════════════
+
+    @contextmanager
+    def request_scope(self):                                               # Memoise lookups until the scope exits (one per HTTP request)
+        token = lookup_memo.set({})
+        try:
+            yield self
+        finally:
+            lookup_memo.reset(token)
+
+    def entry__lookup(self, namespace, key):                               # Resolve key → (cache_id, body) via a single hash retrieve
+        memo = lookup_memo.get()
+        if memo is not None and (namespace, key) in memo:
+            cache_id, body = memo[(namespace, key)]
+            return cache_id, copy.deepcopy(body)                           # Callers mutate bodies before update — never hand out the memo copy
+        cache_hash = self.hash_generator.from_string(key)
+        result     = self.cache_client.retrieve().retrieve__hash__cache_hash(
+            cache_hash = str(cache_hash) ,
+            namespace  = namespace       )
+        cache_id, body = None, None
+        if result is not None and hasattr(result, 'metadata') and result.metadata.cache_id:
+            cache_id, body = str(result.metadata.cache_id), result.data
+        if memo is not None:
+            memo[(namespace, key)] = (cache_id, copy.deepcopy(body))
+        return cache_id, body
+
+    def entry__update(self, namespace, cache_id, body):                    # Update entry body and refresh any memoised copies
+        result = self.cache_client.update().update__json(
+            cache_id  = cache_id   ,
+            namespace = namespace  ,
+            body      = body       )
+        memo = lookup_memo.get()
+        if memo:
+            for memo_key, (memo_cache_id, _) in list(memo.items()):
+                if memo_key[0] == namespace and memo_cache_id == str(cache_id):
+                    memo[memo_key] = (memo_cache_id, copy.deepcopy(body))
+        return result
+
+    def entry__forget(self, namespace, key):                               # Drop a memoised lookup (e.g. a cached miss before create)
+        memo = lookup_memo.get()
+        if memo:
+            memo.pop((namespace, key), None)
+
+    def entry__delete(self, namespace, key):                               # Delete a key_based entry (no-op when absent)
+        cache_id = self.entry__lookup(namespace, key)[0]
+        self.entry__forget(namespace, key)
+        if cache_id is None:
+            return None
+        return self.cache_client.delete().delete__cache_id(cache_id=cache_id, namespace=namespace)
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Bulk Lookup — bounded parallel fan-out + cursor pages over key listings
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def entries__lookup_many(self, namespace, keys):                       # Resolve many keys → [(key, cache_id, body)] in input order
+        keys = [key for key in keys if key]
+        if len(keys) <= 1 or self.bulk_max_workers <= 1:
+            return [(key, *self.entry__lookup(namespace, key)) for key in keys]
+        workers = min(self.bulk_max_workers, len(keys))
+        with ThreadPoolExecutor(max_workers=workers) as executor:          # Each worker runs in a copy of the caller's context (shares the request memo)
+            futures = [executor.submit(copy_context().run, self.entry__lookup, namespace, key)
+                       for key in keys]
+            return [(key, *future.result()) for key, future in zip(keys, futures)]
+
+    def entries__page(self, namespace, keys, cursor=None,                  # One page of bodies from a key listing, ordered by key
+                      limit=None, accept=None, reverse=False,              # reverse → descending (newest first for time-ordered keys)
+                      lookup=None):                                        # lookup(keys) → [(key, cache_id, body)] (default: entries__lookup_many)
+        lookup  = lookup or (lambda batch: self.entries__lookup_many(namespace, batch))
+        ordered = sorted((key for key in keys if key), reverse=reverse)
+        if cursor:
+            ordered = [key for key in ordered if (key < cursor if reverse else key > cursor)]
+        if not limit or limit <= 0:
+            limit = len(ordered)
+        items, position = [], 0
+        while position < len(ordered) and len(items) < limit:
+            batch     = ordered[position:position + limit - len(items)]    # Only fetch what can still fit on this page
+            position += len(batch)
+            for key, _, body in lookup(batch):
+                if body and (accept is None or accept(body)):
+                    items.append(body)
+        next_cursor = ordered[position - 1] if position < len(ordered) else None
+        return dict(items=items, next_cursor=next_cursor)
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Summary Indexes — one small row entry per entity, kept in a summary
+    # namespace per entity namespace ('summaries-tokens', ...). Create/update
+    # blind-writes only that entity's row, so writers never race on a shared
+    # document; list views page over the entity + row listings and read the
+    # source entry for any entity without a row yet (entries from before the
+    # rows, or a lost row write). summary__check (with repair) is the explicit
+    # admin step that rebuilds rows from the source
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def summary__namespace(self, namespace):                               # Namespace holding a namespace's summary rows
+        return f'{NS_SUMMARIES}-{namespace}'
+
+    def summary__row(self, namespace, body):                               # Project an entity body onto its summary fields
+        return {field: body.get(field) for field in SUMMARY__FIELDS[namespace]}
+
+    def summary__lookup(self, namespace, entity_id):                       # (cache_id, row) for one entity
+        return self.entry__lookup(self.summary__namespace(namespace), entity_id)
+
+    def summary__save(self, namespace, row):                               # Create or replace one entity's row (key_based store overwrites)
+        summary_ns = self.summary__namespace(namespace)
+        id_field   = SUMMARY__ID_FIELD[namespace]
+        entity_id  = row.get(id_field, '')
+        self.entry__forget(summary_ns, entity_id)
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = summary_ns      ,
+            strategy        = 'key_based'     ,
+            cache_key       = entity_id       ,
+            file_id         = entity_id       ,
+            body            = row             ,
+            json_field_path = id_field        )
+
+    def summary__upsert(self, namespace, body):                            # Refresh one entity's row and move the namespace generation
+        if not body.get(SUMMARY__ID_FIELD[namespace], ''):
+            return None
+        result = self.summary__save(namespace, self.summary__row(namespace, body))
+        self.summary__generation_bump(namespace)
+        return result
+
+    def summary__generation(self, namespace):                              # Changes whenever any row is written (polled by status caches)
+        doc = self.entry__lookup(self.summary__namespace(namespace), SUMMARY__GENERATION)[1]
+        return doc.get('generation', 0) if doc else 0
+
+    def summary__generation_bump(self, namespace):                         # Blind write of a fresh value — concurrent bumps can't cancel out
+        summary_ns = self.summary__namespace(namespace)
+        doc        = dict(summary_key = SUMMARY__GENERATION                            ,
+                          generation  = time.time_ns() // 1000                         ,   # µs: unique per write, never reused
+                          updated     = datetime.now(timezone.utc).isoformat()         )
+        self.entry__forget(summary_ns, SUMMARY__GENERATION)
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = summary_ns          ,
+            strategy        = 'key_based'         ,
+            cache_key       = SUMMARY__GENERATION ,
+            file_id         = SUMMARY__GENERATION ,
+            body            = doc                 ,
+            json_field_path = 'summary_key'       )
+
+    def summary__ids(self, namespace):                                     # Entity ids that have a summary row
+        return [entity_id for entity_id in self.summary__source_ids(self.summary__namespace(namespace))
+                if not entity_id.startswith(SUMMARY__SKIP_PREFIXES)]
+
+    def summary__rows(self, namespace):                                    # All summary rows (bulk fetch)
+        rows = {}
+        for entity_id, _, row in self.entries__lookup_many(self.summary__namespace(namespace), self.summary__ids(namespace)):
+            if row:
+                rows[entity_id] = row
+        return rows
+
+    def summary__page(self, namespace, cursor=None, limit=None,            # One cursor page of summary rows, ordered by entity id
+                      accept=None, entity_ids=None):                       # entity_ids: page only these (skips both listings)
+        if entity_ids is None:                                             # Every entity: stored ones plus any row, whether or not its row exists yet
+            entity_ids = sorted(set(self.summary__ids(namespace)) |
+                                {entity_id for entity_id in self.summary__source_ids(namespace)
+                                 if not entity_id.startswith(SUMMARY__SKIP_PREFIXES)})
+        return self.entries__page(self.summary__namespace(namespace), entity_ids, cursor=cursor, limit=limit, accept=accept,
+                                  lookup=lambda batch: self.summary__rows_or_source(namespace, batch))
+
+    def summary__rows_or_source(self, namespace, entity_ids):              # [(entity_id, cache_id, row)] — entities without a row read from the source (read-only)
+        found   = self.entries__lookup_many(self.summary__namespace(namespace), entity_ids)
+        missing = [entity_id for entity_id, _, row in found if not row]
+        if not missing:
+            return found
+        source = {entity_id: (cache_id, body) for entity_id, cache_id, body in self.entries__lookup_many(namespace, missing)}
+        result = []
+        for entity_id, cache_id, row in found:
+            if not row and source.get(entity_id, (None, None))[1]:
+                cache_id, body = source[entity_id]
+                row            = self.summary__row(namespace, body)
+            result.append((entity_id, cache_id, row))
+        return result
+
+    def summary__source_rows(self, namespace):                             # Rows derived from the underlying entries (bulk fetch)
+        entity_ids = [entity_id for entity_id in self.summary__source_ids(namespace)
+                      if not entity_id.startswith(SUMMARY__SKIP_PREFIXES)]
+        rows       = {}
+        for entity_id, _, body in self.entries__lookup_many(namespace, entity_ids):
+            if body:
+                rows[entity_id] = self.summary__row(namespace, body)
+        return rows
+
+    def summary__source_ids(self, namespace):                              # Entity ids stored in a namespace
+        return self.cache_client.admin_storage().folders(
+            path             = f'{namespace}/data/key-based/' ,
+            return_full_path = False                          ,
+            recursive        = False                          ) or []
+
+    def summary__check(self, namespace, repair=False):                     # Compare rows against source entries (repair rewrites only the drift)
+        expected = self.summary__source_rows(namespace)
+        actual   = self.summary__rows(namespace)
+        missing  = sorted(set(expected) - set(actual))
+        extra    = sorted(set(actual)   - set(expected))
+        stale    = sorted(entity_id for entity_id in set(expected) & set(actual)
+                          if expected[entity_id] != actual[entity_id])
+        consistent = not (missing or extra or stale)
+        if repair and not consistent:
+            for entity_id in missing + stale:
+                self.summary__save(namespace, expected[entity_id])
+            for entity_id in extra:
+                self.entry__delete(self.summary__namespace(namespace), entity_id)
+            self.summary__generation_bump(namespace)                        # Repaired rows may differ — invalidate downstream caches
+        return dict(namespace  = namespace                          ,
+                    consistent = consistent                         ,
+                    missing    = missing                            ,
+                    extra      = extra                              ,
+                    stale      = stale                              ,
+                    repaired   = bool(repair and not consistent)    )
+
     # ═══════════════════════════════════════════════════════════════════════
     # Analytics Operations
     # ═══════════════════════════════════════════════════════════════════════
@@ -55,73 +325,149 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             cache_id  = cache_id     ,
             namespace = NS_ANALYTICS )
 
+    def analytics__segment_key(self, segment):                             # seg-<minute>-<instance>-<seq>: sortable by write time
+        minute = datetime.fromtimestamp(segment.get('first', 0), timezone.utc).strftime('%Y%m%d%H%M')
+        return f"{ANALYTICS__SEGMENT_PREFIX}{minute}-{segment.get('instance_id', '')}-{segment.get('seq', 0):06d}"
+
+    def analytics__segment_save(self, segment):                            # Store one flushed event segment (immutable once written)
+        seg_key            = self.analytics__segment_key(segment)
+        segment['seg_key'] = seg_key                                        # Add key field so hash matches
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = NS_ANALYTICS    ,
+            strategy        = 'key_based'     ,
+            cache_key       = seg_key         ,
+            file_id         = seg_key         ,
+            body            = segment         ,
+            json_field_path = 'seg_key'       )
+
+    def analytics__segment(self, seg_key):                                 # Single segment by key
+        return self.entry__lookup(NS_ANALYTICS, seg_key)[1]
+
+    def analytics__rollup_namespace(self, hour):                           # Namespace holding one UTC hour's rollups ('YYYYmmddHH')
+        return scoped_namespace(NS_ROLLUPS, hour)
+
+    def analytics__rollup_keys(self, hour):                                # Every partial / merged rollup key of an hour — one listing
+        return self.cache_client.admin_storage().folders(
+            path             = f'{self.analytics__rollup_namespace(hour)}/data/key-based/' ,
+            return_full_path = False                                                      ,
+            recursive        = False                                                      ) or []
+
+    def analytics__rollups(self, hour, keys):                              # {key: rollup} for keys of an hour (bulk fetch; missing keys skipped)
+        return {key: rollup for key, _, rollup in self.entries__lookup_many(self.analytics__rollup_namespace(hour), keys) if rollup}
+
+    def analytics__rollup_save(self, hour, key, rollup):                   # Blind write of a partial (or merged) rollup under its own key
+        namespace          = self.analytics__rollup_namespace(hour)
+        rollup['roll_key'] = key                                            # Add key field so hash matches
+        self.entry__forget(namespace, key)
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = namespace       ,
+            strategy        = 'key_based'     ,
+            cache_key       = key             ,
+            file_id         = key             ,
+            body            = rollup          ,
+            json_field_path = 'roll_key'      )
+
     # ═══════════════════════════════════════════════════════════════════════
     # Token Operations
     # ═══════════════════════════════════════════════════════════════════════
 
     def token__create(self, token_data):                                   # Create a new token via KEY_BASED strategy
         token_name = token_data.get('token_name', '')
-        return self.cache_client.store().store__json__cache_key(
+        self.entry__forget(NS_TOKENS, token_name)
+        result = self.cache_client.store().store__json__cache_key(
             namespace       = NS_TOKENS       ,
             strategy        = 'key_based'     ,
             cache_key       = token_name      ,
             file_id         = token_name      ,
             body            = token_data      ,
             json_field_path = 'token_name'    )
+        if result and hasattr(result, 'cache_id'):
+            self.summary__upsert(NS_TOKENS, token_data)
+        return result
 
     def token__lookup(self, token_name):                                   # Find token by name (hash lookup)
-        cache_hash = self.hash_generator.from_string(token_name)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_TOKENS       )
-        if response and response.get('cache_id'):
-            cache_id = response.get('cache_id')
-            return self.cache_client.retrieve().retrieve__cache_id__json(
-                cache_id  = cache_id   ,
-                namespace = NS_TOKENS  )
-        return None
+        return self.entry__lookup(NS_TOKENS, token_name)[1]
 
     def token__lookup_cache_id(self, token_name):                          # Get cache_id for a token by name
-        cache_hash = self.hash_generator.from_string(token_name)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_TOKENS       )
-        if response:
-            return response.get('cache_id')
-        return None
+        return self.entry__lookup(NS_TOKENS, token_name)[0]
+
+    def token__lookup_entry(self, token_name):                             # (cache_id, token_data) in one round trip
+        return self.entry__lookup(NS_TOKENS, token_name)
 
     def token__update(self, cache_id, token_data):                         # Update token data
-        return self.cache_client.update().update__json(
-            cache_id  = cache_id    ,
-            namespace = NS_TOKENS   ,
-            body      = token_data  )
+        result = self.entry__update(NS_TOKENS, cache_id, token_data)
+        self.summary__upsert(NS_TOKENS, token_data)
+        return result
 
-    def token__use(self, token_name, usage_event_data):                    # Record a token usage event as child data
-        cache_id = self.token__lookup_cache_id(token_name)
+    def token__use(self, token_name, usage_event_data, cache_id=None,      # Record a token usage event as child data (pass cache_id to skip the lookup)
+                   lease_id=''):                                           # lease_id → stored under usage_events/<lease_id> (already paid for)
+        if cache_id is None:
+            cache_id = self.token__lookup_cache_id(token_name)
         if cache_id is None:
             return None
         event_id = usage_event_data.get('event_id', '')
         return self.cache_client.data_store().data__store_json__with__id_and_key(
-            cache_id     = cache_id           ,
-            namespace    = NS_TOKENS          ,
-            data_key     = 'usage_events'     ,
-            data_file_id = event_id           ,
-            body         = usage_event_data   )
+            cache_id     = cache_id                                                            ,
+            namespace    = NS_TOKENS                                                           ,
+            data_key     = f'{TOKEN__DATA_KEY__EVENTS}/{lease_id}' if lease_id else TOKEN__DATA_KEY__EVENTS,
+            data_file_id = event_id                                                            ,
+            body         = usage_event_data                                                    )
 
-    def token__revoke(self, token_name):                                   # Revoke a token (update status to 'revoked')
-        cache_id = self.token__lookup_cache_id(token_name)
-        if cache_id is None:
-            return False
-        token_data = self.cache_client.retrieve().retrieve__cache_id__json(
+    def token__use_delete(self, cache_id, event_id):                       # Remove a rejected usage event
+        return self.token__data_delete(cache_id, TOKEN__DATA_KEY__EVENTS, event_id)
+
+    def token__lease_save(self, cache_id, lease):                          # Record a quota lease (grant + expiry are in the file name, so listings need no reads)
+        return self.cache_client.data_store().data__store_json__with__id_and_key(
+            cache_id     = cache_id                                                            ,
+            namespace    = NS_TOKENS                                                           ,
+            data_key     = TOKEN__DATA_KEY__LEASES                                             ,
+            data_file_id = f"{lease['lease_id']}-{lease['granted']}-{lease['expires']}"        ,
+            body         = lease                                                               )
+
+    def token__lease_delete(self, cache_id, lease):                        # Withdraw a lease that lost a race for the last uses
+        return self.token__data_delete(cache_id, TOKEN__DATA_KEY__LEASES,
+                                       f"{lease['lease_id']}-{lease['granted']}-{lease['expires']}")
+
+    def token__release_save(self, cache_id, release):                      # Record a lease close (written once per lease)
+        return self.cache_client.data_store().data__store_json__with__id_and_key(
+            cache_id     = cache_id                                                            ,
+            namespace    = NS_TOKENS                                                           ,
+            data_key     = TOKEN__DATA_KEY__RELEASES                                           ,
+            data_file_id = f"{release['lease_id']}-{release['unused']}"                        ,
+            body         = release                                                             )
+
+    def token__data_delete(self, cache_id, data_key, data_file_id):        # Delete one token child doc
+        return self.cache_client.data().delete().delete__data__file__with__id_and_key(
+            cache_id     = cache_id                    ,
+            namespace    = NS_TOKENS                   ,
+            data_type    = Enum__Cache__Data_Type.JSON ,
+            data_key     = data_key                    ,
+            data_file_id = data_file_id                )
+
+    def token__ledger(self, cache_id):                                     # [(data_key, data_file_id)] of a token's child docs — one listing
+        result = self.cache_client.data().list().data__list(
             cache_id  = cache_id   ,
             namespace = NS_TOKENS  )
-        if token_data is None:
+        files  = result.json().get('files', []) if result is not None else []
+        return [(file.get('data_key', ''), file.get('data_file_id', '')) for file in files]
+
+    def token__ledger_many(self, token_names):                             # {token_name: ledger} — lookup + listing per token, fanned out
+        def ledger(token_name):
+            cache_id = self.token__lookup_cache_id(token_name)
+            return self.token__ledger(cache_id) if cache_id else []
+        token_names = [token_name for token_name in token_names if token_name]
+        if len(token_names) <= 1 or self.bulk_max_workers <= 1:
+            return {token_name: ledger(token_name) for token_name in token_names}
+        with ThreadPoolExecutor(max_workers=min(self.bulk_max_workers, len(token_names))) as executor:
+            futures = [executor.submit(copy_context().run, ledger, token_name) for token_name in token_names]
+            return {token_name: future.result() for token_name, future in zip(token_names, futures)}
+
+    def token__revoke(self, token_name):                                   # Revoke a token (update status to 'revoked')
+        cache_id, token_data = self.token__lookup_entry(token_name)
+        if cache_id is None or token_data is None:
             return False
-        token_data['status']     = 'revoked'
-        result = self.cache_client.update().update__json(
-            cache_id  = cache_id    ,
-            namespace = NS_TOKENS   ,
-            body      = token_data  )
+        token_data['status'] = 'revoked'
+        result = self.token__update(cache_id, token_data)
         if result and hasattr(result, 'updated_content'):
             return result.updated_content
         return False
@@ -133,14 +479,10 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             recursive        = False                           ) or []
 
     def token__list_all_with_details(self):                               # List all tokens with full data (bulk)
-        token_names = self.token__list_all()
-        tokens      = []
-        for token_name in token_names:
-            if token_name:
-                detail = self.token__lookup(token_name)
-                if detail:
-                    tokens.append(detail)
-        return tokens
+        return self.token__list_page()['items']
+
+    def token__list_page(self, cursor=None, limit=None):                  # One cursor page of token summary rows
+        return self.summary__page(NS_TOKENS, cursor=cursor, limit=limit)
 
     def token__list_data(self, token_name):                              # List data files for a specific token
         cache_id = self.token__lookup_cache_id(token_name)
@@ -156,6 +498,7 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
 
     def key__create(self, key_data):                                        # Create a new key entry via KEY_BASED strategy
         code = key_data.get('code', '')
+        self.entry__forget(NS_KEYS, code)
         result = self.cache_client.store().store__json__cache_key(
             namespace       = NS_KEYS         ,
             strategy        = 'key_based'     ,
@@ -164,35 +507,23 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             body            = key_data        ,
             json_field_path = 'code'          )
         if result and hasattr(result, 'cache_id'):
+            self.summary__upsert(NS_KEYS, key_data)
             return result
         return None
 
     def key__lookup(self, code):                                            # Find key by lookup code (hash lookup)
-        cache_hash = self.hash_generator.from_string(code)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_KEYS         )
-        if response and response.get('cache_id'):
-            cache_id = response.get('cache_id')
-            return self.cache_client.retrieve().retrieve__cache_id__json(
-                cache_id  = cache_id ,
-                namespace = NS_KEYS  )
-        return None
+        return self.entry__lookup(NS_KEYS, code)[1]
 
     def key__lookup_cache_id(self, code):                                   # Get cache_id for a key by code
-        cache_hash = self.hash_generator.from_string(code)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_KEYS         )
-        if response:
-            return response.get('cache_id')
-        return None
+        return self.entry__lookup(NS_KEYS, code)[0]
+
+    def key__lookup_entry(self, code):                                      # (cache_id, key_data) in one round trip
+        return self.entry__lookup(NS_KEYS, code)
 
     def key__update(self, cache_id, key_data):                              # Update key data
-        return self.cache_client.update().update__json(
-            cache_id  = cache_id  ,
-            namespace = NS_KEYS   ,
-            body      = key_data  )
+        result = self.entry__update(NS_KEYS, cache_id, key_data)
+        self.summary__upsert(NS_KEYS, key_data)
+        return result
 
     def key__list_all(self):                                                # List all key codes from storage
         return self.cache_client.admin_storage().folders(
@@ -200,34 +531,44 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             return_full_path = False                         ,
             recursive        = False                         ) or []
 
-    def key__index_fingerprint(self, fingerprint, code):                    # Create fingerprint→code index
-        index_data = dict(fingerprint=fingerprint, code=code)
+    def key__index_fingerprint(self, fingerprint, code, active=True):       # Create or refresh fingerprint→code index
         fp_hex     = fingerprint.replace('sha256:', '')
-        return self.cache_client.store().store__json__cache_key(
-            namespace       = NS_KEYS                         ,
-            strategy        = 'key_based'                     ,
-            cache_key       = f'idx-fp-{fp_hex}'              ,
-            file_id         = f'idx-fp-{fp_hex}'              ,
-            body            = index_data                      ,
-            json_field_path = 'fingerprint'                   )
-
-    def key__lookup_by_fingerprint(self, fingerprint):                      # Check if fingerprint already exists
-        fp_hex     = fingerprint.replace('sha256:', '')
-        cache_hash = self.hash_generator.from_string(f'idx-fp-{fp_hex}')
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_KEYS         )
-        if response and response.get('cache_id'):
-            cache_id = response.get('cache_id')
-            return self.cache_client.retrieve().retrieve__cache_id__json(
-                cache_id  = cache_id ,
-                namespace = NS_KEYS  )
+        fp_key     = f'idx-fp-{fp_hex}'
+        index_data = dict(fp_key      = fp_key       ,                       # Must match cache_key for hash alignment
+                          fingerprint = fingerprint   ,
+                          code        = code          ,
+                          active      = active        )
+        cache_id, existing = self.entry__lookup(NS_KEYS, fp_key)
+        if cache_id:
+            if existing == index_data:
+                return existing
+            self.entry__update(NS_KEYS, cache_id, index_data)
+            return index_data
+        self.entry__forget(NS_KEYS, fp_key)
+        result = self.cache_client.store().store__json__cache_key(
+            namespace       = NS_KEYS         ,
+            strategy        = 'key_based'     ,
+            cache_key       = fp_key          ,
+            file_id         = fp_key          ,
+            body            = index_data      ,
+            json_field_path = 'fp_key'        )
+        if result and hasattr(result, 'cache_id'):
+            return index_data
         return None
 
-    def key__append_log(self, log_entry):                                   # Append entry to transparency log
-        seq     = log_entry.get('seq', 0)
-        log_key = f'log-{seq:08d}'
+    def key__lookup_by_fingerprint(self, fingerprint):                      # Fingerprint index entry (code + active), or None
+        fp_hex = fingerprint.replace('sha256:', '')
+        return self.entry__lookup(NS_KEYS, f'idx-fp-{fp_hex}')[1]
+
+    def key__log_key(self, log_entry):                                      # log-<seq>-<entry_id>: unique per append (legacy entries: log-<seq>)
+        seq      = log_entry.get('seq', 0)
+        entry_id = log_entry.get('entry_id', '')
+        return f'log-{seq:08d}-{entry_id}' if entry_id else f'log-{seq:08d}'
+
+    def key__append_log(self, log_entry):                                   # Append entry to transparency log (own key — never overwrites another entry)
+        log_key = self.key__log_key(log_entry)
         log_entry['log_key'] = log_key                                      # Add key field so hash matches
+        self.entry__forget(NS_KEYS, log_key)
         return self.cache_client.store().store__json__cache_key(
             namespace       = NS_KEYS                                 ,
             strategy        = 'key_based'                             ,
@@ -236,22 +577,51 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             body            = log_entry                               ,
             json_field_path = 'log_key'                               )
 
+    def key__log_keys(self, from_seq=0, to_seq=None):                       # Log entry keys with seq in [from_seq, to_seq), in (seq, entry_id) order
+        log_keys = []
+        for log_key in self.key__list_all():
+            if not log_key.startswith('log-'):
+                continue
+            seq = int(log_key[4:12])
+            if seq >= from_seq and (to_seq is None or seq < to_seq):
+                log_keys.append(log_key)
+        return sorted(log_keys)
+
+    def key__log_entries(self, from_seq, to_seq):                           # Log entries with seq in [from_seq, to_seq) (one listing + page fetch)
+        log_keys = self.key__log_keys(from_seq, to_seq)
+        return [entry for _, _, entry in self.entries__lookup_many(NS_KEYS, log_keys) if entry]
+
+    def key__log_head(self):                                                # Latest appended entry (a hint: concurrent appends may leave it one behind)
+        return self.entry__lookup(NS_KEYS, KEY_LOG__HEAD)[1]
+
+    def key__log_head_save(self, entry):                                    # Blind-write the head hint (a copy of the latest entry)
+        head = dict(entry, head_key=KEY_LOG__HEAD)                          # Add key field so hash matches
+        self.entry__forget(NS_KEYS, KEY_LOG__HEAD)
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = NS_KEYS         ,
+            strategy        = 'key_based'     ,
+            cache_key       = KEY_LOG__HEAD   ,
+            file_id         = KEY_LOG__HEAD   ,
+            body            = head            ,
+            json_field_path = 'head_key'      )
+
+    def key__log_checkpoint(self, seq):                                     # Checkpoint covering entries up to and including seq
+        return self.entry__lookup(NS_KEYS, f'{KEY_LOG__CHECKPOINT_PREFIX}{seq:08d}')[1]
+
+    def key__log_checkpoint_save(self, checkpoint):                         # Store a checkpoint (immutable once written)
+        ckpt_key = f"{KEY_LOG__CHECKPOINT_PREFIX}{checkpoint.get('seq', 0):08d}"
+        checkpoint['ckpt_key'] = ckpt_key                                   # Add key field so hash matches
+        self.entry__forget(NS_KEYS, ckpt_key)
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = NS_KEYS         ,
+            strategy        = 'key_based'     ,
+            cache_key       = ckpt_key        ,
+            file_id         = ckpt_key        ,
+            body            = checkpoint      ,
+            json_field_path = 'ckpt_key'      )
+
     def key__get_log_entries(self):                                          # Get all transparency log entries
-        all_codes = self.key__list_all()
-        log_codes = sorted([c for c in all_codes if c.startswith('log-')])
-        entries   = []
-        for log_key in log_codes:
-            cache_hash = self.hash_generator.from_string(log_key)
-            response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-                cache_hash = str(cache_hash) ,
-                namespace  = NS_KEYS         )
-            if response and response.get('cache_id'):
-                entry = self.cache_client.retrieve().retrieve__cache_id__json(
-                    cache_id  = response['cache_id'] ,
-                    namespace = NS_KEYS              )
-                if entry:
-                    entries.append(entry)
-        return entries
+        return self.key__log_entries(0, None)
 
     # ═══════════════════════════════════════════════════════════════════════
     # User Operations
@@ -259,6 +629,7 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
 
     def user__create(self, user_data):                                        # Create a new user via KEY_BASED strategy
         user_id = user_data.get('user_id', '')
+        self.entry__forget(NS_USERS, user_id)
         result = self.cache_client.store().store__json__cache_key(
             namespace       = NS_USERS        ,
             strategy        = 'key_based'     ,
@@ -267,35 +638,23 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             body            = user_data       ,
             json_field_path = 'user_id'       )
         if result and hasattr(result, 'cache_id'):
+            self.summary__upsert(NS_USERS, user_data)
             return result
         return None
 
     def user__lookup(self, user_id):                                          # Find user by user_id (hash lookup)
-        cache_hash = self.hash_generator.from_string(user_id)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_USERS        )
-        if response and response.get('cache_id'):
-            cache_id = response.get('cache_id')
-            return self.cache_client.retrieve().retrieve__cache_id__json(
-                cache_id  = cache_id  ,
-                namespace = NS_USERS  )
-        return None
+        return self.entry__lookup(NS_USERS, user_id)[1]
 
     def user__lookup_cache_id(self, user_id):                                 # Get cache_id for a user by user_id
-        cache_hash = self.hash_generator.from_string(user_id)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_USERS        )
-        if response:
-            return response.get('cache_id')
-        return None
+        return self.entry__lookup(NS_USERS, user_id)[0]
+
+    def user__lookup_entry(self, user_id):                                    # (cache_id, user_data) in one round trip
+        return self.entry__lookup(NS_USERS, user_id)
 
     def user__update(self, cache_id, user_data):                              # Update user data
-        return self.cache_client.update().update__json(
-            cache_id  = cache_id   ,
-            namespace = NS_USERS   ,
-            body      = user_data  )
+        result = self.entry__update(NS_USERS, cache_id, user_data)
+        self.summary__upsert(NS_USERS, user_data)
+        return result
 
     def user__list_all(self):                                                 # List all user IDs from storage
         return self.cache_client.admin_storage().folders(
@@ -309,6 +668,7 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
         index_data = dict(fp_key      = fp_key       ,                       # Must match cache_key for hash alignment
                           fingerprint = fingerprint   ,
                           user_id     = user_id       )
+        self.entry__forget(NS_USERS, fp_key)
         return self.cache_client.store().store__json__cache_key(
             namespace       = NS_USERS        ,
             strategy        = 'key_based'     ,
@@ -318,18 +678,8 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             json_field_path = 'fp_key'        )
 
     def user__lookup_by_fingerprint(self, fingerprint):                       # Look up user by fingerprint index
-        fp_hex     = fingerprint.replace('sha256:', '')
-        fp_key     = f'idx-fp-{fp_hex}'
-        cache_hash = self.hash_generator.from_string(fp_key)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_USERS        )
-        if response and response.get('cache_id'):
-            cache_id = response.get('cache_id')
-            return self.cache_client.retrieve().retrieve__cache_id__json(
-                cache_id  = cache_id ,
-                namespace = NS_USERS )
-        return None
+        fp_hex = fingerprint.replace('sha256:', '')
+        return self.entry__lookup(NS_USERS, f'idx-fp-{fp_hex}')[1]
 
     # ═══════════════════════════════════════════════════════════════════════
     # Room Operations (Data Room entity)
@@ -337,6 +687,7 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
 
     def room__create(self, room_data):                                        # Create a new room via KEY_BASED strategy
         room_id = room_data.get('room_id', '')
+        self.entry__forget(NS_ROOMS, room_id)
         result = self.cache_client.store().store__json__cache_key(
             namespace       = NS_ROOMS         ,
             strategy        = 'key_based'      ,
@@ -345,35 +696,65 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             body            = room_data        ,
             json_field_path = 'room_id'        )
         if result and hasattr(result, 'cache_id'):
+            self.summary__upsert(NS_ROOMS, room_data)
             return result
         return None
 
     def room__lookup(self, room_id):                                          # Find room by room_id (hash lookup)
-        cache_hash = self.hash_generator.from_string(room_id)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_ROOMS        )
-        if response and response.get('cache_id'):
-            cache_id = response.get('cache_id')
-            return self.cache_client.retrieve().retrieve__cache_id__json(
-                cache_id  = cache_id  ,
-                namespace = NS_ROOMS  )
-        return None
+        return self.entry__lookup(NS_ROOMS, room_id)[1]
 
     def room__lookup_cache_id(self, room_id):                                 # Get cache_id for a room by room_id
-        cache_hash = self.hash_generator.from_string(room_id)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_ROOMS        )
-        if response:
-            return response.get('cache_id')
-        return None
+        return self.entry__lookup(NS_ROOMS, room_id)[0]
+
+    def room__lookup_entry(self, room_id):                                    # (cache_id, room_data) in one round trip
+        return self.entry__lookup(NS_ROOMS, room_id)
 
     def room__update(self, cache_id, room_data):                              # Update room data
-        return self.cache_client.update().update__json(
-            cache_id  = cache_id   ,
-            namespace = NS_ROOMS   ,
-            body      = room_data  )
+        result = self.entry__update(NS_ROOMS, cache_id, room_data)
+        self.summary__upsert(NS_ROOMS, room_data)
+        return result
+
+    def room__member_namespace(self, user_id):                                # Namespace holding one user's membership entries
+        return scoped_namespace(NS_MEMBERS, str(user_id))
+
+    def room__member_key(self, room_id, permission):                          # <room_id>-<permission>: the listing alone gives the user's rooms
+        return f'{room_id}{ROOM__MEMBER_SEPARATOR}{permission}'
+
+    def room__member_keys(self, user_id):                                     # Every membership entry key of a user — one listing
+        return self.cache_client.admin_storage().folders(
+            path             = f'{self.room__member_namespace(user_id)}/data/key-based/' ,
+            return_full_path = False                                                    ,
+            recursive        = False                                                    ) or []
+
+    def room__member_save(self, user_id, room_id, permission):                # Blind write of one (room, user) entry — no other membership is touched
+        namespace  = self.room__member_namespace(user_id)
+        member_key = self.room__member_key(room_id, permission)
+        self.entry__forget(namespace, member_key)
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = namespace                                                          ,
+            strategy        = 'key_based'                                                        ,
+            cache_key       = member_key                                                         ,
+            file_id         = member_key                                                         ,
+            body            = dict(member_key=member_key, user_id=str(user_id), room_id=str(room_id),
+                                   permission=permission)                                        ,
+            json_field_path = 'member_key'                                                       )
+
+    def room__member_delete(self, user_id, room_id, permission):              # Drop one (room, user, permission) entry (no-op when absent)
+        return self.entry__delete(self.room__member_namespace(user_id), self.room__member_key(room_id, permission))
+
+    def room__members_built(self):                                            # Marker written by the membership rebuild (None until it has run)
+        return self.entry__lookup(NS_ROOMS, ROOM__MEMBERS_BUILT)[1]
+
+    def room__members_built_save(self, stats):                                # Record that every room's members have entries (never removed)
+        self.entry__forget(NS_ROOMS, ROOM__MEMBERS_BUILT)
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = NS_ROOMS                                                    ,
+            strategy        = 'key_based'                                                 ,
+            cache_key       = ROOM__MEMBERS_BUILT                                         ,
+            file_id         = ROOM__MEMBERS_BUILT                                         ,
+            body            = dict(stats, marker_key = ROOM__MEMBERS_BUILT                ,
+                                          built      = datetime.now(timezone.utc).isoformat()),
+            json_field_path = 'marker_key'                                                )
 
     def room__list_all(self):                                                 # List all room IDs from storage
         return self.cache_client.admin_storage().folders(
@@ -387,6 +768,7 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
 
     def invite__create(self, invite_data):                                    # Create a new invite via KEY_BASED strategy
         invite_code = invite_data.get('invite_code', '')
+        self.entry__forget(NS_INVITES, invite_code)
         result = self.cache_client.store().store__json__cache_key(
             namespace       = NS_INVITES       ,
             strategy        = 'key_based'      ,
@@ -399,31 +781,50 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
         return None
 
     def invite__lookup(self, invite_code):                                    # Find invite by code (hash lookup)
-        cache_hash = self.hash_generator.from_string(invite_code)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_INVITES      )
-        if response and response.get('cache_id'):
-            cache_id = response.get('cache_id')
-            return self.cache_client.retrieve().retrieve__cache_id__json(
-                cache_id  = cache_id    ,
-                namespace = NS_INVITES  )
-        return None
+        return self.entry__lookup(NS_INVITES, invite_code)[1]
 
     def invite__lookup_cache_id(self, invite_code):                           # Get cache_id for an invite by code
-        cache_hash = self.hash_generator.from_string(invite_code)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_INVITES      )
-        if response:
-            return response.get('cache_id')
-        return None
+        return self.entry__lookup(NS_INVITES, invite_code)[0]
+
+    def invite__lookup_entry(self, invite_code):                              # (cache_id, invite_data) in one round trip
+        return self.entry__lookup(NS_INVITES, invite_code)
 
     def invite__update(self, cache_id, invite_data):                          # Update invite data
-        return self.cache_client.update().update__json(
-            cache_id  = cache_id    ,
-            namespace = NS_INVITES  ,
-            body      = invite_data )
+        return self.entry__update(NS_INVITES, cache_id, invite_data)
+
+    def invite__use_save(self, cache_id, use):                                # Record one acceptance under its own file id (never overwrites another)
+        return self.cache_client.data_store().data__store_json__with__id_and_key(
+            cache_id     = cache_id               ,
+            namespace    = NS_INVITES             ,
+            data_key     = INVITE__DATA_KEY__USES ,
+            data_file_id = use.get('use_id', '')  ,
+            body         = use                    )
+
+    def invite__use_delete(self, cache_id, use_id):                           # Withdraw an acceptance (lost the race, or the join was undone)
+        return self.cache_client.data().delete().delete__data__file__with__id_and_key(
+            cache_id     = cache_id                    ,
+            namespace    = NS_INVITES                  ,
+            data_type    = Enum__Cache__Data_Type.JSON ,
+            data_key     = INVITE__DATA_KEY__USES      ,
+            data_file_id = use_id                      )
+
+    def invite__uses(self, cache_id):                                         # Acceptance file ids, oldest first — one listing
+        result = self.cache_client.data().list().data__list(
+            cache_id  = cache_id   ,
+            namespace = NS_INVITES )
+        files  = result.json().get('files', []) if result is not None else []
+        return sorted(file.get('data_file_id', '') for file in files if file.get('data_key') == INVITE__DATA_KEY__USES)
+
+    def invite__uses_many(self, invite_codes):                                # {invite_code: use ids} — lookup + listing per invite, fanned out
+        def uses(invite_code):
+            cache_id = self.invite__lookup_cache_id(invite_code)
+            return self.invite__uses(cache_id) if cache_id else []
+        invite_codes = [invite_code for invite_code in invite_codes if invite_code]
+        if len(invite_codes) <= 1 or self.bulk_max_workers <= 1:
+            return {invite_code: uses(invite_code) for invite_code in invite_codes}
+        with ThreadPoolExecutor(max_workers=min(self.bulk_max_workers, len(invite_codes))) as executor:
+            futures = [executor.submit(copy_context().run, uses, invite_code) for invite_code in invite_codes]
+            return {invite_code: future.result() for invite_code, future in zip(invite_codes, futures)}
 
     def invite__list_all(self):                                               # List all invite codes from storage
         return self.cache_client.admin_storage().folders(
@@ -437,6 +838,7 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
 
     def audit__append(self, audit_data):                                      # Append audit event via KEY_BASED strategy
         event_id = audit_data.get('event_id', '')
+        self.entry__forget(NS_AUDIT, event_id)
         result = self.cache_client.store().store__json__cache_key(
             namespace       = NS_AUDIT        ,
             strategy        = 'key_based'     ,
@@ -448,17 +850,15 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
             return result
         return None
 
+    def audit__append_many(self, events):                                     # Store many audit events with bounded parallelism
+        if len(events) <= 1 or self.bulk_max_workers <= 1:
+            return [self.audit__append(event) for event in events]
+        with ThreadPoolExecutor(max_workers=min(self.bulk_max_workers, len(events))) as executor:
+            futures = [executor.submit(copy_context().run, self.audit__append, event) for event in events]
+            return [future.result() for future in futures]
+
     def audit__lookup(self, event_id):                                        # Retrieve audit event by event_id
-        cache_hash = self.hash_generator.from_string(event_id)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_AUDIT        )
-        if response and response.get('cache_id'):
-            cache_id = response.get('cache_id')
-            return self.cache_client.retrieve().retrieve__cache_id__json(
-                cache_id  = cache_id  ,
-                namespace = NS_AUDIT  )
-        return None
+        return self.entry__lookup(NS_AUDIT, event_id)[1]
 
     def audit__list_all(self):                                                # List all audit event IDs from storage
         return self.cache_client.admin_storage().folders(
@@ -472,6 +872,7 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
 
     def session__create(self, session_data):                                  # Create a new session via KEY_BASED strategy
         session_token = session_data.get('session_token', '')
+        self.entry__forget(NS_SESSIONS, session_token)
         result = self.cache_client.store().store__json__cache_key(
             namespace       = NS_SESSIONS        ,
             strategy        = 'key_based'        ,
@@ -484,28 +885,80 @@ class Send__Cache__Client(Type_Safe):                                      # Cac
         return None
 
     def session__lookup(self, session_token):                                 # Find session by token (hash lookup)
-        cache_hash = self.hash_generator.from_string(session_token)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_SESSIONS     )
-        if response and response.get('cache_id'):
-            cache_id = response.get('cache_id')
-            return self.cache_client.retrieve().retrieve__cache_id__json(
-                cache_id  = cache_id    ,
-                namespace = NS_SESSIONS )
-        return None
+        return self.entry__lookup(NS_SESSIONS, session_token)[1]
 
     def session__lookup_cache_id(self, session_token):                        # Get cache_id for a session by token
-        cache_hash = self.hash_generator.from_string(session_token)
-        response   = self.cache_client.retrieve().retrieve__hash__cache_hash__cache_id(
-            cache_hash = str(cache_hash) ,
-            namespace  = NS_SESSIONS     )
-        if response:
-            return response.get('cache_id')
-        return None
+        return self.entry__lookup(NS_SESSIONS, session_token)[0]
+
+    def session__lookup_entry(self, session_token):                           # (cache_id, session_data) in one round trip
+        return self.entry__lookup(NS_SESSIONS, session_token)
 
     def session__update(self, cache_id, session_data):                        # Update session data
-        return self.cache_client.update().update__json(
-            cache_id  = cache_id     ,
-            namespace = NS_SESSIONS  ,
-            body      = session_data )
+        return self.entry__update(NS_SESSIONS, cache_id, session_data)
+
+    def session__revocation_keys(self):                                       # Every revocation + generation key — one listing, no reads
+        return self.cache_client.admin_storage().folders(
+            path             = f'{NS_REVOKED}/data/key-based/' ,
+            return_full_path = False                                ,
+            recursive        = False                                ) or []
+
+    def session__revocation_save(self, rev_key):                              # Blind write of one revocation / generation entry (own key)
+        self.entry__forget(NS_REVOKED, rev_key)
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = NS_REVOKED        ,
+            strategy        = 'key_based'           ,
+            cache_key       = rev_key               ,
+            file_id         = rev_key               ,
+            body            = dict(rev_key=rev_key) ,                         # Add key field so hash matches
+            json_field_path = 'rev_key'             )
+
+    def session__revocation_delete(self, rev_key):                            # Drop an entry (expired revocations)
+        return self.entry__delete(NS_REVOKED, rev_key)
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Counter Operations (segmented logs: head hint + one slot per append,
+    # each log in its own namespace so reading it lists only its own slots)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def counter__namespace(self, counter):                                    # Namespace holding one counter's head, slots and checkpoints
+        return scoped_namespace(NS_COUNTERS, counter)
+
+    def counter__entry_save(self, counter, key, body):                        # Blind key_based write into a counter's namespace
+        namespace       = self.counter__namespace(counter)
+        body['log_key'] = key                                                 # Add key field so hash matches
+        self.entry__forget(namespace, key)
+        return self.cache_client.store().store__json__cache_key(
+            namespace       = namespace       ,
+            strategy        = 'key_based'     ,
+            cache_key       = key             ,
+            file_id         = key             ,
+            body            = body            ,
+            json_field_path = 'log_key'       )
+
+    def counter__head(self, counter):                                         # Head hint (seq + chain_hash of the latest slot) — may lag under concurrency
+        return self.entry__lookup(self.counter__namespace(counter), COUNTER__HEAD_KEY)[1]
+
+    def counter__head_save(self, counter, head):                              # Blind-write the head hint
+        return self.counter__entry_save(counter, COUNTER__HEAD_KEY, head)
+
+    def counter__slot_key(self, slot):                                        # slot-<seq>-<claim>: unique per append, so no slot ever overwrites another
+        return f"{COUNTER__SLOT_PREFIX}{slot.get('seq', 0):08d}-{slot.get('claim', '')}"
+
+    def counter__slot_keys(self, counter):                                    # Every slot key of a counter in (seq, claim) order — one listing
+        keys = self.cache_client.admin_storage().folders(
+            path             = f'{self.counter__namespace(counter)}/data/key-based/' ,
+            return_full_path = False                                                ,
+            recursive        = False                                                ) or []
+        return sorted(key for key in keys if key.startswith(COUNTER__SLOT_PREFIX))
+
+    def counter__slots(self, counter, slot_keys):                             # Slots for the given keys, in key order (bulk fetch)
+        return [slot for _, _, slot in self.entries__lookup_many(self.counter__namespace(counter), slot_keys) if slot]
+
+    def counter__slot_save(self, counter, slot):                              # Write a slot under its own key
+        return self.counter__entry_save(counter, self.counter__slot_key(slot), slot)
+
+    def counter__checkpoint(self, counter, seq):                              # Checkpoint recorded for a slot seq (None if absent)
+        return self.entry__lookup(self.counter__namespace(counter), f'{COUNTER__CKPT_PREFIX}{seq:08d}')[1]
+
+    def counter__checkpoint_save(self, counter, checkpoint):                  # Store a checkpoint
+        return self.counter__entry_save(counter, f"{COUNTER__CKPT_PREFIX}{checkpoint.get('seq', 0):08d}", checkpoint)
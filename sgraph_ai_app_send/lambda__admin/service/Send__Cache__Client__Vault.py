@@ -5,12 +5,40 @@
 # folders/files/index stored as child data under data_keys
 # ===============================================================================
 
+import base64
+import re
+from concurrent.futures                                                        import ThreadPoolExecutor
 from mgraph_ai_service_cache_client.client.cache_client.Cache__Service__Client import Cache__Service__Client
+from mgraph_ai_service_cache_client.schemas.cache.enums.Enum__Cache__Data_Type import Enum__Cache__Data_Type
 from osbot_utils.helpers.cache.Cache__Hash__Generator                          import Cache__Hash__Generator
 from osbot_utils.type_safe.Type_Safe                                           import Type_Safe
 
 NS_VAULT = 'vault'                                                            # Namespace for all vault data
 
+CHUNKS__KEY_PREFIX        = 'chunks/'                                         # data_key prefix: one key per chunked file (chunks/<file_guid>)
+CHUNK_RECORDS__KEY_PREFIX = 'chunk-records/'                                  # data_key prefix: one entry per received chunk (<index>-<size>-<sha256>)
+FILE_PARTS__KEY           = 'file-parts'                                      # data_key of assembled-file descriptors (ordered chunk list)
+CHUNK_MANIFEST_KEY        = 'chunk-manifests'                                 # data_key of single-document upload manifests (earlier layout, cleanup only)
+
+ACL__USERS_KEY = 'acl-users'                                                  # data_key of the ACL: one entry per user, named <user>-<permission>
+ACL__DOC_KEY   = 'acl-doc'                                                    # data_key of the (migrated) per-vault ACL document
+ACL__DOC_ID    = 'entries'                                                    # data_file_id of the (migrated) per-vault ACL document
+ACL__ENCODED   = '__'                                                         # Prefix of user ids that are not file-id safe (base32 after it)
+ACL__READ_MAX_WORKERS = 8                                                     # Parallel entry reads when listing an ACL with its details
+
+
+def acl_user_name(user_id):                                                   # Reversible, file-id-safe form of a user id
+    user_id = str(user_id)
+    if re.fullmatch(r'[A-Za-z0-9_-]{1,64}', user_id) and not user_id.startswith(ACL__ENCODED):
+        return user_id
+    return ACL__ENCODED + base64.b32encode(user_id.encode()).decode().rstrip('=').lower()
+
+def acl_name_user(name):                                                      # Inverse of acl_user_name
+    if not name.startswith(ACL__ENCODED):
+        return name
+    encoded = name[len(ACL__ENCODED):].upper()
+    return base64.b32decode(encoded + '=' * (-len(encoded) % 8)).decode()
+
 
 class Send__Cache__Client__Vault(Type_Safe):                                   # Cache client for vault operations
     cache_client   : Cache__Service__Client                                    # Official cache service client
@@ -118,10 +146,117 @@ class Send__Cache__Client__Vault(Type_Safe):                                   #
 
     def file__delete(self, cache_id, file_guid):                               # Delete a single file
         return self.cache_client.data().delete().delete__data__file__with__id_and_key(
-            cache_id     = cache_id      ,
-            namespace    = NS_VAULT      ,
-            data_key     = 'files'       ,
-            data_file_id = file_guid     )
+            cache_id     = cache_id                       ,
+            namespace    = NS_VAULT                       ,
+            data_type    = Enum__Cache__Data_Type.BINARY  ,
+            data_key     = 'files'                        ,
+            data_file_id = file_guid                      )
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Chunk Operations — one data_key per file, so cleanup is a single call
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def chunk__store(self, cache_id, file_guid, chunk_index, encrypted_chunk): # Store one upload chunk
+        return self.cache_client.data_store().data__store_binary__with__id_and_key(
+            cache_id     = cache_id                          ,
+            namespace    = NS_VAULT                          ,
+            data_key     = f'{CHUNKS__KEY_PREFIX}{file_guid}' ,
+            data_file_id = str(chunk_index)                  ,
+            body         = encrypted_chunk                   )
+
+    def chunk__get(self, cache_id, file_guid, chunk_index):                    # Retrieve one upload chunk
+        return self.cache_client.data().retrieve().data__binary__with__id_and_key(
+            cache_id     = cache_id                          ,
+            namespace    = NS_VAULT                          ,
+            data_key     = f'{CHUNKS__KEY_PREFIX}{file_guid}' ,
+            data_file_id = str(chunk_index)                  )
+
+    def chunk__sizes(self, cache_id, file_guid):                               # chunk_index → stored size of a file's chunks — one listing, no reads
+        response = self.cache_client.data().list().data__list__with__key(
+            cache_id  = cache_id                          ,
+            namespace = NS_VAULT                          ,
+            data_key  = f'{CHUNKS__KEY_PREFIX}{file_guid}' )
+        files = response.json().get('files', []) if response is not None else []
+        return {int(file.get('data_file_id')): file.get('file_size', 0) for file in files
+                if str(file.get('data_file_id', '')).isdigit()}
+
+    def chunk__delete(self, cache_id, file_guid, chunk_index):                 # Delete one upload chunk
+        return self.cache_client.data().delete().delete__data__file__with__id_and_key(
+            cache_id     = cache_id                          ,
+            namespace    = NS_VAULT                          ,
+            data_type    = Enum__Cache__Data_Type.BINARY     ,
+            data_key     = f'{CHUNKS__KEY_PREFIX}{file_guid}' ,
+            data_file_id = str(chunk_index)                  )
+
+    def chunk__record_save(self, cache_id, file_guid, chunk_index,             # Record one received chunk (its own entry — no other chunk's record is touched)
+                           size, sha256):
+        return self.cache_client.data_store().data__store_json__with__id_and_key(
+            cache_id     = cache_id                                  ,
+            namespace    = NS_VAULT                                  ,
+            data_key     = f'{CHUNK_RECORDS__KEY_PREFIX}{file_guid}' ,
+            data_file_id = f'{chunk_index}-{size}-{sha256}'          ,
+            body         = dict(size=size, sha256=sha256)            )
+
+    def chunk__records(self, cache_id, file_guid):                             # [(chunk_index, size, sha256)] of a file — one listing, no reads
+        response = self.cache_client.data().list().data__list__with__key(
+            cache_id  = cache_id                                  ,
+            namespace = NS_VAULT                                  ,
+            data_key  = f'{CHUNK_RECORDS__KEY_PREFIX}{file_guid}' )
+        files   = response.json().get('files', []) if response is not None else []
+        records = []
+        for file in files:
+            chunk_index, size, sha256 = str(file.get('data_file_id', '')).split('-')
+            records.append((int(chunk_index), int(size), sha256))
+        return records
+
+    def chunk__records_delete(self, cache_id, file_guid):                      # Delete every chunk record of a file (one call)
+        return self.cache_client.data().delete().delete__all__data__files__with__key(
+            cache_id  = cache_id                                  ,
+            namespace = NS_VAULT                                  ,
+            data_key  = f'{CHUNK_RECORDS__KEY_PREFIX}{file_guid}' )
+
+    def chunk__manifest_delete(self, cache_id, file_guid):                     # Delete a file's upload manifest document (earlier layout)
+        return self.cache_client.data().delete().delete__data__file__with__id_and_key(
+            cache_id     = cache_id                     ,
+            namespace    = NS_VAULT                     ,
+            data_type    = Enum__Cache__Data_Type.JSON  ,
+            data_key     = CHUNK_MANIFEST_KEY           ,
+            data_file_id = file_guid                    )
+
+    def chunk__delete_all(self, cache_id, file_guid):                          # Delete every chunk of a file (one call)
+        return self.cache_client.data().delete().delete__all__data__files__with__key(
+            cache_id  = cache_id                          ,
+            namespace = NS_VAULT                          ,
+            data_key  = f'{CHUNKS__KEY_PREFIX}{file_guid}' )
+
+    def file__parts_store(self, cache_id, file_guid, parts):                   # Store an assembled file's descriptor (chunk order + sizes)
+        return self.cache_client.data_store().data__store_json__with__id_and_key(
+            cache_id     = cache_id         ,
+            namespace    = NS_VAULT         ,
+            data_key     = FILE_PARTS__KEY  ,
+            data_file_id = file_guid        ,
+            body         = parts            )
+
+    def file__parts_get(self, cache_id, file_guid):                            # Retrieve an assembled file's descriptor
+        return self.cache_client.data().retrieve().data__json__with__id_and_key(
+            cache_id     = cache_id         ,
+            namespace    = NS_VAULT         ,
+            data_key     = FILE_PARTS__KEY  ,
+            data_file_id = file_guid        )
+
+    def file__parts_list(self, cache_id):                                      # List assembled-file descriptors (one per assembled file)
+        return self.cache_client.data().list().data__list__with__key(
+            cache_id  = cache_id         ,
+            namespace = NS_VAULT         ,
+            data_key  = FILE_PARTS__KEY  )
+
+    def file__parts_delete(self, cache_id, file_guid):                         # Delete an assembled file's descriptor
+        return self.cache_client.data().delete().delete__data__file__with__id_and_key(
+            cache_id     = cache_id                     ,
+            namespace    = NS_VAULT                     ,
+            data_type    = Enum__Cache__Data_Type.JSON  ,
+            data_key     = FILE_PARTS__KEY              ,
+            data_file_id = file_guid                    )
 
     # ═══════════════════════════════════════════════════════════════════════
     # Index Operations — store, get, update
@@ -184,7 +319,6 @@ class Send__Cache__Client__Vault(Type_Safe):                                   #
             data_key  = 'acl'     )
 
     def acl__delete(self, cache_id, user_id):                                # Delete an ACL entry
-        from mgraph_ai_service_cache_client.schemas.cache.enums.Enum__Cache__Data_Type import Enum__Cache__Data_Type
         return self.cache_client.data().delete().delete__data__file__with__id_and_key(
             cache_id     = cache_id                ,
             namespace    = NS_VAULT                ,
@@ -192,6 +326,74 @@ class Send__Cache__Client__Vault(Type_Safe):                                   #
             data_key     = 'acl'                   ,
             data_file_id = user_id                 )
 
+    def acl__grants(self, cache_id):                                         # [(user_id, permission)] of a vault — one listing, no reads
+        response = self.cache_client.data().list().data__list__with__key(
+            cache_id  = cache_id        ,
+            namespace = NS_VAULT        ,
+            data_key  = ACL__USERS_KEY  )
+        files  = response.json().get('files', []) if response is not None else []
+        grants = []
+        for file in files:
+            if file.get('data_key') != ACL__USERS_KEY:
+                continue
+            name, _, permission = str(file.get('data_file_id', '')).rpartition('-')
+            grants.append((acl_name_user(name), permission))
+        return grants
+
+    def acl__grant_save(self, cache_id, user_id, permission, entry):         # Write one user's entry (blind — no other user's entry is touched)
+        return self.cache_client.data_store().data__store_json__with__id_and_key(
+            cache_id     = cache_id                                      ,
+            namespace    = NS_VAULT                                      ,
+            data_key     = ACL__USERS_KEY                                ,
+            data_file_id = f'{acl_user_name(user_id)}-{permission}'      ,
+            body         = entry                                         )
+
+    def acl__grant_get(self, cache_id, user_id, permission):                 # Read one user's entry (granted_by, granted_at, ...)
+        return self.cache_client.data().retrieve().data__json__with__id_and_key(
+            cache_id     = cache_id                                      ,
+            namespace    = NS_VAULT                                      ,
+            data_key     = ACL__USERS_KEY                                ,
+            data_file_id = f'{acl_user_name(user_id)}-{permission}'      )
+
+    def acl__grant_get_many(self, cache_id, grants):                         # [entry or None] for [(user_id, permission)], read in parallel, input order
+        grants = list(grants)
+        if len(grants) <= 1:
+            return [self.acl__grant_get(cache_id, user_id, permission) for user_id, permission in grants]
+        with ThreadPoolExecutor(max_workers=min(ACL__READ_MAX_WORKERS, len(grants))) as executor:
+            futures = [executor.submit(self.acl__grant_get, cache_id, user_id, permission) for user_id, permission in grants]
+            return [future.result() for future in futures]
+
+    def acl__grant_delete(self, cache_id, user_id, permission):              # Drop one user's entry for a permission
+        return self.cache_client.data().delete().delete__data__file__with__id_and_key(
+            cache_id     = cache_id                                      ,
+            namespace    = NS_VAULT                                      ,
+            data_type    = Enum__Cache__Data_Type.JSON                   ,
+            data_key     = ACL__USERS_KEY                                ,
+            data_file_id = f'{acl_user_name(user_id)}-{permission}'      )
+
+    def acl__doc_get(self, cache_id):                                          # Retrieve the vault's ACL document (all entries, one read)
+        return self.cache_client.data().retrieve().data__json__with__id_and_key(
+            cache_id     = cache_id      ,
+            namespace    = NS_VAULT      ,
+            data_key     = ACL__DOC_KEY  ,
+            data_file_id = ACL__DOC_ID   )
+
+    def acl__doc_store(self, cache_id, acl_doc):                               # Create or replace the vault's ACL document
+        return self.cache_client.data_store().data__store_json__with__id_and_key(
+            cache_id     = cache_id      ,
+            namespace    = NS_VAULT      ,
+            data_key     = ACL__DOC_KEY  ,
+            data_file_id = ACL__DOC_ID   ,
+            body         = acl_doc       )
+
+    def acl__doc_delete(self, cache_id):                                       # Remove the ACL document once its entries are migrated
+        return self.cache_client.data().delete().delete__data__file__with__id_and_key(
+            cache_id     = cache_id                    ,
+            namespace    = NS_VAULT                    ,
+            data_type    = Enum__Cache__Data_Type.JSON ,
+            data_key     = ACL__DOC_KEY                ,
+            data_file_id = ACL__DOC_ID                 )
+
     # ═══════════════════════════════════════════════════════════════════════
     # Bulk Operations — list all, delete all
     # ═══════════════════════════════════════════════════════════════════════
@@ -0,0 +1,119 @@
+# ===============================================================================
+# SGraph Send - Analytics Buffer Service
+# Write-behind buffer for per-request analytics events
+# record() only appends to a bounded in-process ring buffer (oldest events are
+# dropped, and counted, when the cache is unreachable for too long). flush()
+# writes everything buffered as ONE columnar segment object per instance. The
+# app flushes at the end of each request (Middleware__Flush) — Lambda freezes
+# the container once the response is returned, so a timer thread or an atexit
+# hook would never run. Each flushed batch is also folded into the per-minute
+# pulse rollups (Service__Analytics__Pulse)
+# ===============================================================================
+
+import secrets
+import threading
+import time
+from   collections                                                           import deque
+from   datetime                                                              import datetime, timezone
+from   osbot_utils.type_safe.Type_Safe                                      import Type_Safe
+from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client
+from   sgraph_ai_app_send.lambda__admin.service.Service__Analytics__Pulse   import rollups__record
+
+ANALYTICS__BUFFER_CAPACITY = 10_000                                          # Ring buffer bound (events held while flushes fail)
+
+
+def analytics__segment(events, instance_id, seq):                            # Columnar segment: field names once, one value list per field
+    fields = []
+    for event in events:
+        for field in event:
+            if field not in fields:
+                fields.append(field)
+    columns    = {field: [event.get(field) for event in events] for field in fields}
+    timestamps = [event.get('timestamp', 0) for event in events]
+    return dict(instance_id = instance_id                                                         ,
+                seq         = seq                                                                 ,
+                count       = len(events)                                                         ,
+                first       = min(timestamps)                                                     ,
+                last        = max(timestamps)                                                     ,
+                created     = datetime.now(timezone.utc).isoformat()                              ,
+                columns     = columns                                                             )
+
+def analytics__segment_events(segment):                                      # Row view of a columnar segment (inverse of analytics__segment)
+    columns = (segment or {}).get('columns', {})
+    return [{field: values[i] for field, values in columns.items()}
+            for i in range((segment or {}).get('count', 0))]
+
+
+class Service__Analytics__Buffer(Type_Safe):                                 # Ring buffer + segment flusher
+    send_cache_client : Send__Cache__Client                                  # Cache client for segment storage
+    capacity          : int   = ANALYTICS__BUFFER_CAPACITY
+    instance_id       : str                                                  # Distinguishes segments written by parallel containers
+    seq               : int   = 0                                            # Segments written by this instance
+    dropped           : int   = 0                                            # Events pushed out of a full ring buffer
+    unrolled          : list                                                 # (flush_id, events) whose rollups are not yet confirmed
+    events            : object = None                                        # deque(maxlen=capacity)
+    lock              : object = None
+    flush_lock        : object = None                                        # One flush at a time (segment seq order)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.instance_id = self.instance_id or secrets.token_hex(4)
+        self.events      = deque(maxlen=max(1, self.capacity))
+        self.lock        = threading.Lock()
+        self.flush_lock  = threading.Lock()
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Request path
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def record(self, event):                                                 # Buffer one event — no cache traffic
+        event.setdefault('timestamp', time.time())
+        with self.lock:
+            if len(self.events) == self.events.maxlen:
+                self.dropped += 1                                            # deque drops the oldest on append
+            self.events.append(event)
+
+    def pending(self):                                                       # Snapshot of the events not yet flushed (oldest first)
+        with self.lock:
+            return list(self.events)
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Flush (called by Middleware__Flush at the end of every request)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def flush(self):                                                         # Write all buffered events as one segment; returns events written
+        with self.flush_lock:
+            with self.lock:
+                events = list(self.events)
+                self.events.clear()
+            if not events:
+                return 0
+            segment = analytics__segment(events, self.instance_id, self.seq + 1)
+            try:
+                result = self.send_cache_client.analytics__segment_save(segment)
+            except Exception:
+                result = None
+            if result is None:                                               # Cache unreachable — put the events back for the next request's flush
+                with self.lock:
+                    pending = list(self.events)
+                    self.events.clear()
+                    for event in events + pending:
+                        if len(self.events) == self.events.maxlen:
+                            self.dropped += 1
+                        self.events.append(event)
+                return 0
+            self.seq += 1
+            self.unrolled.append((f'{self.instance_id}-{self.seq}', events))
+            self.record_rollups()
+            return len(events)
+
+    def record_rollups(self):                                                # Fold flushed batches into minute rollups; failures retry next flush
+        unrolled = []
+        for flush_id, events in self.unrolled:
+            try:
+                recorded = rollups__record(self.send_cache_client, events, flush_id)
+            except Exception:
+                recorded = False
+            if not recorded:
+                unrolled.append((flush_id, events))
+        self.unrolled = unrolled[-self.capacity:]                            # Bound retained batches (segments hold the raw events anyway)
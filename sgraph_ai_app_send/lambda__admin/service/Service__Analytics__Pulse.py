@@ -1,75 +1,172 @@
 # ===============================================================================
 # SGraph Send - Analytics Pulse Service
-# Computes real-time traffic pulse from recent temporal analytics events
+# Computes real-time traffic pulse from per-minute rollups
+# The analytics flusher folds each flushed batch into one partial rollup per
+# minute (request/transfer counts, a HyperLogLog of ip_hash, a top-K of paths
+# and a t-digest of duration_ms — all fixed-size sketches), written blind under
+# its own key (roll-<minute>-<flush_id>), so instances never overwrite each
+# other and a retried flush rewrites the same partial. Partials live in one
+# namespace per UTC hour: a pulse lists at most two hours and merges on read.
+# A past minute's partials are folded into merged-<minute>, which names the
+# partials it covers — later reads fetch it plus only the partials it lacks
 # ===============================================================================
 
+from collections                                                                import Counter
 from datetime                                                                   import datetime, timezone, timedelta
-from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client              import Send__Cache__Client
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client              import Send__Cache__Client, ANALYTICS__ROLLUP_PREFIX, ANALYTICS__MERGED_PREFIX
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__Count_Min   import Sketch__Count_Min
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__HyperLogLog import Sketch__HyperLogLog
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__T_Digest    import Sketch__T_Digest
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__Top_K       import Sketch__Top_K
+
+ANALYTICS__PULSE_MAX_MINUTES    = 60                                       # Minutes merged by the widest pulse window
+ANALYTICS__PULSE_TOP_PATHS      = 10                                       # Paths reported by a pulse
+ANALYTICS__ROLLUP_PATHS_WIDTH   = 256                                      # Count-Min width of the per-minute path sketch (bounds rollup size)
+TRANSFER_EVENT_TYPES            = ('file_upload', 'file_download')
+
+
+def rollup__minute(timestamp):                                             # 'YYYYmmddHHMM' (UTC) of an epoch timestamp or datetime
+    if not isinstance(timestamp, datetime):
+        timestamp = datetime.fromtimestamp(timestamp or 0, timezone.utc)
+    return timestamp.strftime('%Y%m%d%H%M')
+
+
+def rollup__paths():                                                       # Empty top-K path sketch, sized for a rollup
+    return Sketch__Top_K(k         = ANALYTICS__PULSE_TOP_PATHS                               ,
+                         count_min = Sketch__Count_Min(width=ANALYTICS__ROLLUP_PATHS_WIDTH)   )
+
+
+def rollup__empty(minute):
+    return dict(minute      = minute                          ,
+                requests    = 0                               ,
+                transfers   = 0                               ,
+                event_types = {}                              ,
+                visitors    = Sketch__HyperLogLog().to_data() ,
+                paths       = rollup__paths().to_data()       ,
+                latency     = Sketch__T_Digest().to_data()    )
+
+
+def rollup__build(events):                                                 # {minute: rollup} for a batch of raw events
+    columns = {}                                                           # minute → (event_types, ip_hashes, paths, durations)
+    for event in events:                                                   # One pass to group by minute, then one bulk add per sketch
+        minute = rollup__minute(event.get('timestamp', 0))
+        column = columns.get(minute)
+        if column is None:
+            column = columns[minute] = ([], [], [], [])
+        column[0].append(event.get('event_type', ''))
+        column[1].append(event.get('ip_hash'   , ''))
+        column[2].append(event.get('path'))
+        column[3].append(event.get('duration_ms'))
+    rollups = {}
+    for minute, (event_types, ip_hashes, paths, durations) in columns.items():
+        event_counts    = Counter(event_types)
+        rollups[minute] = dict(minute      = minute                                                        ,
+                               requests    = len(event_types)                                              ,
+                               transfers   = sum(event_counts[name] for name in TRANSFER_EVENT_TYPES)      ,
+                               event_types = dict(event_counts)                                            ,
+                               visitors    = Sketch__HyperLogLog().add_many(ip_hashes).to_data()           ,
+                               paths       = rollup__paths().add_many(filter(None, paths)).to_data()       ,
+                               latency     = Sketch__T_Digest().add_many(durations).to_data()              )
+    return rollups
+
+
+def rollup__merge(target, source):                                         # Fold source counts + visitors into target (in place)
+    target['requests']  = target.get('requests' , 0) + source.get('requests' , 0)
+    target['transfers'] = target.get('transfers', 0) + source.get('transfers', 0)
+    event_types = dict(target.get('event_types') or {})
+    for event_type, count in (source.get('event_types') or {}).items():
+        event_types[event_type] = event_types.get(event_type, 0) + count
+    target['event_types'] = event_types
+    for field, sketch_class in (('visitors', Sketch__HyperLogLog), ('paths', Sketch__Top_K), ('latency', Sketch__T_Digest)):
+        if not source.get(field):                                          # Rollups written before a sketch existed simply lack it
+            continue
+        if not target.get(field):
+            target[field] = source[field]
+            continue
+        target[field] = sketch_class.from_data(target[field]).merge(sketch_class.from_data(source[field])).to_data()
+    return target
 
 
-def compute_pulse(send_cache_client: Send__Cache__Client,                  # Compute pulse for last N minutes
-                  window_minutes: int = 5
-                 ):
-    now        = datetime.now(timezone.utc)
-    year       = now.strftime('%Y')
-    month      = now.strftime('%m')
-    day        = now.strftime('%d')
-    hour       = now.strftime('%H')
-
-    # todo: most of the logic here is already what the cache service does (please read its guidance documents)
-    path_prefix = f'data/temporal/{year}/{month}/{day}/{hour}'
-
-    files = send_cache_client.analytics__list_recent_files(path_prefix)
-
-    if not files:
-        previous = now - timedelta(hours=1)
-        prev_hour = previous.strftime('%H')
-        prev_day  = previous.strftime('%d')
-        prev_month = previous.strftime('%m')
-        prev_year  = previous.strftime('%Y')
-        prev_prefix = f'data/temporal/{prev_year}/{prev_month}/{prev_day}/{prev_hour}'
-        files = send_cache_client.analytics__list_recent_files(prev_prefix)
-
-    active_requests  = 0
-    active_visitors  = set()
-    active_transfers = 0
-
-    cutoff = now - timedelta(minutes=window_minutes)
-
-    for file_path in files:
-        if not str(file_path).endswith('.json') or str(file_path).endswith('.config') or str(file_path).endswith('.metadata'):
-            continue
+def rollup__hour(minute):                                                  # 'YYYYmmddHH' namespace hour of a minute
+    return minute[:10]
 
-        cache_id = _extract_cache_id_from_path(str(file_path))
-        if not cache_id:
-            continue
 
-        event = send_cache_client.analytics__retrieve_event(cache_id)
-        if event is None:
-            continue
+def rollup__partial_key(minute, flush_id):                                 # roll-<minute>-<flush_id>: unique per flush, so partials never collide
+    return f'{ANALYTICS__ROLLUP_PREFIX}{minute}-{flush_id}'
+
+
+def rollup__key_minute(key):                                               # Minute of a partial or merged rollup key (None for other keys)
+    for prefix in (ANALYTICS__ROLLUP_PREFIX, ANALYTICS__MERGED_PREFIX):
+        if key.startswith(prefix):
+            return key[len(prefix):len(prefix) + 12]
+    return None
+
+
+def rollups__record(send_cache_client: Send__Cache__Client,               # Write one flushed batch as one partial per minute (no reads)
+                    events, flush_id):                                     # Returns True when every partial was stored
+    recorded = True
+    for minute, partial in rollup__build(events).items():
+        stored   = send_cache_client.analytics__rollup_save(rollup__hour(minute), rollup__partial_key(minute, flush_id), partial)
+        recorded = stored is not None and recorded
+    return recorded
+
+
+def rollups__read(send_cache_client: Send__Cache__Client,                 # {minute: merged rollup} for the given minutes
+                  minutes, settled_before):                                # minutes < settled_before get (re)written as merged-<minute>
+    rollups = {}
+    hours   = {}
+    for minute in minutes:
+        hours.setdefault(rollup__hour(minute), set()).add(minute)
+    for hour, hour_minutes in hours.items():
+        partials, merged_keys = {}, []                                     # minute → partial keys, merged keys present
+        for key in send_cache_client.analytics__rollup_keys(hour):
+            minute = rollup__key_minute(key)
+            if minute not in hour_minutes:
+                continue
+            if key.startswith(ANALYTICS__MERGED_PREFIX):
+                merged_keys.append(key)
+            else:
+                partials.setdefault(minute, []).append(key)
+        merged  = {rollup__key_minute(key): rollup for key, rollup in send_cache_client.analytics__rollups(hour, merged_keys).items()}
+        covered = {minute: set(rollup.get('partials', [])) for minute, rollup in merged.items()}
+        missing = [key for minute, keys in partials.items() for key in keys if key not in covered.get(minute, ())]
+        fetched = send_cache_client.analytics__rollups(hour, missing)      # Only partials no merged rollup names yet
+        for minute in hour_minutes:
+            added = [key for key in partials.get(minute, []) if key in fetched]
+            if minute not in merged and not added:
+                continue
+            rollup = merged.get(minute) or rollup__empty(minute)
+            for key in added:
+                rollup__merge(rollup, fetched[key])
+            rollup['partials'] = sorted(covered.get(minute, set()).union(added))
+            if added and minute < settled_before:                          # Past minute: store the merge (any merged doc is exact for the partials it names)
+                send_cache_client.analytics__rollup_save(hour, f'{ANALYTICS__MERGED_PREFIX}{minute}', dict(rollup))
+            rollups[minute] = rollup
+    return rollups
 
-        active_requests += 1
 
-        ip_hash = event.get('ip_hash', '')
-        if ip_hash:
-            active_visitors.add(ip_hash)
+def compute_pulse(send_cache_client: Send__Cache__Client,                  # Compute pulse for last N minutes
+                  window_minutes: int = 5 ,
+                  analytics_buffer      = None                             # Optional Service__Analytics__Buffer: include not-yet-flushed events
+                 ):
+    window_minutes = max(1, min(int(window_minutes), ANALYTICS__PULSE_MAX_MINUTES))
+    now            = datetime.now(timezone.utc)
+    minutes        = [rollup__minute(now - timedelta(minutes=offset)) for offset in range(window_minutes)]
 
-        event_type = event.get('event_type', '')
-        if event_type in ('file_upload', 'file_download'):
-            active_transfers += 1
+    pulse = rollup__empty('')
+    for rollup in rollups__read(send_cache_client, minutes, settled_before=minutes[0]).values():
+        rollup__merge(pulse, rollup)
 
+    if analytics_buffer is not None:
+        for minute, rollup in rollup__build(analytics_buffer.pending()).items():
+            if minute in minutes:
+                rollup__merge(pulse, rollup)
+
+    top_paths = Sketch__Top_K.from_data(pulse['paths']).top()
     return dict(
-        window_minutes   = window_minutes          ,
-        active_requests  = active_requests          ,
-        active_visitors  = len(active_visitors)     ,
-        active_transfers = active_transfers         )
-
-
-def _extract_cache_id_from_path(file_path):                                # Extract cache_id from temporal file path
-    parts = file_path.replace('\\', '/').split('/')
-    if not parts:
-        return None
-    filename = parts[-1]
-    if filename.endswith('.json'):
-        return filename[:-5]                                               # Remove .json extension
-    return None
+        window_minutes   = window_minutes                                              ,
+        active_requests  = pulse['requests']                                           ,
+        active_visitors  = Sketch__HyperLogLog.from_data(pulse['visitors']).count()    ,
+        active_transfers = pulse['transfers']                                          ,
+        top_paths        = [dict(path=path, count=count) for path, count in top_paths] ,
+        latency_ms       = Sketch__T_Digest.from_data(pulse['latency']).percentiles()  )
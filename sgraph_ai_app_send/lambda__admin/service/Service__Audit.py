@@ -3,77 +3,260 @@
 # Append-only event log for data rooms (Decision 3)
 # Uses KEY_BASED strategy in NS_AUDIT namespace — immutable, no update/delete
 # Query by room_id, user_id, action type
+# Event ids are time-ordered (ms timestamp + random suffix), so key listings
+# sort chronologically; per-room, per-user and per-action indexes are segmented
+# logs (Service__Counters) holding event copies, read newest-first so a page
+# costs one listing of that index plus the segments that fit on the page
+# log() writes before it returns: the event joins its room's hash chain as a
+# new segment linked to the head segment. Parallel writers that read the same
+# head both land as siblings at one seq — neither is lost, and verification
+# accepts any segment that links to one of the segments before it
 # ===============================================================================
 
+import bisect
 import secrets
 import hashlib
+import threading
+import time
 from   datetime                                                              import datetime, timezone
 from   osbot_utils.type_safe.Type_Safe                                      import Type_Safe
-from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client
+from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client, NS_AUDIT
+from   sgraph_ai_app_send.lambda__admin.service.Service__Counters           import Service__Counters, counter_slot_seq
+
+
+AUDIT__SEGMENT_MAX          = 256                                            # Events per index segment
+AUDIT__CHECKPOINT_INTERVAL  = 16                                             # Room segments between chain checkpoints
+AUDIT__INDEX_FIELDS         = dict(room='room_id', user='user_id', action='action')  # Index scope → event field
+
+
+audit_clock = dict(last_ms=0, lock=threading.Lock())
+
+def audit_event_id():                                                        # 16-char time-ordered id: 11 hex ms (monotonic per process) + 5 hex random
+    with audit_clock['lock']:
+        now_ms = max(time.time_ns() // 1_000_000, audit_clock['last_ms'] + 1)
+        audit_clock['last_ms'] = now_ms
+    return f'{now_ms:011x}{secrets.token_hex(3)[:5]}'
+
+
+def audit_index(scope, scope_id):                                            # Counter name of a room/user audit index
+    return f'audit-{scope}-{scope_id}'
+
+def audit_entry_hash(event):                                                 # Content hash of one event (independent of chain position)
+    content = (f"{event.get('event_id')}:{event.get('room_id')}:{event.get('user_id')}:"
+               f"{event.get('action')}:{event.get('timestamp')}:{event.get('target_guid', '')}")
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+def audit_chain_hash(prev_hash, entry_hash):                                 # Link one event onto the room chain
+    return hashlib.sha256(f'{prev_hash}:{entry_hash}'.encode()).hexdigest()[:16]
 
 
 class Service__Audit(Type_Safe):                                             # Immutable audit trail
     send_cache_client : Send__Cache__Client                                  # Cache client for audit storage
-    _prev_hash        : str = ''                                             # Hash of previous entry (chain of trust)
+    service_counters  : Service__Counters = None                             # Chain + index segments (built on first use from send_cache_client)
+
+    def counters(self):                                                      # Counter service sharing this cache client
+        if self.service_counters is None:
+            self.service_counters = Service__Counters(send_cache_client=self.send_cache_client)
+        return self.service_counters
 
     # ═══════════════════════════════════════════════════════════════════════
     # Log Events
     # ═══════════════════════════════════════════════════════════════════════
 
-    def log(self, room_id, user_id, action, target_guid='',                  # Append an audit event (immutable)
+    def log(self, room_id, user_id, action, target_guid='',                  # Append an audit event (immutable) — stored before this returns
             ip_hash='', metadata=None):
-        event_id = secrets.token_hex(8)                                      # 16-char event ID
-        now      = datetime.now(timezone.utc).isoformat()
-
-        # Hash chain: each entry includes hash of previous entry
-        entry_content = f'{event_id}:{room_id}:{user_id}:{action}:{now}:{self._prev_hash}'
-        entry_hash    = hashlib.sha256(entry_content.encode()).hexdigest()[:16]
-
-        audit_data = dict(event_id    = event_id                 ,
-                          room_id     = room_id                  ,
-                          user_id     = user_id                  ,
-                          action      = action                   ,
-                          target_guid = target_guid              ,
-                          ip_hash     = ip_hash                  ,
-                          timestamp   = now                      ,
-                          prev_hash   = self._prev_hash          ,
-                          entry_hash  = entry_hash               ,
-                          metadata    = metadata or {}           )
-
-        result = self.send_cache_client.audit__append(audit_data)
-        if result is None:
-            return None
-
-        self._prev_hash = entry_hash
-
-        return dict(event_id   = event_id   ,
-                    entry_hash = entry_hash  ,
-                    timestamp  = now         )
+        audit_data = dict(event_id    = audit_event_id()                           ,   # 16-char time-ordered event ID
+                          room_id     = room_id                                    ,
+                          user_id     = user_id                                    ,
+                          action      = action                                     ,
+                          target_guid = target_guid                                ,
+                          ip_hash     = ip_hash                                    ,
+                          timestamp   = datetime.now(timezone.utc).isoformat()     ,
+                          metadata    = metadata or {}                             )
+        audit_data['entry_hash'] = audit_entry_hash(audit_data)
+
+        try:
+            self.append([audit_data])
+        except Exception:
+            return None                                                      # Not stored — never hand out a receipt for it
+
+        return dict(event_id   = audit_data['event_id']   ,
+                    entry_hash = audit_data['entry_hash'] ,
+                    timestamp  = audit_data['timestamp']  )
+
+    def append(self, events):                                                # Write events: chained room segments, event docs, user + action segments
+        by_room = {}
+        for event in events:
+            if event.get('room_id'):
+                by_room.setdefault(event['room_id'], []).append(event)
+        for room_id, room_events in by_room.items():
+            for offset in range(0, len(room_events), AUDIT__SEGMENT_MAX):
+                self.append_chained(room_id, room_events[offset:offset + AUDIT__SEGMENT_MAX])
+        self.send_cache_client.audit__append_many(events)
+        self.index(events, scopes=('user', 'action'))
+        return len(events)
+
+    def append_chained(self, room_id, events):                               # One room segment linked to the head segment
+        counter = audit_index('room', room_id)
+
+        def link(head, slot):
+            prev_hash = head['chain_hash'] if head['seq'] > 0 else ''
+            slot['prev_hash'] = prev_hash
+            for event in slot['events']:
+                event['prev_hash']  = prev_hash
+                event['chain_hash'] = prev_hash = audit_chain_hash(prev_hash, event['entry_hash'])
+            slot['chain_hash'] = prev_hash
+
+        slot = self.counters().add(counter, events=events, kind='audit', link=link)['slot']
+        for original, chained in zip(events, slot['events']):               # Slot holds copies — carry chain fields back to the event docs
+            original['prev_hash']  = chained['prev_hash']
+            original['chain_hash'] = chained['chain_hash']
+        if slot['seq'] % AUDIT__CHECKPOINT_INTERVAL == 0:
+            self.counters().checkpoint_save(counter, slot['seq'], chain_hashes=[slot['chain_hash']])
+        return slot
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Verify
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def verify_chain(self, room_id, from_seq=None, limit=0):                 # Recompute a room's chain; default: from the latest checkpoint to the head
+        counter   = audit_index('room', room_id)
+        slot_keys = self.counters().slot_keys(counter)
+        top_seq   = counter_slot_seq(slot_keys[-1]) if slot_keys else 0
+        if from_seq is None:
+            from_seq = (top_seq // AUDIT__CHECKPOINT_INTERVAL) * AUDIT__CHECKPOINT_INTERVAL + 1
+            if from_seq > top_seq:                                           # Head sits on a checkpoint — re-check that last block
+                from_seq = max(1, from_seq - AUDIT__CHECKPOINT_INTERVAL)
+        from_seq = max(1, from_seq)
+        to_seq   = top_seq if not limit or limit <= 0 else min(top_seq, from_seq + limit - 1)
+
+        by_seq = {}                                                          # One bulk fetch: the anchor seq + the checked range
+        wanted = [slot_key for slot_key in slot_keys if from_seq - 1 <= counter_slot_seq(slot_key) <= to_seq]
+        for segment in self.counters().slots(counter, wanted):
+            by_seq.setdefault(segment['seq'], []).append(segment)
+
+        def failure(seq, reason):
+            return dict(valid=False, room_id=room_id, from_seq=from_seq, checked=seq - from_seq, error_seq=seq, reason=reason)
+
+        def checkpoint_ok(seq, hashes):                                      # A checkpoint pins the hashes seen when it was written
+            if seq % AUDIT__CHECKPOINT_INTERVAL:
+                return True
+            checkpoint = self.counters().checkpoint(counter, seq)
+            return checkpoint is None or set(checkpoint.get('chain_hashes', [])) <= hashes
+
+        prev_hashes = {''}
+        if from_seq > 1:                                                     # Anchor: the segment(s) just before the range
+            prev_hashes = {segment.get('chain_hash', '') for segment in by_seq.get(from_seq - 1, [])}
+            if not prev_hashes:
+                return failure(from_seq - 1, 'missing segment')
+            if not checkpoint_ok(from_seq - 1, prev_hashes):
+                return failure(from_seq - 1, 'checkpoint mismatch')
+
+        for seq in range(from_seq, to_seq + 1):
+            segments = by_seq.get(seq, [])
+            if not segments:
+                return failure(seq, 'missing segment')
+            hashes = set()
+            for segment in segments:                                         # Siblings (parallel writers) each link to a segment at seq - 1
+                chain_hash = segment.get('prev_hash', '')
+                if chain_hash not in prev_hashes:
+                    return failure(seq, 'prev_hash mismatch')
+                for event in segment.get('events', []):
+                    if audit_entry_hash(event) != event.get('entry_hash'):
+                        return failure(seq, f"entry_hash mismatch ({event.get('event_id')})")
+                    chain_hash = audit_chain_hash(chain_hash, event['entry_hash'])
+                    if event.get('chain_hash') != chain_hash:
+                        return failure(seq, f"chain_hash mismatch ({event.get('event_id')})")
+                if segment.get('chain_hash') != chain_hash:
+                    return failure(seq, 'segment chain_hash mismatch')
+                hashes.add(chain_hash)
+            if not checkpoint_ok(seq, hashes):
+                return failure(seq, 'checkpoint mismatch')
+            prev_hashes = hashes
+        return dict(valid=True, room_id=room_id, from_seq=from_seq, checked=to_seq - from_seq + 1, error_seq=None, reason='')
 
     # ═══════════════════════════════════════════════════════════════════════
     # Query Events
     # ═══════════════════════════════════════════════════════════════════════
 
     def query(self, room_id=None, user_id=None, action=None, limit=50):      # Query audit events with optional filters
-        event_ids = self.send_cache_client.audit__list_all()
-        events    = []
-
-        for event_id in event_ids:
-            if not event_id:
-                continue
-            event = self.send_cache_client.audit__lookup(event_id)
-            if event:
-                if room_id and event.get('room_id') != room_id:
-                    continue
-                if user_id and event.get('user_id') != user_id:
-                    continue
-                if action and event.get('action') != action:
-                    continue
-                events.append(event)
+        return self.query_page(room_id=room_id, user_id=user_id, action=action, limit=limit)['events']
+
+    def query_page(self, room_id=None, user_id=None, action=None,            # One cursor page of matching audit events, newest first
+                   cursor=None, limit=50):
+        def accept(event):
+            if room_id and event.get('room_id') != room_id:
+                return False
+            if user_id and event.get('user_id') != user_id:
+                return False
+            if action and event.get('action') != action:
+                return False
+            return True
+        if room_id:
+            return self.index_page(audit_index('room', room_id), accept, cursor=cursor, limit=limit)
+        if user_id:
+            return self.index_page(audit_index('user', user_id), accept, cursor=cursor, limit=limit)
+        if action:
+            return self.index_page(audit_index('action', action), accept, cursor=cursor, limit=limit)
+        event_ids = self.send_cache_client.audit__list_all()                 # No filter — time-ordered ids, newest first, one page fetched
+        page      = self.send_cache_client.entries__page(NS_AUDIT, event_ids, cursor=cursor, limit=limit, reverse=True)
+        return dict(events=page['items'], next_cursor=page['next_cursor'])
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Indexes — per-room / per-user / per-action segments, appended at log time
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def index(self, events, scopes=('room', 'user', 'action'), only_new_scopes=False):  # Append events to their indexes (unchained, one segment per scope)
+        by_scope = {}
+        for event in events:
+            for scope in scopes:
+                if event.get(AUDIT__INDEX_FIELDS[scope]):
+                    by_scope.setdefault(audit_index(scope, event[AUDIT__INDEX_FIELDS[scope]]), []).append(event)
+        indexed = 0
+        for counter, scope_events in by_scope.items():
+            if only_new_scopes and self.counters().head(counter)['seq'] > 0:
+                continue                                                     # Scope already indexed — never duplicate
+            for offset in range(0, len(scope_events), AUDIT__SEGMENT_MAX):
+                self.counters().add(counter, events=scope_events[offset:offset + AUDIT__SEGMENT_MAX], kind='audit')
+            indexed += len(scope_events)
+        return indexed
+
+    def index_page(self, counter, accept=None, cursor=None, limit=50):       # Walk segments newest → oldest; cursor = '<slot_key>' or '<slot_key>:<pos>'
+        limit     = limit if limit and limit > 0 else 50
+        slot_keys = self.counters().slot_keys(counter)                       # (seq, claim) order — one listing of this index only
+        position, pos = len(slot_keys) - 1, None
+        if cursor:
+            slot_key, _, pos = str(cursor).partition(':')
+            position = bisect.bisect_left(slot_keys, slot_key)
+            position = position if position < len(slot_keys) and slot_keys[position] == slot_key else position - 1
+            pos      = int(pos) if pos else None
+        events = []
+        while position >= 0 and len(events) < limit:
+            batch    = slot_keys[max(0, position - (limit - len(events)) + 1):position + 1]   # Every segment holds ≥1 event: never read more than can fit
+            segments = {segment.get('log_key'): segment for segment in self.counters().slots(counter, batch)}
+            for slot_key in reversed(batch):
                 if len(events) >= limit:
                     break
+                entries = (segments.get(slot_key) or {}).get('events', [])
+                pos     = len(entries) if pos is None else min(pos, len(entries))
+                while pos > 0 and len(events) < limit:
+                    pos  -= 1
+                    event = entries[pos]
+                    if accept is None or accept(event):
+                        events.append(event)
+                if pos == 0:
+                    position, pos = position - 1, None
+        if position < 0:
+            next_cursor = None
+        else:
+            next_cursor = slot_keys[position] if pos is None else f'{slot_keys[position]}:{pos}'
+        return dict(events=events, next_cursor=next_cursor)
 
-        return events
+    def rebuild_indexes(self):                                               # Backfill indexes for scopes logged before they existed
+        event_ids = self.send_cache_client.audit__list_all()
+        events    = [event for _, _, event in self.send_cache_client.entries__lookup_many(NS_AUDIT, event_ids) if event]
+        events    = sorted(events, key=lambda item: item.get('timestamp', ''))
+        return dict(scanned=len(events), indexed=self.index(events, only_new_scopes=True))
 
     def get_room_events(self, room_id, limit=50):                            # Shorthand: get events for a specific room
         return self.query(room_id=room_id, limit=limit)
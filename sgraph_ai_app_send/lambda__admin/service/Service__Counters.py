@@ -0,0 +1,78 @@
+# ===============================================================================
+# SGraph Send - Counter Service
+# Segmented append-only logs over the cache service (which only offers
+# last-writer-wins writes and no conditional write). Each append writes a new
+# slot under its own key (slot-<seq>-<claim>), so no append can overwrite
+# another. The head (seq + chain_hash of the latest slot) is a blind-written
+# hint: two writers that read the same head both land at the same seq as
+# siblings. Chained logs therefore accept any slot whose prev_hash matches one
+# of the slots at the previous seq. Nothing is ever dropped; readers list the
+# log's own namespace once and order slots by (seq, claim). A striped
+# in-process lock keeps same-container appends from producing siblings.
+# ===============================================================================
+
+import secrets
+import threading
+from datetime                                                                  import datetime, timezone
+from osbot_utils.type_safe.Type_Safe                                           import Type_Safe
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client              import Send__Cache__Client
+
+COUNTER__LOCK_STRIPES   = 64                                               # In-process lock stripes (hash of counter name)
+
+counter_locks = [threading.Lock() for _ in range(COUNTER__LOCK_STRIPES)]
+
+
+def counter_slot_seq(slot_key):                                            # seq encoded in a slot key (slot-<seq>-<claim>)
+    return int(slot_key.split('-')[1])
+
+
+class Service__Counters(Type_Safe):                                        # Segmented logs: append, head, read, checkpoints
+    send_cache_client : Send__Cache__Client                                # Injected cache client
+
+    def lock(self, counter):                                               # Stripe lock for a counter (serialises same-container appends)
+        return counter_locks[hash(counter) % COUNTER__LOCK_STRIPES]
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Read
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def head(self, counter):                                               # Head hint: {seq, chain_hash} (seq 0 for an empty log)
+        head = self.send_cache_client.counter__head(counter) or {}
+        return dict(seq=head.get('seq', 0), chain_hash=head.get('chain_hash', ''))
+
+    def slot_keys(self, counter):                                          # All slot keys in (seq, claim) order
+        return self.send_cache_client.counter__slot_keys(counter)
+
+    def slots(self, counter, slot_keys):                                   # Slots for the given keys (bulk fetch)
+        return self.send_cache_client.counter__slots(counter, slot_keys)
+
+    def log(self, counter, from_seq=1, limit=None):                        # Slots with seq ≥ from_seq (siblings included), oldest first
+        slot_keys = [slot_key for slot_key in self.slot_keys(counter) if counter_slot_seq(slot_key) >= from_seq]
+        if limit:
+            last_seq  = from_seq + limit - 1
+            slot_keys = [slot_key for slot_key in slot_keys if counter_slot_seq(slot_key) <= last_seq]
+        return self.slots(counter, slot_keys)
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Write
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def add(self, counter, events=None, kind='log', link=None):            # Append one slot; link(head, slot) fills chain fields before the write
+        with self.lock(counter):
+            head = self.head(counter)
+            slot = dict(seq       = head['seq'] + 1                              ,
+                        claim     = secrets.token_hex(4)                         ,
+                        kind      = kind                                         ,
+                        events    = list(events or [])                           ,
+                        timestamp = datetime.now(timezone.utc).isoformat()       )
+            if link is not None:
+                link(head, slot)
+            self.send_cache_client.counter__slot_save(counter, slot)
+            self.send_cache_client.counter__head_save(counter, dict(seq=slot['seq'], chain_hash=slot.get('chain_hash', '')))
+        return dict(success=True, seq=slot['seq'], slot=slot)
+
+    def checkpoint(self, counter, seq):                                    # Checkpoint stored for a slot seq (None if absent)
+        return self.send_cache_client.counter__checkpoint(counter, seq)
+
+    def checkpoint_save(self, counter, seq, **extra):                      # Record a seq (+ extra fields, e.g. chain hashes) as a checkpoint
+        return self.send_cache_client.counter__checkpoint_save(counter, dict(seq=seq, **extra))
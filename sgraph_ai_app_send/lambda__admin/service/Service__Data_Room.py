@@ -3,20 +3,27 @@
 # Room lifecycle: create, lookup, list, archive
 # Data Room = vault with metadata overlay (Decision 1)
 # Uses Service__Vault for storage, Service__Vault__ACL for permissions
+# Per-user membership index keeps a user's room list at O(rooms they belong to):
+# one entry per (room, user), keyed <room_id>-<permission> in the user's own
+# namespace, written blind — concurrent grants never touch each other's entries.
+# Rooms from before the index are backfilled by rebuild_member_indexes, an
+# explicit admin step (POST /rooms/members-rebuild) that leaves a marker;
+# until that marker exists, a user's room list falls back to the ACL scan
 # ===============================================================================
 
 import secrets
 from   datetime                                                              import datetime, timezone
 from   osbot_utils.type_safe.Type_Safe                                      import Type_Safe
-from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client
+from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client, NS_ROOMS, SUMMARY__SKIP_PREFIXES, ROOM__MEMBER_SEPARATOR
 from   sgraph_ai_app_send.lambda__admin.service.Service__Vault              import Service__Vault
-from   sgraph_ai_app_send.lambda__admin.service.Service__Vault__ACL         import Service__Vault__ACL
+from   sgraph_ai_app_send.lambda__admin.service.Service__Vault__ACL         import Service__Vault__ACL, VALID_PERMISSIONS, PERMISSION_RANK
 
 
 class Service__Data_Room(Type_Safe):                                         # Data room lifecycle management
     send_cache_client : Send__Cache__Client                                  # Cache client for room metadata
     service_vault     : Service__Vault                                       # Vault service for file storage
     service_vault_acl : Service__Vault__ACL                                  # ACL service for permissions
+    members_indexed   : bool = False                                         # Rebuild marker seen (cached once true — the marker is never removed)
 
     # ═══════════════════════════════════════════════════════════════════════
     # Room Lifecycle
@@ -55,6 +62,7 @@ class Service__Data_Room(Type_Safe):                                         # D
         result = self.send_cache_client.room__create(room_data)
         if result is None:
             return None
+        self.member_index__update(owner_user_id.strip(), room_id, 'owner')
 
         return dict(room_id         = room_id                   ,
                     name            = room_data['name']         ,
@@ -74,22 +82,31 @@ class Service__Data_Room(Type_Safe):                                         # D
         return room_data
 
     def list_rooms(self, user_id=None):                                      # List rooms, optionally filtered by user access
-        room_ids = self.send_cache_client.room__list_all()
-        rooms    = []
-        for room_id in room_ids:
-            if room_id:
-                room_data = self.send_cache_client.room__lookup(room_id)
-                if room_data and room_data.get('status') != 'archived':
-                    if user_id is None:
-                        rooms.append(room_data)
-                    else:
-                        vault_cache_id = room_data.get('vault_cache_id', '')
-                        if vault_cache_id and self.service_vault_acl.can_view(vault_cache_id, user_id):
-                            rooms.append(room_data)
-        return rooms
+        return self.list_rooms_page(user_id=user_id)['items']
+
+    def list_rooms_page(self, user_id=None, cursor=None, limit=None):        # One cursor page of active rooms (from the rooms summary)
+        if user_id is not None and not self.member_indexes_built():
+            return self.list_rooms_page__acl_scan(user_id, cursor, limit)   # Memberships from before the index have no entries yet
+        member_rooms = None if user_id is None else self.member_rooms(user_id)
+        def accept(room_data):
+            if room_data.get('status') == 'archived':
+                return False
+            return member_rooms is None or room_data.get('room_id') in member_rooms
+        if member_rooms is not None and not member_rooms:
+            return dict(items=[], next_cursor=None)
+        return self.send_cache_client.summary__page(NS_ROOMS, cursor=cursor, limit=limit, accept=accept,
+                                                    entity_ids=None if member_rooms is None else list(member_rooms))
+
+    def list_rooms_page__acl_scan(self, user_id, cursor=None, limit=None):   # Every active room, filtered by its vault ACL (cost grows with the room count)
+        def accept(room_data):
+            if room_data.get('status') == 'archived':
+                return False
+            vault_cache_id = room_data.get('vault_cache_id', '')
+            return bool(vault_cache_id) and self.service_vault_acl.can_view(vault_cache_id, user_id)
+        return self.send_cache_client.summary__page(NS_ROOMS, cursor=cursor, limit=limit, accept=accept)
 
     def archive_room(self, room_id, user_id):                                # Soft-archive a room (owner only)
-        room_data = self.send_cache_client.room__lookup(room_id)
+        cache_id, room_data = self.send_cache_client.room__lookup_entry(room_id)
         if room_data is None:
             return dict(success=False, reason='not_found')
 
@@ -99,9 +116,10 @@ class Service__Data_Room(Type_Safe):                                         # D
 
         room_data['status']   = 'archived'
         room_data['archived'] = datetime.now(timezone.utc).isoformat()
-        cache_id = self.send_cache_client.room__lookup_cache_id(room_id)
-        if cache_id:
-            self.send_cache_client.room__update(cache_id, room_data)
+        self.send_cache_client.room__update(cache_id, room_data)
+
+        for member_id, permission in self.service_vault_acl.grants(vault_cache_id).items():              # Archived rooms leave every member's index
+            self.member_index__update(member_id, room_id, None, previous=permission)
 
         return dict(success = True      ,
                     room_id = room_id   ,
@@ -119,29 +137,57 @@ class Service__Data_Room(Type_Safe):                                         # D
         return self.service_vault_acl.list_permissions(vault_cache_id)
 
     def add_member(self, room_id, user_id, permission, granted_by):          # Add a member to a room
-        room_data = self.send_cache_client.room__lookup(room_id)
+        cache_id, room_data = self.send_cache_client.room__lookup_entry(room_id)
         if room_data is None:
             return dict(success=False, reason='room_not_found')
 
+        check = self.member__check(room_data, user_id, permission, granted_by)
+        if not check.get('success'):
+            return check
+        return self.member__write(cache_id, room_data, user_id, permission, granted_by, check.get('grants'))
+
+    def member__check(self, room_data, user_id, permission, granted_by):     # Owner check against a fresh listing of the vault's ACL
         vault_cache_id = room_data.get('vault_cache_id', '')
+        grants         = self.service_vault_acl.grants(vault_cache_id, fresh=True)
 
         # Only owner can add members
-        if not self.service_vault_acl.is_owner(vault_cache_id, granted_by):
+        if not self.service_vault_acl.permission_allows(grants.get(str(granted_by)), 'owner'):
             return dict(success=False, reason='not_owner')
+        if permission not in VALID_PERMISSIONS:
+            return dict(success=False, reason=f'Invalid permission: {permission}')
+        return dict(success=True, grants=grants)
 
-        result = self.service_vault_acl.grant_access(vault_cache_id, user_id, permission, granted_by)
+    def member__write(self, cache_id, room_data, user_id, permission,        # Grant access and bump the member count
+                      granted_by, grants):
+        vault_cache_id = room_data.get('vault_cache_id', '')
+        previous       = (grants or {}).get(str(user_id))
+        result         = self.service_vault_acl.grant_access__write(vault_cache_id, user_id, permission, granted_by, grants or {})
 
         # Update member count
         if result.get('success') and result.get('action') == 'granted':
             room_data['member_count'] = room_data.get('member_count', 1) + 1
-            cache_id = self.send_cache_client.room__lookup_cache_id(room_id)
-            if cache_id:
-                self.send_cache_client.room__update(cache_id, room_data)
+            self.send_cache_client.room__update(cache_id, room_data)
+        if result.get('success'):
+            self.member_index__update(user_id, room_data.get('room_id', ''), permission, previous=previous)
 
         return result
 
+    def member__undo(self, cache_id, room_data, user_id, permission,         # Reverse a member__write of `permission` (previous: the user's permission before it, or None)
+                     previous, granted_by=''):
+        vault_cache_id = room_data.get('vault_cache_id', '')
+        room_id        = room_data.get('room_id', '')
+        if previous is not None:                                             # Was already a member — restore the old permission
+            grants = self.service_vault_acl.grants(vault_cache_id, fresh=True)
+            self.service_vault_acl.grant_access__write(vault_cache_id, user_id, previous, granted_by, grants)
+            self.member_index__update(user_id, room_id, previous, previous=permission)
+            return
+        if self.service_vault_acl.revoke_access(vault_cache_id, user_id).get('success'):
+            room_data['member_count'] = max(1, room_data.get('member_count', 1) - 1)
+            self.send_cache_client.room__update(cache_id, room_data)
+        self.member_index__update(user_id, room_id, None, previous=permission)
+
     def remove_member(self, room_id, user_id, removed_by):                   # Remove a member from a room
-        room_data = self.send_cache_client.room__lookup(room_id)
+        cache_id, room_data = self.send_cache_client.room__lookup_entry(room_id)
         if room_data is None:
             return dict(success=False, reason='room_not_found')
 
@@ -151,13 +197,71 @@ class Service__Data_Room(Type_Safe):                                         # D
         if not self.service_vault_acl.is_owner(vault_cache_id, removed_by):
             return dict(success=False, reason='not_owner')
 
-        result = self.service_vault_acl.revoke_access(vault_cache_id, user_id)
+        result = self.service_vault_acl.revoke_access(vault_cache_id, user_id)       # Re-lists the ACL (never the cached copy)
 
         # Update member count
         if result.get('success'):
             room_data['member_count'] = max(1, room_data.get('member_count', 1) - 1)
-            cache_id = self.send_cache_client.room__lookup_cache_id(room_id)
-            if cache_id:
-                self.send_cache_client.room__update(cache_id, room_data)
+            self.send_cache_client.room__update(cache_id, room_data)
+            self.member_index__update(user_id, room_id, None, previous=result.get('permission'))
 
         return result
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Membership Index (user_id → rooms)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def member_rooms(self, user_id):                                         # room_id → permission for every room the user belongs to (one listing)
+        rooms = {}
+        for member_key in self.send_cache_client.room__member_keys(str(user_id)):
+            room_id, _, permission = member_key.rpartition(ROOM__MEMBER_SEPARATOR)
+            if PERMISSION_RANK.get(permission, 0) > PERMISSION_RANK.get(rooms.get(room_id), 0):
+                rooms[room_id] = permission                                  # Two entries for one room (racing permission changes): highest wins
+        return rooms
+
+    def member_index__update(self, user_id, room_id, permission,             # Add / change (permission) or drop (None) one room in a user's index
+                             previous=None):                                 # previous: the permission the entry was written with (removed)
+        if not user_id or not room_id:
+            return None
+        user_id, room_id = str(user_id), str(room_id)                        # Safe_Str ids hash differently from str keys
+        if permission:
+            self.send_cache_client.room__member_save(user_id, room_id, permission)
+        if previous and previous != permission:
+            self.send_cache_client.room__member_delete(user_id, room_id, previous)
+        return dict(user_id=user_id, room_id=room_id, permission=permission)
+
+    def rebuild_member_indexes(self):                                        # Admin step: make every member entry match the rooms' ACLs
+        room_ids = [room_id for room_id in self.send_cache_client.room__list_all()
+                    if not room_id.startswith(SUMMARY__SKIP_PREFIXES)]
+        by_user  = {}
+        for room_id, _, room_data in self.send_cache_client.entries__lookup_many(NS_ROOMS, room_ids):
+            if not room_data:
+                continue
+            active = room_data.get('status') != 'archived'
+            for member_id, permission in self.service_vault_acl.grants(room_data.get('vault_cache_id', '')).items():  # Listing only — no entry reads
+                rooms = by_user.setdefault(member_id, {})
+                if active:
+                    rooms[room_id] = permission
+        written = removed = 0
+        for user_id, rooms in by_user.items():
+            if not user_id:
+                continue
+            expected = {self.send_cache_client.room__member_key(room_id, permission) for room_id, permission in rooms.items()}
+            existing = set(self.send_cache_client.room__member_keys(user_id))
+            for member_key in expected - existing:
+                room_id, _, permission = member_key.rpartition(ROOM__MEMBER_SEPARATOR)
+                self.send_cache_client.room__member_save(user_id, room_id, permission)
+                written += 1
+            for member_key in existing - expected:
+                room_id, _, permission = member_key.rpartition(ROOM__MEMBER_SEPARATOR)
+                self.send_cache_client.room__member_delete(user_id, room_id, permission)
+                removed += 1
+        result = dict(rooms=len(room_ids), users=len(by_user), written=written, removed=removed)
+        self.send_cache_client.room__members_built_save(result)              # From now on user room lists come from the index alone
+        self.members_indexed = True
+        return result
+
+    def member_indexes_built(self):                                          # Has rebuild_member_indexes run (in any container)?
+        if not self.members_indexed:
+            self.members_indexed = self.send_cache_client.room__members_built() is not None
+        return self.members_indexed
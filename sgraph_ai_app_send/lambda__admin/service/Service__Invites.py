@@ -1,14 +1,33 @@
 # ===============================================================================
 # SGraph Send - Invite Service
 # Invite lifecycle: create, validate, accept, expire
+# Each acceptance is its own child entry under the invite (<ms>-<user>-<claim>);
+# the first max_uses distinct users in listing order hold the uses. Accepting
+# writes the entry, lists, and withdraws it when it lost — a conditional write
+# without a read-modify-write of the invite document
+# accept_and_join: the join path in one pass — invite + room read once, the
+# invite use consumed first, then the member and session writes issued
+# concurrently; any failure undoes the completed steps in reverse order
 # Composes Send__Cache__Client (not Service__Tokens — invites have room-scoped semantics)
 # ===============================================================================
 
+import hashlib
 import secrets
+import time
+from   concurrent.futures                                                    import ThreadPoolExecutor
+from   contextvars                                                           import copy_context
 from   datetime                                                              import datetime, timezone
 from   osbot_utils.type_safe.Type_Safe                                      import Type_Safe
-from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client
+from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client, NS_INVITES
 from   sgraph_ai_app_send.lambda__admin.service.Service__Data_Room          import Service__Data_Room
+from   sgraph_ai_app_send.lambda__admin.service.Service__Room__Session      import DEFAULT_SESSION_HOURS
+
+
+def invite_user_digest(user_id):                                             # Fixed-width, file-id-safe stand-in for a user id
+    return hashlib.sha256(str(user_id).encode()).hexdigest()[:16]
+
+def invite_use_id(user_id):                                                  # <ms>-<user digest>-<claim>: listing order = acceptance order
+    return f'{time.time_ns() // 1_000_000:013d}-{invite_user_digest(user_id)}-{secrets.token_hex(4)}'
 
 
 class Service__Invites(Type_Safe):                                           # Invite lifecycle management
@@ -56,16 +75,15 @@ class Service__Invites(Type_Safe):                                           # I
                     created     = now         )
 
     def validate_invite(self, invite_code):                                  # Check if invite is valid (without consuming)
-        invite_data = self.send_cache_client.invite__lookup(invite_code)
+        cache_id, invite_data = self.send_cache_client.invite__lookup_entry(invite_code)
         if invite_data is None:
             return dict(valid=False, reason='not_found')
 
         if invite_data.get('status') != 'active':
             return dict(valid=False, reason=invite_data.get('status', 'unknown'))
 
-        max_uses   = invite_data.get('max_uses', 0)
-        used_count = invite_data.get('used_count', 0)
-        if max_uses > 0 and used_count >= max_uses:
+        max_uses = invite_data.get('max_uses', 0)
+        if max_uses > 0 and self.invite__used_count(invite_data, self.send_cache_client.invite__uses(cache_id)) >= max_uses:
             return dict(valid=False, reason='exhausted')
 
         room_id   = invite_data.get('room_id', '')
@@ -78,7 +96,106 @@ class Service__Invites(Type_Safe):                                           # I
                     permission = invite_data.get('permission', 'viewer'))
 
     def accept_invite(self, invite_code, user_id):                           # Accept an invite: add user to room
-        invite_data = self.send_cache_client.invite__lookup(invite_code)
+        cache_id, invite_data = self.send_cache_client.invite__lookup_entry(invite_code)
+        check = self.invite__check(invite_data, user_id)
+        if not check.get('success'):
+            return check
+
+        room_id    = invite_data.get('room_id', '')
+        permission = invite_data.get('permission', 'viewer')
+        created_by = invite_data.get('created_by', '')
+
+        room_cache_id, room_data = self.send_cache_client.room__lookup_entry(room_id)
+        if room_data is None:
+            return dict(success=False, reason='room_not_found')
+        check = self.service_data_room.member__check(room_data, user_id, permission, created_by)
+        if not check.get('success'):
+            return check
+
+        claim = self.invite__claim(cache_id, invite_data, user_id)
+        if not claim.get('success'):
+            return claim
+        try:
+            result = self.service_data_room.member__write(room_cache_id, room_data, user_id, permission, created_by, check.get('grants'))
+        except Exception:
+            result = dict(success=False, reason='member_write_failed')
+        if not result.get('success'):
+            self.send_cache_client.invite__use_delete(cache_id, claim['use_id'])   # Give the use back
+            return result
+
+        return dict(success    = True       ,
+                    room_id    = room_id    ,
+                    permission = permission ,
+                    user_id    = user_id    )
+
+    def accept_and_join(self, invite_code, user_id, service_session,         # Accept + membership + session with a fixed I/O budget
+                        hours=DEFAULT_SESSION_HOURS):
+        # Reads: invite, room, then the vault's ACL listing
+        cache_id, invite_data = self.send_cache_client.invite__lookup_entry(invite_code)
+        check = self.invite__check(invite_data, user_id)
+        if not check.get('success'):
+            return check
+
+        room_id    = invite_data.get('room_id', '')
+        permission = invite_data.get('permission', 'viewer')
+        created_by = invite_data.get('created_by', '')
+
+        room_cache_id, room_data = self.send_cache_client.room__lookup_entry(room_id)
+        if room_data is None:
+            return dict(success=False, reason='room_not_found')
+
+        check = self.service_data_room.member__check(room_data, user_id, permission, created_by)
+        if not check.get('success'):
+            return check
+
+        # 1. Consume the invite use first — only the winner of the last use goes on
+        claim = self.invite__claim(cache_id, invite_data, user_id)
+        if not claim.get('success'):
+            return claim
+        undo = [lambda: self.send_cache_client.invite__use_delete(cache_id, claim['use_id'])]
+
+        # 2. Member and session are independent — issue them together
+        previous = (check.get('grants') or {}).get(str(user_id))          # Permission before this join (None: new member)
+        extra    = dict(name=room_data.get('name', ''))                      # Display-only claims — signed, not encrypted: never a key
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            member  = executor.submit(copy_context().run, self.service_data_room.member__write,
+                                      room_cache_id, room_data, user_id, permission, created_by, check.get('grants'))
+            session = executor.submit(copy_context().run, service_session.create_session,
+                                      room_id, user_id, permission, hours, extra)
+            result  = self.join__result(member , dict(success=False, reason='member_write_failed'))
+            session = self.join__result(session, None)
+
+        if result.get('success'):
+            undo.append(lambda: self.service_data_room.member__undo(room_cache_id, room_data, user_id, permission, previous, created_by))
+        if session:
+            undo.append(lambda: service_session.revoke_session(session.get('session_token', '')))
+        if not result.get('success') or not session:                         # Rare (store failure): undo what was done, newest first
+            self.join__undo(undo)
+            return result if not result.get('success') else dict(success=False, reason='session_failed')
+
+        return dict(success         = True                                      ,
+                    room_id         = room_id                                   ,
+                    room_name       = extra['name']                             ,
+                    vault_cache_key = room_data.get('vault_cache_key', '')      ,
+                    permission      = permission                                ,
+                    user_id         = user_id                                   ,
+                    session_token   = session.get('session_token', '')          ,
+                    expires         = session.get('expires', '')                )
+
+    def join__result(self, future, failed):                                  # A join step's result, or `failed` when it raised
+        try:
+            return future.result()
+        except Exception:
+            return failed
+
+    def join__undo(self, undo):                                              # Run undo steps in reverse order (each best effort)
+        for step in reversed(undo):
+            try:
+                step()
+            except Exception:
+                pass
+
+    def invite__check(self, invite_data, user_id):                           # Cheap pre-check against the invite document (invite__claim decides)
         if invite_data is None:
             return dict(success=False, reason='not_found')
 
@@ -91,59 +208,68 @@ class Service__Invites(Type_Safe):                                           # I
             return dict(success=False, reason='exhausted')
 
         # Check for duplicate acceptance
-        accepted_by = invite_data.get('accepted_by', [])
-        if user_id in accepted_by:
+        if user_id in invite_data.get('accepted_by', []):
             return dict(success=False, reason='already_accepted')
+        return dict(success=True)
 
-        room_id    = invite_data.get('room_id', '')
-        permission = invite_data.get('permission', 'viewer')
-        created_by = invite_data.get('created_by', '')
-
-        # Add user to room via Data Room service
-        result = self.service_data_room.add_member(room_id, user_id, permission, created_by)
-        if not result.get('success'):
-            return result
-
-        # Update invite usage
-        invite_data['used_count'] = used_count + 1
-        accepted_by.append(user_id)
-        invite_data['accepted_by'] = accepted_by
-
-        if max_uses > 0 and invite_data['used_count'] >= max_uses:
-            invite_data['status'] = 'exhausted'
+    def invite__claim(self, cache_id, invite_data, user_id):                 # Conditional consume: write our use, keep it only if it holds a use
+        use_id = invite_use_id(user_id)
+        self.send_cache_client.invite__use_save(cache_id, dict(use_id   = use_id                                   ,
+                                                               user_id  = str(user_id)                             ,
+                                                               accepted = datetime.now(timezone.utc).isoformat()   ))
+        use_ids  = self.send_cache_client.invite__uses(cache_id)
+        accepted = self.invite__accepted(invite_data, use_ids)
+        if use_id in accepted:
+            return dict(success=True, use_id=use_id)
+        self.send_cache_client.invite__use_delete(cache_id, use_id)          # Lost: withdraw so it never counts
+        digest = invite_user_digest(user_id)
+        if any(other.split('-')[1] == digest for other in accepted):
+            return dict(success=False, reason='already_accepted')
+        return dict(success=False, reason='exhausted')
 
-        cache_id = self.send_cache_client.invite__lookup_cache_id(invite_code)
-        if cache_id:
-            self.send_cache_client.invite__update(cache_id, invite_data)
+    def invite__accepted(self, invite_data, use_ids):                        # Use ids holding a use: first per user, up to the uses left
+        max_uses = invite_data.get('max_uses', 0)
+        capacity = max_uses - invite_data.get('used_count', 0) if max_uses > 0 else None   # Document counts: accepts from before per-use entries
+        seen     = {invite_user_digest(user_id) for user_id in invite_data.get('accepted_by', [])}
+        accepted = []
+        for use_id in use_ids:
+            digest = use_id.split('-')[1]
+            if digest in seen:
+                continue
+            if capacity is not None and len(accepted) >= capacity:
+                break
+            seen.add(digest)
+            accepted.append(use_id)
+        return accepted
 
-        return dict(success    = True       ,
-                    room_id    = room_id    ,
-                    permission = permission ,
-                    user_id    = user_id    )
+    def invite__used_count(self, invite_data, use_ids):                      # Uses consumed so far (document count + accepted use entries)
+        return invite_data.get('used_count', 0) + len(self.invite__accepted(invite_data, use_ids))
 
     def expire_invite(self, invite_code):                                    # Manually expire an invite
-        invite_data = self.send_cache_client.invite__lookup(invite_code)
+        cache_id, invite_data = self.send_cache_client.invite__lookup_entry(invite_code)
         if invite_data is None:
             return dict(success=False, reason='not_found')
 
         invite_data['status']  = 'expired'
         invite_data['expired'] = datetime.now(timezone.utc).isoformat()
 
-        cache_id = self.send_cache_client.invite__lookup_cache_id(invite_code)
-        if cache_id:
-            self.send_cache_client.invite__update(cache_id, invite_data)
+        self.send_cache_client.invite__update(cache_id, invite_data)
 
         return dict(success     = True         ,
                     invite_code = invite_code  ,
                     status      = 'expired'    )
 
     def list_invites(self, room_id=None):                                    # List invites, optionally filtered by room
-        invite_codes = self.send_cache_client.invite__list_all()
-        invites      = []
-        for code in invite_codes:
-            if code:
-                invite_data = self.send_cache_client.invite__lookup(code)
-                if invite_data:
-                    if room_id is None or invite_data.get('room_id') == room_id:
-                        invites.append(invite_data)
-        return invites
+        return self.list_invites_page(room_id=room_id)['items']
+
+    def list_invites_page(self, room_id=None, cursor=None, limit=None):      # One cursor page of invites (bulk fetch)
+        invite_codes  = self.send_cache_client.invite__list_all()
+        page          = self.send_cache_client.entries__page(NS_INVITES, invite_codes, cursor=cursor, limit=limit,
+                                                             accept=lambda invite_data: room_id is None or invite_data.get('room_id') == room_id)
+        page['items'] = [dict(invite_data) for invite_data in page['items']]  # Copies: the overlay must not touch memoised bodies
+        uses          = self.send_cache_client.invite__uses_many([invite_data.get('invite_code', '') for invite_data in page['items']])
+        for invite_data in page['items']:                                    # Overlay the live use count (one listing per invite on the page)
+            invite_data['used_count'] = self.invite__used_count(invite_data, uses.get(invite_data.get('invite_code', ''), []))
+            if invite_data.get('status') == 'active' and 0 < invite_data.get('max_uses', 0) <= invite_data['used_count']:
+                invite_data['status'] = 'exhausted'
+        return page
@@ -9,7 +9,10 @@ import hashlib
 import secrets
 from   datetime                                                              import datetime, timezone
 from   osbot_utils.type_safe.Type_Safe                                      import Type_Safe
-from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client
+from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client, NS_KEYS
+
+LOG__CHECKPOINT_INTERVAL = 16                                                # Entries per Merkle checkpoint block
+
 
 
 def _generate_lookup_code():                                                 # Generate XX-XXXX lookup code (base-36: a-z, 0-9)
@@ -36,6 +39,21 @@ def _detect_algorithm(pem):                                                   #
     return 'ECDH', 256
 
 
+def _log_entry_hash(entry):                                                   # Chain hash: seq, action, code, fingerprint + previous hash
+    entry_data = f"{entry.get('seq')}:{entry.get('action')}:{entry.get('code')}:{entry.get('fingerprint')}:{entry.get('prev_hash')}"
+    return hashlib.sha256(entry_data.encode()).hexdigest()[:16]
+
+
+def _merkle_root(leaf_hashes):                                                # Binary Merkle root over entry hashes (odd node promoted)
+    level = [hashlib.sha256(leaf.encode()).hexdigest() for leaf in leaf_hashes]
+    if not level:
+        return ''
+    while len(level) > 1:
+        level = [hashlib.sha256((level[i] + level[i + 1]).encode()).hexdigest() if i + 1 < len(level) else level[i]
+                 for i in range(0, len(level), 2)]
+    return level[0]
+
+
 class Service__Keys(Type_Safe):                                              # Key registry lifecycle management
     send_cache_client : Send__Cache__Client                                  # Injected cache client
 
@@ -45,13 +63,10 @@ class Service__Keys(Type_Safe):                                              # K
 
         fingerprint = _compute_fingerprint_from_pem(public_key_pem)
 
-        # Check for duplicate fingerprint (scan active entries only)
-        all_codes = self.send_cache_client.key__list_all()
-        for existing_code in all_codes:
-            if existing_code and not existing_code.startswith('log-') and not existing_code.startswith('idx-'):
-                existing_entry = self.send_cache_client.key__lookup(existing_code)
-                if existing_entry and existing_entry.get('active', True) and existing_entry.get('fingerprint') == fingerprint:
-                    return dict(error='duplicate', fingerprint=fingerprint)
+        # Check for duplicate fingerprint (O(1) via the fingerprint index — run repair_fingerprint_index after migrations)
+        index_entry = self.send_cache_client.key__lookup_by_fingerprint(fingerprint)
+        if index_entry and index_entry.get('active', True):
+            return dict(error='duplicate', fingerprint=fingerprint)
 
         # Generate unique lookup code (retry on collision)
         for _ in range(10):
@@ -78,6 +93,7 @@ class Service__Keys(Type_Safe):                                              # K
         result = self.send_cache_client.key__create(entry)
         if result is None:
             return None
+        self.send_cache_client.key__index_fingerprint(fingerprint, code)
 
         # Append to transparency log
         self._append_log('publish', code, fingerprint)
@@ -97,50 +113,157 @@ class Service__Keys(Type_Safe):                                              # K
         return entry
 
     def unpublish(self, code):                                               # Unpublish (soft-delete) a key
-        code  = code.lower().strip()
-        entry = self.send_cache_client.key__lookup(code)
+        code            = code.lower().strip()
+        cache_id, entry = self.send_cache_client.key__lookup_entry(code)
         if entry is None:
             return None
 
         entry['active'] = False
-        cache_id = self.send_cache_client.key__lookup_cache_id(code)
-        if cache_id:
-            self.send_cache_client.key__update(cache_id, entry)
+        self.send_cache_client.key__update(cache_id, entry)
+        self._unindex_fingerprint(entry.get('fingerprint', ''), code)
 
         log_hash = self._append_log('unpublish', code, entry.get('fingerprint', ''))
         return dict(code   = code            ,
                     status = 'unpublished'   ,
                     log_entry_hash = log_hash)
 
+    def _unindex_fingerprint(self, fingerprint, code):                       # Release the fingerprint index if it still points at this code
+        if not fingerprint:
+            return
+        index_entry = self.send_cache_client.key__lookup_by_fingerprint(fingerprint)
+        if index_entry and index_entry.get('code') == code:
+            self.send_cache_client.key__index_fingerprint(fingerprint, code, active=False)
+
+    def repair_fingerprint_index(self):                                      # Backfill/repair fingerprint index from key entries
+        codes   = [code for code in self.send_cache_client.key__list_all()
+                   if code and not code.startswith('log-') and not code.startswith('idx-')]
+        entries = [entry for _, _, entry in self.send_cache_client.entries__lookup_many(NS_KEYS, codes) if entry]
+        owners  = {}                                                         # fingerprint → entry that should own the index
+        for entry in sorted(entries, key=lambda item: item.get('created', '')):
+            fingerprint = entry.get('fingerprint', '')
+            if not fingerprint:
+                continue
+            current = owners.get(fingerprint)
+            if current is None or entry.get('active', True) or not current.get('active', True):
+                owners[fingerprint] = entry                                  # Latest active key wins; otherwise latest key
+        repaired = []
+        for fingerprint, entry in owners.items():
+            expected    = dict(code=entry.get('code'), active=entry.get('active', True))
+            index_entry = self.send_cache_client.key__lookup_by_fingerprint(fingerprint) or {}
+            if dict(code=index_entry.get('code'), active=index_entry.get('active', True)) != expected:
+                self.send_cache_client.key__index_fingerprint(fingerprint, expected['code'], active=expected['active'])
+                repaired.append(fingerprint)
+        return dict(scanned  = len(entries)   ,
+                    indexed  = len(owners)    ,
+                    repaired = repaired       )
+
     def list_keys(self):                                                     # List all published keys
-        codes = self.send_cache_client.key__list_all()
-        keys  = []
-        for code in codes:
-            if code and not code.startswith('log-') and not code.startswith('idx-'):
-                entry = self.send_cache_client.key__lookup(code)
-                if entry and entry.get('active', True):
-                    keys.append(entry)
-        return keys
-
-    def get_log(self):                                                       # Get transparency log entries
-        return self.send_cache_client.key__get_log_entries()
-
-    def _append_log(self, action, code, fingerprint):                        # Append entry to transparency log
-        entries  = self.send_cache_client.key__get_log_entries()
-        seq      = len(entries)
-        prev_hash = entries[-1].get('entry_hash', '') if entries else ''
-
-        entry_data = f'{seq}:{action}:{code}:{fingerprint}:{prev_hash}'
-        entry_hash = hashlib.sha256(entry_data.encode()).hexdigest()[:16]
+        return self.list_keys_page()['items']
+
+    def list_keys_page(self, cursor=None, limit=None):                       # One cursor page of published keys (from the keys summary)
+        return self.send_cache_client.summary__page(NS_KEYS, cursor=cursor, limit=limit,
+                                                    accept=lambda entry: entry.get('active', True))
 
+    # ═══════════════════════════════════════════════════════════════════════
+    # Transparency Log — one entry per append under its own key, a head hint,
+    # and per-block Merkle checkpoints. The store has no conditional write, so
+    # two publishes racing on the same head both land as siblings at one seq
+    # (linked to the same parent) instead of one overwriting the other
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def get_log(self, from_seq=0, limit=None):                               # Log entries from from_seq (all remaining when limit is None)
+        return self.get_log_page(from_seq=from_seq, limit=limit)['entries']
+
+    def get_log_page(self, from_seq=0, limit=None):                          # One page of log entries + head (last entry) + next_seq cursor
+        head     = self.log_head()
+        end_seq  = head['seq'] + 1
+        from_seq = max(0, from_seq or 0)
+        to_seq   = end_seq if not limit or limit <= 0 else min(end_seq, from_seq + limit)
+        entries  = self.send_cache_client.key__log_entries(from_seq, to_seq) if from_seq < to_seq else []
+        return dict(entries  = entries                                      ,
+                    head     = head if head['seq'] >= 0 else None           ,
+                    next_seq = to_seq if to_seq < end_seq else None         )
+
+    def log_head(self):                                                      # Last entry (seq=-1 when empty), found by a scan when no hint exists yet
+        head = self.send_cache_client.key__log_head()
+        if head is None:
+            head = self._log_head_from_scan()
+            if head['seq'] >= 0:
+                self.send_cache_client.key__log_head_save(head)
+        head.pop('head_key', None)
+        return head
+
+    def verify_log(self, from_seq=0, limit=None):                            # Verify links (and checkpoints) from from_seq, anchored at the prior checkpoint/entries
+        from_seq = max(0, from_seq or 0)
+        parents  = self._log_anchor_hashes(from_seq)
+        if not parents:
+            return dict(valid=False, from_seq=from_seq, checked=0, error_seq=from_seq - 1, reason='missing_anchor')
+        entries  = self.get_log(from_seq=from_seq, limit=limit)
+        by_seq   = {}
+        for entry in entries:
+            by_seq.setdefault(entry.get('seq'), []).append(entry)
+        checked  = 0
+        expected = from_seq
+        for seq in sorted(by_seq):
+            if seq != expected:                                              # A whole seq is missing
+                return dict(valid=False, from_seq=from_seq, checked=checked, error_seq=expected, reason='chain_broken')
+            for entry in by_seq[seq]:                                        # Siblings (concurrent appends) share one parent seq
+                if entry.get('prev_hash') not in parents or entry.get('entry_hash') != _log_entry_hash(entry):
+                    return dict(valid=False, from_seq=from_seq, checked=checked, error_seq=seq, reason='chain_broken')
+                checked += 1
+            parents  = {entry['entry_hash'] for entry in by_seq[seq]}
+            expected = seq + 1
+            if (seq + 1) % LOG__CHECKPOINT_INTERVAL == 0 and seq + 1 - LOG__CHECKPOINT_INTERVAL >= from_seq:
+                checkpoint = self.send_cache_client.key__log_checkpoint(seq)
+                block      = [entry['entry_hash'] for entry in entries if seq + 1 - LOG__CHECKPOINT_INTERVAL <= entry['seq'] <= seq]
+                if checkpoint and checkpoint.get('merkle_root') != _merkle_root(block):
+                    return dict(valid=False, from_seq=from_seq, checked=checked, error_seq=seq, reason='checkpoint_mismatch')
+        return dict(valid=True, from_seq=from_seq, checked=checked, error_seq=None, reason='')
+
+    def _log_anchor_hashes(self, from_seq):                                  # entry_hashes an entry at from_seq may link to (empty set → no anchor)
+        if from_seq == 0:
+            return {''}
+        checkpoint = self.send_cache_client.key__log_checkpoint(from_seq - 1)
+        if checkpoint:
+            return set(checkpoint.get('head_hashes') or [checkpoint.get('entry_hash', '')])
+        return {entry.get('entry_hash', '') for entry in self.send_cache_client.key__log_entries(from_seq - 1, from_seq)}
+
+    def _log_head_from_scan(self):                                           # Build head from a full scan (logs written before the head existed)
+        entries = self.send_cache_client.key__get_log_entries()
+        if not entries:
+            return dict(seq=-1, entry_hash='')
+        return dict(entries[-1])
+
+    def _append_log(self, action, code, fingerprint):                        # Append entry to transparency log (head read + entry write + head write)
+        head      = self.log_head()
+        seq       = head['seq'] + 1
         log_entry = dict(
             seq         = seq                                                ,
+            entry_id    = secrets.token_hex(4)                               ,   # Unique key suffix — a racing append can't overwrite this entry
             action      = action                                             ,
             code        = code                                               ,
             fingerprint = fingerprint                                        ,
             timestamp   = datetime.now(timezone.utc).isoformat()             ,
-            prev_hash   = prev_hash                                          ,
-            entry_hash  = entry_hash                                         )
+            prev_hash   = head['entry_hash']                                 )
+        log_entry['entry_hash'] = _log_entry_hash(log_entry)
 
-        self.send_cache_client.key__append_log(log_entry)
-        return entry_hash
+        if not self.send_cache_client.key__append_log(log_entry):
+            return None
+        self.send_cache_client.key__log_head_save(log_entry)
+        settled = seq - LOG__CHECKPOINT_INTERVAL                             # Checkpoint the previous block once appends have moved a full block past it
+        if settled >= 0 and (settled + 1) % LOG__CHECKPOINT_INTERVAL == 0:
+            self._log_checkpoint(settled)
+        return log_entry['entry_hash']
+
+    def _log_checkpoint(self, seq):                                          # Merkle root over the block ending at seq (amortised O(1) per append)
+        from_seq = seq + 1 - LOG__CHECKPOINT_INTERVAL
+        block    = self.send_cache_client.key__log_entries(from_seq, seq + 1)
+        if len({entry['seq'] for entry in block}) != LOG__CHECKPOINT_INTERVAL:
+            return None
+        checkpoint = dict(seq         = seq                                                       ,
+                          from_seq    = from_seq                                                  ,
+                          head_hashes = [entry['entry_hash'] for entry in block if entry['seq'] == seq],
+                          merkle_root = _merkle_root([entry['entry_hash'] for entry in block])    ,
+                          created     = datetime.now(timezone.utc).isoformat()                    )
+        self.send_cache_client.key__log_checkpoint_save(checkpoint)
+        return checkpoint
@@ -3,28 +3,59 @@
 # Room-scoped session tokens (Decision 4)
 # Lightweight auth: short code → session → access
 # No JWT, no OAuth — opaque token scoped to room + permission + expiry
+# With a signing_key, tokens are instead stateless and HMAC-signed
+# ('s1.<claims>.<signature>'): validation is pure CPU, and early revocation uses
+# one entry per revoked session (plus one per revoke-all generation bump), read
+# with a single listing at most every revocation_poll s. Entries are never
+# rewritten, so concurrent revocations cannot undo each other
 # ===============================================================================
 
+import base64
+import hashlib
+import hmac
+import json
 import secrets
+import time
 from   datetime                                                              import datetime, timezone, timedelta
 from   osbot_utils.type_safe.Type_Safe                                      import Type_Safe
-from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client
+from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client, SESSION__REVOKED_PREFIX, SESSION__GENERATION_PREFIX
 
-DEFAULT_SESSION_HOURS = 24                                                   # Default session duration
+DEFAULT_SESSION_HOURS    = 24                                                # Default session duration
+SESSION__SIGNED_PREFIX   = 's1.'                                             # Version tag of the signed token format
+SESSION__REVOCATION_POLL = 5.0                                               # Seconds a loaded revocation list is trusted
+
+
+def _b64(data):                                                              # URL-safe base64 without padding
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
 
 
 class Service__Room__Session(Type_Safe):                                     # Room session management
-    send_cache_client : Send__Cache__Client                                  # Cache client for session storage
+    send_cache_client     : Send__Cache__Client                              # Cache client for session storage
+    signing_key           : str   = ''                                       # HMAC key — empty keeps opaque, stored tokens
+    revocation_poll       : float = SESSION__REVOCATION_POLL
+    revoked               : dict                                             # session_id → expiry (epoch seconds) of revoked signed sessions
+    revoked_keys          : list                                             # Listed revocation keys with an expiry in the past (pruned on revoke)
+    revocation_generation : int   = 0                                        # Signed tokens issued below this generation are void
+    revocations_checked   : float = float('-inf')                            # When the revocation list was last loaded (never)
+
+    def now(self):                                                           # Wall clock in epoch seconds (overridable in tests)
+        return time.time()
 
     # ═══════════════════════════════════════════════════════════════════════
     # Create / Validate / Revoke
     # ═══════════════════════════════════════════════════════════════════════
 
     def create_session(self, room_id, user_id, permission,                   # Create a room-scoped session token
-                       hours=DEFAULT_SESSION_HOURS):
+                       hours=DEFAULT_SESSION_HOURS, extra=None):
         if not room_id or not user_id:
             return None
 
+        if self.signing_key:
+            return self.create_signed_session(room_id, user_id, permission, hours, extra)
+
         session_token = secrets.token_hex(16)                                # 32-char opaque token
         now           = datetime.now(timezone.utc)
         expires       = now + timedelta(hours=hours)
@@ -48,6 +79,9 @@ class Service__Room__Session(Type_Safe):                                     # R
                     expires       = expires.isoformat()    )
 
     def validate_session(self, session_token):                               # Validate a session token
+        if session_token.startswith(SESSION__SIGNED_PREFIX):
+            return self.validate_signed_session(session_token)
+
         session_data = self.send_cache_client.session__lookup(session_token)
         if session_data is None:
             return dict(valid=False, reason='not_found')
@@ -68,17 +102,124 @@ class Service__Room__Session(Type_Safe):                                     # R
                     permission = session_data.get('permission', '')      )
 
     def revoke_session(self, session_token):                                 # Revoke a session token
-        session_data = self.send_cache_client.session__lookup(session_token)
+        if session_token.startswith(SESSION__SIGNED_PREFIX):
+            return self.revoke_signed_session(session_token)
+
+        cache_id, session_data = self.send_cache_client.session__lookup_entry(session_token)
         if session_data is None:
             return dict(success=False, reason='not_found')
 
         session_data['status']  = 'revoked'
         session_data['revoked'] = datetime.now(timezone.utc).isoformat()
 
-        cache_id = self.send_cache_client.session__lookup_cache_id(session_token)
-        if cache_id:
-            self.send_cache_client.session__update(cache_id, session_data)
+        self.send_cache_client.session__update(cache_id, session_data)
+
+        return dict(success       = True          ,
+                    session_token = session_token  ,
+                    status        = 'revoked'      )
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Signed Sessions (stateless)
+    # ═══════════════════════════════════════════════════════════════════════
 
+    def sign(self, payload):                                                 # HMAC-SHA256 over the versioned payload
+        return _b64(hmac.new(self.signing_key.encode(), f'{SESSION__SIGNED_PREFIX}{payload}'.encode(), hashlib.sha256).digest())
+
+    def create_signed_session(self, room_id, user_id, permission, hours, extra=None):  # No storage write — the token is the session
+        self.refresh_revocations()                                           # Stamp the current generation, not a stale local one
+        expires = int(self.now() + hours * 3600)
+        claims  = dict(i = secrets.token_hex(8)            ,                 # Session id (revocation handle)
+                       r = room_id                         ,
+                       u = user_id                         ,
+                       p = permission                      ,
+                       e = expires                         ,
+                       g = self.revocation_generation      )
+        if extra:
+            claims['x'] = extra                                              # Display-only data (e.g. room name) — saves a lookup on validate
+        payload       = _b64(json.dumps(claims, separators=(',', ':'), sort_keys=True).encode())
+        session_token = f'{SESSION__SIGNED_PREFIX}{payload}.{self.sign(payload)}'
+        return dict(session_token = session_token                                                  ,
+                    room_id       = room_id                                                        ,
+                    user_id       = user_id                                                        ,
+                    permission    = permission                                                     ,
+                    expires       = datetime.fromtimestamp(expires, timezone.utc).isoformat()      )
+
+    def signed_claims(self, session_token):                                  # Verified claims dict, or None (bad format / signature / no key)
+        if not self.signing_key:
+            return None
+        parts = session_token[len(SESSION__SIGNED_PREFIX):].split('.')
+        if len(parts) != 2 or not hmac.compare_digest(self.sign(parts[0]), parts[1]):
+            return None
+        try:
+            return json.loads(_unb64(parts[0]))
+        except ValueError:
+            return None
+
+    def validate_signed_session(self, session_token):                        # Pure CPU, plus a revocation poll at most every revocation_poll s
+        claims = self.signed_claims(session_token)
+        if claims is None:
+            return dict(valid=False, reason='invalid_signature')
+        now = self.now()
+        if claims.get('e', 0) <= now:
+            return dict(valid=False, reason='expired')
+        self.refresh_revocations(now)
+        if claims.get('i') in self.revoked or claims.get('g', 0) < self.revocation_generation:
+            return dict(valid=False, reason='revoked')
+        result = dict(valid      = True                   ,
+                      room_id    = claims.get('r', '')    ,
+                      user_id    = claims.get('u', '')    ,
+                      permission = claims.get('p', '')    )
+        if claims.get('x'):
+            result['extra'] = claims['x']
+        return result
+
+    def revoke_signed_session(self, session_token):                          # Write this session's own revocation entry
+        claims = self.signed_claims(session_token)
+        if claims is None:
+            return dict(success=False, reason='not_found')
+        expires = int(claims.get('e', 0))
+        self.send_cache_client.session__revocation_save(f"{SESSION__REVOKED_PREFIX}{expires:010d}-{claims['i']}")
+        self.revoked[claims['i']] = expires                                  # This instance sees its own revocation immediately
+        self.prune_revocations()
         return dict(success       = True          ,
                     session_token = session_token  ,
                     status        = 'revoked'      )
+
+    def revoke_all_sessions(self):                                           # Void every signed token issued so far (adds a generation entry)
+        self.send_cache_client.session__revocation_save(f'{SESSION__GENERATION_PREFIX}{secrets.token_hex(8)}')
+        self.revocations_checked = float('-inf')
+        self.refresh_revocations()
+        return dict(success=True, generation=self.revocation_generation)
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Revocation List
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def refresh_revocations(self, now=None):                                 # Re-list the entries when the local copy is older than revocation_poll
+        now = self.now() if now is None else now
+        if now - self.revocations_checked < self.revocation_poll:
+            return
+        self.revocations_checked = now
+        try:
+            rev_keys = self.send_cache_client.session__revocation_keys()
+        except Exception:
+            return                                                           # Keep the last known list — retry on the next poll
+        revoked, expired, generation = {}, [], 0
+        for rev_key in rev_keys:
+            if rev_key.startswith(SESSION__GENERATION_PREFIX):
+                generation += 1
+            elif rev_key.startswith(SESSION__REVOKED_PREFIX):
+                expires, _, session_id = rev_key[len(SESSION__REVOKED_PREFIX):].partition('-')
+                if int(expires) > now:
+                    revoked[session_id] = int(expires)
+                else:
+                    expired.append(rev_key)                                  # Expired tokens fail anyway
+        self.revoked               = revoked
+        self.revoked_keys          = expired
+        self.revocation_generation = generation
+
+    def prune_revocations(self):                                             # Delete entries of revocations whose tokens have expired
+        expired, self.revoked_keys = self.revoked_keys, []
+        for rev_key in expired:
+            self.send_cache_client.session__revocation_delete(rev_key)
+        return len(expired)
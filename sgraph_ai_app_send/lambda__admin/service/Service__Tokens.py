@@ -5,8 +5,49 @@
 # ===============================================================================
 
 import secrets
+import threading
+import time
 from osbot_utils.type_safe.Type_Safe                                           import Type_Safe
-from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client              import Send__Cache__Client
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client              import Send__Cache__Client, NS_TOKENS, TOKEN__DATA_KEY__EVENTS, TOKEN__DATA_KEY__LEASES, TOKEN__DATA_KEY__RELEASES
+
+TOKEN__LEASE_TTL      = 300                                                # Seconds a lease holds its full grant (then only its recorded uses count)
+TOKEN__LOCK_STRIPES   = 64                                                 # In-process lock stripes (hash of token name)
+
+token_locks = [threading.Lock() for _ in range(TOKEN__LOCK_STRIPES)]
+
+
+def token_ledger(files, now=None):                                         # Usage count from a token's child-doc listing (no reads)
+    now      = time.time() if now is None else now                         # uses    : usage_events/<event_id>            — one per unleased use
+    uses     = 0                                                           # leases  : leases/<lease_id>-<granted>-<expires>
+    leases   = {}                                                          # releases: releases/<lease_id>-<unused>
+    used     = {}                                                          # leased uses: usage_events/<lease_id>/<event_id>
+    released = {}
+    for data_key, file_id in files:
+        if data_key == TOKEN__DATA_KEY__EVENTS:
+            uses += 1
+        elif data_key.startswith(f'{TOKEN__DATA_KEY__EVENTS}/'):
+            lease_id       = data_key[len(TOKEN__DATA_KEY__EVENTS) + 1:]
+            used[lease_id] = used.get(lease_id, 0) + 1
+        elif data_key == TOKEN__DATA_KEY__LEASES:
+            lease_id, granted, expires = (file_id.split('-') + ['', '', ''])[:3]
+            if granted.isdigit() and expires.isdigit():
+                leases[lease_id] = dict(granted=int(granted), expires=int(expires))
+        elif data_key == TOKEN__DATA_KEY__RELEASES:
+            lease_id, _, unused = file_id.rpartition('-')
+            if unused.isdigit():                                           # Concurrent closes of one lease: the smallest return wins
+                released[lease_id] = min(int(unused), released.get(lease_id, int(unused)))
+    total = uses
+    for lease_id, lease in leases.items():
+        lease['used']   = min(lease['granted'], used.get(lease_id, 0))
+        lease['unused'] = released.get(lease_id)
+        if lease['unused'] is not None:
+            lease['charge'] = lease['granted'] - lease['unused']           # Closed: what the holder kept
+        elif now < lease['expires']:
+            lease['charge'] = lease['granted']                             # Open: the whole grant is spoken for
+        else:
+            lease['charge'] = lease['used']                                # Expired unclosed (holder gone): only recorded uses count
+        total += lease['charge']
+    return dict(total=total, leases=leases)
 
 
 class Service__Tokens(Type_Safe):                                          # Token lifecycle management
@@ -31,11 +72,27 @@ class Service__Tokens(Type_Safe):                                          # Tok
                         token_name = token_name            )
         return None
 
-    def lookup(self, token_name):                                          # Find token by name
-        return self.send_cache_client.token__lookup(token_name)
+    def lookup(self, token_name):                                          # Find token by name (usage_count counted from its usage docs)
+        cache_id, token_data = self.send_cache_client.token__lookup_entry(token_name)
+        if token_data is None:
+            return None
+        token_data['usage_count'] = self.ledger(cache_id)['total']
+        return token_data
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Usage — one child doc per use / lease / lease close; the count is taken
+    # from a single listing, so concurrent writers never overwrite each other.
+    # The token record is only rewritten when the status changes.
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def lock(self, token_name):                                            # Stripe lock (serialises same-container write + count)
+        return token_locks[hash(token_name) % TOKEN__LOCK_STRIPES]
+
+    def ledger(self, cache_id):                                            # Current usage ledger of a token
+        return token_ledger(self.send_cache_client.token__ledger(cache_id))
 
     def use(self, token_name, ip_hash='', action='page_opened', transfer_id=''):  # Record a token usage
-        token_data = self.send_cache_client.token__lookup(token_name)
+        cache_id, token_data = self.send_cache_client.token__lookup_entry(token_name)
         if token_data is None:
             return dict(success=False, reason='not_found')
 
@@ -45,58 +102,155 @@ class Service__Tokens(Type_Safe):                                          # Tok
         if status == 'exhausted':
             return dict(success=False, reason='exhausted')
 
-        usage_limit = token_data.get('usage_limit', 0)
-        usage_count = token_data.get('usage_count', 0)
-        if usage_limit > 0 and usage_count >= usage_limit:
-            token_data['status'] = 'exhausted'
-            cache_id = self.send_cache_client.token__lookup_cache_id(token_name)
-            if cache_id:
-                self.send_cache_client.token__update(cache_id, token_data)
+        result = self.use_events(token_name, cache_id, token_data, [dict(ip_hash=ip_hash, action=action, transfer_id=transfer_id)])
+        if not result['accepted']:
             return dict(success=False, reason='exhausted')
+        return dict(success     = True                              ,
+                    usage_count = result['usage_count']             ,
+                    remaining   = result['remaining']               )
 
-        token_data['usage_count'] = usage_count + 1
-        if usage_limit > 0 and token_data['usage_count'] >= usage_limit:
-            token_data['status'] = 'exhausted'
+    def use_events(self, token_name, cache_id, token_data, events):        # Store the events, count once, withdraw whatever landed past the limit
+        usage_limit  = token_data.get('usage_limit', 0)
+        usage_events = [self.usage_event(event) for event in events]
+        with self.lock(token_name):
+            for usage_event in usage_events:
+                self.send_cache_client.token__use(token_name, usage_event, cache_id=cache_id)
+            total = self.ledger(cache_id)['total']
+            over  = min(len(usage_events), max(0, total - usage_limit)) if usage_limit > 0 else 0
+            for usage_event in usage_events[len(usage_events) - over:]:    # Our own newest events give way (a racing writer may lose too — never both win)
+                self.send_cache_client.token__use_delete(cache_id, usage_event['event_id'])
+        total -= over
+        self._status_update(cache_id, token_data, total)
+        return dict(accepted    = len(usage_events) - over                                  ,
+                    rejected    = over                                                      ,
+                    usage_count = total                                                     ,
+                    remaining   = max(0, usage_limit - total) if usage_limit > 0 else -1    )
 
-        cache_id = self.send_cache_client.token__lookup_cache_id(token_name)
-        if cache_id is None:
-            return dict(success=False, reason='not_found')
+    def usage_event(self, event):                                          # Usage-event document (one per use)
+        return dict(event_id         = event.get('event_id') or secrets.token_hex(8),
+                    ip_hash          = event.get('ip_hash'    , '')                ,
+                    action           = event.get('action'     , 'page_opened')     ,
+                    transfer_id      = event.get('transfer_id', '')                ,
+                    success          = True                                        ,
+                    rejection_reason = ''                                          )
 
-        self.send_cache_client.token__update(cache_id, token_data)
+    def use_batch(self, events):                                           # Apply queued usage events, grouped per token
+        by_token = {}
+        for event in events or []:
+            token_name = (event or {}).get('token_name', '')
+            if token_name:
+                by_token.setdefault(token_name, []).append(event)
+        return dict(results={token_name: self._use_many(token_name, token_events)
+                             for token_name, token_events in by_token.items()})
 
-        event_id = secrets.token_hex(8)
-        usage_event = dict(
-            event_id         = event_id     ,
-            ip_hash          = ip_hash      ,
-            action           = action       ,
-            transfer_id      = transfer_id  ,
-            success          = True         ,
-            rejection_reason = ''           )
+    def _use_many(self, token_name, token_events):                         # Record leased events, count the unleased ones against the limit
+        cache_id, token_data = self.send_cache_client.token__lookup_entry(token_name)
+        if token_data is None:
+            return dict(accepted=0, rejected=len(token_events), reason='not_found')
 
-        self.send_cache_client.token__use(token_name, usage_event)
+        leased  = [event for event in token_events if event.get('lease_id')]  # Already paid for by a lease — recorded, not counted again
+        counted = [event for event in token_events if not event.get('lease_id')]
+        for event in leased:
+            self.send_cache_client.token__use(token_name, self.usage_event(event), cache_id=cache_id, lease_id=event['lease_id'])
 
-        return dict(success    = True                              ,
-                    usage_count = token_data['usage_count']         ,
-                    remaining   = max(0, usage_limit - token_data['usage_count']) if usage_limit > 0 else -1)
+        status      = token_data.get('status', '')
+        usage_limit = token_data.get('usage_limit', 0)
+        if counted and status not in ('revoked', 'exhausted'):
+            result = self.use_events(token_name, cache_id, token_data, counted)
+        else:
+            total  = self.ledger(cache_id)['total']
+            result = dict(accepted=0, rejected=len(counted), usage_count=total,
+                          remaining=max(0, usage_limit - total) if usage_limit > 0 else -1)
+        accepted = len(leased) + result['accepted']
+        rejected = len(token_events) - accepted
+        if status in ('revoked', 'exhausted') and rejected:
+            return dict(accepted=accepted, rejected=rejected, reason=status, usage_count=result['usage_count'], status=status)
+        return dict(accepted    = accepted                                  ,
+                    rejected    = rejected                                  ,
+                    reason      = 'exhausted' if rejected else ''           ,
+                    usage_count = result['usage_count']                     ,
+                    status      = token_data['status']                      ,
+                    remaining   = result['remaining']                       )
+
+    def lease(self, token_name, size):                                     # Reserve a block of up to size uses for a user Lambda
+        cache_id, token_data = self.send_cache_client.token__lookup_entry(token_name)
+        if token_data is None:
+            return dict(success=False, reason='not_found')
+        status = token_data.get('status', '')
+        if status in ('revoked', 'exhausted'):
+            return dict(success=False, reason=status)
+
+        usage_limit = token_data.get('usage_limit', 0)
+        with self.lock(token_name):
+            total   = self.ledger(cache_id)['total']
+            granted = min(max(1, size), usage_limit - total) if usage_limit > 0 else max(1, size)
+            if granted <= 0:
+                self._status_update(cache_id, token_data, total)
+                return dict(success=False, reason='exhausted')
+            lease = dict(lease_id = secrets.token_hex(8)                  ,
+                         granted  = granted                               ,
+                         expires  = int(time.time()) + TOKEN__LEASE_TTL   )
+            self.send_cache_client.token__lease_save(cache_id, lease)
+            total = self.ledger(cache_id)['total']                         # Verify: a racing container may have taken the same uses
+            if usage_limit > 0 and total > usage_limit:
+                self.send_cache_client.token__lease_delete(cache_id, lease)
+                return dict(success=False, reason='contention')
+        self._status_update(cache_id, token_data, total)
+        return dict(success     = True                                                       ,
+                    lease_id    = lease['lease_id']                                          ,
+                    granted     = granted                                                    ,
+                    lease_ttl   = TOKEN__LEASE_TTL                                           ,
+                    usage_count = total                                                      ,
+                    usage_limit = usage_limit                                                ,
+                    remaining   = max(0, usage_limit - total) if usage_limit > 0 else -1     )
+
+    def release(self, token_name, lease_id, unused):                       # Close a lease, returning its unused part (once)
+        cache_id, token_data = self.send_cache_client.token__lookup_entry(token_name)
+        if token_data is None:
+            return dict(success=False, reason='not_found')
+        with self.lock(token_name):
+            ledger = self.ledger(cache_id)
+            lease  = ledger['leases'].get(lease_id)
+            if lease is None:
+                return dict(success=False, reason='unknown_lease')
+            if lease['unused'] is not None:
+                return dict(success=False, reason='closed')
+            if unused < 0 or unused > lease['granted'] - lease['used']:    # Never hand back uses that were recorded against the lease
+                return dict(success=False, reason='invalid_unused')
+            self.send_cache_client.token__release_save(cache_id, dict(lease_id=lease_id, unused=unused))
+        total = ledger['total'] - lease['charge'] + lease['granted'] - unused
+        self._status_update(cache_id, token_data, total)
+        return dict(success=True, released=unused, usage_count=total, status=token_data['status'])
+
+    def _status_update(self, cache_id, token_data, total):                 # Rewrite the token record only when its status flips
+        usage_limit = token_data.get('usage_limit', 0)
+        status      = token_data.get('status', '')
+        if status == 'active' and usage_limit > 0 and total >= usage_limit:
+            token_data['status'] = 'exhausted'
+        elif status == 'exhausted' and (usage_limit == 0 or total < usage_limit):
+            token_data['status'] = 'active'                                # Lease closed below the limit
+        if token_data['status'] != status:
+            token_data['usage_count'] = total
+            self.send_cache_client.token__update(cache_id, token_data)
+        token_data['usage_count'] = total
+        return token_data
 
     def update_limit(self, token_name, new_limit):                          # Update usage limit for a token
-        token_data = self.send_cache_client.token__lookup(token_name)
+        cache_id, token_data = self.send_cache_client.token__lookup_entry(token_name)
         if token_data is None:
             return None
 
         token_data['usage_limit'] = new_limit
-        usage_count = token_data.get('usage_count', 0)
+        usage_count = self.ledger(cache_id)['total']
+        token_data['usage_count'] = usage_count
         if token_data.get('status') == 'exhausted' and (new_limit == 0 or usage_count < new_limit):
             token_data['status'] = 'active'                              # Auto-reactivate if new limit allows
 
-        cache_id = self.send_cache_client.token__lookup_cache_id(token_name)
-        if cache_id is None:
-            return None
         self.send_cache_client.token__update(cache_id, token_data)
         return token_data
 
     def reactivate(self, token_name):                                      # Reactivate a revoked or exhausted token
-        token_data = self.send_cache_client.token__lookup(token_name)
+        cache_id, token_data = self.send_cache_client.token__lookup_entry(token_name)
         if token_data is None:
             return None
 
@@ -105,9 +259,6 @@ class Service__Tokens(Type_Safe):                                          # Tok
             return token_data                                              # Already active
 
         token_data['status'] = 'active'
-        cache_id = self.send_cache_client.token__lookup_cache_id(token_name)
-        if cache_id is None:
-            return None
         self.send_cache_client.token__update(cache_id, token_data)
         return token_data
 
@@ -117,5 +268,20 @@ class Service__Tokens(Type_Safe):                                          # Tok
     def list_tokens(self):                                                 # List all token files
         return self.send_cache_client.token__list_all()
 
-    def list_tokens_with_details(self):                                    # List all tokens with full data
-        return self.send_cache_client.token__list_all_with_details()
+    def list_tokens_with_details(self):                                    # List all tokens with full data (live usage counts)
+        return self.with_usage_counts(self.send_cache_client.token__list_all_with_details())
+
+    def generation(self):                                                  # Token status generation (polled by user Lambda caches)
+        return self.send_cache_client.summary__generation(NS_TOKENS)
+
+    def list_tokens_page(self, cursor=None, limit=None):                   # One cursor page of tokens with full data (live usage counts)
+        page          = self.send_cache_client.token__list_page(cursor=cursor, limit=limit)
+        page['items'] = self.with_usage_counts(page['items'])
+        return page
+
+    def with_usage_counts(self, items):                                    # Overlay counted usage on summary rows (the record only snapshots it on status changes)
+        ledgers = self.send_cache_client.token__ledger_many([item.get('token_name', '') for item in items])
+        for item in items:
+            if item.get('token_name') in ledgers:
+                item['usage_count'] = token_ledger(ledgers[item['token_name']])['total']
+        return items
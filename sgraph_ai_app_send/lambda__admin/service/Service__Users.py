@@ -8,7 +8,7 @@
 import secrets
 from   datetime                                                              import datetime, timezone
 from   osbot_utils.type_safe.Type_Safe                                      import Type_Safe
-from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client
+from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client         import Send__Cache__Client, NS_USERS
 
 
 class Service__Users(Type_Safe):                                             # User identity management
@@ -63,24 +63,19 @@ class Service__Users(Type_Safe):                                             # U
         return None
 
     def deactivate(self, user_id):                                           # Soft-delete a user
-        entry = self.send_cache_client.user__lookup(user_id)
+        cache_id, entry = self.send_cache_client.user__lookup_entry(user_id)
         if entry is None:
             return None
 
         entry['active'] = False
-        cache_id = self.send_cache_client.user__lookup_cache_id(user_id)
-        if cache_id:
-            self.send_cache_client.user__update(cache_id, entry)
+        self.send_cache_client.user__update(cache_id, entry)
 
         return dict(user_id = user_id          ,
                     status  = 'deactivated'    )
 
     def list_users(self):                                                    # List all active users
-        user_ids = self.send_cache_client.user__list_all()
-        users    = []
-        for user_id in user_ids:
-            if user_id and not user_id.startswith('idx-'):
-                entry = self.send_cache_client.user__lookup(user_id)
-                if entry and entry.get('active', True):
-                    users.append(entry)
-        return users
+        return self.list_users_page()['items']
+
+    def list_users_page(self, cursor=None, limit=None):                      # One cursor page of active users (from the users summary)
+        return self.send_cache_client.summary__page(NS_USERS, cursor=cursor, limit=limit,
+                                                    accept=lambda entry: entry.get('active', True))
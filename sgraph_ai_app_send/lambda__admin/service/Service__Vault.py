@@ -4,12 +4,21 @@
 # Uses Send__Cache__Client__Vault for all cache operations
 # ===============================================================================
 
+import hashlib
 import secrets
 from   datetime                                                                    import datetime, timezone
 from   osbot_utils.type_safe.Type_Safe                                            import Type_Safe
 from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client__Vault        import Send__Cache__Client__Vault
 
 
+class Vault__File__Corrupt(Exception):                                         # An assembled file's chunk is missing or differs from its descriptor
+    def __init__(self, file_guid, chunk_index, reason):
+        super().__init__(f'file {file_guid}: chunk {chunk_index} {reason}')
+        self.file_guid   = file_guid
+        self.chunk_index = chunk_index
+        self.reason      = reason
+
+
 class Service__Vault(Type_Safe):                                               # Vault lifecycle management
     vault_cache_client : Send__Cache__Client__Vault                            # Dedicated vault cache client
     vault_acl          : 'Service__Vault__ACL' = None                          # Optional ACL service (Phase 1)
@@ -104,65 +113,155 @@ class Service__Vault(Type_Safe):                                               #
             return None
         return self.vault_cache_client.file__store(cache_id, file_guid, encrypted_bytes)
 
-    def get_file(self, vault_cache_key, file_guid):                            # Get encrypted file
+    def get_file(self, vault_cache_key, file_guid):                            # Get encrypted file (assembled files are joined from their chunks; raises Vault__File__Corrupt)
+        parts = self.stream_file(vault_cache_key, file_guid)
+        if parts is None:
+            return None
+        return b''.join(parts)
+
+    def stream_file(self, vault_cache_key, file_guid):                         # Iterator of byte parts (one chunk in memory at a time), or None
         cache_id = self.vault_cache_client.vault__lookup_cache_id(vault_cache_key)
         if cache_id is None:
             return None
-        return self.vault_cache_client.file__get(cache_id, file_guid)
-
-    def list_files(self, vault_cache_key):                                     # List all files
+        data = self.vault_cache_client.file__get(cache_id, file_guid)
+        if data is not None:
+            return iter([bytes(data)])
+        parts = self.vault_cache_client.file__parts_get(cache_id, file_guid)
+        if parts is None:
+            return None
+        sizes  = parts.get('chunk_sizes' , [])
+        hashes = parts.get('chunk_sha256', [])
+        stored = self.vault_cache_client.chunk__sizes(cache_id, file_guid)    # One listing: a missing or resized chunk fails here, before any byte is sent
+        for chunk_index, size in enumerate(sizes):
+            if chunk_index not in stored:
+                raise Vault__File__Corrupt(file_guid, chunk_index, 'missing')
+            if stored[chunk_index] != size:
+                raise Vault__File__Corrupt(file_guid, chunk_index, 'size_mismatch')
+        def chunks():                                                          # Each chunk re-checked as read: a failure here aborts the stream
+            for chunk_index in range(parts.get('total_chunks', 0)):
+                chunk = self.vault_cache_client.chunk__get(cache_id, file_guid, chunk_index)
+                if chunk is None:
+                    raise Vault__File__Corrupt(file_guid, chunk_index, 'missing')
+                chunk = bytes(chunk)
+                if chunk_index < len(sizes) and len(chunk) != sizes[chunk_index]:
+                    raise Vault__File__Corrupt(file_guid, chunk_index, 'size_mismatch')
+                if chunk_index < len(hashes) and hashlib.sha256(chunk).hexdigest() != hashes[chunk_index]:
+                    raise Vault__File__Corrupt(file_guid, chunk_index, 'hash_mismatch')
+                yield chunk
+        return chunks()
+
+    def list_files(self, vault_cache_key):                                     # List all files: stored blobs + assembled files (data_key 'file-parts')
         cache_id = self.vault_cache_client.vault__lookup_cache_id(vault_cache_key)
         if cache_id is None:
             return None
-        return self.vault_cache_client.file__list(cache_id)
-
-    def delete_file(self, vault_cache_key, file_guid):                         # Delete a file
+        blobs     = self.listed_files(self.vault_cache_client.file__list      (cache_id))
+        assembled = self.listed_files(self.vault_cache_client.file__parts_list(cache_id))
+        stored    = {file.get('data_file_id') for file in blobs}
+        files     = blobs + [file for file in assembled if file.get('data_file_id') not in stored]   # A blob shadows a descriptor (see stream_file); file_size of an assembled entry is its descriptor's
+        return dict(cache_id   = str(cache_id)                                  ,
+                    files      = files                                          ,
+                    file_count = len(files)                                     ,
+                    total_size = sum(file.get('file_size', 0) for file in files))
+
+    def listed_files(self, response):                                          # File infos of a data listing (empty when the listing failed)
+        if response is None:
+            return []
+        return response.json().get('files') or []
+
+    def delete_file(self, vault_cache_key, file_guid):                         # Delete a file with its chunks (one call), descriptor and chunk records
         cache_id = self.vault_cache_client.vault__lookup_cache_id(vault_cache_key)
         if cache_id is None:
             return None
+        self.vault_cache_client.chunk__delete_all      (cache_id, file_guid)  # Blind deletes (no reads): absent items are no-ops
+        self.vault_cache_client.file__parts_delete     (cache_id, file_guid)
+        self.vault_cache_client.chunk__records_delete  (cache_id, file_guid)  # Abandoned uploads leave chunk records behind
+        self.vault_cache_client.chunk__manifest_delete (cache_id, file_guid)  # ... or a manifest document (earlier layout)
         return self.vault_cache_client.file__delete(cache_id, file_guid)
 
     # ═══════════════════════════════════════════════════════════════════════
     # Chunked File Upload — for files exceeding Lambda 6MB payload limit
+    # Chunks may arrive in parallel and in any order: each one is recorded
+    # (size + SHA-256) as its own entry, named <index>-<size>-<sha256>, so the
+    # upload manifest is one listing of those entries. Assembly checks
+    # completeness from that listing alone and is zero-copy — the cache
+    # service has no multipart/append write, so the file is recorded as its
+    # ordered chunks (a parts descriptor) and read back chunk by chunk
     # ═══════════════════════════════════════════════════════════════════════
 
-    def store_file_chunk(self, vault_cache_key, file_guid, chunk_index, encrypted_chunk):
+    def store_file_chunk(self, vault_cache_key, file_guid, chunk_index,        # Store a chunk and record it (its own entry — parallel chunks never collide)
+                         encrypted_chunk, chunk_sha256=''):
+        cache_id = self.vault_cache_client.vault__lookup_cache_id(vault_cache_key)
+        if cache_id is None:
+            return None
+        sha256 = hashlib.sha256(encrypted_chunk).hexdigest()
+        if chunk_sha256 and chunk_sha256.lower() != sha256:                   # Corrupted in transit — reject before storing
+            return dict(error='hash_mismatch', chunk_index=chunk_index, sha256=sha256)
+        if self.vault_cache_client.chunk__store(cache_id, file_guid, chunk_index, encrypted_chunk) is None:
+            return None
+        entry = dict(size=len(encrypted_chunk), sha256=sha256)
+        if self.vault_cache_client.chunk__record_save(cache_id, file_guid, chunk_index, entry['size'], sha256) is None:
+            return None
+        return dict(chunk_index=chunk_index, **entry)
+
+    def chunk_manifest__load(self, cache_id, file_guid):                       # chunk_index (str) → size + sha256, from one listing of the chunk records
+        candidates = {}
+        for chunk_index, size, sha256 in self.vault_cache_client.chunk__records(cache_id, file_guid):
+            candidates.setdefault(str(chunk_index), []).append(dict(size=size, sha256=sha256))
+        chunks = {}
+        for chunk_index, entries in candidates.items():
+            if len(entries) > 1:                                               # Chunk re-sent with other bytes: the stored chunk decides (one read)
+                entries = self.chunk_manifest__stored(cache_id, file_guid, chunk_index, entries)
+            if entries:
+                chunks[chunk_index] = entries[0]
+        return chunks
+
+    def chunk_manifest__stored(self, cache_id, file_guid, chunk_index, entries):  # The records matching the chunk bytes currently stored
+        chunk  = self.vault_cache_client.chunk__get(cache_id, file_guid, chunk_index)
+        sha256 = hashlib.sha256(bytes(chunk)).hexdigest() if chunk is not None else None
+        return [entry for entry in entries if entry['sha256'] == sha256]
+
+    def chunk_manifest(self, vault_cache_key, file_guid):                      # Upload progress: chunk_index → size + sha256
         cache_id = self.vault_cache_client.vault__lookup_cache_id(vault_cache_key)
         if cache_id is None:
             return None
-        chunk_id = f'{file_guid}__chunk__{chunk_index}'
-        return self.vault_cache_client.file__store(cache_id, chunk_id, encrypted_chunk)
+        return dict(file_guid=file_guid, chunks=self.chunk_manifest__load(cache_id, file_guid))
 
     def assemble_file(self, vault_cache_key, file_guid, total_chunks):
         cache_id = self.vault_cache_client.vault__lookup_cache_id(vault_cache_key)
         if cache_id is None:
             return None
 
-        # Read all chunks in order
-        parts = []
+        chunks = self.chunk_manifest__load(cache_id, file_guid)               # One listing — completeness checked before anything is written
         for i in range(total_chunks):
-            chunk_id   = f'{file_guid}__chunk__{i}'
-            chunk_data = self.vault_cache_client.file__get(cache_id, chunk_id)
-            if chunk_data is None:
+            if str(i) not in chunks:
                 return dict(error='missing_chunk', chunk_index=i)
-            if isinstance(chunk_data, (bytes, bytearray)):
-                parts.append(chunk_data)
-            else:
-                parts.append(bytes(chunk_data) if chunk_data else b'')
 
-        # Concatenate and store as the final file
-        assembled = b''.join(parts)
-        result = self.vault_cache_client.file__store(cache_id, file_guid, assembled)
-
-        # Clean up chunks (best-effort — delete may not be supported on all backends)
-        for i in range(total_chunks):
-            chunk_id = f'{file_guid}__chunk__{i}'
-            try:
-                self.vault_cache_client.file__delete(cache_id, chunk_id)
-            except Exception:
-                pass                                                             # Chunk cleanup is non-critical
-
-        return dict(status='assembled', file_guid=file_guid, size=len(assembled))
+        ordered = [chunks[str(i)] for i in range(total_chunks)]
+        size    = sum(chunk['size'] for chunk in ordered)
+        parts   = dict(file_guid     = file_guid                                ,
+                       total_chunks  = total_chunks                             ,
+                       chunk_sizes   = [chunk['size']   for chunk in ordered]   ,
+                       chunk_sha256  = [chunk['sha256'] for chunk in ordered]   ,
+                       size          = size                                     ,
+                       assembled     = datetime.now(timezone.utc).isoformat()   )
+        self.vault_cache_client.file__parts_store(cache_id, file_guid, parts)
+        self.vault_cache_client.file__delete(cache_id, file_guid)            # A blob stored earlier under this guid would shadow the parts
+        self.vault_cache_client.chunk__records_delete(cache_id, file_guid)   # The descriptor now carries the sizes + hashes
+
+        return dict(status='assembled', file_guid=file_guid, size=size)
+
+    def verify_file(self, vault_cache_key, file_guid):                         # Re-hash an assembled file's chunks against its descriptor
+        cache_id = self.vault_cache_client.vault__lookup_cache_id(vault_cache_key)
+        if cache_id is None:
+            return None
+        parts = self.vault_cache_client.file__parts_get(cache_id, file_guid)
+        if parts is None:
+            return dict(valid=False, reason='not_assembled')
+        for chunk_index, expected in enumerate(parts.get('chunk_sha256', [])):
+            chunk = self.vault_cache_client.chunk__get(cache_id, file_guid, chunk_index)
+            if chunk is None or hashlib.sha256(bytes(chunk)).hexdigest() != expected:
+                return dict(valid=False, reason='chunk_mismatch', chunk_index=chunk_index)
+        return dict(valid=True, checked=len(parts.get('chunk_sha256', [])))
 
     # ═══════════════════════════════════════════════════════════════════════
     # Index Operations
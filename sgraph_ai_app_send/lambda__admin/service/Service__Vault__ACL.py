@@ -1,11 +1,16 @@
 # ===============================================================================
 # SGraph Send - Vault Access Control Service
 # Permission management: grant, revoke, check, list
-# ACL entries stored as child data under the vault cache entry
+# ACL entries stored one per user under the vault cache entry, named
+# <user>-<permission>: a listing of the vault's ACL is the whole ACL (one read),
+# and grants / revokes write or delete only that user's entry, so concurrent
+# writers never overwrite each other. Listings are kept in-process for
+# cache_ttl seconds for checks; a revoke always re-lists and drops the local
+# copy, so a revoke from another container takes at most cache_ttl to be seen
 # Permission levels: owner, editor, viewer
 # ===============================================================================
 
-import secrets
+import time
 from   datetime                                                                    import datetime, timezone
 from   osbot_utils.type_safe.Type_Safe                                            import Type_Safe
 from   sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client__Vault        import Send__Cache__Client__Vault
@@ -17,9 +22,18 @@ PERMISSION_RANK = dict(owner  = 3 ,
                        editor = 2 ,
                        viewer = 1 )
 
+ACL__CACHE_TTL        = 2.0                                                  # Seconds a loaded ACL listing is trusted for checks
+ACL__CACHE_MAX_VAULTS = 1024                                                 # LRU bound on cached ACL listings
+
 
 class Service__Vault__ACL(Type_Safe):                                        # Vault access control management
     vault_cache_client : Send__Cache__Client__Vault                          # Dedicated vault cache client
+    cache_ttl          : float = ACL__CACHE_TTL
+    max_vaults         : int   = ACL__CACHE_MAX_VAULTS
+    docs               : dict                                                # cache_id → (expires_at, grants), insertion order = LRU order
+
+    def now(self):                                                           # Monotonic clock (overridable in tests)
+        return time.monotonic()
 
     # ═══════════════════════════════════════════════════════════════════════
     # Grant / Revoke
@@ -28,76 +42,135 @@ class Service__Vault__ACL(Type_Safe):                                        # V
     def grant_access(self, cache_id, user_id, permission, granted_by):       # Grant a user access to a vault
         if permission not in VALID_PERMISSIONS:
             return dict(success=False, reason=f'Invalid permission: {permission}')
+        grants = self.grants(cache_id, fresh=True)
+        return self.grant_access__write(cache_id, user_id, permission, granted_by, grants)
 
-        # Check if user already has access
-        existing = self.vault_cache_client.acl__get(cache_id, user_id)
-        if existing is not None:
-            # Update existing permission
-            existing['permission'] = permission
-            existing['granted_by'] = granted_by
-            existing['updated']    = datetime.now(timezone.utc).isoformat()
-            self.vault_cache_client.acl__update(cache_id, user_id, existing)
-            return dict(success    = True        ,
-                        user_id    = user_id     ,
-                        permission = permission  ,
-                        action     = 'updated'   )
-
-        acl_entry = dict(user_id    = user_id                                        ,
-                         permission = permission                                     ,
-                         granted_by = granted_by                                     ,
-                         granted_at = datetime.now(timezone.utc).isoformat()         ,
-                         active     = True                                           )
-
-        result = self.vault_cache_client.acl__store(cache_id, user_id, acl_entry)
-        if result is None:
-            return dict(success=False, reason='Failed to store ACL entry')
-
-        return dict(success    = True        ,
-                    user_id    = user_id     ,
-                    permission = permission  ,
-                    action     = 'granted'   )
+    def grant_access__write(self, cache_id, user_id, permission,             # Write phase of grant_access (caller already listed the grants)
+                            granted_by, grants):
+        if permission not in VALID_PERMISSIONS:
+            return dict(success=False, reason=f'Invalid permission: {permission}')
 
-    def revoke_access(self, cache_id, user_id):                              # Revoke a user's access to a vault
-        existing = self.vault_cache_client.acl__get(cache_id, user_id)
+        user_id  = str(user_id)                                              # Safe_Str ids hash differently from str keys
+        existing = grants.get(user_id)                                       # Check if user already has access
+        entry    = dict(user_id    = user_id                                 ,
+                        permission = permission                              ,
+                        granted_by = str(granted_by)                         ,
+                        granted_at = datetime.now(timezone.utc).isoformat()  ,
+                        active     = True                                    )
+        if self.vault_cache_client.acl__grant_save(cache_id, user_id, permission, entry) is None:
+            self.docs.pop(str(cache_id), None)
+            return dict(success=False, reason='Failed to store ACL entry')
+        if existing and existing != permission:                              # Permission changed — drop the old entry
+            self.vault_cache_client.acl__grant_delete(cache_id, user_id, existing)
+        self.remember(cache_id, dict(grants, **{user_id: permission}))
+
+        return dict(success    = True                                            ,
+                    user_id    = user_id                                         ,
+                    permission = permission                                      ,
+                    action     = 'granted' if existing is None else 'updated'    )
+
+    def revoke_access(self, cache_id, user_id):                              # Revoke a user's access to a vault (never trusts the cached listing)
+        user_id  = str(user_id)
+        grants   = self.grants(cache_id, fresh=True)
+        existing = grants.get(user_id)
         if existing is None:
             return dict(success=False, reason='No access entry found')
 
-        if existing.get('permission') == 'owner':
+        if existing == 'owner':
             return dict(success=False, reason='Cannot revoke owner access')
 
-        self.vault_cache_client.acl__delete(cache_id, user_id)
+        self.vault_cache_client.acl__grant_delete(cache_id, user_id, existing)
+        self.docs.pop(str(cache_id), None)                                   # Next check re-lists: nothing cached can still allow the user
 
-        return dict(success = True          ,
-                    user_id = user_id       ,
-                    action  = 'revoked'     )
+        return dict(success    = True          ,
+                    user_id    = user_id       ,
+                    permission = existing      ,
+                    action     = 'revoked'     )
 
     # ═══════════════════════════════════════════════════════════════════════
     # Check / Query
     # ═══════════════════════════════════════════════════════════════════════
 
     def check_permission(self, cache_id, user_id, required_permission):      # Check if user has at least the required permission
-        entry = self.vault_cache_client.acl__get(cache_id, user_id)
-        if entry is None:
-            return False
-        if not entry.get('active', True):
+        return self.permission_allows(self.grants(cache_id).get(str(user_id)), required_permission)
+
+    def get_permission(self, cache_id, user_id):                             # Get a user's permission level for a vault
+        return self.grants(cache_id).get(str(user_id))
+
+    def list_permissions(self, cache_id):                                    # List all ACL entries for a vault (listing + parallel entry reads)
+        grants  = list(self.grants(cache_id).items())                        # The listing decides who is in; the entries carry who granted and when
+        entries = self.vault_cache_client.acl__grant_get_many(cache_id, grants)
+        return [dict(user_id    = user_id                                    ,
+                     permission = permission                                 ,
+                     granted_by = (entry or {}).get('granted_by', '')        ,
+                     granted_at = (entry or {}).get('granted_at', '')        ,
+                     active     = True                                       )
+                for (user_id, permission), entry in zip(grants, entries)]
+
+    def is_owner(self, cache_id, user_id):                                   # Check if user is the vault owner
+        return self.check_permission(cache_id, user_id, 'owner')
+
+    def permission_allows(self, permission, required_permission):            # check_permission over an already-listed permission
+        if permission is None:
             return False
+        return PERMISSION_RANK.get(permission, 0) >= PERMISSION_RANK.get(required_permission, 0)
+
+    def can_edit(self, cache_id, user_id):                                   # Check if user can edit (editor or owner)
+        return self.check_permission(cache_id, user_id, 'editor')
 
-        user_rank     = PERMISSION_RANK.get(entry.get('permission'), 0)
-        required_rank = PERMISSION_RANK.get(required_permission, 0)
-        return user_rank >= required_rank
+    def can_view(self, cache_id, user_id):                                   # Check if user can view (viewer, editor, or owner)
+        return self.check_permission(cache_id, user_id, 'viewer')
 
-    def get_permission(self, cache_id, user_id):                             # Get a user's permission level for a vault
-        entry = self.vault_cache_client.acl__get(cache_id, user_id)
-        if entry is None:
-            return None
-        if not entry.get('active', True):
-            return None
-        return entry.get('permission')
-
-    def list_permissions(self, cache_id):                                    # List all ACL entries for a vault
+    # ═══════════════════════════════════════════════════════════════════════
+    # ACL Listing
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def grants(self, cache_id, fresh=False):                                 # user_id → permission for a vault (treat as read-only)
+        cache_id = str(cache_id)
+        now      = self.now()
+        cached   = self.docs.pop(cache_id, None)
+        if cached is not None and cached[0] > now and not fresh:
+            self.docs[cache_id] = cached                                     # Re-insert: most recently used
+            return cached[1]
+        grants = {}
+        for user_id, permission in self.vault_cache_client.acl__grants(cache_id):
+            if PERMISSION_RANK.get(permission, 0) > PERMISSION_RANK.get(grants.get(user_id), 0):
+                grants[user_id] = permission                                 # Two entries for one user (racing changes): highest wins
+        if not grants:                                                       # Vault from before per-user entries — migrate on first read
+            grants = self.migrate(cache_id)
+        self.remember(cache_id, grants)
+        return grants
+
+    def remember(self, cache_id, grants):                                    # Cache a listing and evict least recently used beyond max_vaults
+        cache_id = str(cache_id)
+        self.docs.pop(cache_id, None)
+        if self.max_vaults <= 0 or self.cache_ttl <= 0:
+            return
+        self.docs[cache_id] = (self.now() + self.cache_ttl, grants)
+        while len(self.docs) > self.max_vaults:
+            self.docs.pop(next(iter(self.docs)), None)
+
+    def migrate(self, cache_id):                                             # Copy an ACL document / legacy child entries to per-user entries, then delete them
+        acl_doc = self.vault_cache_client.acl__doc_get(cache_id)
+        legacy  = self.legacy_entries(cache_id)
+        entries = dict(legacy, **((acl_doc or {}).get('entries') or {}))    # The document is newer than the legacy entries
+        grants  = {}
+        for user_id, entry in entries.items():
+            permission = entry.get('permission')
+            if not entry.get('active', True) or permission not in VALID_PERMISSIONS:
+                continue
+            self.vault_cache_client.acl__grant_save(cache_id, user_id, permission, dict(entry, user_id=str(user_id)))
+            grants[str(user_id)] = permission
+        if acl_doc is not None:
+            self.vault_cache_client.acl__doc_delete(cache_id)
+        for file_id in legacy.values():
+            self.vault_cache_client.acl__delete(cache_id, file_id['_file_id'])
+        return grants
+
+    def legacy_entries(self, cache_id):                                      # Entries stored one child per user under 'acl' (first layout)
         response = self.vault_cache_client.acl__list(cache_id)
         if response is None:
-            return []
+            return {}
 
         # Extract file IDs from the list response
         file_ids = []
@@ -112,18 +185,9 @@ class Service__Vault__ACL(Type_Safe):                                        # V
             file_ids = response
 
         # Resolve each ACL entry by user_id
-        acl_list = []
+        entries = {}
         for file_id in file_ids:
             entry = self.vault_cache_client.acl__get(cache_id, file_id)
-            if entry and entry.get('active', True):
-                acl_list.append(entry)
-        return acl_list
-
-    def is_owner(self, cache_id, user_id):                                   # Check if user is the vault owner
-        return self.check_permission(cache_id, user_id, 'owner')
-
-    def can_edit(self, cache_id, user_id):                                   # Check if user can edit (editor or owner)
-        return self.check_permission(cache_id, user_id, 'editor')
-
-    def can_view(self, cache_id, user_id):                                   # Check if user can view (viewer, editor, or owner)
-        return self.check_permission(cache_id, user_id, 'viewer')
+            if entry:
+                entries[entry.get('user_id', file_id)] = dict(entry, _file_id=file_id)
+        return entries
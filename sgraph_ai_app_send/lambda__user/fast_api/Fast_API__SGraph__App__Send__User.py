@@ -1,3 +1,5 @@
+from contextlib                                                                     import asynccontextmanager
+from starlette.concurrency                                                          import run_in_threadpool
 from osbot_fast_api_serverless.fast_api.routes.Routes__Info import Routes__Info
 
 from osbot_fast_api_serverless.fast_api.Serverless__Fast_API                        import Serverless__Fast_API
@@ -16,8 +18,11 @@ from sgraph_ai_app_send.lambda__user.storage.Send__Config
 from sgraph_ai_app_send.lambda__user.user__config                                   import APP__SEND__USER__FAST_API__TITLE, APP__SEND__USER__FAST_API__DESCRIPTION
 from sgraph_ai_app_send.lambda__user.service.Admin__Service__Client                 import Admin__Service__Client
 from sgraph_ai_app_send.lambda__user.service.Admin__Service__Client__Setup          import setup_admin_service_client__remote
+from sgraph_ai_app_send.lambda__user.service.Token__Status__Cache                   import Token__Status__Cache
+from sgraph_ai_app_send.lambda__user.service.Token__Usage__Queue                   import Token__Usage__Queue
 from sgraph_ai_app_send.lambda__user.user__config                                   import HEADER__SGRAPH_SEND__ACCESS_TOKEN, HEADER__SGRAPH_VAULT__WRITE_KEY, ENV_VAR__N8N_WEBHOOK_URL, ENV_VAR__N8N_WEBHOOK_SECRET
 from sgraph_ai_app_send.utils.MCP__Setup                                            import MCP__Setup
+from sgraph_ai_app_send.utils.Middleware__Flush                                     import Middleware__Flush
 from sgraph_ai_app_send.utils.Version                                               import version__sgraph_ai_app_send
 
 ROUTES_PATHS__API_DOCS                = ['/api/docs', '/api/openapi.json', '/api/redoc']
@@ -28,6 +33,8 @@ class Fast_API__SGraph__App__Send__User(Serverless__Fast_API):
     transfer_service     : Transfer__Service      = None                            # Shared transfer service instance
     presigned_service    : Service__Presigned_Urls = None                           # Presigned URL service (S3 mode only)
     admin_service_client : Admin__Service__Client = None                            # Admin Lambda client (REMOTE in prod, IN_MEMORY in tests)
+    token_status_cache   : Token__Status__Cache   = None                            # Shared token status cache (one per Lambda container)
+    token_usage_queue    : Token__Usage__Queue    = None                            # Lease-backed token usage recording (one per Lambda container)
     early_access_service : Service__Early_Access  = None                            # Early Access signup (n8n webhook)
     vault_service        : Service__Vault__Pointer = None                            # Vault pointer service (mutable files)
     vault_zip_service    : Service__Vault__Zip      = None                            # Vault zip builder with content-addressable caching
@@ -70,6 +77,13 @@ class Fast_API__SGraph__App__Send__User(Serverless__Fast_API):
             except Exception:                                                       # Admin client setup failure must not block user Lambda
                 self.admin_service_client = None
 
+        if self.token_status_cache is None and self.admin_service_client is not None:   # One cache shared by every token-checking route
+            self.token_status_cache = Token__Status__Cache(admin_service_client=self.admin_service_client)
+
+        if self.token_usage_queue is None and self.admin_service_client is not None:    # Uses spent from admin leases, events flushed at the end of each request
+            self.token_usage_queue = Token__Usage__Queue(admin_service_client = self.admin_service_client,
+                                                         token_status_cache   = self.token_status_cache  )
+
         if self.early_access_service is None:                                      # Auto-create early access service from env vars
             from osbot_utils.utils.Env import get_env
             self.early_access_service = Service__Early_Access(
@@ -109,22 +123,44 @@ class Fast_API__SGraph__App__Send__User(Serverless__Fast_API):
         self.add_routes(Routes__Info             )
         self.add_routes(Routes__Transfers        ,
                         transfer_service     = self.transfer_service     ,
-                        admin_service_client = self.admin_service_client )
+                        admin_service_client = self.admin_service_client ,
+                        token_status_cache   = self.token_status_cache   ,
+                        token_usage_queue    = self.token_usage_queue    )
         self.add_routes(Routes__Presigned        ,
                         presigned_service    = self.presigned_service    ,
-                        admin_service_client = self.admin_service_client )
+                        admin_service_client = self.admin_service_client ,
+                        token_status_cache   = self.token_status_cache   )
         self.add_routes(Routes__Early_Access   ,
                         service_early_access = self.early_access_service )
         self.add_routes(Routes__Vault__Pointer ,
                         vault_service        = self.vault_service        ,
                         vault_zip_service    = self.vault_zip_service    ,
-                        admin_service_client = self.admin_service_client )
+                        admin_service_client = self.admin_service_client ,
+                        token_status_cache   = self.token_status_cache   )
         self.add_routes(Routes__Vault__Presigned,
                         vault_presigned_service = self.vault_presigned_service,
-                        admin_service_client    = self.admin_service_client   )
+                        admin_service_client    = self.admin_service_client   ,
+                        token_status_cache      = self.token_status_cache     )
+
+        if self.token_usage_queue is not None:                                        # Ship queued usage events before Lambda freezes the container
+            self.app().add_middleware(Middleware__Flush,
+                                      flushers = [self.token_usage_queue])
+            self.setup_lifespan__close(self.token_usage_queue)                         # ... and hand its leased quota back when the app shuts down
 
         self.setup_mcp()                                                              # Mount MCP server (after all routes registered)
 
+    def setup_lifespan__close(self, closeable):                                       # Call closeable.close() at app shutdown (wraps the app's own lifespan)
+        router = self.app().router
+        inner  = router.lifespan_context
+        @asynccontextmanager
+        async def lifespan(app):
+            async with inner(app) as state:
+                try:
+                    yield state
+                finally:
+                    await run_in_threadpool(closeable.close)                          # Blocking HTTP calls to admin stay off the event loop
+        router.lifespan_context = lifespan
+
     def setup_mcp(self):                                                              # Mount MCP server on /mcp endpoint
         from sgraph_ai_app_send.lambda__user.user__config import HEADER__SGRAPH_SEND__ACCESS_TOKEN
         mcp_setup = MCP__Setup(name            = 'sgraph-send-user'                              ,
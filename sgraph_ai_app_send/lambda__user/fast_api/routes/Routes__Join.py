@@ -42,35 +42,24 @@ class Routes__Join(Fast_API__Routes):
         if not body.user_id:
             raise HTTPException(status_code=400, detail='user_id is required')
 
-        # 1. Accept invite (adds user as room member)
-        accept_result = self.service_invites.accept_invite(invite_code, body.user_id)
-        if not accept_result.get('success'):
-            reason = accept_result.get('reason', 'Failed')
+        # 1. Accept invite + add member + create session (invite and room read once, writes concurrent)
+        result = self.service_invites.accept_and_join(invite_code, body.user_id, self.service_session)
+        if not result.get('success'):
+            reason = result.get('reason', 'Failed')
             status = 404 if reason == 'not_found' else 400
             raise HTTPException(status_code=status, detail=reason)
 
-        room_id    = accept_result.get('room_id', '')
-        permission = accept_result.get('permission', 'viewer')
-
-        # 2. Create session token for immediate room access
-        session = self.service_session.create_session(room_id, body.user_id, permission)
-
-        # 3. Look up room metadata for the UI
-        room_data = self.service_invites.service_data_room.get_room(room_id)
-        room_name      = room_data.get('name', '')           if room_data else ''
-        vault_cache_key = room_data.get('vault_cache_key', '') if room_data else ''
-
-        # 4. Audit
-        self.service_audit.log(room_id, body.user_id, 'invite.accepted',
+        # 2. Audit (written before log() returns)
+        self.service_audit.log(result.get('room_id', ''), body.user_id, 'invite.accepted',
                                target_guid=invite_code)
 
-        return dict(success         = True            ,
-                    room_id         = room_id         ,
-                    room_name       = room_name       ,
-                    vault_cache_key = vault_cache_key  ,
-                    permission      = permission       ,
-                    session_token   = session.get('session_token', '') if session else '' ,
-                    expires         = session.get('expires', '')       if session else '' )
+        return dict(success         = True                                  ,
+                    room_id         = result.get('room_id'        , '')     ,
+                    room_name       = result.get('room_name'      , '')     ,
+                    vault_cache_key = result.get('vault_cache_key', '')     ,
+                    permission      = result.get('permission'     , '')     ,
+                    session_token   = result.get('session_token'  , '')     ,
+                    expires         = result.get('expires'        , '')     )
 
     # ═══════════════════════════════════════════════════════════════════════
     # Validate session (for room page to check access on load)
@@ -82,8 +71,8 @@ class Routes__Join(Fast_API__Routes):
         result = self.service_session.validate_session(session_token)
 
         if result.get('valid'):
-            room_id   = result.get('room_id', '')
-            room_data = self.service_invites.service_data_room.get_room(room_id)
+            result.pop('extra', None)                                               # Signed claims are readable by anyone: the vault key only comes from the room
+            room_data = self.service_invites.service_data_room.get_room(result.get('room_id', ''))
             result['room_name']       = room_data.get('name', '')            if room_data else ''
             result['vault_cache_key'] = room_data.get('vault_cache_key', '') if room_data else ''
 
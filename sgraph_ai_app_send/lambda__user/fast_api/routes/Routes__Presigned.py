@@ -25,6 +25,7 @@ class Routes__Presigned(Fast_API__Routes):
     tag                  : str = TAG__ROUTES_PRESIGNED
     presigned_service    : Service__Presigned_Urls                                   # Auto-initialized by Type_Safe
     admin_service_client : object = None                                             # Optional Admin__Service__Client
+    token_status_cache   : object = None                                             # Token__Status__Cache built once by the app and shared by every token-checking route
 
     def check_access_token(self, request: Request):                                  # Same token validation as Routes__Transfers
         provided_token = request.headers.get(HEADER__SGRAPH_SEND__ACCESS_TOKEN, '')
@@ -33,10 +34,9 @@ class Routes__Presigned(Fast_API__Routes):
             if not provided_token:
                 raise HTTPException(status_code=401, detail='Access token required')
             try:
-                response = self.admin_service_client.token_lookup(provided_token)
-                if response.status_code == 404:
+                status_code, data = self.token_status_cache.token_status(provided_token) # Cached — adds no admin round trip on a hit
+                if status_code == 404:
                     raise HTTPException(status_code=401, detail='Invalid access token')
-                data = response.json()
                 if data.get('status') != 'active':
                     raise HTTPException(status_code=401, detail=f'Access token {data.get("status", "invalid")}')
                 return provided_token
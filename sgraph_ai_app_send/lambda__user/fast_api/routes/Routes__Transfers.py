@@ -33,6 +33,28 @@ class Routes__Transfers(Fast_API__Routes):
     tag                  : str = TAG__ROUTES_TRANSFERS
     transfer_service     : Transfer__Service                                     # Auto-initialized by Type_Safe
     admin_service_client : object = None                                         # Optional Admin__Service__Client (typed as object to avoid circular import)
+    token_status_cache   : object = None                                         # Token__Status__Cache built once by the app and shared by every token-checking route
+    token_usage_queue    : object = None                                         # Optional Token__Usage__Queue (batched usage recording, injected by app)
+
+    def record_token_use(self, token_name, ip_hash, action, transfer_id=''):     # Consume one use — spent from an admin lease when a usage queue is wired, else synchronous
+        if self.token_usage_queue is None:
+            return self.admin_service_client.token_use(token_name  = token_name  ,
+                                                       ip_hash     = ip_hash     ,
+                                                       action      = action      ,
+                                                       transfer_id = transfer_id ).json()
+        status_code, data = self.token_status_cache.token_status(token_name)
+        if status_code == 404:
+            return dict(success=False, reason='not_found')
+        if status_code != 200:
+            raise ValueError(f'token lookup failed: {status_code}')
+        status = data.get('status', '')
+        if status in ('revoked', 'exhausted'):
+            return dict(success=False, reason=status)
+        return self.token_usage_queue.use(token_name  = token_name  ,
+                                          token_data  = data        ,
+                                          ip_hash     = ip_hash     ,
+                                          action      = action      ,
+                                          transfer_id = transfer_id )
 
     def check_access_token(self, request: Request, access_token: str = ''):      # Validate access token — header, query param, or env-var fallback
         raw_token      = (access_token                                                 # MCP tool parameter (Claude.ai web)
@@ -46,11 +68,10 @@ class Routes__Transfers(Fast_API__Routes):
                 raise HTTPException(status_code = 401,
                                     detail      = 'Access token required')
             try:
-                response = self.admin_service_client.token_lookup(provided_token)
-                if response.status_code == 404:
+                status_code, data = self.token_status_cache.token_status(provided_token) # Cached — adds no admin round trip on a hit
+                if status_code == 404:
                     raise HTTPException(status_code = 401,
                                         detail      = 'Invalid access token')
-                data = response.json()
                 if data.get('status') != 'active':
                     raise HTTPException(status_code = 401,
                                         detail      = f'Access token {data.get("status", "invalid")}')
@@ -140,10 +161,10 @@ class Routes__Transfers(Fast_API__Routes):
         if token_name and self.admin_service_client is not None:
             try:
                 ip_hash = hashlib.sha256((request.client.host if request.client else '').encode()).hexdigest()
-                self.admin_service_client.token_use(token_name  = token_name              ,
-                                                    ip_hash     = ip_hash                  ,
-                                                    action      = 'upload_completed'       ,
-                                                    transfer_id = str(transfer_id)         )
+                self.record_token_use(token_name  = token_name              ,
+                                      ip_hash     = ip_hash                  ,
+                                      action      = 'upload_completed'       ,
+                                      transfer_id = str(transfer_id)         )
             except Exception:
                 pass                                                             # Non-critical — don't fail the upload if usage tracking fails
 
@@ -238,10 +259,9 @@ class Routes__Transfers(Fast_API__Routes):
             return dict(success = True)                                          # No admin service → always valid (dev mode)
         try:
             ip_hash = hashlib.sha256((request.client.host if request.client else '').encode()).hexdigest()
-            response = self.admin_service_client.token_use(token_name  = token_name    ,
-                                                            ip_hash     = ip_hash       ,
-                                                            action      = 'page_opened' )
-            return response.json()
+            return self.record_token_use(token_name = str(token_name) ,
+                                         ip_hash    = ip_hash         ,
+                                         action     = 'page_opened'   )
         except Exception:
             raise HTTPException(status_code = 503,
                                 detail      = 'Token validation service unavailable')
@@ -38,6 +38,7 @@ class Routes__Vault__Pointer(Fast_API__Routes):
     vault_service        : Service__Vault__Pointer                               # Auto-initialized by Type_Safe
     vault_zip_service    : Service__Vault__Zip      = None                       # Vault zip builder (optional — injected by app)
     admin_service_client : object = None                                         # Optional Admin__Service__Client
+    token_status_cache   : object = None                                         # Token__Status__Cache built once by the app and shared by every token-checking route
 
     @staticmethod
     def _validate_vault_id(vault_id):                                            # Reject non-opaque vault IDs (security: prevents leaking names into S3/logs)
@@ -55,11 +56,10 @@ class Routes__Vault__Pointer(Fast_API__Routes):
                 raise HTTPException(status_code = 401,
                                     detail      = 'Access token required')
             try:
-                response = self.admin_service_client.token_lookup(provided_token)
-                if response.status_code == 404:
+                status_code, data = self.token_status_cache.token_status(provided_token) # Cached — adds no admin round trip on a hit
+                if status_code == 404:
                     raise HTTPException(status_code = 401,
                                         detail      = 'Invalid access token')
-                data = response.json()
                 if data.get('status') != 'active':
                     raise HTTPException(status_code = 401,
                                         detail      = f'Access token {data.get("status", "invalid")}')
@@ -20,9 +20,21 @@ class Admin__Service__Client(Type_Safe):
                                                  action      = action      ,
                                                  transfer_id = transfer_id ))
 
+    def token_use_batch(self, events):                                           # Record many queued usages in one call (grouped per token by admin)
+        return self.requests().execute('POST', '/tokens/use-batch', body=dict(events=events))
+
+    def token_lease(self, token_name, size):                                     # Reserve a block of uses (quota lease)
+        return self.requests().execute('POST', f'/tokens/lease/{token_name}?size={int(size)}')
+
+    def token_release(self, token_name, lease_id, unused):                       # Return the unused part of a lease
+        return self.requests().execute('POST', f'/tokens/release/{token_name}?lease_id={lease_id}&unused={int(unused)}')
+
     def token_lookup(self, token_name):                                          # Look up token by name via admin service
         return self.requests().execute('GET', f'/tokens/lookup/{token_name}')
 
+    def token_generation(self):                                                  # Token status generation (changes on revoke/exhaust/reactivate)
+        return self.requests().execute('GET', '/tokens/generation')
+
     def token_create(self, token_name, usage_limit=50, created_by='system', metadata=None):  # Create a new token via admin service
         return self.requests().execute('POST', '/tokens/create',
                                        body=dict(token_name  = token_name       ,
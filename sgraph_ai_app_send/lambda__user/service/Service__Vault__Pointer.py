@@ -136,6 +136,17 @@ class Service__Vault__Pointer(Type_Safe):
                         status  = 'conflict' ,
                         current = current_b64)
 
+    def write_if_hash_match(self, vault_id, file_id, match_hash, data_b64,       # Compare-and-swap on SHA-256 of current content (no payload read on S3)
+                            write_key_hex):
+        submitted_hash = self._hash_write_key(write_key_hex)
+        if not self._check_vault_write_key(vault_id, submitted_hash):
+            return None                                                          # Auth failure
+
+        self._ensure_manifest(vault_id, submitted_hash)
+        result = self._cas_write_hash(vault_id, file_id, match_hash, data_b64)
+        del result['op']
+        return result
+
     def list_files(self, vault_id, prefix=''):                                   # List file_ids in a vault matching prefix
         vault_folder = path__vault_prefix(vault_id) + prefix if prefix else path__vault_prefix(vault_id)
         scoped_paths = self.storage_fs.folder__files__all(vault_folder)          # Scoped S3 list — only this vault's prefix
@@ -183,9 +194,11 @@ class Service__Vault__Pointer(Type_Safe):
                 results.append(dict(op = 'write', file_id = file_id, status = 'ok'))
 
             elif op_type == 'write-if-match':
-                match_val = op.get('match')
                 data_val  = op.get('data')
-                cas_result = self._cas_write(vault_id, file_id, match_val, data_val)
+                if 'match_hash' in op:                                           # Hash mode: client sends SHA-256 of expected content
+                    cas_result = self._cas_write_hash(vault_id, file_id, op.get('match_hash'), data_val)
+                else:
+                    cas_result = self._cas_write(vault_id, file_id, op.get('match'), data_val)
                 results.append(cas_result)
                 if cas_result['status'] == 'conflict':                           # Stop on conflict
                     break
@@ -258,3 +271,35 @@ class Service__Vault__Pointer(Type_Safe):
         else:
             current_b64 = base64.b64encode(current).decode('ascii') if current else None
             return dict(op = 'write-if-match', file_id = file_id, status = 'conflict', current = current_b64)
+
+    def _cas_write_hash(self, vault_id, file_id, match_hash, data_b64):         # Internal hash-based CAS (no auth check — already validated)
+        payload_path       = self.vault_payload_path(vault_id, file_id)
+        current_hash, etag = self._content_hash(payload_path)
+        expected_hash      = match_hash.lower().replace('sha256:', '') if match_hash else None
+
+        if current_hash == expected_hash:
+            new_data = base64.b64decode(data_b64)
+            if self._save_if_unchanged(payload_path, new_data, etag):
+                return dict(op = 'write-if-match', file_id = file_id, status = 'ok', hash = hashlib.sha256(new_data).hexdigest())
+            current_hash, _ = self._content_hash(payload_path)                   # Lost a race with another instance — report the winner's hash
+        return dict(op = 'write-if-match', file_id = file_id, status = 'conflict', current_hash = current_hash)
+
+    def _content_hash(self, payload_path):                                       # (sha256_hex, etag) of current payload, (None, None) if absent
+        content_hash = getattr(self.storage_fs, 'file__content_hash', None)      # S3 backend: HEAD returns stored hash + ETag
+        if content_hash:
+            details = content_hash(payload_path)
+            if details is None:
+                return None, None
+            if details.get('sha256'):
+                return details.get('sha256'), details.get('etag')
+            payload = self.storage_fs.file__bytes(payload_path)                  # Legacy object without stored hash — hash it once
+            return hashlib.sha256(payload).hexdigest(), details.get('etag')
+        if not self.storage_fs.file__exists(payload_path):
+            return None, None
+        return hashlib.sha256(self.storage_fs.file__bytes(payload_path)).hexdigest(), None
+
+    def _save_if_unchanged(self, payload_path, data, etag):                      # Conditional save where the backend supports it (S3 If-Match / If-None-Match)
+        save_if_match = getattr(self.storage_fs, 'file__save__if_match', None)
+        if save_if_match:
+            return save_if_match(payload_path, data, etag)
+        return self.storage_fs.file__save(payload_path, data)
@@ -0,0 +1,81 @@
+# ===============================================================================
+# SGraph Send - Token Status Cache
+# In-process positive/negative cache of admin token lookups for the user Lambda
+# Bounded (LRU), short TTLs, and flushed whenever the admin token generation
+# changes (revoke / exhaust / reactivate / create) — polled at most every few seconds
+# ===============================================================================
+
+import time
+from osbot_utils.type_safe.Type_Safe                                             import Type_Safe
+
+TOKEN_CACHE__TTL__POSITIVE      = 30.0                                           # Seconds a found token (any status) is trusted
+TOKEN_CACHE__TTL__NEGATIVE      = 5.0                                            # Seconds an unknown token stays rejected
+TOKEN_CACHE__GENERATION_POLL    = 2.0                                            # Seconds between /tokens/generation polls
+TOKEN_CACHE__MAX_ENTRIES        = 1024                                           # LRU bound on cached tokens
+
+
+class Token__Status__Cache(Type_Safe):                                           # Hot-path token validation cache
+    admin_service_client : object = None                                         # Admin__Service__Client (token_lookup + token_generation)
+    ttl_positive         : float  = TOKEN_CACHE__TTL__POSITIVE
+    ttl_negative         : float  = TOKEN_CACHE__TTL__NEGATIVE
+    generation_poll      : float  = TOKEN_CACHE__GENERATION_POLL
+    max_entries          : int    = TOKEN_CACHE__MAX_ENTRIES
+    entries              : dict                                                  # token_name → (expires_at, status_code, data), insertion order = LRU order
+    generation           : int    = -1                                           # Last admin generation seen (-1 = never polled)
+    generation_checked   : float  = float('-inf')                                # When the generation was last polled (never)
+
+    def now(self):                                                               # Monotonic clock (overridable in tests)
+        return time.monotonic()
+
+    def token_status(self, token_name):                                          # (status_code, token_data) — 200/404 cached, anything else passed through
+        now = self.now()
+        self.refresh_generation(now)
+        cached = self.entries.pop(token_name, None)
+        if cached is not None and cached[0] > now:
+            self.entries[token_name] = cached                                    # Re-insert: most recently used
+            return cached[1], cached[2]
+
+        response    = self.admin_service_client.token_lookup(token_name)
+        status_code = response.status_code
+        if status_code == 404:
+            self.store(token_name, now + self.ttl_negative, status_code, None)
+            return status_code, None
+        data = response.json()
+        if status_code == 200:
+            self.store(token_name, now + self.ttl_positive, status_code, data)
+        return status_code, data
+
+    def store(self, token_name, expires_at, status_code, data):                  # Insert and evict least recently used beyond max_entries
+        if self.max_entries <= 0:
+            return
+        self.entries[token_name] = (expires_at, status_code, data)
+        while len(self.entries) > self.max_entries:
+            self.entries.pop(next(iter(self.entries)), None)
+
+    def refresh_generation(self, now):                                           # Poll admin generation; flush everything when it moved
+        if now - self.generation_checked < self.generation_poll:
+            return
+        self.generation_checked = now
+        try:
+            response   = self.admin_service_client.token_generation()
+            generation = response.json().get('generation', 0) if response.status_code == 200 else -1
+        except Exception:
+            generation = -1                                                      # Admin unreachable — retry on the next poll
+        if generation < 0 or generation != self.generation:                      # Moved (or unknown) — cached statuses can't be trusted
+            self.entries.clear()
+            self.generation = generation
+
+    def apply_usage(self, token_name, usage_count, status=''):                   # Adopt admin-confirmed usage (from a batched flush) without a lookup
+        cached = self.entries.get(token_name)
+        if cached is None or cached[1] != 200:
+            return
+        data = dict(cached[2], usage_count=usage_count)
+        if status:
+            data['status'] = status
+        self.entries[token_name] = (cached[0], cached[1], data)
+
+    def invalidate(self, token_name=None):                                       # Drop one token (or everything)
+        if token_name is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(token_name, None)
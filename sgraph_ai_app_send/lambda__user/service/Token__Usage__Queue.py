@@ -0,0 +1,145 @@
+# ===============================================================================
+# SGraph Send - Token Usage Queue
+# Spends token uses from quota leases granted by admin (one call per block of
+# uses instead of one per request). Admin never grants past usage_limit, so the
+# limit holds across every user Lambda container. The usage events themselves
+# are shipped to admin in batches via POST /tokens/use-batch, which stores one
+# usage-event document per event. The app flushes the queue after each
+# response (Middleware__Flush) — nothing waits on a background thread that a
+# frozen Lambda container would never run. Leases left unused for lease_idle
+# seconds are handed back by that flush, and the rest on app shutdown (close).
+# ===============================================================================
+
+import secrets
+import threading
+import time
+from osbot_utils.type_safe.Type_Safe                                             import Type_Safe
+
+TOKEN_USAGE__MAX_BATCH          = 50                                             # Events per /tokens/use-batch call
+TOKEN_USAGE__MAX_PENDING        = 10_000                                         # Hard bound on queued events while admin is unreachable
+TOKEN_USAGE__LEASE_SIZE         = 5                                              # Uses leased from admin per call (quota held by one container)
+TOKEN_USAGE__LEASE_MARGIN       = 30                                             # Seconds before admin's lease expiry that we stop spending it
+TOKEN_USAGE__LEASE_IDLE         = 60                                             # Seconds without a use after which a flush returns the lease's quota
+
+
+class Token__Usage__Queue(Type_Safe):                                            # Lease-backed, record-in-batches token usage
+    admin_service_client : object = None                                         # Admin__Service__Client (token_lease, token_use_batch, token_release)
+    token_status_cache   : object = None                                         # Optional Token__Status__Cache (refreshed after each flush)
+    max_batch            : int    = TOKEN_USAGE__MAX_BATCH
+    max_pending          : int    = TOKEN_USAGE__MAX_PENDING
+    lease_size           : int    = TOKEN_USAGE__LEASE_SIZE
+    lease_idle           : int    = TOKEN_USAGE__LEASE_IDLE
+    pending              : list                                                  # Queued usage events (oldest first)
+    leases               : dict                                                  # token_name → {lease_id, remaining, usage_count, usage_limit, deadline}
+    lease_locks          : dict                                                  # token_name → Lock held while leasing (never self.lock during HTTP)
+    lock                 : object = None
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.lock = threading.Lock()
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Request path
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def use(self, token_name, token_data=None, ip_hash='', action='page_opened', transfer_id=''):  # Spend one use from a local lease (leasing a new block when empty)
+        with self.lock:
+            if len(self.pending) >= self.max_pending:                            # Admin unreachable for too long — refuse rather than drop recorded uses
+                return dict(success=False, reason='busy')
+            spent = self.lease_spend(token_name, ip_hash, action, transfer_id)
+        if spent:
+            return spent
+        with self.lease_lock(token_name):                                        # One lease call per token at a time; other tokens are not blocked
+            with self.lock:
+                spent = self.lease_spend(token_name, ip_hash, action, transfer_id)   # Another request may have leased while we waited
+            if spent:
+                return spent
+            response = self.admin_service_client.token_lease(token_name, max(1, self.lease_size))
+            data     = response.json() if response.status_code == 200 else {}
+            if not data.get('success'):
+                return dict(success=False, reason=data.get('reason', 'exhausted'))
+            lease = dict(lease_id    = data['lease_id']                                                    ,
+                         remaining   = data['granted']                                                     ,
+                         usage_count = data['usage_count'] - data['granted']                               ,
+                         usage_limit = data.get('usage_limit', 0)                                          ,
+                         deadline    = time.monotonic() + data.get('lease_ttl', 0) - TOKEN_USAGE__LEASE_MARGIN,
+                         last_used   = time.monotonic()                                                    )
+            with self.lock:
+                self.leases[token_name] = lease
+                return self.lease_spend(token_name, ip_hash, action, transfer_id)
+
+    def lease_spend(self, token_name, ip_hash, action, transfer_id):             # Spend one use of a live lease (caller holds self.lock); None when a new lease is needed
+        lease = self.leases.get(token_name)
+        if lease is None or lease['remaining'] <= 0 or time.monotonic() >= lease['deadline']:
+            return None                                                          # An expired lease is simply dropped: admin then counts only its recorded uses
+        lease['remaining']   -= 1
+        lease['usage_count'] += 1
+        lease['last_used']    = time.monotonic()
+        self.pending.append(dict(token_name  = token_name         ,
+                                 ip_hash     = ip_hash            ,
+                                 action      = action             ,
+                                 transfer_id = transfer_id        ,
+                                 event_id    = secrets.token_hex(8),
+                                 lease_id    = lease['lease_id']  ))
+        usage_limit = lease['usage_limit']
+        return dict(success     = True                                                           ,
+                    usage_count = lease['usage_count']                                           ,
+                    remaining   = max(0, usage_limit - lease['usage_count']) if usage_limit > 0 else -1)
+
+    def lease_lock(self, token_name):                                            # Per-token lock guarding the lease call
+        with self.lock:
+            return self.lease_locks.setdefault(token_name, threading.Lock())
+
+    def release_leases(self, idle=None):                                         # Hand unused lease quota back to admin (idle → only leases unused for that many seconds)
+        now = time.monotonic()
+        with self.lock:
+            leases = {token_name: lease for token_name, lease in self.leases.items()
+                      if idle is None or now - lease['last_used'] >= idle}
+            for token_name in leases:
+                del self.leases[token_name]
+        for token_name, lease in leases.items():
+            if lease['remaining'] > 0 and now < lease['deadline']:
+                try:
+                    self.admin_service_client.token_release(token_name, lease['lease_id'], lease['remaining'])
+                except Exception:
+                    pass                                                         # Unreturned quota is lost, never over-granted
+        return len(leases)
+
+    def close(self):                                                             # Drain the queue and return leased quota
+        self.flush()
+        self.release_leases()
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Flush (called by Middleware__Flush after every response)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def flush(self):                                                             # Ship queued events to admin, then return idle leases; returns number of events sent
+        sent = 0
+        while True:
+            with self.lock:
+                batch = self.pending[:self.max_batch]
+                del self.pending[:len(batch)]
+            if not batch:
+                self.release_leases(idle=self.lease_idle)                        # Quota a quiet container holds is free for the others again
+                return sent
+            try:
+                response = self.admin_service_client.token_use_batch(batch)
+                results  = response.json().get('results', {}) if response.status_code == 200 else None
+            except Exception:
+                results  = None
+            if results is None:                                                  # Admin unreachable — put the batch back for the next request's flush
+                with self.lock:
+                    self.pending[:0] = batch
+                return sent
+            self.apply_results(batch, results)
+            sent += len(batch)
+
+    def apply_results(self, batch, results):                                     # Feed admin's counts back into the token status cache
+        if self.token_status_cache is None:
+            return
+        for token_name in dict.fromkeys(event['token_name'] for event in batch):
+            result = results.get(token_name) or {}
+            if result.get('reason') == 'not_found':
+                self.token_status_cache.invalidate(token_name)
+            elif 'usage_count' in result:
+                self.token_status_cache.apply_usage(token_name, result['usage_count'], result.get('status', ''))
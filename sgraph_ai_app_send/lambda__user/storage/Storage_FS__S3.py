@@ -3,6 +3,7 @@
 # Storage_FS implementation backed by AWS S3 via osbot-aws
 # ===============================================================================
 
+import hashlib
 from typing                                                                     import List
 from osbot_aws.AWS_Config                                                       import aws_config
 from osbot_aws.aws.s3.S3                                                        import S3
@@ -11,6 +12,9 @@ from osbot_utils.type_safe.type_safe_core.decorators.type_safe
 from osbot_utils.utils.Json                                                     import bytes_to_json
 from memory_fs.storage_fs.Storage_FS                                            import Storage_FS
 
+S3_METADATA__CONTENT_SHA256 = 'content-sha256'                                  # User metadata key holding the payload SHA-256 (read via HEAD, no GET)
+S3_ERROR_CODES__PRECONDITION = ('PreconditionFailed', 'ConditionalRequestConflict')
+
 
 class Storage_FS__S3(Storage_FS):                                               # S3-backed Storage_FS implementation
     s3_bucket : str                                                             # S3 bucket name
@@ -64,10 +68,45 @@ class Storage_FS__S3(Storage_FS):
     def file__save(self, path: Safe_Str__File__Path,                            # Save bytes to S3
                          data: bytes
                    ) -> bool:
-        key = self.s3_key(path)
+        key      = self.s3_key(path)
+        metadata = {S3_METADATA__CONTENT_SHA256: hashlib.sha256(data).hexdigest()}
         return self.s3.file_create_from_bytes(file_bytes = data            ,
                                               bucket     = self.s3_bucket  ,
-                                              key        = key             )
+                                              key        = key             ,
+                                              metadata   = metadata        )
+
+    def file__content_hash(self, path: Safe_Str__File__Path):                   # HEAD-only: stored SHA-256 + ETag (no payload read)
+        from botocore.exceptions import ClientError
+        key = self.s3_key(path)
+        try:
+            details = self.s3.client().head_object(Bucket=self.s3_bucket, Key=key)
+        except ClientError:
+            return None                                                         # File doesn't exist
+        metadata = details.get('Metadata') or {}
+        return dict(sha256 = metadata.get(S3_METADATA__CONTENT_SHA256) ,       # None for objects written before the hash was recorded
+                    etag   = details.get('ETag')                       )
+
+    def file__save__if_match(self, path: Safe_Str__File__Path,                  # Conditional put: If-Match etag, or If-None-Match * when etag is None
+                                   data: bytes,
+                                   etag: str = None
+                             ) -> bool:
+        from botocore.exceptions import ClientError
+        key    = self.s3_key(path)
+        kwargs = dict(Body     = data                                                          ,
+                      Bucket   = self.s3_bucket                                                ,
+                      Key      = key                                                           ,
+                      Metadata = {S3_METADATA__CONTENT_SHA256: hashlib.sha256(data).hexdigest()})
+        if etag:
+            kwargs['IfMatch']     = etag
+        else:
+            kwargs['IfNoneMatch'] = '*'
+        try:
+            self.s3.client().put_object(**kwargs)
+            return True
+        except ClientError as error:
+            if error.response.get('Error', {}).get('Code') in S3_ERROR_CODES__PRECONDITION:
+                return False                                                    # Lost the race — another writer changed the object
+            raise
 
     @type_safe
     def file__str(self, path: Safe_Str__File__Path) -> str:                     # Read file as string from S3
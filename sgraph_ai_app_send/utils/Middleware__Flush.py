@@ -0,0 +1,42 @@
+# ===============================================================================
+# SGraph Send - Flush Middleware
+# Flushes write-behind buffers (user token usage queue, admin analytics
+# buffer) once per HTTP request, as a background task of the response: the
+# body is sent first and the flush runs after it, still inside the request's
+# ASGI call. Lambda freezes the container once that call returns, so anything
+# still buffered would wait for the next request (or be lost with the
+# container) — flushing here is what makes buffering safe without a
+# background thread.
+# ===============================================================================
+
+from starlette.background                                                       import BackgroundTasks
+from starlette.concurrency                                                      import run_in_threadpool
+from starlette.middleware.base                                                  import BaseHTTPMiddleware
+from starlette.requests                                                        import Request
+
+
+class Middleware__Flush(BaseHTTPMiddleware):                                # One flush of every buffer per HTTP request
+
+    def __init__(self, app, flushers: list):                                # Anything with a flush() method (None entries are skipped)
+        super().__init__(app)
+        self.flushers = [flusher for flusher in flushers if flusher is not None]
+
+    async def dispatch(self, request: Request, call_next):
+        try:
+            response = await call_next(request)
+        except Exception:
+            await self.flush()                                             # No response to defer to — flush on the way out of the failure
+            raise
+        tasks = BackgroundTasks()
+        if response.background is not None:                                # Keep any task the response already carries (it runs first)
+            tasks.add_task(response.background)
+        tasks.add_task(self.flush)
+        response.background = tasks
+        return response
+
+    async def flush(self):
+        for flusher in self.flushers:
+            try:
+                await run_in_threadpool(flusher.flush)                     # Blocking cache/HTTP writes stay off the event loop
+            except Exception:
+                pass                                                       # A failed flush keeps its events buffered for the next request
@@ -0,0 +1,75 @@
+# ===============================================================================
+# SGraph Send - Vault ACL Benchmarks
+# Permission checks and listing against vaults with 1, 100 and 10k members
+# (in-memory cache service — measures the per-user ACL listing + lookup path)
+#   A — check_permission, listing cached in-process
+#   B — check_permission, cold (one listing)
+#   C — list_permissions, cold (one listing + parallel entry reads)
+# ===============================================================================
+
+from datetime                                                                                          import datetime, timezone
+from osbot_utils.helpers.performance.benchmark.testing.TestCase__Benchmark__Timing                    import TestCase__Benchmark__Timing
+from osbot_utils.helpers.performance.benchmark.schemas.timing.Schema__Perf_Benchmark__Timing__Config   import Schema__Perf_Benchmark__Timing__Config
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Setup                                       import create_send_cache_client
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client__Vault                               import Send__Cache__Client__Vault
+from sgraph_ai_app_send.lambda__admin.service.Service__Vault                                           import Service__Vault
+from sgraph_ai_app_send.lambda__admin.service.Service__Vault__ACL                                      import Service__Vault__ACL
+
+VAULT_SIZES = (1, 100, 10_000)
+
+
+class test__performance__vault_acl(TestCase__Benchmark__Timing):
+
+    config = Schema__Perf_Benchmark__Timing__Config(
+        title            = 'Vault ACL: one entry per user'                ,
+        description      = 'check_permission / list_permissions by size'  ,
+        measure_only_3   = True                                           ,
+        print_to_console = True                                           ,
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        send_cache_client      = create_send_cache_client()
+        cls.vault_cache_client = Send__Cache__Client__Vault(
+            cache_client   = send_cache_client.cache_client   ,
+            hash_generator = send_cache_client.hash_generator )
+        cls.vault_acl          = Service__Vault__ACL(vault_cache_client=cls.vault_cache_client)
+        vault_service          = Service__Vault(vault_cache_client=cls.vault_cache_client, vault_acl=cls.vault_acl)
+        now                    = datetime.now(timezone.utc).isoformat()
+        cls.vaults             = {}
+        for size in VAULT_SIZES:                                                 # Write the entries directly (grant_access re-lists the ACL each time)
+            cache_id = vault_service.create(f'acl-bench-{size}')['cache_id']
+            for index in range(size):
+                user_id    = f'user-{index:05d}'
+                permission = 'owner' if index == 0 else 'viewer'
+                cls.vault_cache_client.acl__grant_save(cache_id, user_id, permission, dict(user_id    = user_id      ,
+                                                                                             permission = permission   ,
+                                                                                             granted_by = 'user-00000' ,
+                                                                                             granted_at = now          ,
+                                                                                             active     = True         ))
+            cls.vaults[size] = cache_id
+
+    def cold_acl(self):                                                          # Fresh instance: nothing cached
+        return Service__Vault__ACL(vault_cache_client=self.vault_cache_client)
+
+    def test__A__check_permission__cached(self):
+        for size, cache_id in self.vaults.items():
+            last_user = f'user-{size - 1:05d}'
+            self.vault_acl.can_view(cache_id, last_user)                         # Warm the listing
+            def target():
+                assert self.vault_acl.can_view(cache_id, last_user) is True
+            self.benchmark(f'A_{size:05d}__check_permission__cached', target)
+
+    def test__B__check_permission__cold(self):
+        for size, cache_id in self.vaults.items():
+            last_user = f'user-{size - 1:05d}'
+            def target():
+                assert self.cold_acl().can_view(cache_id, last_user) is True
+            self.benchmark(f'B_{size:05d}__check_permission__cold', target)
+
+    def test__C__list_permissions__cold(self):
+        for size, cache_id in self.vaults.items():
+            def target():
+                assert len(self.cold_acl().list_permissions(cache_id)) == size
+            self.benchmark(f'C_{size:05d}__list_permissions__cold', target)
@@ -0,0 +1,30 @@
+# ===============================================================================
+# Test helper: counts Cache Service round trips made through a Send__Cache__Client
+# Wraps the shared Cache__Service__Client__Requests.execute used by every facade
+# ===============================================================================
+
+from osbot_utils.type_safe.Type_Safe                                                import Type_Safe
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client                   import Send__Cache__Client
+
+
+class Send__Cache__Call__Counter(Type_Safe):
+    send_cache_client : Send__Cache__Client = None
+    calls             : list
+    original_execute  : object              = None
+
+    def __enter__(self):
+        requests              = self.send_cache_client.cache_client.requests()
+        self.original_execute = requests.execute
+        def execute(*args, **kwargs):
+            self.calls.append(f"{kwargs.get('method')} {kwargs.get('path')}")
+            return self.original_execute(*args, **kwargs)
+        requests.execute = execute
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        requests = self.send_cache_client.cache_client.requests()
+        del requests.execute                                                        # Restore the class-level method
+        return False
+
+    def count(self):
+        return len(self.calls)
@@ -100,3 +100,19 @@ class test_Routes__Tokens(TestCase):
         assert len(data['tokens']) > 0
         token_names = [t['token_name'] for t in data['tokens']]
         assert 'route-detail-1' in token_names
+
+    def test__list_details__paginated(self):
+        for i in range(3):
+            self.client.post('/tokens/create', json=dict(token_name=f'route-page-{i}', usage_limit=5))
+        names  = []
+        cursor = ''
+        for _ in range(100):
+            data   = self.client.get('/tokens/list-details', params=dict(cursor=cursor, limit=2)).json()
+            assert len(data['tokens']) <= 2
+            names += [token['token_name'] for token in data['tokens']]
+            cursor = data['next_cursor']
+            if cursor is None:
+                break
+        assert names                 == sorted(names)
+        assert len(names)            == len(set(names))
+        assert {'route-page-0', 'route-page-1', 'route-page-2'} <= set(names)
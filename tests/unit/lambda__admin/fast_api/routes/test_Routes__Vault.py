@@ -0,0 +1,62 @@
+# ===============================================================================
+# Tests for Routes__Vault
+# Integration tests: admin FastAPI app with vault file endpoints
+# ===============================================================================
+
+import base64
+from unittest                                                                       import TestCase
+from sgraph_ai_app_send.lambda__admin.fast_api.routes.Routes__Vault                import base64_json_stream
+from tests.unit.lambda__admin.Fast_API__Test_Objs__SGraph__App__Send__Admin        import setup__html_graph_service__fast_api_test_objs
+
+
+class test_Routes__Vault(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        test_objs         = setup__html_graph_service__fast_api_test_objs()
+        cls.client        = test_objs.fast_api__client
+        cls.service_vault = test_objs.fast_api.service_vault
+        cls.vault_key = 'route-vault-files-001'
+        cls.client.post('/vault/create', json=dict(vault_cache_key=cls.vault_key))
+
+    def store_chunk(self, file_guid, chunk_index, total_chunks, chunk):
+        return self.client.post('/vault/file-chunk', json=dict(vault_cache_key = self.vault_key                      ,
+                                                               file_guid       = file_guid                           ,
+                                                               chunk_index     = chunk_index                         ,
+                                                               total_chunks    = total_chunks                        ,
+                                                               chunk_data      = base64.b64encode(chunk).decode()    ))
+
+    def test__base64_json_stream__matches_one_shot_encoding(self):
+        parts = [b'a', b'bcde', b'', b'fghijklm', b'n']                      # Part sizes not aligned to 3 bytes
+        assert b''.join(base64_json_stream(parts)) == b'{"data":"' + base64.b64encode(b''.join(parts)) + b'"}'
+        assert b''.join(base64_json_stream([]))    == b'{"data":""}'
+
+    def test__file__assembled__streamed_and_listed(self):
+        chunks = [b'\x01' * 1000, b'\x02' * 1001, b'\x03' * 7]
+        for chunk_index, chunk in enumerate(chunks):
+            assert self.store_chunk('route-big-file', chunk_index, len(chunks), chunk).status_code == 200
+        response = self.client.post('/vault/file-assemble', json=dict(vault_cache_key=self.vault_key, file_guid='route-big-file', total_chunks=len(chunks)))
+        assert response.json()['size'] == 2008
+
+        response = self.client.get(f'/vault/file/{self.vault_key}/route-big-file')
+        assert response.status_code == 200
+        assert base64.b64decode(response.json()['data']) == b''.join(chunks)
+
+        listing = self.client.get(f'/vault/files/{self.vault_key}').json()
+        assert 'route-big-file' in [file['data_file_id'] for file in listing['files']]
+
+    def test__file__not_found(self):
+        assert self.client.get(f'/vault/file/{self.vault_key}/no-such-file').status_code == 404
+
+    def test__file__assembled__chunk_deleted__500_before_streaming(self):
+        chunks = [b'\x04' * 10, b'\x05' * 10]
+        for chunk_index, chunk in enumerate(chunks):
+            self.store_chunk('route-lost-chunk', chunk_index, len(chunks), chunk)
+        self.client.post('/vault/file-assemble', json=dict(vault_cache_key=self.vault_key, file_guid='route-lost-chunk', total_chunks=len(chunks)))
+        vault_cache_client = self.service_vault.vault_cache_client
+        cache_id           = vault_cache_client.vault__lookup_cache_id(self.vault_key)
+        vault_cache_client.chunk__delete(cache_id, 'route-lost-chunk', 1)
+
+        response = self.client.get(f'/vault/file/{self.vault_key}/route-lost-chunk')
+        assert response.status_code == 500
+        assert response.json()['detail'] == 'File corrupt: file route-lost-chunk: chunk 1 missing'
@@ -0,0 +1,135 @@
+# ===============================================================================
+# Tests for CloudFront__Logs__Collector
+# Listing (one pass per day/hour prefix, hour cutoff, whole window), streaming
+# projected parsing, summaries folded per file, and per-file partials
+# Uses an in-memory S3 client (list_objects_v2 pages + get_object), no AWS
+# ===============================================================================
+
+import gzip
+import io
+import json
+from datetime                                                                                     import datetime, timezone, timedelta
+from unittest                                                                                     import TestCase
+from sgraph_ai_app_send.lambda__admin.server_analytics.collectors.CloudFront__Logs__Collector     import CloudFront__Logs__Collector
+from sgraph_ai_app_send.lambda__admin.server_analytics.collectors.CloudFront__Logs__Summary       import CloudFront__Logs__Summary
+
+
+def log_line(status='200', path='/index.html', time_taken='0.010', agent='agent-0', edge='LHR50-C1', result='Hit'):
+    fields = ['1700000000.0', status, '512', 'GET', path] + ['-'] * 5 + [agent, '-', edge, result] + ['-'] * 2 + [time_taken]
+    return '\t'.join(fields)
+
+
+class S3__Client__In_Memory:                                                     # list_objects_v2 paginator + get_object over a dict
+    def __init__(self, objects, page_size=2):
+        self.objects   = objects                                                 # key → (last_modified, body)
+        self.page_size = page_size
+        self.listed    = []                                                      # Prefixes listed (one entry per page)
+        self.read      = []                                                      # Keys downloaded
+
+    def get_paginator(self, operation):
+        return self
+
+    def paginate(self, Bucket, Prefix):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        for start in range(0, max(1, len(keys)), self.page_size):
+            self.listed.append(Prefix)
+            yield dict(Contents=[dict(Key=key, ETag=f'"etag-{key}"', LastModified=self.objects[key][0])
+                                 for key in keys[start:start + self.page_size]])
+
+    def get_object(self, Bucket, Key):
+        self.read.append(Key)
+        body = self.objects[Key][1].encode()
+        if not Key.endswith('.txt'):                                             # .txt objects are stored uncompressed
+            body = gzip.compress(body)
+        return dict(Body=io.BytesIO(body))
+
+
+def hourly_objects(hours, now):                                                  # One gzip log file per hour, newest first
+    objects = {}
+    for hours_ago in range(hours):
+        when = now - timedelta(hours=hours_ago, minutes=1)
+        key  = (f"cloudfront-realtime/year={when.strftime('%Y')}/month={when.strftime('%m')}/day={when.strftime('%d')}/"
+                f"stream-{when.strftime('%H%M')}.gz")
+        objects[key] = (when, log_line() + '\n' + log_line(status='404', path='/missing') + '\n')
+    return objects
+
+
+class test_CloudFront__Logs__Collector(TestCase):
+
+    def setUp(self):
+        self.now       = datetime.now(timezone.utc)
+        self.s3        = S3__Client__In_Memory(hourly_objects(48, self.now))
+        self.collector = CloudFront__Logs__Collector(logs_bucket='logs', lookback_hours=24)
+        self.collector._s3_client = self.s3
+
+    def test__log_prefixes__each_day_once(self):
+        prefixes = self.collector._log_prefixes(self.now)
+        assert len(prefixes)      == len(set(prefixes))
+        assert len(prefixes)      in (2, 3)                                      # 24h spans two days (three when starting at 00:xx)
+
+        self.collector.hour_partitioned = True
+        assert len(self.collector._log_prefixes(self.now)) == 25                 # Hour-floored cutoff → 25 hour prefixes
+
+    def test__list_log_files__window_and_no_duplicates(self):
+        keys   = self.collector._list_log_files()
+        cutoff = self.collector._cutoff(self.now)
+        assert len(keys)                == len(set(keys))
+        assert keys                     == sorted(keys)
+        assert len(keys)                == sum(1 for when, _ in self.s3.objects.values() if when >= cutoff)
+        assert len(set(self.s3.listed)) == len(self.collector._log_prefixes(self.now))   # No prefix listed twice
+
+    def test__collect__always_reads_the_whole_window(self):                     # No watermark on the collector (it is recreated per call)
+        events = self.collector.collect()
+        files  = self.collector.log_files_read
+        assert len(events)                   == 2 * files
+        assert len(self.s3.read)             == files
+
+        new_key = f"cloudfront-realtime/year={self.now.strftime('%Y')}/month={self.now.strftime('%m')}/day={self.now.strftime('%d')}/stream-new.gz"
+        self.s3.objects[new_key] = (self.now, log_line())
+        assert len(self.collector.collect()) == 2 * files + 1                    # Same collector, second call: old files + the new one
+        assert self.collector.collect_summary()['total_records'] == 2 * files + 1
+
+    def test__collect__streams_projected_columns(self):
+        day = f"cloudfront-realtime/year={self.now.strftime('%Y')}/month={self.now.strftime('%m')}/day={self.now.strftime('%d')}/"
+        self.s3.objects = {f'{day}plain.txt'  : (self.now, '#comment\n' + log_line(status='503', time_taken='-') + '\n'),
+                           f'{day}no-ext'     : (self.now, log_line(path='/gz-detected-by-magic'))                 }
+        rows = self.collector.collect(columns=('sc-status', 'cs-uri-stem', 'time-taken'))
+        assert sorted(row['cs-uri-stem'] for row in rows) == ['/gz-detected-by-magic', '/index.html']
+        assert set(rows[0])                               == {'sc-status', 'cs-uri-stem', 'time-taken'}
+        assert 503 in [row['sc-status'] for row in rows]                         # Typed numeric columns
+
+    def test__collect_summary(self):
+        day   = f"cloudfront-realtime/year={self.now.strftime('%Y')}/month={self.now.strftime('%m')}/day={self.now.strftime('%d')}/"
+        lines = [log_line(agent=f'agent-{i % 3}') for i in range(9)]
+        self.s3.objects = {f'{day}a.gz': (self.now, '\n'.join(lines[:5])),
+                           f'{day}b.gz': (self.now, '\n'.join(lines[5:] + [log_line(status='404', path='/missing', time_taken='0.200',
+                                                                                      edge='CDG3-C1', result='Error')]))}
+        summary = self.collector.collect_summary()
+        assert summary['total_records']      == 10
+        assert summary['log_files_read']     == 2
+        assert summary['status_breakdown']   == {'2xx': 9, '4xx': 1}
+        assert summary['edge_locations']     == ['CDG3-C1', 'LHR50-C1']
+        assert summary['cache_hit_rate']     == 90.0
+        assert summary['top_paths']          == [dict(path='/index.html', count=9), dict(path='/missing', count=1)]
+        assert summary['unique_user_agents'] == 3
+        assert summary['latency_ms']['p50']  == 10.0
+        assert summary['time_range'].startswith('2023-11-14T22:13:20')
+
+    def test__collect_summary__empty(self):
+        self.s3.objects = {}
+        summary = self.collector.collect_summary()
+        assert summary['total_records'] == 0
+        assert summary['top_paths']     == []
+
+    def test__summarise_files__partials_round_trip(self):
+        log_objects = self.collector.list_log_objects()
+        partials    = self.collector.summarise_files(log_objects)
+        assert len(partials) == len(log_objects)
+
+        direct, restored = CloudFront__Logs__Summary(), CloudFront__Logs__Summary()
+        for _, partial in partials:
+            restored.merge(CloudFront__Logs__Summary.from_data(json.loads(json.dumps(partial.to_data()))))   # Stored as JSON, merged later
+            direct  .merge(partial)
+        assert restored.result()                     == direct.result()
+        assert restored.result()['status_breakdown'] == {'2xx': len(log_objects), '4xx': len(log_objects)}
+        assert CloudFront__Logs__Summary.from_data(None).result()['total_records'] == 0
@@ -0,0 +1,110 @@
+# ===============================================================================
+# Tests for CloudWatch__Client — batched GetMetricData
+# Query specs are sent in batches of ≤ 500 per call, split between the
+# regional and us-east-1 (CloudFront) clients; paged results are stitched,
+# failures and missed deadlines raise
+# Uses an in-memory CloudWatch client (records calls), no AWS, no mocks
+# ===============================================================================
+
+import time
+from datetime                                                                                      import datetime, timezone
+from unittest                                                                                      import TestCase
+from sgraph_ai_app_send.lambda__admin.server_analytics.CloudWatch__Client                         import CloudWatch__Client, CLOUDWATCH__MAX_QUERIES_PER_CALL
+from sgraph_ai_app_send.lambda__admin.server_analytics.Service__Metrics__Collector                import Service__Metrics__Collector
+from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metric__Query              import Schema__Metric__Query
+from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Thresholds__Config         import Schema__Thresholds__Config
+
+
+class CloudWatch__Boto3__In_Memory:                                              # get_metric_data over canned values (two points per query, one per page)
+    def __init__(self, fail=False):
+        self.calls = []                                                          # [MetricDataQueries] per call
+        self.fail  = fail
+
+    def get_metric_data(self, MetricDataQueries, StartTime, EndTime, ScanBy, NextToken=None):
+        if self.fail:
+            raise ConnectionError('cloudwatch unavailable')
+        self.calls.append(MetricDataQueries)
+        page = 1 if NextToken else 0
+        results = [dict(Id         = query['Id']                                          ,
+                        Timestamps = [datetime.fromtimestamp(1_700_000_000 + page * 300, timezone.utc)],
+                        Values     = [float(int(query['Id'][1:]) + page)]                 )
+                   for query in MetricDataQueries]
+        return dict(MetricDataResults=results, NextToken=None if page else 'page-2')
+
+
+def query(metric_name='Invocations', namespace='AWS/Lambda', statistic='Sum'):
+    return Schema__Metric__Query(namespace   = namespace                                ,
+                                 metric_name = metric_name                              ,
+                                 dimensions  = [{'Name': 'FunctionName', 'Value': 'fn'}],
+                                 statistic   = statistic                                )
+
+
+class test_CloudWatch__Client(TestCase):
+
+    def setUp(self):
+        self.regional = CloudWatch__Boto3__In_Memory()
+        self.us_east  = CloudWatch__Boto3__In_Memory()
+        self.client   = CloudWatch__Client()
+        self.client._boto3_client    = self.regional
+        self.client._boto3_client_cf = self.us_east
+
+    def test__get_metric_batch__chunks_of_500(self):
+        queries = [query() for _ in range(CLOUDWATCH__MAX_QUERIES_PER_CALL * 2 + 10)]
+        series  = self.client.get_metric_batch(queries)
+        assert len(series)                                 == len(queries)
+        assert [len(call) for call in self.regional.calls] == [500, 500, 500, 500, 10, 10]   # Two pages per chunk
+        assert self.us_east.calls                          == []
+        assert series[0].values                            == [0.0, 1.0]                     # Pages stitched, chronological
+        assert series[-1].values                           == [1009.0, 1010.0]
+        assert series[0].timestamps                        == [1_700_000_000, 1_700_000_300]
+
+    def test__get_metric_batch__split_by_region(self):
+        queries = [query(), query('Requests', 'AWS/CloudFront'), query('Duration', statistic='p95')]
+        series  = self.client.get_metric_batch(queries)
+        assert len(self.regional.calls[0]) == 2
+        assert len(self.us_east .calls[0]) == 1
+        assert self.us_east.calls[0][0]['MetricStat']['Metric']['Namespace'] == 'AWS/CloudFront'
+        assert [str(s.metric_name) for s in series]                        == ['Invocations', 'Requests', 'Duration']
+        assert str(series[2].statistic)                                      == 'p95'
+
+    def test__get_metric_batch__failure_raises(self):                           # No silently empty series
+        self.client._boto3_client = CloudWatch__Boto3__In_Memory(fail=True)
+        with self.assertRaises(ConnectionError):
+            self.client.get_metric_batch([query(), query('Requests', 'AWS/CloudFront')])
+
+    def test__get_metric_batch__no_call_past_the_deadline(self):
+        with self.assertRaises(TimeoutError):
+            self.client.get_metric_batch([query()], deadline=time.monotonic())
+        assert self.regional.calls == []
+
+    def test__collect_snapshot__failed_region_marked_unknown(self):
+        self.client._boto3_client_cf = CloudWatch__Boto3__In_Memory(fail=True)
+        service  = Service__Metrics__Collector(cloudwatch_client   = self.client                 ,
+                                               distribution_id     = 'E1ABC2DEF'                 ,
+                                               lambda_user_name    = 'user-dev'                  ,
+                                               lambda_admin_name   = 'admin-dev'                 ,
+                                               s3_transfers_bucket = 'transfers-bucket'          ,
+                                               s3_cache_bucket     = 'cache-bucket'              ,
+                                               thresholds          = Schema__Thresholds__Config())
+        snapshot = service.collect_snapshot()
+        statuses = {health['component']: health for health in snapshot.health_status}
+        assert statuses['CloudFront']['status']       == 'unknown'
+        assert statuses['CloudFront']['message']      == 'CloudWatch error: ConnectionError'
+        assert statuses['Lambda: user']['status']     != 'unknown'               # Other region unaffected
+        assert snapshot.cloudfront.requests.values    == []
+        assert len(snapshot.lambda_user.invocations.values) == 2
+
+    def test__collect_snapshot__two_calls(self):
+        service = Service__Metrics__Collector(cloudwatch_client   = self.client                 ,
+                                              distribution_id     = 'E1ABC2DEF'                 ,
+                                              lambda_user_name    = 'user-dev'                  ,
+                                              lambda_admin_name   = 'admin-dev'                 ,
+                                              s3_transfers_bucket = 'transfers-bucket'          ,
+                                              s3_cache_bucket     = 'cache-bucket'              ,
+                                              thresholds          = Schema__Thresholds__Config())
+        snapshot = service.collect_snapshot()
+        assert len(self.regional.calls[0]) == 2 * 9 + 2 * 8                      # Two Lambdas + two buckets, one request (plus its second page)
+        assert len(self.us_east .calls[0]) == 6                                  # CloudFront
+        assert len(self.regional.calls) + len(self.us_east.calls) == 4
+        assert len(snapshot.lambda_admin.duration_p99.values) == 2
+        assert str(snapshot.s3_cache.bucket_name)             == 'cache-bucket'
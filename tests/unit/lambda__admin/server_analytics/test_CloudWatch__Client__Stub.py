@@ -5,6 +5,7 @@
 
 from unittest                                                                                     import TestCase
 from sgraph_ai_app_send.lambda__admin.server_analytics.CloudWatch__Client__Stub                  import CloudWatch__Client__Stub
+from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metric__Query             import Schema__Metric__Query
 from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metric__Series            import Schema__Metric__Series
 
 
@@ -77,3 +78,11 @@ class test_CloudWatch__Client__Stub(TestCase):
                                             statistic   = 'Sum'                                 ,
                                             unit        = 'Count'                               )
         assert type(result) is Schema__Metric__Series
+
+    def test__get_metric_batch(self):
+        queries = [Schema__Metric__Query(namespace='AWS/Lambda'    , metric_name='Duration', dimensions=[], statistic='p95', unit='Milliseconds'),
+                   Schema__Metric__Query(namespace='AWS/CloudFront', metric_name='Requests', dimensions=[], statistic='Sum', unit='None'        )]
+        result  = self.stub.get_metric_batch(queries, lookback_minutes=60, period_seconds=300)
+        assert [str(series.metric_name) for series in result] == ['Duration', 'Requests']
+        assert str(result[0].statistic)                       == 'p95'
+        assert len(result[1].values)                          == 12
@@ -0,0 +1,104 @@
+# ===============================================================================
+# Tests for Service__Metrics__Cache — CloudFront log summaries
+# Per-file partials are stored under S3 key + ETag; a refresh summarises the
+# whole window but parses only files without a partial (in-process copy
+# first, then the partials the stored-key listing says exist)
+# ===============================================================================
+
+from datetime                                                                                     import datetime, timezone
+from unittest                                                                                     import TestCase
+from sgraph_ai_app_send.lambda__admin.server_analytics.Service__Metrics__Cache                   import Service__Metrics__Cache
+from sgraph_ai_app_send.lambda__admin.server_analytics.Service__Metrics__Collector               import Service__Metrics__Collector
+from sgraph_ai_app_send.lambda__admin.server_analytics.collectors.CloudFront__Logs__Collector     import CloudFront__Logs__Collector
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Setup                                  import create_send_cache_client
+from tests.unit.lambda__admin.server_analytics.test_CloudFront__Logs__Collector                   import S3__Client__In_Memory, hourly_objects, log_line
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                                          import Send__Cache__Call__Counter
+
+
+class Service__Metrics__Collector__In_Memory_S3(Service__Metrics__Collector):   # CloudFront logs read from an in-memory S3 client
+    s3 : object
+
+    def cloudfront_logs_collector(self, logs_bucket, lookback_hours=24):
+        collector = CloudFront__Logs__Collector(logs_bucket=logs_bucket, lookback_hours=lookback_hours)
+        collector._s3_client = self.s3
+        return collector
+
+
+class test_Service__Metrics__Cache(TestCase):
+
+    def setUp(self):
+        self.send_cache_client = create_send_cache_client()                     # Fresh in-memory store per test
+        self.now               = datetime.now(timezone.utc)
+        self.s3                = S3__Client__In_Memory(hourly_objects(6, self.now))
+        self.collector         = Service__Metrics__Collector__In_Memory_S3(s3=self.s3)
+        self.metrics_cache     = Service__Metrics__Cache(send_cache_client = self.send_cache_client,
+                                                         metrics_collector = self.collector        )
+
+    def get_summary(self, metrics_cache=None):
+        return (metrics_cache or self.metrics_cache).get_cf_logs_summary('logs', lookback_hours=24, force_refresh=True)
+
+    def test__get_cf_logs_summary__parses_only_new_files(self):
+        first = self.get_summary()
+        assert first['log_files_parsed']  == 6
+        assert first['total_records']     == 12
+        assert first['status_breakdown']  == {'2xx': 6, '4xx': 6}
+
+        reads  = len(self.s3.read)
+        second = self.get_summary()
+        assert second['log_files_parsed'] == 0                                   # Every file already has a partial
+        assert len(self.s3.read)          == reads
+        assert second['total_records']    == first['total_records']
+
+        new_key = f"cloudfront-realtime/year={self.now.strftime('%Y')}/month={self.now.strftime('%m')}/day={self.now.strftime('%d')}/stream-new.gz"
+        self.s3.objects[new_key] = (self.now, log_line(status='503'))
+        third = self.get_summary()
+        assert third['log_files_parsed']  == 1
+        assert self.s3.read[reads:]       == [new_key]
+        assert third['total_records']     == 13
+        assert third['status_breakdown']  == {'2xx': 6, '4xx': 6, '5xx': 1}
+
+    def test__get_cf_logs_summary__partials_survive_a_new_instance(self):
+        self.get_summary()
+        reads         = len(self.s3.read)
+        metrics_cache = Service__Metrics__Cache(send_cache_client = self.send_cache_client,   # e.g. a cold Lambda: nothing in memory
+                                                metrics_collector = self.collector        )
+        summary = self.get_summary(metrics_cache)
+        assert summary['log_files_parsed'] == 0                                  # Partials come from the cache store
+        assert summary['total_records']    == 12
+        assert len(self.s3.read)           == reads
+
+    def test__get_cf_logs_summary__rewritten_file_is_reparsed(self):
+        self.get_summary()
+        key = sorted(self.s3.objects)[0]
+        when, _ = self.s3.objects.pop(key)
+        self.s3.objects[key.replace('.gz', '-v2.gz')] = (when, log_line())     # Different key/ETag → no partial
+        summary = self.get_summary()
+        assert summary['log_files_parsed'] == 1
+        assert summary['total_records']    == 11                                 # Old partial dropped with its file
+
+    def test__get_cf_logs_summary__watermark_persisted_with_partials(self):     # A cold instance fetches only the listed partials, parses the rest
+        self.get_summary()
+        new_key = f"cloudfront-realtime/year={self.now.strftime('%Y')}/month={self.now.strftime('%m')}/day={self.now.strftime('%d')}/stream-new.gz"
+        self.s3.objects[new_key] = (self.now, log_line())
+        metrics_cache = Service__Metrics__Cache(send_cache_client = self.send_cache_client,
+                                                metrics_collector = self.collector        )
+        with Send__Cache__Call__Counter(send_cache_client=self.send_cache_client) as counter:
+            summary = self.get_summary(metrics_cache)
+        assert summary['log_files_parsed'] == 1                                  # Only the new file
+        assert summary['total_records']    == 13                                 # ... but the summary covers the whole window
+        lookups = [call for call in counter.calls if '/retrieve/' in call]
+        assert len(lookups)                == 6                                  # One per stored partial, none for the new file
+
+    def test__get_cf_logs_summary__prunes_partials_outside_the_window(self):
+        self.s3.objects = hourly_objects(30, self.now)
+        self.metrics_cache.get_cf_logs_summary('logs', lookback_hours=48, force_refresh=True)
+        assert len(self.metrics_cache._cf_log_partial_keys()) == 30
+        legacy_key = 'cf-log-part-' + '0' * 32                                   # Key from before partial keys carried the hour
+        self.send_cache_client.cache_client.store().store__json__cache_key(namespace='metrics', strategy='key_based', cache_key=legacy_key, file_id=legacy_key,
+                                                                           body=dict(part_key=legacy_key), json_field_path='part_key')
+
+        summary   = self.get_summary()                                           # 24h window
+        in_window = self.collector.cloudfront_logs_collector('logs', 24).list_log_objects()
+        assert summary['total_records']                      == 2 * len(in_window)
+        assert self.metrics_cache._cf_log_partial_keys()     == {self.metrics_cache._cf_log_partial_key(log_object) for log_object in in_window}
+        assert self.get_summary()['log_files_parsed']        == 0                # Window partials kept
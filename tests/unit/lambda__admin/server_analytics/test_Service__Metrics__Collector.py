@@ -4,6 +4,8 @@
 # Uses CloudWatch__Client__Stub (no mocks, no patches)
 # ===============================================================================
 
+import threading
+import time
 from unittest                                                                                      import TestCase
 from sgraph_ai_app_send.lambda__admin.server_analytics.CloudWatch__Client__Stub                   import CloudWatch__Client__Stub
 from sgraph_ai_app_send.lambda__admin.server_analytics.Service__Metrics__Collector                import Service__Metrics__Collector
@@ -11,6 +13,17 @@ from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Metrics__
 from sgraph_ai_app_send.lambda__admin.server_analytics.schemas.Schema__Thresholds__Config         import Schema__Thresholds__Config
 
 
+class CloudWatch__Client__Stub__Slow_Region(CloudWatch__Client__Stub):          # Batches for one namespace block until released (or their deadline)
+    slow_namespace : str    = 'AWS/CloudFront'
+    release        : object = None                                              # threading.Event
+
+    def get_metric_batch(self, queries, lookback_minutes=60, period_seconds=300, deadline=None):
+        if any(str(query.namespace) == self.slow_namespace for query in queries):
+            if not self.release.wait(timeout=max(0.0, deadline - time.monotonic())):
+                raise TimeoutError('slow region')                                # Like CloudWatch__Client: no call past the deadline
+        return super().get_metric_batch(queries, lookback_minutes, period_seconds)
+
+
 class test_Service__Metrics__Collector(TestCase):
 
     @classmethod
@@ -85,3 +98,31 @@ class test_Service__Metrics__Collector(TestCase):
         assert 's3_transfers'  in snapshot_dict
         assert 's3_cache'      in snapshot_dict
         assert 'health_status' in snapshot_dict
+
+    def test__collect_snapshot__slow_region_marked_unknown(self):
+        release = threading.Event()
+        stub    = CloudWatch__Client__Stub__Slow_Region(release=release)
+        service = Service__Metrics__Collector(cloudwatch_client   = stub                        ,
+                                              distribution_id     = 'E1ABC2DEF'                 ,
+                                              lambda_user_name    = 'user-dev'                  ,
+                                              lambda_admin_name   = 'admin-dev'                 ,
+                                              s3_transfers_bucket = 'transfers-bucket'          ,
+                                              s3_cache_bucket     = 'cache-bucket'              ,
+                                              timeout_seconds     = 0.2                         ,
+                                              thresholds          = Schema__Thresholds__Config())
+        threads = threading.active_count()
+        try:
+            start  = time.monotonic()
+            result = service.collect_snapshot()
+            assert time.monotonic() - start < 2                                 # Bounded by the deadline, not the slow region
+            assert threading.active_count() == threads                          # No batch thread left running
+        finally:
+            release.set()
+        statuses = {health['component']: health for health in result.health_status}
+        assert statuses['CloudFront']['status']     == 'unknown'
+        assert statuses['CloudFront']['message']    == 'No metrics within 0.2s (timed out)'
+        statuses = {component: health['status'] for component, health in statuses.items()}
+        assert statuses['Lambda: user']             in ('healthy', 'warning', 'critical')
+        assert len(result.lambda_user.invocations.values) == 12                  # Regional batch finished
+        assert result.cloudfront.requests.values          == []
+        assert str(result.cloudfront.distribution_id)     == 'E1ABC2DEF'
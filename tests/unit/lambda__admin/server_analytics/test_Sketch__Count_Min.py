@@ -0,0 +1,51 @@
+# ===============================================================================
+# Tests for Sketch__Count_Min
+# Frequency estimates (never under), merge, and JSON round trip
+# ===============================================================================
+
+import json
+from unittest                                                                           import TestCase
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__Count_Min       import Sketch__Count_Min
+
+
+class test_Sketch__Count_Min(TestCase):
+
+    def test__estimate__never_undercounts(self):
+        sketch = Sketch__Count_Min()
+        counts = {f'/path-{i}': i + 1 for i in range(300)}
+        for value, count in counts.items():
+            sketch.add(value, count)
+        assert sketch.total == sum(counts.values())
+        for value, count in counts.items():
+            assert count <= sketch.estimate(value) <= count + sketch.total * 0.02
+        assert sketch.estimate('/never-seen') <= sketch.total * 0.02
+
+    def test__merge(self):
+        left, right = Sketch__Count_Min().add('a', 3), Sketch__Count_Min().add('a', 4).add('b')
+        left.merge(right)
+        assert left.estimate('a') == 7
+        assert left.total         == 8
+        with self.assertRaises(ValueError):
+            left.merge(Sketch__Count_Min(width=16))
+
+    def test__to_data__round_trip(self):
+        sparse = Sketch__Count_Min().add('x', 5)
+        data   = json.loads(json.dumps(sparse.to_data()))
+        assert 'sparse' in data
+        assert Sketch__Count_Min.from_data(data).estimate('x') == 5
+
+        dense = Sketch__Count_Min(width=64)
+        for i in range(1000):
+            dense.add(i)
+        data = json.loads(json.dumps(dense.to_data()))
+        assert 'dense' in data
+        assert Sketch__Count_Min.from_data(data).table == dense.table
+
+    def test__add_many__one_update_per_distinct_value(self):
+        batched, single = Sketch__Count_Min(), Sketch__Count_Min()
+        values          = ['a'] * 5 + ['b'] * 2 + ['c']
+        for value in values:
+            single.add(value)
+        batched.add_many(values)
+        assert batched.table == single.table
+        assert batched.total == 8
@@ -0,0 +1,55 @@
+# ===============================================================================
+# Tests for Sketch__HyperLogLog
+# Distinct counts within error bounds, merge, and JSON round trip
+# ===============================================================================
+
+import json
+from unittest                                                                           import TestCase
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__HyperLogLog     import Sketch__HyperLogLog
+
+
+class test_Sketch__HyperLogLog(TestCase):
+
+    def test__count__small_exact(self):
+        sketch = Sketch__HyperLogLog()
+        for value in ('a', 'b', 'c', 'a', '', None):                             # Duplicates and empty values don't count
+            sketch.add(value)
+        assert sketch.count() == 3
+        assert Sketch__HyperLogLog().count() == 0
+
+    def test__count__large_within_error(self):
+        sketch = Sketch__HyperLogLog()
+        for i in range(20_000):
+            sketch.add(f'visitor-{i}')
+        assert abs(sketch.count() - 20_000) < 20_000 * 0.05
+
+    def test__merge(self):
+        left, right = Sketch__HyperLogLog(), Sketch__HyperLogLog()
+        for i in range(3000):
+            left.add(i)
+        for i in range(1500, 4500):
+            right.add(i)
+        assert abs(left.merge(right).count() - 4500) < 4500 * 0.05
+        with self.assertRaises(ValueError):
+            left.merge(Sketch__HyperLogLog(precision=10))
+
+    def test__to_data__sparse_and_dense(self):
+        sparse = Sketch__HyperLogLog().add('one')
+        data   = json.loads(json.dumps(sparse.to_data()))
+        assert 'sparse' in data
+        assert Sketch__HyperLogLog.from_data(data).registers == sparse.registers
+
+        dense = Sketch__HyperLogLog()
+        for i in range(5000):
+            dense.add(i)
+        data = json.loads(json.dumps(dense.to_data()))
+        assert 'dense' in data
+        assert Sketch__HyperLogLog.from_data(data).count() == dense.count()
+        assert Sketch__HyperLogLog.from_data(None).count() == 0
+
+    def test__add_many__same_as_add(self):
+        values = [f'visitor-{i % 700}' for i in range(2000)] + ['', None]
+        single = Sketch__HyperLogLog()
+        for value in values:
+            single.add(value)
+        assert Sketch__HyperLogLog().add_many(values).registers == single.registers
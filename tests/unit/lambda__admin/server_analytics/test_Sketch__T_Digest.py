@@ -0,0 +1,46 @@
+# ===============================================================================
+# Tests for Sketch__T_Digest
+# Percentile accuracy, bounded centroids, merge, and JSON round trip
+# ===============================================================================
+
+import json
+import random
+from unittest                                                                           import TestCase
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__T_Digest        import Sketch__T_Digest
+
+
+class test_Sketch__T_Digest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        random.seed(7)
+        cls.values = [random.expovariate(1 / 50) for _ in range(20_000)]          # Latency-like long tail
+        cls.exact  = sorted(cls.values)
+
+    def exact_quantile(self, q):
+        return self.exact[int(q * len(self.exact)) - 1]
+
+    def test__quantiles__accurate(self):
+        digest = Sketch__T_Digest()
+        for value in self.values:
+            digest.add(value)
+        for q in (0.5, 0.95, 0.99):
+            assert abs(digest.quantile(q) - self.exact_quantile(q)) < self.exact_quantile(q) * 0.03
+        assert digest.quantile(0) == self.exact[0]
+        assert digest.quantile(1) == self.exact[-1]
+        assert len(digest.centroids) <= digest.compression
+
+    def test__small_and_empty(self):
+        assert Sketch__T_Digest().percentiles()                         == dict(p50=None, p95=None, p99=None)
+        assert Sketch__T_Digest().add(5).add(1).add(9).percentiles()['p50'] == 5.0
+
+    def test__merge__round_trip(self):
+        left, right = Sketch__T_Digest(), Sketch__T_Digest()
+        for value in self.values[:10_000]:
+            left.add(value)
+        for value in self.values[10_000:]:
+            right.add(value)
+        left   = Sketch__T_Digest.from_data(json.loads(json.dumps(left.to_data())))
+        merged = left.merge(Sketch__T_Digest.from_data(right.to_data()))
+        assert merged.count == len(self.values)
+        assert abs(merged.quantile(0.95) - self.exact_quantile(0.95)) < self.exact_quantile(0.95) * 0.03
@@ -0,0 +1,52 @@
+# ===============================================================================
+# Tests for Sketch__Top_K
+# Heavy hitters with bounded candidates, merge, and JSON round trip
+# ===============================================================================
+
+import json
+from unittest                                                                           import TestCase
+from sgraph_ai_app_send.lambda__admin.server_analytics.sketches.Sketch__Top_K           import Sketch__Top_K
+
+
+def skewed_paths():                                                              # /hot-0 is most frequent, long tail of singletons
+    paths = []
+    for i in range(5):
+        paths += [f'/hot-{i}'] * (100 - i * 10)
+    paths += [f'/tail-{i}' for i in range(2000)]
+    return paths
+
+
+class test_Sketch__Top_K(TestCase):
+
+    def test__top__finds_heavy_hitters(self):
+        sketch = Sketch__Top_K(k=5)
+        for path in skewed_paths():
+            sketch.add(path)
+        assert [path for path, _ in sketch.top()] == [f'/hot-{i}' for i in range(5)]
+        assert len(sketch.candidates)             <= sketch.capacity()          # Memory bounded despite 2005 distinct paths
+
+    def test__merge(self):
+        left, right = Sketch__Top_K(k=3), Sketch__Top_K(k=3)
+        for path in ['/a'] * 5 + ['/b'] * 2:
+            left.add(path)
+        for path in ['/b'] * 6 + ['/c']:
+            right.add(path)
+        assert left.merge(right).top() == [('/b', 8), ('/a', 5), ('/c', 1)]
+
+    def test__to_data__round_trip(self):
+        sketch = Sketch__Top_K(k=5)
+        for path in skewed_paths():
+            sketch.add(path)
+        restored = Sketch__Top_K.from_data(json.loads(json.dumps(sketch.to_data())))
+        assert restored.top() == sketch.top()
+        restored.add('/hot-4', 100)
+        assert restored.top(1)[0][0] == '/hot-4'
+
+    def test__add_many__same_as_add(self):
+        single = Sketch__Top_K(k=5)
+        for path in skewed_paths():
+            single.add(path)
+        batched = Sketch__Top_K(k=5).add_many(skewed_paths() + [None])
+        assert batched.top()                 == single.top()
+        assert batched.count_min.table       == single.count_min.table
+        assert batched.count_min.total       == len(skewed_paths())
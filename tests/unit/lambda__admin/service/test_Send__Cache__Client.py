@@ -5,6 +5,7 @@
 
 from unittest                                                                   import TestCase
 from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Setup               import create_send_cache_client
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                        import Send__Cache__Call__Counter
 
 
 class test_Send__Cache__Client(TestCase):
@@ -83,3 +84,128 @@ class test_Send__Cache__Client(TestCase):
     def test__token__revoke__not_found(self):
         result = self.client.token__revoke('nonexistent-for-revoke')
         assert result is False
+
+    # --- Coalesced entry lookups ---
+
+    def test__token__lookup_entry(self):
+        result = self.client.token__create(dict(token_name='test-token-entry', usage_limit=5,
+                                                usage_count=0, status='active', created_by='test', metadata={}))
+        with Send__Cache__Call__Counter(send_cache_client=self.client) as counter:
+            cache_id, token_data = self.client.token__lookup_entry('test-token-entry')
+        assert cache_id                       == str(result.cache_id)
+        assert token_data.get('token_name')   == 'test-token-entry'
+        assert counter.count()                == 1                            # Hash resolve + body in one round trip
+
+    def test__token__lookup_entry__not_found(self):
+        assert self.client.token__lookup_entry('nonexistent-entry') == (None, None)
+
+    def test__request_scope__memoises_lookups(self):
+        self.client.token__create(dict(token_name='test-token-memo', usage_limit=5,
+                                       usage_count=0, status='active', created_by='test', metadata={}))
+        with self.client.request_scope():
+            with Send__Cache__Call__Counter(send_cache_client=self.client) as counter:
+                first             = self.client.token__lookup('test-token-memo')
+                cache_id          = self.client.token__lookup_cache_id('test-token-memo')
+                first['status']   = 'mutated-locally'                           # Caller mutation must not leak into the memo
+                second            = self.client.token__lookup('test-token-memo')
+            assert counter.count()   == 1
+            assert cache_id          is not None
+            assert second['status']  == 'active'
+
+            second['usage_count'] = 3                                           # Update refreshes the memoised body
+            self.client.token__update(cache_id, second)
+            assert self.client.token__lookup('test-token-memo')['usage_count'] == 3
+
+        with Send__Cache__Call__Counter(send_cache_client=self.client) as counter:   # Outside the scope every lookup goes to the cache service
+            self.client.token__lookup('test-token-memo')
+            self.client.token__lookup('test-token-memo')
+        assert counter.count() == 2
+
+    def test__request_scope__create_clears_memoised_miss(self):
+        with self.client.request_scope():
+            assert self.client.token__lookup('test-token-late') is None
+            self.client.token__create(dict(token_name='test-token-late', usage_limit=5,
+                                           usage_count=0, status='active', created_by='test', metadata={}))
+            assert self.client.token__lookup('test-token-late')['token_name'] == 'test-token-late'
+
+    def test__entries__lookup_many(self):
+        for name in ('bulk-a', 'bulk-b', 'bulk-c'):
+            self.client.token__create(dict(token_name=name, usage_limit=5, usage_count=0,
+                                           status='active', created_by='test', metadata={}))
+        with Send__Cache__Call__Counter(send_cache_client=self.client) as counter:
+            results = self.client.entries__lookup_many('tokens', ['bulk-c', 'bulk-missing', 'bulk-a', ''])
+        assert [key for key, _, _ in results]          == ['bulk-c', 'bulk-missing', 'bulk-a']   # Input order kept, empty keys dropped
+        assert results[0][2]['token_name']             == 'bulk-c'
+        assert results[1][1:]                          == (None, None)
+        assert results[2][1]                           is not None
+        assert counter.count()                         == 3                             # One round trip per key, fanned out
+
+    def test__entries__page(self):
+        names = [f'page-{i:02d}' for i in range(7)]
+        for name in names:
+            self.client.token__create(dict(token_name=name, usage_limit=5, usage_count=0,
+                                           status='active', created_by='test', metadata={}))
+        keys      = list(reversed(names)) + ['page-missing']
+        seen      = []
+        cursor    = None
+        while True:
+            page   = self.client.entries__page('tokens', keys, cursor=cursor, limit=3)
+            seen  += [item['token_name'] for item in page['items']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert seen == names                                                    # Sorted by key, no gaps or repeats
+
+        page = self.client.entries__page('tokens', keys, limit=2,
+                                         accept=lambda body: body['token_name'] > 'page-04')
+        assert [item['token_name'] for item in page['items']] == ['page-05', 'page-06']
+        assert page['next_cursor']                            == 'page-06'     # Filtered pages keep fetching until full
+
+    def test__summary__maintained_on_create_and_update(self):
+        generation = self.client.summary__generation('tokens')
+        self.client.token__create(dict(token_name='sum-token', usage_limit=5, usage_count=0,
+                                       status='active', created_by='test', metadata={}))
+        rows = self.client.summary__rows('tokens')
+        assert rows['sum-token'] == dict(token_name='sum-token', status='active', usage_count=0,
+                                         usage_limit=5, created_by='test')
+        assert self.client.token__revoke('sum-token')
+        assert self.client.summary__rows('tokens')['sum-token']['status'] == 'revoked'
+        assert self.client.summary__generation('tokens') != generation          # Status caches see the change
+
+        with Send__Cache__Call__Counter(send_cache_client=self.client) as counter:
+            page = self.client.token__list_page(limit=2)
+        assert counter.count() == 2 + len(page['items'])                        # Row + entity listings, one small row per item on the page
+        assert page['items'][0]['token_name'] <= page['items'][-1]['token_name']
+
+    def test__summary__row_write_touches_only_its_entity(self):
+        self.client.token__create(dict(token_name='sum-one', usage_limit=5, usage_count=0,
+                                       status='active', created_by='test', metadata={}))
+        cache_id, token_data = self.client.token__lookup_entry('sum-one')
+        token_data['status'] = 'exhausted'
+        with Send__Cache__Call__Counter(send_cache_client=self.client) as counter:
+            self.client.token__update(cache_id, token_data)
+        assert counter.count() == 3                                             # Token update + its row + generation (no summary read, no rebuild)
+
+    def test__summary__fields_keep_what_clients_read(self):
+        key_row  = self.client.summary__row('keys' , dict(code='k', signing_key_pem='S', public_key_pem='P'))
+        room_row = self.client.summary__row('rooms', dict(room_id='r', vault_cache_key='v'))
+        assert key_row['signing_key_pem']  == 'S'                               # Admin key registry renders the PEM
+        assert key_row['public_key_pem']   == 'P'
+        assert room_row['vault_cache_key'] == 'v'
+
+    def test__summary__check_and_rebuild(self):
+        self.client.token__create(dict(token_name='sum-drift', usage_limit=5, usage_count=0,
+                                       status='active', created_by='test', metadata={}))
+        self.client.summary__save('tokens', dict(token_name='sum-drift', status='stale'))   # Simulate a lost row write + a phantom row
+        self.client.summary__save('tokens', dict(token_name='sum-ghost'))
+
+        check = self.client.summary__check('tokens')
+        assert check['consistent'] is False
+        assert check['stale']      == ['sum-drift']
+        assert check['extra']      == ['sum-ghost']
+
+        repaired = self.client.summary__check('tokens', repair=True)
+        assert repaired['repaired'] is True
+        assert self.client.summary__check('tokens')['consistent'] is True
+        assert self.client.summary__rows('tokens')['sum-drift']['status'] == 'active'
+        assert 'sum-ghost' not in self.client.summary__rows('tokens')
@@ -0,0 +1,92 @@
+# ===============================================================================
+# Tests for Service__Analytics__Buffer
+# Write-behind analytics: ring buffer, one columnar segment per flush, requeue
+# on failure, and the middleware flushing at the end of each request
+# ===============================================================================
+
+from unittest                                                                       import TestCase
+from starlette.testclient                                                           import TestClient
+from sgraph_ai_app_send.lambda__admin.fast_api.Fast_API__SGraph__App__Send__Admin   import Fast_API__SGraph__App__Send__Admin
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client                  import Send__Cache__Client
+from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Setup                   import create_send_cache_client
+from sgraph_ai_app_send.lambda__admin.service.Service__Analytics__Buffer           import Service__Analytics__Buffer, analytics__segment, analytics__segment_events
+from sgraph_ai_app_send.lambda__admin.service.Service__Analytics__Pulse            import compute_pulse
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                           import Send__Cache__Call__Counter
+
+
+class Send__Cache__Client__Down(Send__Cache__Client):                           # Every segment write fails
+    def analytics__segment_save(self, segment):
+        raise ConnectionError('cache down')
+
+
+def event(i, ip_hash='visitor'):
+    return dict(event_id=f'evt-{i}', event_type='page_view', path='/index.html', ip_hash=ip_hash, timestamp=1_700_000_000 + i)
+
+
+class test_Service__Analytics__Buffer(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_client = create_send_cache_client()
+
+    def setUp(self):
+        self.buffer = Service__Analytics__Buffer(send_cache_client=self.cache_client)
+
+    def test__record__no_cache_traffic(self):
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as counter:
+            self.buffer.record(event(1))
+            self.buffer.record(event(2))
+        assert counter.count()          == 0
+        assert len(self.buffer.events)  == 2
+
+    def test__flush__one_segment_per_flush(self):
+        for i in range(3):
+            self.buffer.record(event(i))
+        assert self.buffer.flush()      == 3
+        assert len(self.buffer.events)  == 0
+        assert self.buffer.seq          == 1
+
+        segment = dict(instance_id=self.buffer.instance_id, seq=1, first=1_700_000_000)
+        stored  = self.cache_client.analytics__segment(self.cache_client.analytics__segment_key(segment))
+        assert stored['count']                          == 3
+        assert stored['columns']['event_id']            == ['evt-0', 'evt-1', 'evt-2']
+        assert analytics__segment_events(stored)[1]['event_id'] == 'evt-1'
+        assert self.buffer.flush()                      == 0                      # Empty buffer — nothing written
+
+    def test__ring_buffer__drops_oldest(self):
+        buffer = Service__Analytics__Buffer(send_cache_client=self.cache_client, capacity=2)
+        for i in range(3):
+            buffer.record(event(i))
+        assert [e['event_id'] for e in buffer.events] == ['evt-1', 'evt-2']
+        assert buffer.dropped           == 1
+
+    def test__flush__failure_requeues(self):
+        buffer = Service__Analytics__Buffer(send_cache_client=Send__Cache__Client__Down())
+        buffer.record(event(1))
+        assert buffer.flush()           == 0
+        assert len(buffer.events)       == 1                                      # Kept for the next flush
+        assert buffer.seq               == 0
+
+    def test__segment__columnar_round_trip(self):
+        events  = [event(1, 'a'), dict(event_id='evt-2', timestamp=1_700_000_005, extra='x')]
+        segment = analytics__segment(events, 'inst', 7)
+        assert segment['count']          == 2
+        assert segment['first']          == 1_700_000_001
+        assert segment['last']           == 1_700_000_005
+        assert segment['columns']['extra'] == [None, 'x']
+        assert analytics__segment_events(segment)[0]['ip_hash'] == 'a'
+
+    def test__middleware__flushes_at_end_of_request(self):
+        cache_client = create_send_cache_client()
+        buffer       = Service__Analytics__Buffer(send_cache_client=cache_client)
+        fast_api     = Fast_API__SGraph__App__Send__Admin(send_cache_client = cache_client,
+                                                          analytics_buffer  = buffer      ).setup()
+        client       = TestClient(fast_api.app())
+        client.get('/info/health')
+        assert len(buffer.events)       == 0                                      # Nothing left for a frozen container to lose
+        assert buffer.seq               == 1                                      # One segment for the request
+        assert buffer.unrolled          == []                                     # ... and its minute rollup
+
+        pulse = compute_pulse(cache_client, window_minutes=5)                    # Another instance (no buffer) sees the request
+        assert pulse['active_requests'] == 1
+        assert pulse['top_paths']       == [dict(path='/info/health', count=1)]
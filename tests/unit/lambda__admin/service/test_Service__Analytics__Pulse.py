@@ -1,11 +1,14 @@
 # ===============================================================================
 # Tests for Service__Analytics__Pulse
-# Pulse computation from recent analytics events
+# Pulse computation from per-minute rollups written by the analytics flusher
 # ===============================================================================
 
+import time
 from unittest                                                                   import TestCase
 from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Setup               import create_send_cache_client
-from sgraph_ai_app_send.lambda__admin.service.Service__Analytics__Pulse        import compute_pulse
+from sgraph_ai_app_send.lambda__admin.service.Service__Analytics__Buffer       import Service__Analytics__Buffer
+from sgraph_ai_app_send.lambda__admin.service.Service__Analytics__Pulse        import compute_pulse, rollup__build, rollup__minute, rollup__hour, rollups__read, rollups__record, ANALYTICS__PULSE_MAX_MINUTES
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                       import Send__Cache__Call__Counter
 
 
 class test_Service__Analytics__Pulse(TestCase):
@@ -13,9 +16,10 @@ class test_Service__Analytics__Pulse(TestCase):
     @classmethod
     def setUpClass(cls):
         cls.cache_client = create_send_cache_client()
+        cls.buffer       = Service__Analytics__Buffer(send_cache_client=cls.cache_client)
 
         for i in range(5):
-            cls.cache_client.analytics__record_event(dict(
+            cls.buffer.record(dict(
                 event_id   = f'pulse-evt-{i}'    ,
                 event_type = 'page_view'          ,
                 path       = '/index.html'        ,
@@ -24,13 +28,14 @@ class test_Service__Analytics__Pulse(TestCase):
                 ip_hash    = f'visitor-{i % 3}'   ,       # 3 unique visitors
                 content_bytes = 1024              ))
 
-        cls.cache_client.analytics__record_event(dict(
+        cls.buffer.record(dict(
             event_id   = 'pulse-upload'   ,
             event_type = 'file_upload'    ,
             path       = '/transfers/upload/abc' ,
             method     = 'POST'           ,
             status_code = 200             ,
             ip_hash    = 'uploader-1'     ))
+        cls.buffer.flush()                                                         # One segment + this minute's rollup
 
     def test__pulse__returns_counts(self):
         result = compute_pulse(self.cache_client, window_minutes=60)
@@ -48,8 +53,85 @@ class test_Service__Analytics__Pulse(TestCase):
         result = compute_pulse(self.cache_client, window_minutes=60)
         assert result['active_visitors'] >= 3                                      # At least 3 unique + uploader
 
+    def test__pulse__counts_transfers(self):
+        result = compute_pulse(self.cache_client, window_minutes=60)
+        assert result['active_transfers'] >= 1
+
     def test__pulse__empty_window(self):
         fresh_client = create_send_cache_client()
         result = compute_pulse(fresh_client, window_minutes=5)
         assert result is not None
         assert result['active_requests'] == 0
+
+    def test__pulse__top_paths_and_latency(self):
+        cache_client = create_send_cache_client()
+        events       = [dict(event_type='page_view', path=f'/p{i % 2}', duration_ms=10 * (i + 1), timestamp=time.time()) for i in range(5)]
+        rollups__record(cache_client, events, 'inst-paths-1')
+        result = compute_pulse(cache_client, window_minutes=5)
+        assert result['top_paths']         == [dict(path='/p0', count=3), dict(path='/p1', count=2)]
+        assert result['latency_ms']['p50'] == 30.0
+
+    def test__rollup__build__bulk_per_minute(self):
+        events  = [dict(event_type='file_upload', ip_hash='a', path='/up', duration_ms=5, timestamp=60 * i) for i in range(2)]
+        events += [dict(event_type='page_view'  , ip_hash='b', path=None , timestamp=30)]
+        rollups = rollup__build(events)
+        assert sorted(rollups)                   == ['197001010000', '197001010001']
+        first   = rollups['197001010000']
+        assert first['requests']                 == 2
+        assert first['transfers']                == 1
+        assert first['event_types']              == dict(file_upload=1, page_view=1)
+        assert first['paths']['count_min']['total'] == 1                           # Events without a path are not counted
+        assert first['latency']['count']         == 1
+
+    def test__pulse__reads_only_rollups(self):                                     # Cost is bounded by the window, not by traffic
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as counter:
+            result = compute_pulse(self.cache_client, window_minutes=1000)
+        assert result['window_minutes'] == ANALYTICS__PULSE_MAX_MINUTES
+        assert counter.count()          <= 2 + 2 * ANALYTICS__PULSE_MAX_MINUTES   # One listing per hour, then only the rollups present, whatever the event count
+
+    def test__rollups__record__retried_flush_counted_once(self):
+        cache_client = create_send_cache_client()
+        events       = [dict(event_type='file_download', ip_hash=f'ip-{i}', timestamp=time.time()) for i in range(4)]
+        minute       = rollup__minute(events[0]['timestamp'])
+        assert rollups__record(cache_client, events, 'inst-a-1') is True
+        assert rollups__record(cache_client, events, 'inst-a-1') is True          # Same flush id — rewrites the same partial
+        assert rollups__record(cache_client, events, 'inst-b-1') is True          # Another instance, same minute — its own partial
+        rollup = rollups__read(cache_client, [minute], settled_before=minute)[minute]
+        assert rollup['requests']  == 8
+        assert rollup['transfers'] == 8
+        assert rollup['partials']  == [f'roll-{minute}-inst-a-1', f'roll-{minute}-inst-b-1']
+        assert compute_pulse(cache_client, window_minutes=5)['active_visitors'] == 4   # HyperLogLog union: same 4 ip_hashes
+
+    def test__rollups__record__instances_never_lose_counts(self):                # Interleaved flushes from many instances all count
+        cache_client = create_send_cache_client()
+        events       = [dict(event_type='page_view', ip_hash='ip', timestamp=time.time())]
+        minute       = rollup__minute(events[0]['timestamp'])
+        for seq in range(3):
+            for instance in ('inst-a', 'inst-b', 'inst-c'):
+                rollups__record(cache_client, events, f'{instance}-{seq}')
+        assert rollups__read(cache_client, [minute], settled_before=minute)[minute]['requests'] == 9
+
+    def test__rollups__read__past_minute_merged_once(self):
+        cache_client = create_send_cache_client()
+        timestamp    = time.time() - 3600                                          # A settled minute, an hour ago
+        minute       = rollup__minute(timestamp)
+        now_minute   = rollup__minute(time.time())
+        for flush_id in ('inst-a-1', 'inst-b-1', 'inst-c-1'):
+            rollups__record(cache_client, [dict(event_type='page_view', timestamp=timestamp)], flush_id)
+        assert rollups__read(cache_client, [minute], now_minute)[minute]['requests'] == 3
+        assert f'merged-{minute}' in cache_client.analytics__rollup_keys(rollup__hour(minute))
+
+        with Send__Cache__Call__Counter(send_cache_client=cache_client) as counter:
+            rollup = rollups__read(cache_client, [minute], now_minute)[minute]
+        assert rollup['requests'] == 3
+        assert counter.count()    == 2                                             # The hour listing + the merged rollup (no partials, no write)
+
+        rollups__record(cache_client, [dict(event_type='page_view', timestamp=timestamp)], 'inst-late-1')
+        assert rollups__read(cache_client, [minute], now_minute)[minute]['requests'] == 4   # A late partial is folded in on top
+
+    def test__pulse__includes_unflushed_events(self):
+        cache_client = create_send_cache_client()
+        buffer       = Service__Analytics__Buffer(send_cache_client=cache_client)
+        buffer.record(dict(event_type='page_view', ip_hash='pending-visitor'))
+        assert compute_pulse(cache_client, window_minutes=5)['active_requests']                          == 0
+        assert compute_pulse(cache_client, window_minutes=5, analytics_buffer=buffer)['active_requests'] == 1
@@ -55,10 +55,10 @@ class test_Service__Audit(TestCase):
             assert 'prev_hash'  in event                                     # Every entry has prev_hash field
             assert len(event['entry_hash']) == 16                            # 16-char truncated SHA-256
 
-    def test__11__hash_chain__exactly_one_root(self):
-        events = self.service.query()
+    def test__11__hash_chain__exactly_one_root_per_room(self):
+        events = self.service.get_room_events('room-aud-001')
         roots  = [e for e in events if e.get('prev_hash') == '']
-        assert len(roots) == 1                                               # Exactly one entry with empty prev_hash (the first)
+        assert len(roots) == 1                                               # Exactly one entry with empty prev_hash (the room's first)
 
     # ═══════════════════════════════════════════════════════════════════════
     # Query Events
@@ -96,3 +96,112 @@ class test_Service__Audit(TestCase):
         for event in events:
             assert event.get('room_id') == 'room-aud-001'
             assert event.get('action')  == 'file.uploaded'
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Indexed Queries
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def test__30__room_query__newest_first_with_cursor(self):
+        for index in range(7):
+            self.service.log('room-aud-page', 'user-aud-page', f'file.uploaded', target_guid=f'file-{index}')
+        first  = self.service.query_page(room_id='room-aud-page', limit=3)
+        second = self.service.query_page(room_id='room-aud-page', limit=3, cursor=first['next_cursor'])
+        third  = self.service.query_page(room_id='room-aud-page', limit=3, cursor=second['next_cursor'])
+        guids  = [event['target_guid'] for page in (first, second, third) for event in page['events']]
+        assert guids                 == [f'file-{index}' for index in reversed(range(7))]
+        assert third['next_cursor'] is None
+
+    def test__31__room_query__cost_independent_of_other_rooms(self):
+        from tests.unit.lambda__admin.Send__Cache__Call__Counter import Send__Cache__Call__Counter
+        self.service.log('room-aud-quiet', 'user-aud-quiet', 'room.created')
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as before:
+            self.service.query_page(room_id='room-aud-quiet', limit=50)
+        for index in range(10):                                               # Noise in another room must not change the cost
+            self.service.log('room-aud-noisy', 'user-aud-noisy', 'file.uploaded')
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as after:
+            events = self.service.query_page(room_id='room-aud-quiet', limit=50)['events']
+        assert len(events)   == 1
+        assert after.count() == before.count()
+
+    def test__32__rebuild_indexes__backfills_unindexed_scopes(self):
+        self.cache_client.audit__append(dict(event_id='legacyaudit00001', room_id='room-aud-legacy',
+                                             user_id='user-aud-legacy', action='room.created',
+                                             timestamp='2020-01-01T00:00:00+00:00'))
+        assert self.service.get_room_events('room-aud-legacy') == []
+        result = self.service.rebuild_indexes()
+        assert result['indexed'] >= 2                                         # Legacy room + legacy user scopes
+        assert [event['event_id'] for event in self.service.get_room_events('room-aud-legacy')] == ['legacyaudit00001']
+        assert self.service.rebuild_indexes()['indexed'] == 0                 # Idempotent
+
+    def test__33__unscoped_query__newest_first_by_time_ordered_id(self):
+        service = Service__Audit(send_cache_client=create_send_cache_client())
+        events  = [service.log('room-aud-time', 'user-aud-time', 'room.opened') for _ in range(3)]
+        ids     = [event['event_id'] for event in events]
+        assert ids == sorted(ids)                                            # Ids sort by creation time
+        page    = service.query_page(limit=2)
+        assert [event['event_id'] for event in page['events']] == [ids[2], ids[1]]
+        older   = service.query_page(limit=2, cursor=page['next_cursor'])
+        assert [event['event_id'] for event in older['events']] == [ids[0]]
+        assert older['next_cursor'] is None
+
+    def test__34__action_query__served_from_action_index(self):
+        from tests.unit.lambda__admin.Send__Cache__Call__Counter import Send__Cache__Call__Counter
+        self.service.log('room-aud-act', 'user-aud-act', 'room.archived')
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as calls:
+            events = self.service.query_page(action='room.archived')['events']
+        assert [event['room_id'] for event in events] == ['room-aud-act']
+        assert not [call for call in calls.calls if 'folders' in call and 'audit/data' in call]   # No full listing scan of the audit namespace
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Durable Appends + Chain
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def test__40__log_is_stored_before_it_returns(self):
+        result = self.service.log('room-aud-durable', 'user-aud-durable', 'file.uploaded')
+        other  = Service__Audit(send_cache_client=self.cache_client)          # Nothing held in this instance
+        events = other.get_room_events('room-aud-durable')
+        assert [event['event_id'] for event in events] == [result['event_id']]
+        assert events[0]['entry_hash']                 == result['entry_hash']
+        assert other.verify_chain('room-aud-durable', from_seq=1)['valid'] is True
+
+    def test__41__chain_survives_new_instance(self):                           # Cold start / parallel Lambda continues the same chain
+        self.service.log('room-aud-chain', 'user-aud-chain', 'room.created')
+        other = Service__Audit(send_cache_client=self.cache_client)
+        other.log('room-aud-chain', 'user-aud-chain', 'file.uploaded')
+        events = self.service.get_room_events('room-aud-chain')
+        assert [event['action'] for event in events] == ['file.uploaded', 'room.created']
+        assert events[0]['prev_hash']                == events[1]['chain_hash']
+        assert self.service.verify_chain('room-aud-chain', from_seq=1)['valid'] is True
+
+    def test__43__parallel_writers_on_one_head__both_kept(self):              # Two Lambdas read the same head: siblings, nothing lost
+        counter = 'audit-room-room-aud-race'
+        self.service.log('room-aud-race', 'user-aud-race', 'room.created')
+        head    = self.service.counters().head(counter)
+        self.service.log('room-aud-race', 'user-aud-race', 'file.uploaded', target_guid='file-a')
+        self.cache_client.counter__head_save(counter, head)                  # Second writer still sees the old head
+        self.service.log('room-aud-race', 'user-aud-race', 'file.uploaded', target_guid='file-b')
+        self.service.log('room-aud-race', 'user-aud-race', 'file.uploaded', target_guid='file-c')
+        segments = self.service.counters().log(counter)
+        assert [segment['seq'] for segment in segments] == [1, 2, 2, 3]
+        guids    = {event['target_guid'] for event in self.service.get_room_events('room-aud-race')}
+        assert guids >= {'file-a', 'file-b', 'file-c'}
+        assert self.service.verify_chain('room-aud-race', from_seq=1)       == dict(valid=True, room_id='room-aud-race', from_seq=1,
+                                                                                    checked=3, error_seq=None, reason='')
+
+    def test__42__verify_chain__from_checkpoint_and_tamper(self):
+        from sgraph_ai_app_send.lambda__admin.service.Service__Audit import AUDIT__CHECKPOINT_INTERVAL
+        for index in range(AUDIT__CHECKPOINT_INTERVAL + 2):
+            self.service.log('room-aud-verify', 'user-aud-verify', 'file.uploaded', target_guid=f'file-{index}')   # One segment each — crosses a checkpoint
+        counter = 'audit-room-room-aud-verify'
+        assert self.service.counters().checkpoint(counter, AUDIT__CHECKPOINT_INTERVAL) is not None
+        tail = self.service.verify_chain('room-aud-verify')
+        assert tail['valid']    is True
+        assert tail['from_seq'] == AUDIT__CHECKPOINT_INTERVAL + 1            # Only the blocks after the checkpoint
+        assert tail['checked']  == 2
+
+        segment = self.service.counters().log(counter, from_seq=3, limit=1)[0]
+        segment['events'][0]['action'] = 'file.deleted'                      # Tamper with a stored event
+        self.cache_client.counter__slot_save(counter, segment)
+        full = self.service.verify_chain('room-aud-verify', from_seq=1)
+        assert full['valid']     is False
+        assert full['error_seq'] == 3
@@ -9,6 +9,7 @@ from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client__Vault       i
 from sgraph_ai_app_send.lambda__admin.service.Service__Vault                   import Service__Vault
 from sgraph_ai_app_send.lambda__admin.service.Service__Vault__ACL             import Service__Vault__ACL
 from sgraph_ai_app_send.lambda__admin.service.Service__Data_Room              import Service__Data_Room
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                        import Send__Cache__Call__Counter
 
 
 class test_Service__Data_Room(TestCase):
@@ -134,6 +135,30 @@ class test_Service__Data_Room(TestCase):
         result = self.service.remove_member(self.room_id, 'editor-001', 'editor-001')
         assert result.get('success') is False
 
+    def test__38__member_index__tracks_membership(self):
+        assert self.service.member_rooms('owner-001' ).get(self.room_id) == 'owner'
+        assert self.service.member_rooms('editor-001')                  == {self.room_id: 'editor'}
+        assert self.room_id not in self.service.member_rooms('viewer-001')  # Removed in test__35
+
+    def test__38__list_rooms__user__acl_scan_until_index_built(self):
+        assert self.service.member_indexes_built() is False
+        self.cache_client.room__member_delete('editor-001', self.room_id, 'editor')       # A membership from before the index
+        try:
+            rooms = self.service.list_rooms(user_id='editor-001')
+            assert [r.get('room_id') for r in rooms] == [self.room_id]               # Still listed (from the room's ACL)
+        finally:
+            self.cache_client.room__member_save('editor-001', self.room_id, 'editor')
+
+    def test__39__list_rooms__user__cost_independent_of_room_count(self):
+        for index in range(5):
+            self.service.create_room(f'Other Room {index}', f'other-owner-{index}')
+        self.service.rebuild_member_indexes()
+        assert self.service.member_indexes_built() is True
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as counter:
+            rooms = self.service.list_rooms(user_id='editor-001')
+        assert [r.get('room_id') for r in rooms] == [self.room_id]
+        assert counter.count()                   == 2                        # Membership index + the member room's summary row — no per-room ACL reads
+
     # ═══════════════════════════════════════════════════════════════════════
     # Archive
     # ═══════════════════════════════════════════════════════════════════════
@@ -157,3 +182,39 @@ class test_Service__Data_Room(TestCase):
         rooms    = self.service.list_rooms()
         room_ids = [r.get('room_id') for r in rooms]
         assert self.room_id not in room_ids
+
+    def test__44__archived_room__leaves_member_indexes(self):
+        assert self.room_id not in self.service.member_rooms('owner-001')
+        assert self.room_id not in self.service.member_rooms('editor-001')
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Membership Index Backfill
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def test__50__rebuild_member_indexes(self):
+        room = self.service.create_room('Backfill Room', 'backfill-owner')
+        self.service.add_member(room['room_id'], 'backfill-viewer', 'viewer', 'backfill-owner')
+        self.cache_client.room__member_delete('backfill-viewer', room['room_id'], 'viewer')
+        self.cache_client.room__member_save  ('backfill-viewer', self.room_id, 'viewer')   # Stale: archived room
+        assert self.service.member_rooms('backfill-viewer') == {self.room_id: 'viewer'}   # Simulate an index that predates the membership
+
+        result = self.service.rebuild_member_indexes()
+        assert result.get('rooms') >= 1
+        assert self.cache_client.room__members_built()['rooms'] == result['rooms']
+        cold_service = Service__Data_Room(send_cache_client = self.cache_client  ,  # Another container sees the marker
+                                          service_vault     = self.vault_service ,
+                                          service_vault_acl = self.vault_acl     )
+        assert cold_service.member_indexes_built() is True
+        assert self.service.member_rooms('backfill-viewer') == {room['room_id']: 'viewer'}
+        assert self.room_id not in self.service.member_rooms('owner-001')    # Archived rooms are not backfilled
+
+    def test__51__member_index__concurrent_grants_both_kept(self):           # Entries are per (room, user): no read-modify-write to lose
+        first  = self.service.create_room('Race Room A', 'race-owner')
+        second = self.service.create_room('Race Room B', 'race-owner')
+        self.service.member_index__update('race-member', first ['room_id'], 'viewer')
+        self.service.member_index__update('race-member', second['room_id'], 'editor')
+        assert self.service.member_rooms('race-member') == {first ['room_id']: 'viewer',
+                                                            second['room_id']: 'editor'}
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as counter:
+            self.service.create_room('Race Room C', 'race-owner')
+        assert not [call for call in counter.calls if 'folders/rooms/' in call]   # No index rebuild (room listing) on the request path
@@ -10,6 +10,8 @@ from sgraph_ai_app_send.lambda__admin.service.Service__Vault                   i
 from sgraph_ai_app_send.lambda__admin.service.Service__Vault__ACL             import Service__Vault__ACL
 from sgraph_ai_app_send.lambda__admin.service.Service__Data_Room              import Service__Data_Room
 from sgraph_ai_app_send.lambda__admin.service.Service__Invites                import Service__Invites
+from sgraph_ai_app_send.lambda__admin.service.Service__Room__Session          import Service__Room__Session
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                        import Send__Cache__Call__Counter
 
 
 class test_Service__Invites(TestCase):
@@ -129,6 +131,67 @@ class test_Service__Invites(TestCase):
         assert result.get('success') is False
         assert result.get('reason')  == 'expired'
 
+    # ═══════════════════════════════════════════════════════════════════════
+    # Accept + Join (composed, fixed I/O budget)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def test__35__accept_and_join__fixed_io_budget(self):
+        session_service = Service__Room__Session(send_cache_client=self.cache_client)
+        code            = self.service.create_invite(self.room_id, 'viewer', 'owner-inv-001', max_uses=2)['invite_code']
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as counter:
+            result = self.service.accept_and_join(code, 'joiner-001', session_service)
+        assert result.get('success')     is True
+        assert result.get('room_name')   == 'Invite Test Room'
+        assert result.get('permission')  == 'viewer'
+        assert counter.count()           == 11                               # invite + room + ACL listing, use store + use listing, ACL entry + room update + summary row + generation + membership entry, session store
+        assert session_service.validate_session(result['session_token'])['room_id'] == self.room_id
+        assert self.service.validate_invite(code).get('valid') is True       # One of two uses consumed
+        assert self.service.accept_and_join(code, 'joiner-001', session_service).get('reason') == 'already_accepted'
+        members = [m.get('user_id') for m in self.data_room_service.get_members(self.room_id)]
+        assert 'joiner-001' in members
+
+    def test__36__accept_and_join__not_owner_writes_nothing(self):
+        session_service = Service__Room__Session(send_cache_client=self.cache_client)
+        code            = self.service.create_invite(self.room_id, 'viewer', 'not-the-owner', max_uses=1)['invite_code']
+        result          = self.service.accept_and_join(code, 'joiner-002', session_service)
+        assert result.get('success') is False
+        assert result.get('reason')  == 'not_owner'
+        assert self.service.validate_invite(code).get('valid') is True       # Invite use not consumed
+
+    def test__37__accept_and_join__signed_token_carries_no_vault_key(self):
+        session_service = Service__Room__Session(send_cache_client=self.cache_client, signing_key='test-signing-key')
+        code            = self.service.create_invite(self.room_id, 'viewer', 'owner-inv-001', max_uses=1)['invite_code']
+        result          = self.service.accept_and_join(code, 'joiner-003', session_service)
+        claims          = session_service.signed_claims(result['session_token'])
+        assert result.get('vault_cache_key')                                 # Still returned to the joiner directly
+        assert claims['x']                == dict(name='Invite Test Room')   # Claims are only signed — anyone holding the token can read them
+
+    def test__38__accept_and_join__last_use_goes_to_one_user(self):         # Two joiners read the invite before either consumes it
+        code            = self.service.create_invite(self.room_id, 'viewer', 'owner-inv-001', max_uses=1)['invite_code']
+        cache_id, stale = self.cache_client.invite__lookup_entry(code)
+        first           = self.service.invite__claim(cache_id, dict(stale), 'racer-001')
+        second          = self.service.invite__claim(cache_id, dict(stale), 'racer-002')
+        assert first  == dict(success=True, use_id=first['use_id'])
+        assert second == dict(success=False, reason='exhausted')
+        assert self.cache_client.invite__uses(cache_id) == [first['use_id']]   # The loser's use was withdrawn
+        assert self.service.validate_invite(code)['reason'] == 'exhausted'
+
+    def test__39__accept_and_join__failed_member_write_gives_the_use_back(self):
+        session_service = Service__Room__Session(send_cache_client=self.cache_client)
+        code            = self.service.create_invite(self.room_id, 'viewer', 'owner-inv-001', max_uses=1)['invite_code']
+        member__write   = self.data_room_service.member__write
+        def failing_write(*args):
+            raise ConnectionError('store down')
+        self.data_room_service.member__write = failing_write
+        try:
+            result = self.service.accept_and_join(code, 'joiner-004', session_service)
+        finally:
+            self.data_room_service.member__write = member__write
+        assert result == dict(success=False, reason='member_write_failed')
+        assert self.service.validate_invite(code)['valid'] is True            # Use given back
+        assert 'joiner-004' not in [m.get('user_id') for m in self.data_room_service.get_members(self.room_id)]
+        assert self.service.accept_and_join(code, 'joiner-004', session_service)['success'] is True
+
     # ═══════════════════════════════════════════════════════════════════════
     # List Invites
     # ═══════════════════════════════════════════════════════════════════════
@@ -3,9 +3,11 @@
 # Key registry lifecycle: publish, lookup, unpublish, list, log
 # ===============================================================================
 
+import hashlib
 from unittest                                                                   import TestCase
 from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Setup               import create_send_cache_client
-from sgraph_ai_app_send.lambda__admin.service.Service__Keys                    import Service__Keys
+from sgraph_ai_app_send.lambda__admin.service.Service__Keys                    import Service__Keys, LOG__CHECKPOINT_INTERVAL
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                        import Send__Cache__Call__Counter
 
 TEST_PEM = """-----BEGIN PUBLIC KEY-----
 MIICIjANBgkqhkiG9w0BAQEFAAOCAg8AMIICCgKCAgEA0Z3VS5JJcds3xfn/ygWe
@@ -37,6 +39,10 @@ v5S0CZJPA8GNfPDZz9LF/Z4DaF4xRfXqxWGG/x1mKsJi8P+LQxGPxu/LGWaR3y/
 dNrcQ/9s/LLcXc8qYqjvqXcCAwEAAQ==
 -----END PUBLIC KEY-----"""
 
+TEST_PEM_3 = TEST_PEM.replace('cMrcQ', 'eMrcQ')                                  # Distinct fingerprints for index tests
+TEST_PEM_4 = TEST_PEM.replace('cMrcQ', 'fMrcQ')
+TEST_PEM_5 = TEST_PEM.replace('cMrcQ', 'gMrcQ')
+
 
 class test_Service__Keys(TestCase):
 
@@ -121,3 +127,101 @@ class test_Service__Keys(TestCase):
             assert entry.get('entry_hash')  is not None
             if i > 0:
                 assert entry.get('prev_hash') == entries[i-1].get('entry_hash')
+
+    def test__publish_key__duplicate_uses_fingerprint_index(self):
+        first = self.service.publish(TEST_PEM_3)
+        assert first.get('code')
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as counter:
+            result = self.service.publish(TEST_PEM_3)
+        assert result.get('error') == 'duplicate'
+        assert counter.count()     == 1                                          # One index lookup, independent of registry size
+
+    def test__publish_key__allowed_after_unpublish(self):
+        first = self.service.publish(TEST_PEM_4)
+        self.service.unpublish(first['code'])
+        index = self.cache_client.key__lookup_by_fingerprint(first['fingerprint'])
+        assert index['active'] is False
+        second = self.service.publish(TEST_PEM_4)
+        assert second.get('code')                                               # Not rejected as duplicate
+        assert second['code'] != first['code']
+        assert self.cache_client.key__lookup_by_fingerprint(first['fingerprint'])['code'] == second['code']
+
+    def test__repair_fingerprint_index(self):
+        published   = self.service.publish(TEST_PEM_5)
+        fingerprint = published['fingerprint']
+        self.cache_client.key__index_fingerprint(fingerprint, 'zz-lost', active=False)   # Simulate a stale index entry (e.g. pre-index data)
+
+        result = self.service.repair_fingerprint_index()
+        assert fingerprint in result['repaired']
+        assert result['scanned'] >= 1
+        assert self.cache_client.key__lookup_by_fingerprint(fingerprint)['code'] == published['code']
+        assert self.service.publish(TEST_PEM_5).get('error') == 'duplicate'
+        assert self.service.repair_fingerprint_index()['repaired'] == []
+
+    def test__transparency_log__append_cost_is_constant(self):
+        service = Service__Keys(send_cache_client=create_send_cache_client())
+        counts  = []
+        for seq in range(LOG__CHECKPOINT_INTERVAL - 2):
+            with Send__Cache__Call__Counter(send_cache_client=service.send_cache_client) as counter:
+                assert service._append_log('publish', f'aa-{seq:04d}', f'sha256:{seq:016x}')
+            counts.append(counter.count())
+        assert counts[1] == counts[-1] == 3                                     # Head hint read + entry write + head hint write, regardless of log length
+        assert service.log_head()['seq'] == LOG__CHECKPOINT_INTERVAL - 3
+
+    def test__transparency_log__checkpoints_pages_and_verify(self):
+        service = Service__Keys(send_cache_client=create_send_cache_client())
+        total   = 2 * LOG__CHECKPOINT_INTERVAL + 4
+        for seq in range(total):
+            service._append_log('publish', f'bb-{seq:04d}', f'sha256:{seq:016x}')
+
+        checkpoint = service.send_cache_client.key__log_checkpoint(LOG__CHECKPOINT_INTERVAL - 1)  # Written once appends moved a block past it
+        assert checkpoint['from_seq']   == 0
+        assert checkpoint['merkle_root'] != ''
+        assert service.send_cache_client.key__log_checkpoint(2 * LOG__CHECKPOINT_INTERVAL - 1) is None
+
+        page = service.get_log_page(from_seq=2, limit=3)
+        assert [entry['seq'] for entry in page['entries']] == [2, 3, 4]
+        assert page['next_seq']                            == 5
+        assert page['head']['seq']                         == total - 1
+        assert page['head']['code']                        == f'bb-{total - 1:04d}'    # Head is the last entry (same shape as before)
+        assert service.get_log_page(from_seq=total - 2, limit=10)['next_seq'] is None
+
+        assert service.verify_log()['valid']                                      is True
+        assert service.verify_log(from_seq=LOG__CHECKPOINT_INTERVAL)['checked']  == total - LOG__CHECKPOINT_INTERVAL  # Incremental: anchored at the checkpoint
+
+        tampered = service.send_cache_client.key__log_entries(total - 2, total - 1)[0]
+        tampered['code'] = 'zz-evil'
+        cache_id = service.send_cache_client.entry__lookup('keys', tampered['log_key'])[0]
+        service.send_cache_client.cache_client.update().update__json(cache_id=cache_id, namespace='keys', body=tampered)
+        result = service.verify_log(from_seq=LOG__CHECKPOINT_INTERVAL)
+        assert result['valid']     is False
+        assert result['error_seq'] == total - 2
+
+    def test__transparency_log__racing_appends_are_both_kept(self):
+        service = Service__Keys(send_cache_client=create_send_cache_client())
+        service._append_log('publish', 'dd-0000', 'sha256:00')
+        stale   = service.log_head()
+        service._append_log('publish', 'dd-0001', 'sha256:01')
+        service.send_cache_client.key__log_head_save(stale)                     # A second writer read the head before the first append landed
+        service._append_log('publish', 'dd-0002', 'sha256:02')
+        service._append_log('publish', 'dd-0003', 'sha256:03')
+        entries = service.get_log()
+        assert sorted(entry['code'] for entry in entries)        == ['dd-0000', 'dd-0001', 'dd-0002', 'dd-0003']   # Nothing overwritten
+        assert sorted(entry['seq']  for entry in entries)        == [0, 1, 1, 2]                                   # Siblings at seq 1
+        assert service.verify_log()['valid'] is True
+
+    def test__transparency_log__head_migrated_from_legacy_entries(self):
+        cache_client = create_send_cache_client()
+        prev_hash    = ''
+        for seq in range(3):                                                    # Entries written before the head pointer existed
+            entry = dict(seq=seq, action='publish', code=f'cc-{seq:04d}', fingerprint='sha256:00', prev_hash=prev_hash)
+            entry['entry_hash'] = hashlib.sha256(f"{seq}:publish:cc-{seq:04d}:sha256:00:{prev_hash}".encode()).hexdigest()[:16]
+            cache_client.key__append_log(entry)
+            prev_hash = entry['entry_hash']
+        service = Service__Keys(send_cache_client=cache_client)
+        head    = service.log_head()
+        assert head['seq']        == 2
+        assert head['entry_hash'] == prev_hash
+        service._append_log('publish', 'cc-0003', 'sha256:01')
+        assert [entry['seq'] for entry in service.get_log()] == [0, 1, 2, 3]
+        assert service.verify_log()['valid'] is True
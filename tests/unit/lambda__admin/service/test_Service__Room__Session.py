@@ -86,3 +86,82 @@ class test_Service__Room__Session(TestCase):
         validation = self.service.validate_session(token)
         assert validation.get('valid')  is False
         assert validation.get('reason') == 'expired'
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # Signed Sessions (stateless)
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def signed_service(self):
+        return Service__Room__Session(send_cache_client=self.cache_client, signing_key='test-signing-key')
+
+    def test__40__signed_session__validates_without_storage(self):
+        from tests.unit.lambda__admin.Send__Cache__Call__Counter import Send__Cache__Call__Counter
+        service = self.signed_service()
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as create_counter:
+            session = service.create_session('room-signed-001', 'user-signed-001', 'editor',
+                                              extra=dict(room_name='Signed Room'))
+        assert create_counter.count()               == 1                     # Revocation list poll only — no session record written
+        assert session['session_token'].startswith('s1.')
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as counter:
+            result = service.validate_session(session['session_token'])
+        assert counter.count()       == 0
+        assert result['valid']       is True
+        assert result['room_id']     == 'room-signed-001'
+        assert result['permission']  == 'editor'
+        assert result['extra']       == dict(room_name='Signed Room')
+
+    def test__41__signed_session__tampered_and_wrong_key(self):
+        service = self.signed_service()
+        token   = service.create_session('room-signed-002', 'user-signed-002', 'viewer')['session_token']
+        payload, signature = token[3:].split('.')
+        forged  = service.create_session('room-signed-002', 'user-signed-002', 'owner')['session_token'][3:].split('.')[0]
+        assert service.validate_session(f's1.{forged}.{signature}')['reason'] == 'invalid_signature'
+        other   = Service__Room__Session(send_cache_client=self.cache_client, signing_key='other-key')
+        assert other.validate_session(token)['reason']                       == 'invalid_signature'
+
+    def test__42__signed_session__expired(self):
+        service = self.signed_service()
+        token   = service.create_session('room-signed-003', 'user-signed-003', 'viewer', hours=0)['session_token']
+        assert service.validate_session(token)['reason'] == 'expired'
+
+    def test__43__signed_session__revocation_reaches_other_instances(self):
+        issuer  = self.signed_service()
+        reader  = self.signed_service()
+        token   = issuer.create_session('room-signed-004', 'user-signed-004', 'viewer')['session_token']
+        assert reader.validate_session(token)['valid'] is True
+        assert issuer.revoke_session(token)['status']  == 'revoked'
+        assert issuer.validate_session(token)['reason'] == 'revoked'                  # Same instance: immediate
+        assert reader.validate_session(token)['valid']  is True                       # Other instance: until its next poll
+        reader.revocations_checked = float('-inf')
+        assert reader.validate_session(token)['reason'] == 'revoked'
+
+    def test__44__signed_session__revoke_all_bumps_generation(self):
+        service = self.signed_service()
+        before  = service.create_session('room-signed-005', 'user-signed-005', 'viewer')['session_token']
+        service.revoke_all_sessions()
+        after   = service.create_session('room-signed-005', 'user-signed-005', 'viewer')['session_token']
+        assert service.validate_session(before)['reason'] == 'revoked'
+        assert service.validate_session(after)['valid']   is True
+
+    def test__45__signed_session__concurrent_revocations_both_kept(self):    # Two instances revoke without seeing each other
+        issuer = self.signed_service()
+        first  = issuer.create_session('room-signed-006', 'user-signed-006', 'viewer')['session_token']
+        second = issuer.create_session('room-signed-006', 'user-signed-007', 'viewer')['session_token']
+        self.signed_service().revoke_session(first)
+        self.signed_service().revoke_session(second)
+        reader = self.signed_service()
+        assert reader.validate_session(first)['reason']  == 'revoked'
+        assert reader.validate_session(second)['reason'] == 'revoked'
+
+    def test__46__signed_session__expired_revocations_pruned(self):
+        service = self.signed_service()
+        token   = service.create_session('room-signed-008', 'user-signed-008', 'viewer', hours=1)['session_token']
+        service.revoke_session(token)
+        later   = self.signed_service()
+        later.now = lambda: service.now() + 7200                             # Token (and its revocation) has expired
+        later.refresh_revocations()
+        assert len(later.revoked_keys) >= 1
+        assert later.prune_revocations() >= 1
+        later.revocations_checked = float('-inf')
+        later.refresh_revocations()
+        assert later.revoked_keys == []
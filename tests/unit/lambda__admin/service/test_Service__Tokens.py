@@ -6,6 +6,7 @@
 from unittest                                                                   import TestCase
 from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Setup               import create_send_cache_client
 from sgraph_ai_app_send.lambda__admin.service.Service__Tokens                  import Service__Tokens
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                        import Send__Cache__Call__Counter
 
 
 class test_Service__Tokens(TestCase):
@@ -130,3 +131,113 @@ class test_Service__Tokens(TestCase):
     def test__list_tokens(self):
         files = self.service.list_tokens()
         assert files is not None
+
+    def test__list_tokens__legacy_entries_without_rows_stay_listed(self):        # Entries from before summary rows + one new token (one row)
+        cache_client = create_send_cache_client()
+        service      = Service__Tokens(send_cache_client=cache_client)
+        for token_name in ('legacy-a', 'legacy-b'):                                # Stored raw: no summary row
+            cache_client.cache_client.store().store__json__cache_key(namespace='tokens', strategy='key_based', cache_key=token_name, file_id=token_name,
+                                                                     body=dict(token_name=token_name, status='active', usage_limit=5, usage_count=0),
+                                                                     json_field_path='token_name')
+        service.create('new-token', usage_limit=5, created_by='test')
+        assert [token['token_name'] for token in service.list_tokens_with_details()] == ['legacy-a', 'legacy-b', 'new-token']
+        page = cache_client.token__list_page(limit=2)
+        assert [row['token_name'] for row in page['items']]                      == ['legacy-a', 'legacy-b']
+        page = cache_client.token__list_page(cursor=page['next_cursor'], limit=2)
+        assert [row['token_name'] for row in page['items']]                      == ['new-token']
+
+    def test__use__cache_round_trips(self):
+        self.service.create('svc-round-trips', usage_limit=10, created_by='test')
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as counter:
+            result = self.service.use('svc-round-trips')
+        assert result['success'] is True
+        assert counter.count()   == 3                                              # lookup_entry + usage event + usage listing
+
+    def test__use_batch(self):
+        self.service.create('svc-batch-a', usage_limit=3 , created_by='test')
+        self.service.create('svc-batch-b', usage_limit=10, created_by='test')
+        events = ([dict(token_name='svc-batch-a', action='page_opened')] * 5 +
+                  [dict(token_name='svc-batch-b', action='page_opened')] * 2 +
+                  [dict(token_name='svc-batch-missing')]                     )
+        results = self.service.use_batch(events)['results']
+        assert results['svc-batch-a']['accepted']    == 3
+        assert results['svc-batch-a']['rejected']    == 2
+        assert results['svc-batch-a']['status']      == 'exhausted'
+        assert results['svc-batch-b']['usage_count'] == 2
+        assert results['svc-batch-b']['remaining']   == 8
+        assert results['svc-batch-missing']['reason'] == 'not_found'
+        assert self.service.lookup('svc-batch-a')['usage_count'] == 3
+
+    def test__use_batch__cache_round_trips(self):                                  # One usage-event document per event, one listing per token
+        self.service.create('svc-batch-trips', usage_limit=100, created_by='test')
+        events = [dict(token_name='svc-batch-trips')] * 8
+        with Send__Cache__Call__Counter(send_cache_client=self.cache_client) as counter:
+            result = self.service.use_batch(events)
+        assert result['results']['svc-batch-trips']['accepted'] == 8
+        assert counter.count()                                   == 10             # lookup_entry + 8 usage events + usage listing
+
+    def test__use__concurrent_never_overshoots(self):                             # Every use is its own document — the limit holds under contention
+        from concurrent.futures import ThreadPoolExecutor
+        self.service.create('svc-race', usage_limit=5, created_by='test')
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: self.service.use('svc-race'), range(12)))
+        assert sum(1 for result in results if result['success']) == 5
+        assert self.service.lookup('svc-race')['usage_count']     == 5
+        assert self.service.lookup('svc-race')['status']          == 'exhausted'
+
+    def test__use__does_not_rewrite_token_record(self):
+        self.service.create('svc-no-rewrite', usage_limit=100, created_by='test')
+        self.service.use('svc-no-rewrite')
+        self.service.use('svc-no-rewrite')
+        record = self.cache_client.token__lookup('svc-no-rewrite')
+        assert record['usage_count']                                 == 0          # Record only changes with the status
+        assert self.service.lookup('svc-no-rewrite')['usage_count']  == 2          # Counted from the usage documents
+        page = self.service.list_tokens_page()
+        assert [item['usage_count'] for item in page['items'] if item['token_name'] == 'svc-no-rewrite'] == [2]   # List views show the live count
+        files = self.cache_client.token__list_data('svc-no-rewrite').json()['files']
+        assert len(files)                                             == 2
+        assert files[0]['data_key']                                   == 'usage_events'
+
+    def test__lease_and_release(self):
+        self.service.create('svc-lease', usage_limit=10, created_by='test')
+        lease = self.service.lease('svc-lease', 8)
+        assert lease['granted']     == 8
+        assert lease['usage_count'] == 8
+        second = self.service.lease('svc-lease', 8)
+        assert second['granted']    == 2                                          # Partial grant up to the limit
+        assert self.service.lookup('svc-lease')['status'] == 'exhausted'
+        assert self.service.use('svc-lease')['reason']    == 'exhausted'
+
+        released = self.service.release('svc-lease', lease['lease_id'], 3)
+        assert released['usage_count'] == 7
+        assert released['status']      == 'active'                               # Quota returned — token usable again
+        assert self.service.use('svc-lease')['usage_count'] == 8
+
+    def test__release__validated_against_the_lease(self):                         # Forged, oversized and repeated releases are refused
+        self.service.create('svc-release-checks', usage_limit=5, created_by='test')
+        lease  = self.service.lease('svc-release-checks', 5)
+        events = [dict(token_name='svc-release-checks', lease_id=lease['lease_id'])] * 2
+        self.service.use_batch(events)
+        assert self.service.release('svc-release-checks', 'forged-lease'  , 1)['reason'] == 'unknown_lease'
+        assert self.service.release('svc-release-checks', lease['lease_id'], 4)['reason'] == 'invalid_unused'   # 2 of 5 were recorded as used
+        assert self.service.release('svc-release-checks', lease['lease_id'], -1)['reason'] == 'invalid_unused'
+        assert self.service.release('svc-release-checks', lease['lease_id'], 3)['usage_count'] == 2
+        assert self.service.release('svc-release-checks', lease['lease_id'], 3)['reason'] == 'closed'
+        assert self.service.lookup('svc-release-checks')['usage_count'] == 2       # Counted once, never below the recorded uses
+
+    def test__lease__expired_counts_only_recorded_uses(self):                      # A container that died with a lease does not keep its quota
+        from sgraph_ai_app_send.lambda__admin.service.Service__Tokens import token_ledger
+        files = [('leases', 'aaaa-5-100'), ('usage_events/aaaa', 'e1'), ('usage_events', 'e2'),
+                 ('leases', 'bbbb-4-100'), ('releases', 'bbbb-3')                                 ]
+        assert token_ledger(files, now=50 )['total'] == 5 + 1 + 1                  # Open lease charges its whole grant
+        assert token_ledger(files, now=150)['total'] == 1 + 1 + 1                  # Expired: only its recorded use
+
+    def test__use_batch__leased_events_are_logged_not_counted(self):
+        self.service.create('svc-leased-batch', usage_limit=10, created_by='test')
+        lease   = self.service.lease('svc-leased-batch', 4)
+        events  = [dict(token_name='svc-leased-batch', lease_id=lease['lease_id'], event_id=f'leased-{i}') for i in range(3)]
+        result  = self.service.use_batch(events)['results']['svc-leased-batch']
+        assert result['accepted']    == 3
+        assert result['usage_count'] == 4
+        files = self.cache_client.token__list_data('svc-leased-batch').json()['files']
+        assert sorted(file['data_file_id'] for file in files if file['data_key'] != 'leases') == ['leased-0', 'leased-1', 'leased-2']   # One usage-event document per event
@@ -3,10 +3,13 @@
 # Vault lifecycle: create, lookup, folder/file/index CRUD, bulk operations
 # ===============================================================================
 
+import hashlib
+from concurrent.futures                                                         import ThreadPoolExecutor
 from unittest                                                                   import TestCase
 from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Setup               import create_send_cache_client
 from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client__Vault       import Send__Cache__Client__Vault
-from sgraph_ai_app_send.lambda__admin.service.Service__Vault                   import Service__Vault
+from sgraph_ai_app_send.lambda__admin.service.Service__Vault                   import Service__Vault, Vault__File__Corrupt
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                        import Send__Cache__Call__Counter
 
 
 class test_Service__Vault(TestCase):
@@ -17,6 +20,7 @@ class test_Service__Vault(TestCase):
         vault_cache_client = Send__Cache__Client__Vault(
             cache_client   = send_cache_client.cache_client   ,
             hash_generator = send_cache_client.hash_generator )
+        cls.send_cache_client = send_cache_client
         cls.service   = Service__Vault(vault_cache_client=vault_cache_client)
         cls.vault_key = 'svc-vault-test-001'
 
@@ -126,6 +130,13 @@ class test_Service__Vault(TestCase):
         if isinstance(data, (bytes, bytearray)):
             assert data == b'chunk-zero-data-aaachunk-one-data-bbb'
 
+    def test__36a__list_files__includes_assembled_files(self):
+        result   = self.service.list_files(self.vault_key)
+        file_ids = [file['data_file_id'] for file in result['files']]
+        assert 'file-aaa' in file_ids                                        # Stored blob
+        assert 'big-file' in file_ids                                        # Assembled: descriptor + chunks, no blob
+        assert result['file_count'] == len(file_ids)
+
     def test__37__assemble_file__missing_chunk(self):
         # Store only 1 of 2 expected chunks
         self.service.store_file_chunk(self.vault_key, 'partial-file', 0, b'only-this')
@@ -134,6 +145,88 @@ class test_Service__Vault(TestCase):
         assert result.get('error') == 'missing_chunk'
         assert result.get('chunk_index') == 1
 
+    def test__37a__assemble_file__moves_no_chunk_bytes(self):
+        for index in (2, 0, 1):                                              # Any upload order
+            self.service.store_file_chunk(self.vault_key, 'zero-copy-file', index, bytes([65 + index]) * 1000)
+        with Send__Cache__Call__Counter(send_cache_client=self.send_cache_client) as counter:
+            result = self.service.assemble_file(self.vault_key, 'zero-copy-file', 3)
+        assert result == dict(status='assembled', file_guid='zero-copy-file', size=3000)
+        assert not [call for call in counter.calls if '/data/binary/' in call]   # Manifest + descriptor only — no chunk reads
+        assert [len(part) for part in self.service.stream_file(self.vault_key, 'zero-copy-file')] == [1000, 1000, 1000]
+        assert self.service.get_file(self.vault_key, 'zero-copy-file') == b'A' * 1000 + b'B' * 1000 + b'C' * 1000
+
+    def test__37b__delete_file__removes_chunks_in_one_call(self):
+        with Send__Cache__Call__Counter(send_cache_client=self.send_cache_client) as counter:
+            self.service.delete_file(self.vault_key, 'zero-copy-file')
+        assert len([call for call in counter.calls if call.startswith('DELETE')]) == 5  # All chunks, descriptor, chunk records, old manifest, any blob
+        assert self.service.get_file(self.vault_key, 'zero-copy-file') is None
+
+    def test__37c__chunk_manifest__records_size_and_hash(self):
+        result = self.service.store_file_chunk(self.vault_key, 'hashed-file', 1, b'second')
+        assert result == dict(chunk_index=1, size=6, sha256=hashlib.sha256(b'second').hexdigest())
+        self.service.store_file_chunk(self.vault_key, 'hashed-file', 0, b'first', chunk_sha256=hashlib.sha256(b'first').hexdigest())
+        chunks = self.service.chunk_manifest(self.vault_key, 'hashed-file')['chunks']
+        assert sorted(chunks)        == ['0', '1']
+        assert chunks['0']['size']   == 5
+
+    def test__37d__store_file_chunk__hash_mismatch_rejected(self):
+        result = self.service.store_file_chunk(self.vault_key, 'hashed-file', 2, b'third', chunk_sha256='00' * 32)
+        assert result.get('error')       == 'hash_mismatch'
+        assert '2' not in self.service.chunk_manifest(self.vault_key, 'hashed-file')['chunks']
+
+    def test__37e__assemble_file__missing_chunk_from_manifest_in_one_read(self):
+        with Send__Cache__Call__Counter(send_cache_client=self.send_cache_client) as counter:
+            result = self.service.assemble_file(self.vault_key, 'hashed-file', 3)
+        assert result          == dict(error='missing_chunk', chunk_index=2)
+        assert counter.count() == 2                                          # Vault lookup + chunk record listing
+
+    def test__37f__parallel_out_of_order_chunks(self):
+        chunks = {index: bytes([97 + index]) * 100 for index in range(8)}
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda index: self.service.store_file_chunk(self.vault_key, 'parallel-file', index, chunks[index]),
+                                        reversed(range(8))))
+        assert all('error' not in result for result in results)
+        assert self.service.assemble_file(self.vault_key, 'parallel-file', 8)['size'] == 800
+        assert self.service.get_file(self.vault_key, 'parallel-file')     == b''.join(chunks[index] for index in range(8))
+        assert self.service.verify_file(self.vault_key, 'parallel-file')  == dict(valid=True, checked=8)
+
+    def test__37g__store_file_chunk__no_reads(self):
+        with Send__Cache__Call__Counter(send_cache_client=self.send_cache_client) as counter:
+            self.service.store_file_chunk(self.vault_key, 'no-read-file', 0, b'chunk')
+        assert counter.count() == 3                                          # Vault lookup + chunk + its record — no manifest read-modify-write
+
+    def test__37h__chunk_resent_with_other_bytes__stored_chunk_wins(self):
+        self.service.store_file_chunk(self.vault_key, 'resent-file', 0, b'first-version')
+        self.service.store_file_chunk(self.vault_key, 'resent-file', 0, b'second')         # Leaves two records for chunk 0
+        chunks = self.service.chunk_manifest(self.vault_key, 'resent-file')['chunks']
+        assert chunks['0'] == dict(size=6, sha256=hashlib.sha256(b'second').hexdigest())
+        assert self.service.assemble_file(self.vault_key, 'resent-file', 1)['size'] == 6
+        assert self.service.verify_file(self.vault_key, 'resent-file') == dict(valid=True, checked=1)
+
+    def test__37i__stream_file__chunk_deleted__raises_before_streaming(self):
+        for index in range(3):
+            self.service.store_file_chunk(self.vault_key, 'lost-chunk-file', index, bytes([48 + index]) * 50)
+        self.service.assemble_file(self.vault_key, 'lost-chunk-file', 3)
+        cache_id = self.service.vault_cache_client.vault__lookup_cache_id(self.vault_key)
+        self.service.vault_cache_client.chunk__delete(cache_id, 'lost-chunk-file', 1)
+        with self.assertRaises(Vault__File__Corrupt) as context:
+            self.service.stream_file(self.vault_key, 'lost-chunk-file')       # Raised on the call — not after chunk 0 was yielded
+        assert (context.exception.chunk_index, context.exception.reason) == (1, 'missing')
+        with self.assertRaises(Vault__File__Corrupt):
+            self.service.get_file(self.vault_key, 'lost-chunk-file')
+
+    def test__37j__stream_file__chunk_replaced__aborts_stream(self):
+        for index in range(2):
+            self.service.store_file_chunk(self.vault_key, 'swapped-chunk-file', index, bytes([65 + index]) * 20)
+        self.service.assemble_file(self.vault_key, 'swapped-chunk-file', 2)
+        cache_id = self.service.vault_cache_client.vault__lookup_cache_id(self.vault_key)
+        self.service.vault_cache_client.chunk__store(cache_id, 'swapped-chunk-file', 1, b'Z' * 20)   # Same size, other bytes
+        parts = self.service.stream_file(self.vault_key, 'swapped-chunk-file')
+        assert next(parts) == b'A' * 20
+        with self.assertRaises(Vault__File__Corrupt) as context:
+            next(parts)
+        assert context.exception.reason == 'hash_mismatch'
+
     def test__38__store_file_chunk__vault_not_found(self):
         result = self.service.store_file_chunk('bad-key', 'f001', 0, b'data')
         assert result is None
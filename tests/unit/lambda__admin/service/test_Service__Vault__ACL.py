@@ -8,6 +8,14 @@ from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Setup               i
 from sgraph_ai_app_send.lambda__admin.service.Send__Cache__Client__Vault       import Send__Cache__Client__Vault
 from sgraph_ai_app_send.lambda__admin.service.Service__Vault                   import Service__Vault
 from sgraph_ai_app_send.lambda__admin.service.Service__Vault__ACL             import Service__Vault__ACL
+from tests.unit.lambda__admin.Send__Cache__Call__Counter                        import Send__Cache__Call__Counter
+
+
+class Service__Vault__ACL__Clock(Service__Vault__ACL):                         # Manually advanced clock
+    clock : float = 1000.0
+
+    def now(self):
+        return self.clock
 
 
 class test_Service__Vault__ACL(TestCase):
@@ -18,6 +26,8 @@ class test_Service__Vault__ACL(TestCase):
         vault_cache_client = Send__Cache__Client__Vault(
             cache_client   = send_cache_client.cache_client   ,
             hash_generator = send_cache_client.hash_generator )
+        cls.send_cache_client  = send_cache_client
+        cls.vault_cache_client = vault_cache_client
 
         cls.vault_acl = Service__Vault__ACL(vault_cache_client=vault_cache_client)
         cls.service   = Service__Vault(vault_cache_client=vault_cache_client,
@@ -118,6 +128,10 @@ class test_Service__Vault__ACL(TestCase):
         user_ids = [e.get('user_id') for e in entries]
         assert 'user-owner-001'  in user_ids
         assert 'user-editor-001' in user_ids
+        by_user  = {e.get('user_id'): e for e in entries}
+        assert by_user['user-editor-001']['granted_by'] == 'user-owner-001'
+        assert by_user['user-owner-001' ]['granted_by'] == 'user-owner-001'   # Auto-granted on create
+        assert by_user['user-editor-001']['granted_at']                       # ISO timestamp of the grant
 
     # ═══════════════════════════════════════════════════════════════════════
     # Revoke access
@@ -139,3 +153,70 @@ class test_Service__Vault__ACL(TestCase):
     def test__53__revoke_nonexistent_user(self):
         result = self.vault_acl.revoke_access(self.cache_id, 'user-ghost-999')
         assert result.get('success') is False
+
+    # ═══════════════════════════════════════════════════════════════════════
+    # ACL listing: one read per vault, cached checks
+    # ═══════════════════════════════════════════════════════════════════════
+
+    def test__60__list_permissions__listing_plus_entry_reads(self):
+        cold_acl = Service__Vault__ACL(vault_cache_client=self.vault_cache_client)
+        with Send__Cache__Call__Counter(send_cache_client=self.send_cache_client) as counter:
+            entries = cold_acl.list_permissions(self.cache_id)
+        assert len(entries)    >= 2
+        assert counter.count() == 1 + len(entries)                           # One listing + one entry read per member (in parallel)
+        assert all(entry['granted_by'] for entry in entries)
+
+    def test__60a__check_permission__listing_only(self):
+        cold_acl = Service__Vault__ACL(vault_cache_client=self.vault_cache_client)
+        with Send__Cache__Call__Counter(send_cache_client=self.send_cache_client) as counter:
+            cold_acl.check_permission(self.cache_id, 'user-owner-001', 'owner')
+        assert counter.count() == 1                                          # Checks never read entry bodies
+
+    def test__61__check_permission__cached_until_ttl(self):
+        acl = Service__Vault__ACL__Clock(vault_cache_client=self.vault_cache_client)
+        assert acl.is_owner(self.cache_id, 'user-owner-001') is True
+        with Send__Cache__Call__Counter(send_cache_client=self.send_cache_client) as counter:
+            assert acl.can_view(self.cache_id, 'user-viewer-001')  is True
+            assert acl.can_view(self.cache_id, 'user-unknown-999') is False
+        assert counter.count() == 0                                          # Dict lookups on the cached listing
+
+        self.vault_acl.grant_access(self.cache_id, 'user-late-001', 'viewer', 'user-owner-001')
+        assert acl.can_view(self.cache_id, 'user-late-001') is False         # Another instance's grant: seen after the TTL
+        acl.clock += acl.cache_ttl
+        assert acl.can_view(self.cache_id, 'user-late-001') is True
+
+    def test__62__legacy_entries_migrated_on_first_read(self):
+        cache_id = self.service.create('acl-test-vault-legacy')['cache_id']  # No owner — no per-user entries yet
+        self.vault_cache_client.acl__store(cache_id, 'user-legacy-001', dict(user_id='user-legacy-001', permission='editor', active=True))
+        assert self.vault_acl.can_edit(cache_id, 'user-legacy-001') is True
+        assert self.vault_cache_client.acl__grants(cache_id)           == [('user-legacy-001', 'editor')]
+        assert self.vault_cache_client.acl__list(cache_id).json()['files'] == []     # Legacy entry deleted once copied
+
+    def test__63__acl_document_migrated_and_deleted(self):
+        cache_id = self.service.create('acl-test-vault-doc')['cache_id']
+        self.vault_cache_client.acl__doc_store(cache_id, dict(entries={'user@example.com': dict(user_id='user@example.com', permission='owner' , active=True),
+                                                                       'user-gone-001'   : dict(user_id='user-gone-001'   , permission='viewer', active=False)}))
+        assert Service__Vault__ACL(vault_cache_client=self.vault_cache_client).is_owner(cache_id, 'user@example.com') is True
+        assert self.vault_cache_client.acl__grants(cache_id)  == [('user@example.com', 'owner')]   # Unsafe ids round-trip through the entry name
+        assert self.vault_cache_client.acl__doc_get(cache_id) is None
+
+    def test__64__concurrent_grant_and_revoke__both_survive(self):           # Two instances act on the same stale listing
+        instance_a = Service__Vault__ACL(vault_cache_client=self.vault_cache_client)
+        instance_b = Service__Vault__ACL(vault_cache_client=self.vault_cache_client)
+        self.vault_acl.grant_access(self.cache_id, 'user-race-001', 'viewer', 'user-owner-001')
+        stale      = instance_a.grants(self.cache_id, fresh=True)
+        instance_b.grants(self.cache_id, fresh=True)
+
+        assert instance_b.revoke_access(self.cache_id, 'user-race-001').get('success') is True
+        assert instance_a.grant_access__write(self.cache_id, 'user-race-002', 'viewer', 'user-owner-001', stale).get('success') is True
+
+        grants = Service__Vault__ACL(vault_cache_client=self.vault_cache_client).grants(self.cache_id)
+        assert 'user-race-001' not in grants                                 # The revoke was not overwritten by the grant
+        assert grants.get('user-race-002') == 'viewer'
+
+    def test__65__revoke_bypasses_cached_listing(self):
+        acl = Service__Vault__ACL__Clock(vault_cache_client=self.vault_cache_client)
+        self.vault_acl.grant_access(self.cache_id, 'user-revoke-001', 'viewer', 'user-owner-001')
+        assert acl.can_view(self.cache_id, 'user-revoke-001') is True         # Cached listing now allows the user
+        assert acl.revoke_access(self.cache_id, 'user-revoke-001').get('success') is True
+        assert acl.can_view(self.cache_id, 'user-revoke-001') is False        # Seen at once — no waiting for the TTL
@@ -35,6 +35,17 @@ class test_Routes__Transfers__with_tokens(TestCase):
         cls.user_fast_api = Fast_API__SGraph__App__Send__User(admin_service_client = cls.admin_service_client).setup()
         cls.client        = cls.user_fast_api.client()
 
+    # --- token usage queue lifecycle ---
+
+    def test__shutdown__returns_leased_quota(self):
+        self.admin_service_client.token_create('lease-shutdown-token', usage_limit=10)
+        user_fast_api = Fast_API__SGraph__App__Send__User(admin_service_client = self.admin_service_client).setup()
+        with TestClient(user_fast_api.app()) as client:                           # Context manager runs the app's lifespan
+            assert client.post('/api/transfers/validate-token/lease-shutdown-token').json()['usage_count'] == 1
+            assert self.admin_service_client.token_lookup('lease-shutdown-token').json()['usage_count'] == user_fast_api.token_usage_queue.lease_size
+        assert self.admin_service_client.token_lookup('lease-shutdown-token').json()['usage_count'] == 1   # Unused lease quota handed back on shutdown
+        assert user_fast_api.token_usage_queue.leases == {}
+
     # --- check-token endpoint ---
 
     def test__check_token__valid(self):
@@ -149,3 +160,21 @@ class test_Routes__Transfers__with_tokens(TestCase):
         # Download payload (public endpoint)
         download = self.client.get(f'/api/transfers/download/{tid}')
         assert download.content == payload
+
+    def test__token_status_cache__one_cache_shared_by_routes(self):
+        self.admin_service_client.token_create('shared-cache-token', usage_limit=10)
+        cache   = self.user_fast_api.token_status_cache
+        headers = {HEADER__SGRAPH_SEND__ACCESS_TOKEN: 'shared-cache-token'}
+        self.client.post('/api/presigned/initiate', headers=headers,            # Presigned route checks the token first (S3 step may fail in memory mode)
+                         json=dict(file_size_bytes=1024, num_parts=1))
+        assert 'shared-cache-token' in cache.entries                            # Cached by the app's cache, not a route-local one
+        calls = []
+        token_lookup = self.admin_service_client.token_lookup
+        self.admin_service_client.token_lookup = lambda name: calls.append(name) or token_lookup(name)
+        try:
+            response = self.client.post('/api/transfers/create', headers=headers,
+                                        json=dict(file_size_bytes=10, content_type_hint='text/plain'))
+        finally:
+            del self.admin_service_client.token_lookup
+        assert response.status_code == 200
+        assert calls == []                                                      # Transfers route hits the same cache entry
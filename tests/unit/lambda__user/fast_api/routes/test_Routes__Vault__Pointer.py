@@ -5,6 +5,7 @@
 # ===============================================================================
 
 import base64
+import hashlib
 import json
 from unittest                                                                    import TestCase
 from tests.unit.lambda__user.Fast_API__Test_Objs__SGraph__App__Send__User        import setup__fast_api__user__test_objs
@@ -292,6 +293,21 @@ class test_Routes__Vault__Pointer(TestCase):
         assert data['results'][0]['status']  == 'conflict'
         assert data['results'][0]['current'] == base64.b64encode(b'commit-aaa').decode()
 
+    def test__batch__write_if_match__hash_mode(self):
+        vault = 'batchvault009'
+        setup_ops = [dict(op='write', file_id='bare/refs/ref-001',
+                          data=base64.b64encode(b'commit-aaa').decode())]
+        self._batch(vault_id=vault, operations=setup_ops)
+
+        ops = [dict(op='write-if-match', file_id='bare/refs/ref-001',
+                    match_hash=hashlib.sha256(b'stale').hexdigest(),
+                    data=base64.b64encode(b'new').decode())]
+        response = self._batch(vault_id=vault, operations=ops)
+        assert response.status_code == 200
+        result = response.json()['results'][0]
+        assert result['status']       == 'conflict'
+        assert result['current_hash'] == hashlib.sha256(b'commit-aaa').hexdigest()
+
     def test__batch__missing_write_key(self):
         response = self.client.post(f'/api/vault/batch/{VAULT_ID}',
                                     content = json.dumps({'operations': []}),
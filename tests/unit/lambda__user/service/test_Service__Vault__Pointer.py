@@ -5,6 +5,7 @@
 # ===============================================================================
 
 import base64
+import hashlib
 from unittest                                                                    import TestCase
 from sgraph_ai_app_send.lambda__user.service.Service__Vault__Pointer             import Service__Vault__Pointer
 
@@ -315,6 +316,67 @@ class test_Service__Vault__Pointer(TestCase):
                                              'wrong-key')
         assert result is None
 
+    # === write-if-hash-match (compare-and-swap on content hash) ===
+
+    def test__write_if_hash_match__succeeds_when_matching(self):
+        self.service.write(self.vault_id, 'ref-001', self.write_key, b'commit-aaa')
+
+        current_hash = hashlib.sha256(b'commit-aaa').hexdigest()
+        new_b64      = base64.b64encode(b'commit-bbb').decode()
+
+        result = self.service.write_if_hash_match(self.vault_id, 'ref-001',
+                                                  current_hash, new_b64, self.write_key)
+        assert result == dict(file_id = 'ref-001'                                  ,
+                              status  = 'ok'                                       ,
+                              hash    = hashlib.sha256(b'commit-bbb').hexdigest()  )
+        assert self.service.read(self.vault_id, 'ref-001') == b'commit-bbb'
+
+    def test__write_if_hash_match__accepts_prefixed_hash(self):
+        self.service.write(self.vault_id, 'ref-001', self.write_key, b'commit-aaa')
+        match_hash = 'sha256:' + hashlib.sha256(b'commit-aaa').hexdigest().upper()
+        result     = self.service.write_if_hash_match(self.vault_id, 'ref-001', match_hash,
+                                                      base64.b64encode(b'commit-bbb').decode(), self.write_key)
+        assert result['status'] == 'ok'
+
+    def test__write_if_hash_match__conflict_returns_hash_not_content(self):
+        self.service.write(self.vault_id, 'ref-001', self.write_key, b'commit-aaa')
+
+        stale_hash = hashlib.sha256(b'commit-old').hexdigest()
+        result     = self.service.write_if_hash_match(self.vault_id, 'ref-001', stale_hash,
+                                                      base64.b64encode(b'commit-bbb').decode(), self.write_key)
+        assert result == dict(file_id      = 'ref-001'                                 ,
+                              status       = 'conflict'                                ,
+                              current_hash = hashlib.sha256(b'commit-aaa').hexdigest() )
+        assert self.service.read(self.vault_id, 'ref-001') == b'commit-aaa'      # Unchanged
+
+    def test__write_if_hash_match__first_write_with_no_existing(self):
+        result = self.service.write_if_hash_match(self.vault_id, 'ref-new', None,
+                                                  base64.b64encode(b'first').decode(), self.write_key)
+        assert result['status'] == 'ok'
+        assert self.service.read(self.vault_id, 'ref-new') == b'first'
+
+    def test__write_if_hash_match__conflict_when_file_exists_but_match_is_none(self):
+        self.service.write(self.vault_id, 'ref-001', self.write_key, b'existing')
+        result = self.service.write_if_hash_match(self.vault_id, 'ref-001', None,
+                                                  base64.b64encode(b'overwrite').decode(), self.write_key)
+        assert result['status'] == 'conflict'
+
+    def test__write_if_hash_match__wrong_key_rejected(self):
+        self.service.write(self.vault_id, 'ref-001', self.write_key, b'data')
+        result = self.service.write_if_hash_match(self.vault_id, 'ref-001',
+                                                  hashlib.sha256(b'data').hexdigest(),
+                                                  base64.b64encode(b'new').decode(), 'wrong-key')
+        assert result is None
+
+    def test__write_if_hash_match__lost_race_reports_conflict(self):
+        self.service.write(self.vault_id, 'ref-001', self.write_key, b'commit-aaa')
+        self.service.storage_fs.file__save__if_match = lambda path, data, etag: False   # Simulate S3 412 PreconditionFailed
+        result = self.service.write_if_hash_match(self.vault_id, 'ref-001',
+                                                  hashlib.sha256(b'commit-aaa').hexdigest(),
+                                                  base64.b64encode(b'commit-bbb').decode(), self.write_key)
+        assert result['status'] == 'conflict'
+        assert self.service.read(self.vault_id, 'ref-001') == b'commit-aaa'
+
     # === list_files ===
 
     def test__list_files__empty_vault(self):
@@ -416,6 +478,22 @@ class test_Service__Vault__Pointer(TestCase):
         assert self.service.read(self.vault_id, 'bare/data/obj-2') is None      # Third op skipped
         assert self.service.read(self.vault_id, 'bare/refs/ref-001') == b'commit-aaa'  # Ref unchanged
 
+    def test__batch__write_if_match__hash_mode(self):
+        self.service.write(self.vault_id, 'bare/refs/ref-001', self.write_key, b'commit-aaa')
+
+        operations = [dict(op='write-if-match', file_id='bare/refs/ref-001',
+                           match_hash=hashlib.sha256(b'commit-aaa').hexdigest(),
+                           data=base64.b64encode(b'commit-bbb').decode()),
+                      dict(op='write-if-match', file_id='bare/refs/ref-001',
+                           match_hash=hashlib.sha256(b'commit-aaa').hexdigest(),
+                           data=base64.b64encode(b'commit-ccc').decode())]
+        result = self.service.batch(self.vault_id, operations, self.write_key)
+        assert result['results'][0]['status']       == 'ok'
+        assert result['results'][1]['status']       == 'conflict'
+        assert result['results'][1]['current_hash'] == hashlib.sha256(b'commit-bbb').hexdigest()
+        assert 'current' not in result['results'][1]                            # No content echoed back in hash mode
+        assert self.service.read(self.vault_id, 'bare/refs/ref-001') == b'commit-bbb'
+
     def test__batch__delete(self):
         self.service.write(self.vault_id, 'bare/data/obj-old', self.write_key, b'old-blob')
         operations = [
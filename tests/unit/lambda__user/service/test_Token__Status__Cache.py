@@ -0,0 +1,95 @@
+# ===============================================================================
+# Tests for Token__Status__Cache
+# Hot-path token validation cache: TTLs, LRU bound, generation-based invalidation
+# Uses IN_MEMORY mode: real admin FastAPI app, no network
+# ===============================================================================
+
+from unittest                                                                          import TestCase
+from osbot_fast_api.api.schemas.consts.consts__Fast_API                               import ENV_VAR__FAST_API__AUTH__API_KEY__NAME, ENV_VAR__FAST_API__AUTH__API_KEY__VALUE
+from osbot_utils.utils.Env                                                             import set_env
+from sgraph_ai_app_send.lambda__admin.fast_api.Fast_API__SGraph__App__Send__Admin      import Fast_API__SGraph__App__Send__Admin
+from sgraph_ai_app_send.lambda__user.service.Admin__Service__Client                    import Admin__Service__Client
+from sgraph_ai_app_send.lambda__user.service.Admin__Service__Client__Setup             import setup_admin_service_client__in_memory
+from sgraph_ai_app_send.lambda__user.service.Token__Status__Cache                      import Token__Status__Cache
+
+
+class Admin__Service__Client__Counting(Admin__Service__Client):                  # Records which admin endpoints were hit
+    calls : list
+
+    def token_lookup(self, token_name):
+        self.calls.append('lookup')
+        return super().token_lookup(token_name)
+
+    def token_generation(self):
+        self.calls.append('generation')
+        return super().token_generation()
+
+
+class Token__Status__Cache__Clock(Token__Status__Cache):                        # Manually advanced clock
+    clock : float = 1000.0
+
+    def now(self):
+        return self.clock
+
+
+class test_Token__Status__Cache(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        set_env(ENV_VAR__FAST_API__AUTH__API_KEY__NAME , 'token-cache-test-key' )
+        set_env(ENV_VAR__FAST_API__AUTH__API_KEY__VALUE, 'token-cache-test-value')
+        cls.admin_fast_api = Fast_API__SGraph__App__Send__Admin().setup()
+        setup_admin_service_client__in_memory(cls.admin_fast_api)
+
+    def setUp(self):
+        self.admin = Admin__Service__Client__Counting()
+        self.cache = Token__Status__Cache__Clock(admin_service_client=self.admin)
+
+    def revoke(self, token_name):
+        return self.admin.requests().execute('POST', f'/tokens/revoke/{token_name}')
+
+    def test__positive_hit_skips_admin(self):
+        self.admin.token_create('cache-positive', usage_limit=5)
+        status_code, data = self.cache.token_status('cache-positive')
+        assert status_code        == 200
+        assert data['status']     == 'active'
+        assert self.admin.calls   == ['generation', 'lookup']
+
+        self.cache.clock += 1                                                    # Within TTL and poll interval: no admin traffic at all
+        assert self.cache.token_status('cache-positive')[0] == 200
+        assert self.admin.calls   == ['generation', 'lookup']
+
+        self.cache.clock += self.cache.ttl_positive                              # TTL expiry forces a fresh lookup
+        self.cache.token_status('cache-positive')
+        assert self.admin.calls[-1] == 'lookup'
+
+    def test__negative_cache(self):
+        assert self.cache.token_status('cache-missing') == (404, None)
+        assert self.cache.token_status('cache-missing') == (404, None)
+        assert self.admin.calls.count('lookup') == 1
+        self.cache.clock += self.cache.ttl_negative + 0.1
+        self.cache.token_status('cache-missing')
+        assert self.admin.calls.count('lookup') == 2
+
+    def test__revocation_invalidates_via_generation(self):
+        self.admin.token_create('cache-revoked', usage_limit=5)
+        assert self.cache.token_status('cache-revoked')[1]['status'] == 'active'
+        assert self.revoke('cache-revoked').status_code           == 200
+
+        self.cache.clock += 1                                                    # Before the next poll the cached status may still be served
+        assert self.cache.token_status('cache-revoked')[1]['status'] == 'active'
+
+        self.cache.clock += self.cache.generation_poll                           # Next poll sees the new generation and flushes
+        assert self.cache.token_status('cache-revoked')[1]['status'] == 'revoked'
+
+    def test__created_token_clears_negative_entry(self):
+        assert self.cache.token_status('cache-late')[0] == 404
+        self.admin.token_create('cache-late', usage_limit=5)
+        self.cache.clock += self.cache.generation_poll
+        assert self.cache.token_status('cache-late')[0] == 200
+
+    def test__lru_bound(self):
+        self.cache.max_entries = 2
+        for name in ('lru-a', 'lru-b', 'lru-c'):
+            self.cache.token_status(name)
+        assert list(self.cache.entries) == ['lru-b', 'lru-c']
@@ -0,0 +1,113 @@
+# ===============================================================================
+# Tests for Token__Usage__Queue
+# Lease-backed token uses + batched flush to admin via /tokens/use-batch
+# Uses IN_MEMORY mode: real admin FastAPI app, no network
+# ===============================================================================
+
+from unittest                                                                          import TestCase
+from osbot_fast_api.api.schemas.consts.consts__Fast_API                               import ENV_VAR__FAST_API__AUTH__API_KEY__NAME, ENV_VAR__FAST_API__AUTH__API_KEY__VALUE
+from osbot_utils.utils.Env                                                             import set_env
+from sgraph_ai_app_send.lambda__admin.fast_api.Fast_API__SGraph__App__Send__Admin      import Fast_API__SGraph__App__Send__Admin
+from sgraph_ai_app_send.lambda__user.service.Admin__Service__Client                    import Admin__Service__Client
+from sgraph_ai_app_send.lambda__user.service.Admin__Service__Client__Setup             import setup_admin_service_client__in_memory
+from sgraph_ai_app_send.lambda__user.service.Token__Status__Cache                      import Token__Status__Cache
+from sgraph_ai_app_send.lambda__user.service.Token__Usage__Queue                       import Token__Usage__Queue
+
+
+class Admin__Service__Client__Batch_Counting(Admin__Service__Client):            # Records batch calls; can simulate admin being down
+    batches : list
+    offline : bool = False
+
+    def token_use_batch(self, events):
+        if self.offline:
+            raise ConnectionError('admin unreachable')
+        self.batches.append(len(events))
+        return super().token_use_batch(events)
+
+
+class test_Token__Usage__Queue(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        set_env(ENV_VAR__FAST_API__AUTH__API_KEY__NAME , 'usage-queue-test-key' )
+        set_env(ENV_VAR__FAST_API__AUTH__API_KEY__VALUE, 'usage-queue-test-value')
+        cls.admin_fast_api = Fast_API__SGraph__App__Send__Admin().setup()
+        setup_admin_service_client__in_memory(cls.admin_fast_api)
+
+    def setUp(self):
+        self.admin = Admin__Service__Client__Batch_Counting()
+        self.cache = Token__Status__Cache(admin_service_client=self.admin)
+        self.queue = Token__Usage__Queue(admin_service_client=self.admin, token_status_cache=self.cache)
+
+    def test__use__spends_a_lease(self):
+        self.admin.token_create('queue-lease', usage_limit=5)
+        queue   = Token__Usage__Queue(admin_service_client=self.admin, lease_size=3)
+        results = [queue.use('queue-lease') for _ in range(6)]
+        assert [result['success'] for result in results] == [True] * 5 + [False]  # Two leases (3 + 2), then admin refuses
+        assert results[4]           == dict(success=True, usage_count=5, remaining=0)
+        assert results[5]['reason'] == 'exhausted'
+        assert self.admin.batches   == []                                          # Nothing shipped until the flush
+        assert queue.flush()        == 5
+        lookup = self.admin.token_lookup('queue-lease').json()
+        assert lookup['usage_count'] == 5                                          # Leased events are recorded, not counted twice
+        assert lookup['status']      == 'exhausted'
+
+    def test__use__limit_holds_across_queues(self):                                # Two containers share one admin-side quota
+        self.admin.token_create('queue-shared', usage_limit=4)
+        queue_a = Token__Usage__Queue(admin_service_client=self.admin, lease_size=3)
+        queue_b = Token__Usage__Queue(admin_service_client=self.admin, lease_size=3)
+        results = [queue.use('queue-shared') for queue in (queue_a, queue_b) * 4]
+        assert sum(1 for result in results if result['success']) == 4
+
+    def test__flush__batches_and_updates_cache(self):
+        self.admin.token_create('queue-flush', usage_limit=100)
+        self.cache.token_status('queue-flush')
+        for _ in range(7):
+            self.queue.use('queue-flush')
+        self.queue.max_batch = 5
+        assert self.queue.flush()     == 7
+        assert self.admin.batches     == [5, 2]
+        assert self.queue.pending     == []
+        assert self.cache.entries['queue-flush'][2]['usage_count'] == self.admin.token_lookup('queue-flush').json()['usage_count']
+
+    def test__flush__admin_down_keeps_events(self):
+        self.admin.token_create('queue-offline', usage_limit=10)
+        self.queue.use('queue-offline')
+        self.admin.offline = True
+        assert self.queue.flush()             == 0
+        assert len(self.queue.pending)        == 1
+        self.admin.offline = False
+        assert self.queue.flush()             == 1
+        assert self.queue.pending             == []
+
+    def test__use__refuses_when_pending_is_full(self):                             # Bounded queue never drops recorded uses
+        self.admin.token_create('queue-full', usage_limit=10)
+        queue = Token__Usage__Queue(admin_service_client=self.admin, max_pending=2)
+        assert queue.use('queue-full')['success'] is True
+        assert queue.use('queue-full')['success'] is True
+        assert queue.use('queue-full')            == dict(success=False, reason='busy')
+        assert len(queue.pending)                 == 2
+        assert queue.leases['queue-full']['remaining'] == queue.lease_size - 2     # The refused use did not spend quota
+
+    def test__release_returns_unused(self):
+        self.admin.token_create('queue-lease-release', usage_limit=10)
+        queue = Token__Usage__Queue(admin_service_client=self.admin, lease_size=4)
+        queue.use('queue-lease-release')
+        assert self.admin.token_lookup('queue-lease-release').json()['usage_count'] == 4
+        queue.close()
+        assert self.admin.token_lookup('queue-lease-release').json()['usage_count'] == 1
+        assert queue.leases == {}
+
+    def test__flush__releases_idle_lease__frees_quota(self):
+        self.admin.token_create('queue-idle', usage_limit=4)
+        queue_a = Token__Usage__Queue(admin_service_client=self.admin, lease_size=4)
+        queue_b = Token__Usage__Queue(admin_service_client=self.admin, lease_size=4)
+        assert queue_a.use('queue-idle')['success'] is True                        # queue_a now holds the whole quota
+        assert queue_b.use('queue-idle')            == dict(success=False, reason='exhausted')
+        assert queue_a.flush()                      == 1
+        assert 'queue-idle' in queue_a.leases                                      # Just used — not idle yet
+        queue_a.lease_idle = 0
+        queue_a.flush()
+        assert queue_a.leases                       == {}
+        assert self.admin.token_lookup('queue-idle').json()['usage_count'] == 1    # The released uses are back in admin's quota
+        assert [queue_b.use('queue-idle')['success'] for _ in range(4)] == [True, True, True, False]
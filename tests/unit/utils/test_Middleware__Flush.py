@@ -0,0 +1,68 @@
+# ===============================================================================
+# Tests for Middleware__Flush
+# Every registered buffer is flushed once per request — after the response
+# body, or on the way out when the handler fails — and a failing flush never
+# breaks the response
+# ===============================================================================
+
+from unittest                                                                   import TestCase
+from fastapi                                                                    import FastAPI
+from starlette.background                                                       import BackgroundTask
+from starlette.responses                                                        import StreamingResponse
+from starlette.testclient                                                       import TestClient
+from sgraph_ai_app_send.utils.Middleware__Flush                                import Middleware__Flush
+
+
+class Buffer__Counting:                                                    # Minimal flusher: counts flush() calls
+    def __init__(self, fail=False, events=None):
+        self.flushes = 0
+        self.fail    = fail
+        self.events  = events if events is not None else []
+
+    def flush(self):
+        self.flushes += 1
+        self.events.append('flush')
+        if self.fail:
+            raise ConnectionError('store unreachable')
+
+
+class test_Middleware__Flush(TestCase):
+
+    def setUp(self):
+        self.events  = []
+        self.buffer  = Buffer__Counting(events=self.events)
+        self.failing = Buffer__Counting(fail=True)
+        app          = FastAPI()
+        events       = self.events
+
+        @app.get('/stream')
+        def stream():
+            def body():
+                events.append('body')
+                yield b'streamed'
+            return StreamingResponse(body(), background=BackgroundTask(events.append, 'route-task'))
+
+        @app.get('/ok')
+        def ok():
+            return dict(ok=True)
+
+        @app.get('/boom')
+        def boom():
+            raise ValueError('handler failed')
+
+        app.add_middleware(Middleware__Flush, flushers=[self.failing, None, self.buffer])
+        self.client = TestClient(app, raise_server_exceptions=False)
+
+    def test__flushes_once_per_request(self):
+        assert self.client.get('/ok').json() == dict(ok=True)
+        assert self.client.get('/ok').status_code == 200
+        assert self.buffer .flushes == 2
+        assert self.failing.flushes == 2                                   # Its error did not stop the next flusher
+
+    def test__flushes_when_handler_fails(self):
+        assert self.client.get('/boom').status_code == 500
+        assert self.buffer.flushes == 1
+
+    def test__flushes_after_the_body_is_sent(self):
+        assert self.client.get('/stream').content == b'streamed'
+        assert self.events == ['body', 'route-task', 'flush']              # Deferred to a background task — the route's own task still runs first